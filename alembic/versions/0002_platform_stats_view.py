@@ -0,0 +1,64 @@
+"""Platform statistics materialized view
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:12:03.418211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# One row per reporting window (days). Timestamps are stored as naive UTC.
+PLATFORM_STATS_VIEW = """
+CREATE MATERIALIZED VIEW platform_stats_mv AS
+WITH params AS (
+    SELECT w.window_days,
+           timezone('utc', now()) - make_interval(days => w.window_days) AS since
+    FROM (VALUES (1), (7), (30), (90)) AS w(window_days)
+)
+SELECT
+    p.window_days,
+    (SELECT count(*) FROM users) AS total_users,
+    (
+        SELECT count(DISTINCT a.user_id)
+        FROM (
+            SELECT f.sharer_id AS user_id FROM foods f WHERE f.created_at >= p.since
+            UNION ALL
+            SELECT f.claimed_by_id FROM foods f WHERE f.created_at >= p.since
+        ) AS a
+        WHERE a.user_id IS NOT NULL
+    ) AS active_users,
+    (SELECT count(*) FROM buildings) AS total_buildings,
+    (SELECT count(*) FROM foods) AS total_food_posts,
+    (SELECT count(*) FROM foods f WHERE f.created_at >= p.since) AS recent_food_posts,
+    (SELECT count(*) FROM foods f WHERE f.status = 'available') AS active_food_posts,
+    (SELECT count(*) FROM exchanges) AS total_exchanges,
+    (
+        SELECT count(*) FROM exchanges e
+        WHERE e.status = 'completed' AND e.completed_at >= p.since
+    ) AS completed_exchanges,
+    (SELECT coalesce(sum(c.balance), 0) FROM credits c) AS total_credits,
+    (
+        SELECT count(*) FROM credit_transactions t WHERE t.created_at >= p.since
+    ) AS recent_transactions,
+    timezone('utc', now()) AS refreshed_at
+FROM params p
+"""
+
+
+def upgrade() -> None:
+    op.execute(PLATFORM_STATS_VIEW)
+    # REFRESH ... CONCURRENTLY needs a unique index
+    op.execute("CREATE UNIQUE INDEX ix_platform_stats_mv_window ON platform_stats_mv (window_days)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv")
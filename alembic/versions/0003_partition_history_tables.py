@@ -0,0 +1,141 @@
+"""Partition exchanges and credit_transactions by month
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:41:27.905114
+
+Both tables are rebuilt as range partitioned tables on ``created_at`` with
+one partition per month, from the oldest row through three months ahead;
+``PartitionManager`` keeps creating partitions after that. Existing rows are
+copied in one transaction, so large tables need a maintenance window.
+
+The primary keys become ``(id, created_at)``. A foreign key to a partitioned
+table must cover its partition key, so ``credit_transactions.exchange_id``
+no longer references ``exchanges``.
+"""
+from typing import Dict, List, Sequence, Tuple, Union
+
+from alembic import context, op
+from alembic.script import ScriptDirectory
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTITIONED_TABLES = ('exchanges', 'credit_transactions')
+MONTHS_AHEAD = 3
+
+FOREIGN_KEYS: Dict[str, List[Tuple[str, str]]] = {
+    'exchanges': [
+        ('sharer_id', 'users'),
+        ('recipient_id', 'users'),
+        ('food_id', 'foods'),
+        ('cancelled_by_id', 'users'),
+    ],
+    'credit_transactions': [
+        ('user_id', 'users'),
+        ('food_id', 'foods'),
+        ('created_by_id', 'users'),
+        ('operation_id', 'credit_operations'),
+    ],
+}
+
+INDEXES: Dict[str, List[Tuple[str, List[str]]]] = {
+    'exchanges': [
+        ('ix_exchanges_sharer_id_created_at', ['sharer_id', 'created_at']),
+        ('ix_exchanges_recipient_id_created_at', ['recipient_id', 'created_at']),
+        ('ix_exchanges_status_created_at', ['status', 'created_at']),
+        ('ix_exchanges_food_id', ['food_id']),
+    ],
+    'credit_transactions': [
+        ('ix_credit_transactions_user_id_created_at', ['user_id', 'created_at']),
+    ],
+}
+
+# Partitions named <table>_pYYYY_MM, as PartitionManager expects
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', coalesce(
+                (SELECT min(created_at) FROM {source}), timezone('utc', now())
+            )),
+            date_trunc('month', timezone('utc', now())) + interval '{ahead} months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF {table} FOR VALUES FROM (%L) TO (%L)',
+            '{table}_p' || to_char(month, 'YYYY_MM'),
+            month,
+            month + interval '1 month'
+        );
+    END LOOP;
+END $$
+"""
+
+
+def _platform_stats_view() -> str:
+    # platform_stats_mv reads both tables; reuse its definition from 0002
+    script = ScriptDirectory.from_config(context.config)
+    return script.get_revision('0002').module.PLATFORM_STATS_VIEW
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate ``table`` with or without partitioning and copy its rows."""
+    source = f'{table}_old'
+    op.rename_table(table, source)
+    op.drop_constraint(f'{table}_pkey', source, type_='primary')
+
+    if partitioned:
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        op.create_primary_key(f'{table}_pkey', table, ['id', 'created_at'])
+        op.execute(CREATE_PARTITIONS.format(table=table, source=source, ahead=MONTHS_AHEAD))
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS)')
+        op.create_primary_key(f'{table}_pkey', table, ['id'])
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {source}')
+    op.drop_table(source)
+
+    for column, referred in FOREIGN_KEYS[table]:
+        op.create_foreign_key(f'{table}_{column}_fkey', table, referred, [column], ['id'])
+    if partitioned:
+        # Indexes on the parent are created on every partition
+        for name, columns in INDEXES[table]:
+            op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv")
+    op.drop_constraint('credit_transactions_exchange_id_fkey', 'credit_transactions', type_='foreignkey')
+
+    for table in PARTITIONED_TABLES:
+        _rebuild(table, partitioned=True)
+
+    op.execute(_platform_stats_view())
+    op.execute("CREATE UNIQUE INDEX ix_platform_stats_mv_window ON platform_stats_mv (window_days)")
+
+
+def downgrade() -> None:
+    # Partitions already moved to the archive schema are left in place
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv")
+
+    for table in PARTITIONED_TABLES:
+        _rebuild(table, partitioned=False)
+
+    op.create_foreign_key(
+        'credit_transactions_exchange_id_fkey', 'credit_transactions', 'exchanges',
+        ['exchange_id'], ['id'],
+    )
+    op.execute(_platform_stats_view())
+    op.execute("CREATE UNIQUE INDEX ix_platform_stats_mv_window ON platform_stats_mv (window_days)")
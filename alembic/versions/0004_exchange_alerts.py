@@ -0,0 +1,43 @@
+"""Exchange alerts maintained by the problematic exchange detector
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 13:05:48.220167
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('exchange_alerts',
+    sa.Column('exchange_id', postgresql.UUID(as_uuid=False), nullable=False),
+    sa.Column('exchange_created_at', sa.DateTime(), nullable=False),
+    sa.Column('alert_type', sa.String(length=20), nullable=False),
+    sa.Column('severity', sa.String(length=10), nullable=False),
+    sa.Column('severity_rank', sa.SmallInteger(), nullable=False),
+    sa.Column('due_at', sa.DateTime(), nullable=False),
+    sa.Column('scheduled_pickup_at', sa.DateTime(), nullable=True),
+    sa.Column('detected_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('exchange_id')
+    )
+    op.create_index(
+        'ix_exchange_alerts_severity_rank_created_at',
+        'exchange_alerts',
+        ['severity_rank', 'exchange_created_at', 'exchange_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_exchange_alerts_severity_rank_created_at', table_name='exchange_alerts')
+    op.drop_table('exchange_alerts')
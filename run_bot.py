@@ -24,15 +24,8 @@ async def main():
         logger.info(f"Environment: {settings.environment}")
         logger.info("=" * 50)
         
-        if settings.telegram_webhook_url:
-            logger.info("Starting bot in webhook mode", webhook_url=settings.telegram_webhook_url)
-            await bot_instance.start_webhook(
-                webhook_url=settings.telegram_webhook_url,
-                port=8443
-            )
-        else:
-            logger.info("Starting bot in polling mode")
-            await bot_instance.start_polling()
+        logger.info("Starting bot in polling mode")
+        await bot_instance.start_polling()
         
         # Keep the bot running
         while True:
@@ -51,4 +44,10 @@ if __name__ == "__main__":
         print("❌ Error: TELEGRAM_BOT_TOKEN is required")
         sys.exit(1)
     
+    if settings.telegram_webhook_url:
+        # Webhook updates are posted to the API, which runs the bot itself
+        print("❌ Error: TELEGRAM_WEBHOOK_URL is set; the bot runs inside the API")
+        print("   Start it with: uvicorn src.api.main:app")
+        sys.exit(1)
+    
     asyncio.run(main())
\ No newline at end of file
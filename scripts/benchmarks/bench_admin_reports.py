@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Compare the problematic exchanges report built in memory with its stream.
+
+For each size, seeds that many long-pending exchanges, then measures the
+JSON list endpoint (unlimited, as it was before) and the NDJSON/CSV export:
+time to first byte, total time, and peak Python memory (tracemalloc, in a
+separate pass since tracing slows everything down). Run against a
+disposable database; every table in it is dropped:
+
+    python scripts/benchmarks/bench_admin_reports.py --rows 10000,100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.streaming import stream_records
+from src.core.config import get_settings
+from src.models import Base
+from src.services.admin_service import PROBLEMATIC_EXCHANGE_FIELDS, AdminService
+
+settings = get_settings()
+
+USERS = 500
+
+
+async def seed(factory: async_sessionmaker, rows: int) -> None:
+    """Insert ``rows`` exchanges pending for two to six days."""
+    async with factory() as db:
+        await db.execute(text(
+            "INSERT INTO buildings (id, name, address, city, state, zip_code, country, "
+            "building_type, status, max_users, is_pilot, created_at, updated_at) "
+            "VALUES (gen_random_uuid(), 'Bench', '1 Bench St', 'City', 'ST', '00000', 'US', "
+            "'apartment', 'active', 10000, false, now(), now())"
+        ))
+        await db.execute(text(
+            "INSERT INTO users (id, telegram_id, first_name, last_name, building_id, status, "
+            "sharing_enabled, notifications_enabled, is_phone_verified, created_at, updated_at) "
+            "SELECT gen_random_uuid(), g, 'User', 'Number ' || g, b.id, 'verified', true, true, "
+            "true, now(), now() FROM generate_series(1, :users) g, buildings b"
+        ), {"users": USERS})
+        await db.execute(text(
+            "CREATE TEMP TABLE bench_users ON COMMIT DROP AS "
+            "SELECT row_number() OVER () - 1 AS n, id, building_id FROM users"
+        ))
+        await db.execute(text(
+            "CREATE TEMP TABLE bench_foods ON COMMIT DROP AS "
+            "SELECT g, gen_random_uuid() AS id, u.id AS sharer_id, u.building_id "
+            "FROM generate_series(1, CAST(:rows AS integer)) g "
+            "JOIN bench_users u ON u.n = g % :users"
+        ), {"rows": rows, "users": USERS})
+        await db.execute(text(
+            "INSERT INTO foods (id, title, category, serving_size, prepared_at, pickup_start, "
+            "pickup_end, expires_at, status, credit_value, sharer_id, building_id, "
+            "created_at, updated_at) "
+            "SELECT id, 'Lentil soup ' || g, 'cooked_grains', 'small', now(), now(), now(), "
+            "now(), 'claimed', 3, sharer_id, building_id, now(), now() FROM bench_foods"
+        ))
+        await db.execute(text(
+            "INSERT INTO exchanges (id, sharer_id, recipient_id, food_id, status, "
+            "sharer_confirmed, recipient_confirmed, credit_amount, credits_transferred, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), f.sharer_id, r.id, f.id, 'pending', false, false, 3, "
+            "false, timezone('utc', now()) - make_interval(hours => 48 + f.g % 96), now() "
+            "FROM bench_foods f JOIN bench_users r ON r.n = (f.g * 7 + 1) % :users"
+        ), {"users": USERS})
+        await db.commit()
+        await db.execute(text("ANALYZE"))
+
+
+async def list_report(factory: async_sessionmaker, export_format: str) -> Tuple[float, int]:
+    """Build the whole JSON body like the list endpoint; first byte is at the end."""
+    async with factory() as db:
+        exchanges = await AdminService(db).get_problematic_exchanges(days=7)
+        body = json.dumps(jsonable_encoder({
+            "exchanges": exchanges,
+            "total_count": len(exchanges),
+        })).encode()
+    return time.perf_counter(), len(body)
+
+
+async def stream_report(factory: async_sessionmaker, export_format: str) -> Tuple[float, int]:
+    """Consume the export response; returns when the first chunk arrived."""
+    async def records():
+        async with factory() as db:
+            async for record in AdminService(db).stream_problematic_exchanges(days=7):
+                yield record
+
+    response = stream_records(records(), export_format, PROBLEMATIC_EXCHANGE_FIELDS, "bench")
+    first_byte = None
+    size = 0
+    async for chunk in response.body_iterator:
+        if first_byte is None:
+            first_byte = time.perf_counter()
+        size += len(chunk)
+    return first_byte, size
+
+
+async def measure(
+    run: Callable[[async_sessionmaker, str], Awaitable[Tuple[float, int]]],
+    factory: async_sessionmaker,
+    export_format: str,
+) -> Dict[str, float]:
+    started = time.perf_counter()
+    first_byte, size = await run(factory, export_format)
+    total = time.perf_counter() - started
+
+    tracemalloc.start()
+    await run(factory, export_format)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ttfb_ms": (first_byte - started) * 1000,
+        "total_ms": total * 1000,
+        "peak_mb": peak / 1024 / 1024,
+        "body_mb": size / 1024 / 1024,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="10000,100000")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    print(f"{'rows':>8} {'variant':<12} {'ttfb ms':>9} {'total ms':>9} {'peak MB':>8} {'body MB':>8}")
+    for rows in (int(size) for size in args.rows.split(",")):
+        async with engine.begin() as conn:
+            # Also clear what the migrations may have left behind
+            await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+            await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+            await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        await seed(factory, rows)
+
+        variants = (
+            ("json list", list_report, "ndjson"),
+            ("ndjson", stream_report, "ndjson"),
+            ("csv", stream_report, "csv"),
+        )
+        for label, run, export_format in variants:
+            result = await measure(run, factory, export_format)
+            print(
+                f"{rows:>8} {label:<12} {result['ttfb_ms']:>9.1f} {result['total_ms']:>9.1f} "
+                f"{result['peak_mb']:>8.1f} {result['body_mb']:>8.1f}"
+            )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
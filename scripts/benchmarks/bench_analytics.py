@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Push a synthetic event firehose through the analytics pipeline.
+
+Events are published the way committed transactions publish them, counted
+by ``AnalyticsRecorder`` and flushed to Redis every ``--flush-ms``. Reports
+sustained events/s and flush latency. Use a disposable Redis database:
+
+    python scripts/benchmarks/bench_analytics.py --events 500000 --buildings 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.events import DomainEvent, publish, subscribe, unsubscribe
+from src.core.metrics import metrics
+from src.core.redis import close_redis, init_redis
+from src.services.analytics_service import (
+    ANALYTICS_EVENTS,
+    CREDIT_TRANSFER,
+    AnalyticsRecorder,
+    AnalyticsService,
+)
+
+
+async def run(events: int, buildings: int, batch: int, flush_ms: float, spread_minutes: int) -> None:
+    redis_client = await init_redis()
+    recorder = AnalyticsRecorder()
+    subscribe(recorder.record)
+    metrics.reset()
+
+    building_ids = [f"bench-{i}" for i in range(buildings)]
+    start = datetime.utcnow() - timedelta(minutes=spread_minutes)
+    step = timedelta(minutes=spread_minutes) / events
+    published = 0
+    flushed_fields = 0
+    last_flush = time.perf_counter()
+
+    started = time.perf_counter()
+    while published < events:
+        # One "transaction commit" worth of events
+        chunk = [
+            DomainEvent(
+                name=(name := random.choice(ANALYTICS_EVENTS)),
+                building_id=random.choice(building_ids),
+                amount=random.randint(1, 5) if name == CREDIT_TRANSFER else 0,
+                occurred_at=start + step * (published + i),
+            )
+            for i in range(min(batch, events - published))
+        ]
+        publish(chunk)
+        published += len(chunk)
+
+        if (time.perf_counter() - last_flush) * 1000 >= flush_ms:
+            flushed_fields += await recorder.flush(redis_client)
+            last_flush = time.perf_counter()
+        else:
+            await asyncio.sleep(0)
+    flushed_fields += await recorder.flush(redis_client)
+    elapsed = time.perf_counter() - started
+    unsubscribe(recorder.record)
+
+    counts = await AnalyticsService(redis_client).get_counts(timedelta(minutes=spread_minutes + 1))
+    counted = sum(counts[name] for name in ANALYTICS_EVENTS) if counts else 0
+    flush = metrics.timing_summary("analytics_flush_seconds") or {}
+
+    print(f"events={events} buildings={buildings} batch={batch} flush_every={flush_ms}ms")
+    print(f"throughput:      {events / elapsed:,.0f} events/s ({elapsed:.2f}s)")
+    print(f"fields flushed:  {flushed_fields:,} in {flush.get('count', 0):.0f} flushes")
+    print(f"flush p50/p95:   {flush.get('p50_ms', 0):.1f} / {flush.get('p95_ms', 0):.1f} ms")
+    print(f"counted (all):   {counted:,} (includes earlier runs against the same Redis)")
+    await close_redis()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--buildings", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=50, help="Events published per commit")
+    parser.add_argument("--flush-ms", type=float, default=1000.0)
+    parser.add_argument("--spread-minutes", type=int, default=10, help="Time range the events cover")
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.buildings, args.batch, args.flush_ms, args.spread_minutes))
+
+
+if __name__ == "__main__":
+    main()
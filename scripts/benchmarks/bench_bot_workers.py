@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Replay synthetic Telegram updates through the stream to N bot workers.
+
+For each worker count, starts that many worker processes, waits until they
+have split the partitions, appends ``--updates`` messages from ``--chats``
+chats and times how long the pool takes to handle them all. Each handler
+parses the update as PTB does, then spends ``--cpu-ms`` of CPU and waits
+``--io-ms`` (standing in for database and Telegram API calls). Every
+worker also checks each chat's updates arrive in order. Run against a
+disposable Valkey database; it is flushed:
+
+    REDIS_URL=redis://localhost:6379/9 python scripts/benchmarks/bench_bot_workers.py --workers 1,2,4
+"""
+
+import argparse
+import asyncio
+import math
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import redis.asyncio as redis
+from telegram import Update
+
+from src.bot.update_stream import (
+    LEASE_KEY_PREFIX,
+    STREAM_KEY_PREFIX,
+    UpdateStreamProducer,
+    UpdateStreamWorker,
+)
+from src.core.config import get_settings
+
+settings = get_settings()
+
+PARTITIONS = 16
+LEASE_SECONDS = 3.0
+
+
+def _message(update_id: int, chat_id: int) -> Dict[str, Any]:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private", "first_name": "Bench"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Bench"},
+            "text": "/browse",
+        },
+    }
+
+
+async def _work(cpu_ms: float, io_ms: float, stop: Any, results: Any) -> None:
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    last_seen: Dict[int, int] = {}
+    counts = {"handled": 0, "out_of_order": 0}
+
+    async def handle(update_data: Dict[str, Any]) -> None:
+        update = Update.de_json(update_data, None)
+        chat_id = update.effective_chat.id
+        if update.update_id < last_seen.get(chat_id, -1):
+            counts["out_of_order"] += 1
+        last_seen[chat_id] = update.update_id
+        deadline = time.perf_counter() + cpu_ms / 1000
+        while time.perf_counter() < deadline:
+            pass
+        await asyncio.sleep(io_ms / 1000)
+        counts["handled"] += 1
+
+    worker = UpdateStreamWorker(client, handle, partitions=PARTITIONS, lease_seconds=LEASE_SECONDS)
+    task = asyncio.create_task(worker.run())
+    while not stop.is_set():
+        await asyncio.sleep(0.05)
+    await worker.stop()
+    await task
+    await client.aclose()
+    results.put(counts)
+
+
+def _worker_process(cpu_ms: float, io_ms: float, stop: Any, results: Any) -> None:
+    asyncio.run(_work(cpu_ms, io_ms, stop, results))
+
+
+async def _wait_balanced(client: redis.Redis, workers: int, timeout: float = 30.0) -> None:
+    """Wait until every worker holds its share of the partitions."""
+    share = math.ceil(PARTITIONS / workers)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        owners = await client.mget([f"{LEASE_KEY_PREFIX}{p}" for p in range(PARTITIONS)])
+        held: Dict[str, int] = {}
+        for owner in owners:
+            if owner:
+                held[owner] = held.get(owner, 0) + 1
+        if len(held) == workers and sum(held.values()) == PARTITIONS and max(held.values()) <= share:
+            return
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"workers did not split the partitions within {timeout}s")
+
+
+async def _drained(client: redis.Redis) -> bool:
+    lengths = await asyncio.gather(*(
+        client.xlen(f"{STREAM_KEY_PREFIX}{p}") for p in range(PARTITIONS)
+    ))
+    return not any(lengths)
+
+
+async def run(workers: int, args: argparse.Namespace) -> Tuple[float, Dict[str, int]]:
+    client = redis.from_url(settings.redis_url, decode_responses=True)
+    await client.flushdb()
+
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(args.cpu_ms, args.io_ms, stop, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    await _wait_balanced(client, workers)
+
+    producer = UpdateStreamProducer(client, partitions=PARTITIONS, max_length=args.updates)
+    started = time.perf_counter()
+    for first in range(0, args.updates, 500):
+        await asyncio.gather(*(
+            producer.publish(_message(i, 1000 + i % args.chats), 1000 + i % args.chats)
+            for i in range(first, min(first + 500, args.updates))
+        ))
+    while not await _drained(client):
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    totals = {"handled": 0, "out_of_order": 0}
+    for _ in processes:
+        for key, value in results.get(timeout=30).items():
+            totals[key] += value
+    for process in processes:
+        process.join()
+    await client.flushdb()
+    await client.aclose()
+    return elapsed, totals
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--cpu-ms", type=float, default=0.5)
+    parser.add_argument("--io-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.updates:,} updates from {args.chats} chats, {PARTITIONS} partitions, "
+          f"{args.cpu_ms} ms CPU + {args.io_ms} ms I/O per update, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'updates/s':>10} {'handled':>9} {'out of order':>13}")
+    for workers in (int(count) for count in args.workers.split(",")):
+        elapsed, totals = await run(workers, args)
+        print(
+            f"{workers:>8} {elapsed:>9.2f} {args.updates / elapsed:>10.0f} "
+            f"{totals['handled']:>9} {totals['out_of_order']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Measure request throughput at several connection pool sizes.
+
+Each simulated request checks out a connection, runs a query that takes
+``--query-ms`` on the server and returns the connection. Run against a
+disposable database:
+
+    python scripts/benchmarks/bench_db_pool.py --pool-sizes 5,10,20,40 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+
+from src.core.config import get_settings
+from src.core.database import create_database_engine
+from src.core.db_pool import pool_status
+from src.core.metrics import metrics
+
+settings = get_settings()
+
+
+async def run_load(
+    pool_size: int,
+    concurrency: int,
+    duration: float,
+    query_ms: float,
+    pre_ping: str,
+) -> Dict[str, float]:
+    """Run the workload against one pool size."""
+    metrics.reset()
+    engine = create_database_engine(
+        settings.database_url,
+        pool_size=pool_size,
+        max_overflow=0,
+        pre_ping=pre_ping,
+    )
+    statement = text("SELECT pg_sleep(:seconds)")
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client() -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with engine.connect() as conn:
+                    await conn.execute(statement, {"seconds": query_ms / 1000})
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    # Open the pool before measuring
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    status = pool_status(engine.sync_engine)
+    await engine.dispose()
+
+    latencies.sort()
+    wait = status["wait"] or {}
+    return {
+        "pool_size": pool_size,
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        "wait_p95_ms": wait.get("p95_ms", 0.0),
+        "waited": wait.get("count", 0),
+        "timeouts": status["timeouts"],
+        "errors": errors,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pool-sizes", default="5,10,20,40")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per pool size")
+    parser.add_argument("--query-ms", type=float, default=5.0, help="Server time per query")
+    parser.add_argument("--pre-ping", choices=["always", "idle", "never"], default=settings.database_pre_ping)
+    args = parser.parse_args()
+
+    print(
+        f"concurrency={args.concurrency} duration={args.duration}s "
+        f"query={args.query_ms}ms pre_ping={args.pre_ping}"
+    )
+    print(f"{'pool':>5} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'wait p95':>9} {'waited':>7} {'timeouts':>9}")
+    for pool_size in (int(size) for size in args.pool_sizes.split(",")):
+        result = await run_load(
+            pool_size, args.concurrency, args.duration, args.query_ms, args.pre_ping
+        )
+        print(
+            f"{result['pool_size']:>5} {result['requests_per_second']:>9.1f} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['wait_p95_ms']:>9.2f} {result['waited']:>7} {result['timeouts']:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Time the problematic exchanges report read from exchange_alerts.
+
+Seeds long-pending exchanges (as bench_admin_reports does) among many
+completed ones, then times the detector's full scan, which is what every
+page view used to run, a refresh with nothing new, and the dashboard and
+list reads from the alerts table. Run against a disposable database;
+every table in it is dropped:
+
+    python scripts/benchmarks/bench_exchange_alerts.py --rows 100000 --completed 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Awaitable, Callable
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from bench_admin_reports import seed
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.models import Base
+from src.services.admin_service import AdminService
+
+settings = get_settings()
+
+
+async def add_completed(factory: async_sessionmaker, rows: int) -> None:
+    """Insert ``rows`` completed exchanges, which the detector must skip."""
+    async with factory() as db:
+        await db.execute(text(
+            "INSERT INTO exchanges (id, sharer_id, recipient_id, food_id, status, "
+            "sharer_confirmed, recipient_confirmed, credit_amount, credits_transferred, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), e.sharer_id, e.recipient_id, e.food_id, 'completed', "
+            "true, true, 3, true, timezone('utc', now()) - make_interval(mins => g % 40000), now() "
+            "FROM generate_series(1, CAST(:rows AS integer)) g "
+            "JOIN (SELECT * FROM exchanges LIMIT 1) e ON true"
+        ), {"rows": rows})
+        await db.commit()
+        await db.execute(text("ANALYZE"))
+
+
+async def median_ms(run: Callable[[], Awaitable[object]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000, help="Problematic exchanges")
+    parser.add_argument("--completed", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+        await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(factory, args.rows)
+    await add_completed(factory, args.completed)
+
+    async with factory() as db:
+        service = AdminService(db)
+        scan = AdminService._detect_problematic_exchanges_query
+
+        async def full_scan():
+            return (await db.execute(scan(datetime.utcnow()))).all()
+
+        async def refresh():
+            await service.refresh_exchange_alerts()
+            await db.commit()
+
+        started = time.perf_counter()
+        counts = await service.refresh_exchange_alerts()
+        await db.commit()
+        first_refresh = (time.perf_counter() - started) * 1000
+        await db.execute(text("ANALYZE exchange_alerts"))
+        await db.commit()
+
+        results = {
+            "full scan (old page view)": await median_ms(full_scan, args.repeat),
+            "refresh, nothing new": await median_ms(refresh, max(args.repeat // 4, 1)),
+            "dashboard read (top 5 + count)": await median_ms(
+                lambda: _dashboard(service), args.repeat
+            ),
+            "list read (limit 100)": await median_ms(
+                lambda: service.get_problematic_exchanges(days=7, limit=100), args.repeat
+            ),
+        }
+
+    print(f"{counts['new']:,} alerts among {args.rows + args.completed:,} exchanges; "
+          f"first refresh {first_refresh:.0f} ms")
+    for label, value in results.items():
+        print(f"{label:<34} {value:>10.2f} ms")
+    print(f"worst-case detection latency: {settings.exchange_alert_detect_seconds}s interval "
+          f"+ {results['refresh, nothing new'] / 1000:.2f}s refresh")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def _dashboard(service: AdminService) -> None:
+    await service.get_problematic_exchanges(days=3, limit=5)
+    await service.count_problematic_exchanges(days=3)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Time a new food post broadcast to ``--recipients`` neighbours.
+
+Fills one building's subscriber index in Valkey, then runs
+``NotificationService.broadcast_food_post`` through an ``ExtBot`` with the
+send governor. Telegram is replaced by a transport that answers after
+``--rtt-ms``. Runs once with the configured send budget and once with an
+effectively unlimited one, which shows the pipeline's own overhead. Run
+against a disposable Valkey database; the governor and index keys are
+deleted:
+
+    REDIS_URL=redis://localhost:6379/9 python scripts/benchmarks/bench_food_broadcast.py --recipients 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from telegram.ext import ExtBot
+from telegram.request import BaseRequest, RequestData
+
+from src.bot.send_governor import SendGovernor
+from src.core.config import get_settings
+from src.core.metrics import metrics
+from src.core.redis import close_redis, init_redis
+from src.services.notification_service import NotificationService
+from src.services.subscriber_index import subscriber_key
+
+settings = get_settings()
+
+BUILDING_ID = "bench-building"
+
+
+class FakeTelegram(BaseRequest):
+    """Answers every sendMessage with a message after a fixed delay."""
+
+    def __init__(self, rtt_ms: float) -> None:
+        self.rtt = rtt_ms / 1000
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_request(
+        self,
+        url: str,
+        method: str,
+        request_data: Optional[RequestData] = None,
+        read_timeout: Any = None,
+        write_timeout: Any = None,
+        connect_timeout: Any = None,
+        pool_timeout: Any = None,
+    ) -> Tuple[int, bytes]:
+        await asyncio.sleep(self.rtt)
+        chat_id = int(request_data.parameters["chat_id"]) if request_data else 0
+        result = {"message_id": 1, "date": int(time.time()), "chat": {"id": chat_id, "type": "private"}}
+        return 200, json.dumps({"ok": True, "result": result}).encode()
+
+
+async def _reset(recipients: int) -> None:
+    client = await init_redis()
+    keys = [key async for key in client.scan_iter("telegram:send:*")]
+    if keys:
+        await client.delete(*keys)
+    profile = json.dumps({"allergens": [], "dietary": []})
+    await client.delete(subscriber_key(BUILDING_ID))
+    await client.hset(
+        subscriber_key(BUILDING_ID),
+        mapping={str(100_000 + i): profile for i in range(recipients)},
+    )
+
+
+async def run(args: argparse.Namespace, per_second: float) -> float:
+    settings.telegram_send_per_second = per_second
+    await _reset(args.recipients)
+    bot = ExtBot(
+        token="123:bench",
+        rate_limiter=SendGovernor(),
+        request=FakeTelegram(args.rtt_ms),
+    )
+    food = SimpleNamespace(
+        id="bench-food",
+        building_id=BUILDING_ID,
+        title="Lentil soup",
+        allergens=None,
+        dietary_info=None,
+        pickup_location="Lobby",
+        pickup_start=datetime.utcnow(),
+        pickup_end=datetime.utcnow() + timedelta(hours=2),
+        credit_value=2,
+    )
+    started = time.perf_counter()
+    sent = await NotificationService(None, bot=bot).broadcast_food_post(food, sharer_telegram_id=0)
+    elapsed = time.perf_counter() - started
+    assert sent == args.recipients, f"only {sent} of {args.recipients} sent"
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recipients", type=int, default=1000)
+    parser.add_argument("--rtt-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    budget = settings.telegram_send_per_second
+    print(f"{args.recipients} recipients, {args.rtt_ms:g} ms per Telegram call, "
+          f"{settings.notification_batch_concurrency} in flight")
+    print(f"{'budget/s':>10} {'seconds':>9} {'sent/s':>8}")
+    for per_second in (budget, 1_000_000):
+        metrics.reset()
+        elapsed = await run(args, per_second)
+        print(f"{per_second:>10g} {elapsed:>9.2f} {args.recipients / elapsed:>8.1f}")
+    lookup = metrics.timing_summary("subscriber_index_lookup_seconds")
+    print(f"index lookup for {args.recipients} subscribers: {lookup['max_ms']:.1f} ms")
+
+    client = await init_redis()
+    keys = [key async for key in client.scan_iter("telegram:send:*")]
+    await client.delete(subscriber_key(BUILDING_ID), *keys)
+    await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Time inline query answers against Telegram's inline answer deadline.
+
+Seeds one building with ``--users`` residents and ``--foods`` available
+posts, then sends ``--queries`` inline searches from random residents,
+``--concurrency`` at a time, drawn from a handful of common searches.
+Each run builds the Telegram results, so the time is what the handler
+spends before answering. Runs once without the inline caches (a
+building query per search) and once with them; searchers are resolved
+through the user profile cache in both. Run against a disposable
+database and Valkey; every table is dropped and the inline keys deleted:
+
+    REDIS_URL=redis://localhost:6379/9 python scripts/benchmarks/bench_inline_search.py --foods 2000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Any, List
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+
+from src.bot.inline_search import (
+    INLINE_ANSWER_DEADLINE_SECONDS,
+    KEY_PREFIX,
+    InlineSearch,
+    build_results,
+)
+from src.core.config import get_settings
+from src.core.database import engine
+from src.core.redis import close_redis, init_redis
+from src.models import Base
+
+settings = get_settings()
+
+SEARCHES = ["", "soup", "vegan", "vegan soup", "bread", "curry", "gluten-free", "cake"]
+DISHES = ["Lentil soup", "Sourdough bread", "Chickpea curry", "Carrot cake", "Tomato soup"]
+
+
+class NoCache:
+    """A Valkey client that never has anything, for the uncached baseline."""
+
+    async def get(self, key: str) -> None:
+        return None
+
+    async def set(self, key: str, value: Any, ex: int = None) -> None:
+        pass
+
+
+async def seed(users: int, foods: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+        await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(
+            "INSERT INTO buildings (id, name, address, city, state, zip_code, country, "
+            "building_type, status, max_users, is_pilot, created_at, updated_at) "
+            "VALUES (gen_random_uuid(), 'Bench', '1 Bench St', 'City', 'ST', '00000', 'US', "
+            "'apartment', 'active', 10000, false, now(), now())"
+        ))
+        await conn.execute(text(
+            "INSERT INTO users (id, telegram_id, first_name, building_id, status, "
+            "sharing_enabled, notifications_enabled, is_phone_verified, created_at, updated_at) "
+            "SELECT gen_random_uuid(), g, 'User', b.id, 'verified', true, true, true, now(), "
+            "now() "
+            "FROM generate_series(1, :users) g, buildings b"
+        ), {"users": users})
+        await conn.execute(text(
+            "INSERT INTO foods (id, title, description, dietary_info, category, serving_size, "
+            "prepared_at, pickup_start, pickup_end, expires_at, status, credit_value, sharer_id, "
+            "building_id, created_at, updated_at) "
+            "SELECT gen_random_uuid(), (CAST(:dishes AS text[]))[1 + g % 5] || ' #' || g, "
+            "'Made this morning', "
+            "CASE WHEN g % 3 = 0 THEN 'Vegan, gluten-free' END, 'cooked_grains', 'small', "
+            "now(), now() + interval '1 hour', now() + interval '3 hours', "
+            "now() + interval '1 day', 'available', 1, u.id, u.building_id, now(), now() "
+            "FROM generate_series(1, CAST(:foods AS integer)) g "
+            "JOIN users u ON u.telegram_id = 1 + g % :users"
+        ), {"foods": foods, "users": users, "dishes": DISHES})
+        await conn.execute(text("ANALYZE"))
+
+
+async def run(search: InlineSearch, args: argparse.Namespace) -> List[float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(7)
+    queries = [(rng.randint(1, args.users), rng.choice(SEARCHES)) for _ in range(args.queries)]
+
+    async def answer(telegram_id: int, query: str) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            page, _ = await search.search(telegram_id, query)
+            build_results(page)
+            return time.perf_counter() - started
+
+    return await asyncio.gather(*(answer(*query) for query in queries))
+
+
+def report(label: str, timings: List[float]) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    late = sum(1 for t in timings if t > INLINE_ANSWER_DEADLINE_SECONDS)
+    print(f"{label:<10} {statistics.median(timings) * 1000:>9.1f} {p95 * 1000:>9.1f} "
+          f"{timings[-1] * 1000:>9.1f} {p95 / INLINE_ANSWER_DEADLINE_SECONDS:>10.2%} {late:>6}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--foods", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    # Stay under the Valkey client's 20 connections; past that, reads fail over to SQL
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    await seed(args.users, args.foods)
+    client = await init_redis()
+    keys = [key async for key in client.scan_iter(f"{KEY_PREFIX}:*")]
+    if keys:
+        await client.delete(*keys)
+
+    print(f"{args.queries} searches from {args.users} residents over {args.foods} posts "
+          f"(searching the first {settings.bot_inline_max_results}), "
+          f"{args.concurrency} at a time; deadline {INLINE_ANSWER_DEADLINE_SECONDS:g} s")
+    print(f"{'':<10} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'p95/limit':>10} {'late':>6}")
+    report("uncached", await run(InlineSearch(NoCache()), args))
+    report("cached", await run(InlineSearch(client), args))
+
+    keys = [key async for key in client.scan_iter(f"{KEY_PREFIX}:*")]
+    if keys:
+        await client.delete(*keys)
+    await close_redis()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Compare history queries before and after monthly partitioning.
+
+Seeds several years of exchanges and credit transactions at migration 0002,
+times the recent-history queries, adds the 0003 indexes to the plain tables
+and times them again, then upgrades to 0003 (partitioned) and repeats. Run
+against a disposable database; every table in it is dropped:
+
+    python scripts/benchmarks/bench_partitions.py --years 3 --per-day 1000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from alembic import command
+from alembic.config import Config
+from src.core.config import get_settings
+from src.core.partitions import is_partition_name
+from src.models import Base
+
+settings = get_settings()
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+USERS = 2000
+FOODS = 10000
+
+# The statements the services issue, with their created_at bounds
+QUERIES: Dict[str, str] = {
+    "credits list (90d)": (
+        "SELECT * FROM credit_transactions WHERE user_id = :user_id "
+        "AND created_at >= timezone('utc', now()) - interval '90 days' "
+        "ORDER BY created_at DESC LIMIT 20"
+    ),
+    "user activity exchanges (90d)": (
+        "SELECT * FROM exchanges WHERE sharer_id = :user_id "
+        "AND created_at >= timezone('utc', now()) - interval '90 days' "
+        "ORDER BY created_at DESC LIMIT 10"
+    ),
+    "problematic pending (7d)": (
+        "SELECT * FROM exchanges WHERE status = 'pending' "
+        "AND created_at < timezone('utc', now()) - interval '24 hours' "
+        "AND created_at > timezone('utc', now()) - interval '7 days'"
+    ),
+    "recent transactions count (30d)": (
+        "SELECT count(*) FROM credit_transactions "
+        "WHERE created_at >= timezone('utc', now()) - interval '30 days'"
+    ),
+}
+
+INDEXES = (
+    "CREATE INDEX ix_exchanges_sharer_id_created_at ON exchanges (sharer_id, created_at)",
+    "CREATE INDEX ix_exchanges_recipient_id_created_at ON exchanges (recipient_id, created_at)",
+    "CREATE INDEX ix_exchanges_status_created_at ON exchanges (status, created_at)",
+    "CREATE INDEX ix_exchanges_food_id ON exchanges (food_id)",
+    "CREATE INDEX ix_credit_transactions_user_id_created_at ON credit_transactions (user_id, created_at)",
+)
+
+
+def _migrate(connection, revision: str) -> None:
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    config.attributes["connection"] = connection
+    command.upgrade(config, revision)
+
+
+async def reset(conn: AsyncConnection) -> None:
+    """Drop everything the benchmark or the migrations created."""
+    await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+    await conn.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+    await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+    await conn.run_sync(Base.metadata.drop_all)
+    await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+
+async def seed(conn: AsyncConnection, years: int, per_day: int) -> int:
+    """Insert ``years`` of history, ``per_day`` exchanges and two ledger rows each."""
+    await conn.execute(text(
+        "INSERT INTO buildings (id, name, address, city, state, zip_code, country, "
+        "building_type, status, max_users, is_pilot, created_at, updated_at) "
+        "VALUES (gen_random_uuid(), 'Bench', '1 Bench St', 'City', 'ST', '00000', 'US', "
+        "'apartment', 'active', 10000, false, now(), now())"
+    ))
+    await conn.execute(text(
+        "INSERT INTO users (id, telegram_id, first_name, building_id, status, "
+        "sharing_enabled, notifications_enabled, is_phone_verified, created_at, updated_at) "
+        "SELECT gen_random_uuid(), g, 'User ' || g, b.id, 'verified', true, true, true, "
+        "now(), now() FROM generate_series(1, :users) g, buildings b"
+    ), {"users": USERS})
+    await conn.execute(text(
+        "CREATE TEMP TABLE bench_users AS "
+        "SELECT row_number() OVER () - 1 AS n, id, building_id FROM users"
+    ))
+    await conn.execute(text(
+        "INSERT INTO foods (id, title, category, serving_size, prepared_at, pickup_start, "
+        "pickup_end, expires_at, status, credit_value, sharer_id, building_id, "
+        "created_at, updated_at) "
+        "SELECT gen_random_uuid(), 'Food ' || g, 'cooked_grains', 'small', now(), now(), "
+        "now(), now(), 'completed', 3, u.id, u.building_id, now(), now() "
+        "FROM generate_series(1, :foods) g JOIN bench_users u ON u.n = g % :users"
+    ), {"foods": FOODS, "users": USERS})
+
+    # Exchanges spread evenly over the period; some are still pending
+    days = years * 365
+    await conn.execute(text(
+        "CREATE TEMP TABLE bench_foods AS "
+        "SELECT row_number() OVER () - 1 AS n, id FROM foods"
+    ))
+    await conn.execute(text(
+        "INSERT INTO exchanges (id, sharer_id, recipient_id, food_id, status, "
+        "sharer_confirmed, recipient_confirmed, credit_amount, credits_transferred, "
+        "created_at, updated_at) "
+        "SELECT gen_random_uuid(), s.id, r.id, f.id, "
+        "CASE WHEN g % 50 = 0 THEN 'pending' ELSE 'completed' END, "
+        "true, true, 3, true, t, t "
+        "FROM (SELECT g, timezone('utc', now()) - make_interval(secs => "
+        "g * CAST(:seconds_apart AS float8)) AS t "
+        "FROM generate_series(1, CAST(:total AS integer)) g) e "
+        "JOIN bench_users s ON s.n = e.g % :users "
+        "JOIN bench_users r ON r.n = (e.g * 7 + 1) % :users "
+        "JOIN bench_foods f ON f.n = e.g % :foods"
+    ), {
+        "total": days * per_day,
+        "seconds_apart": 86400 / per_day,
+        "users": USERS,
+        "foods": FOODS,
+    })
+    await conn.execute(text(
+        "INSERT INTO credit_transactions (id, user_id, transaction_type, amount, "
+        "balance_before, balance_after, exchange_id, created_at) "
+        "SELECT gen_random_uuid(), sharer_id, 'earned_sharing', credit_amount, 0, "
+        "credit_amount, id, created_at FROM exchanges "
+        "UNION ALL "
+        "SELECT gen_random_uuid(), recipient_id, 'spent_claiming', -credit_amount, "
+        "credit_amount, 0, id, created_at FROM exchanges"
+    ))
+    return days * per_day
+
+
+async def time_queries(conn: AsyncConnection, repeat: int) -> Dict[str, Tuple[float, int]]:
+    """Median milliseconds and partitions scanned per query."""
+    await conn.execute(text("ANALYZE"))
+    user_ids = list((await conn.execute(text("SELECT id FROM users"))).scalars())
+    results = {}
+    for label, sql in QUERIES.items():
+        timings: List[float] = []
+        for _ in range(repeat):
+            params = {"user_id": random.choice(user_ids)} if ":user_id" in sql else {}
+            started = time.perf_counter()
+            await conn.execute(text(sql), params)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        params = {"user_id": user_ids[0]} if ":user_id" in sql else {}
+        plan = (await conn.execute(text(f"EXPLAIN {sql}"), params)).scalars().all()
+        scanned = {
+            word.strip('"') for line in plan for word in line.split()
+            if is_partition_name(word.strip('"'))
+        }
+        results[label] = (statistics.median(timings), len(scanned))
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--per-day", type=int, default=1000, help="Exchanges per day")
+    parser.add_argument("--repeat", type=int, default=50, help="Runs per query")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url)
+    async with engine.begin() as conn:
+        await reset(conn)
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "0002")
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        exchanges = await seed(conn, args.years, args.per_day)
+    print(
+        f"seeded {exchanges:,} exchanges and {2 * exchanges:,} credit transactions "
+        f"over {args.years} years in {time.perf_counter() - started:.1f}s"
+    )
+
+    layouts: Dict[str, Dict[str, Tuple[float, int]]] = {}
+    async with engine.connect() as conn:
+        layouts["0002 plain"] = await time_queries(conn, args.repeat)
+    async with engine.begin() as conn:
+        for statement in INDEXES:
+            await conn.execute(text(statement))
+    async with engine.connect() as conn:
+        layouts["0002 + indexes"] = await time_queries(conn, args.repeat)
+    async with engine.begin() as conn:
+        for statement in INDEXES:
+            await conn.execute(text(f"DROP INDEX {statement.split()[2]}"))
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "head")
+    print(f"migrated to partitioned tables in {time.perf_counter() - started:.1f}s")
+    async with engine.connect() as conn:
+        layouts["0003 partitioned"] = await time_queries(conn, args.repeat)
+
+    print(f"{'query':<34}" + "".join(f"{name:>20}" for name in layouts))
+    for label in QUERIES:
+        cells = []
+        for results in layouts.values():
+            median_ms, scanned = results[label]
+            cells.append(f"{median_ms:>10.2f} ms" + (f" ({scanned:>2}p)" if scanned else " " * 6))
+        print(f"{label:<34}" + "".join(f"{cell:>20}" for cell in cells))
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Measure how the send governor shares the Telegram budget under a broadcast.
+
+Queues ``--bulk`` notifications to distinct chats while one interactive
+reply is sent every ``--reply-interval`` seconds, through ``--processes``
+processes sharing the Valkey buckets. Telegram is replaced by a no-op.
+Reports the achieved send rate and how long replies and notifications
+waited, with the interactive reserve on and off. Run against a
+disposable Valkey database; the governor's keys are deleted:
+
+    REDIS_URL=redis://localhost:6379/9 python scripts/benchmarks/bench_send_governor.py
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.bot import send_governor
+from src.bot.send_governor import BULK, SendGovernor
+from src.core.redis import close_redis, init_redis
+
+
+def _percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)] if ordered else 0.0
+
+
+async def _send(governor: SendGovernor, chat_id: int, priority: str, waits: List[float]) -> None:
+    started = time.perf_counter()
+
+    async def telegram() -> bool:
+        waits.append(time.perf_counter() - started)
+        return True
+
+    await governor.process_request(
+        telegram, (), {}, "sendMessage", {"chat_id": chat_id}, {"priority": priority}
+    )
+
+
+async def _work(index: int, args: argparse.Namespace, reserve: int, results: Any) -> None:
+    send_governor.settings.telegram_send_interactive_reserve = reserve
+    governor = SendGovernor()
+    bulk_waits: List[float] = []
+    reply_waits: List[float] = []
+    share = args.bulk // args.processes
+
+    started = time.perf_counter()
+    bulk = [
+        asyncio.create_task(_send(governor, 10_000_000 + index * share + i, BULK, bulk_waits))
+        for i in range(share)
+    ]
+    replies = []
+    while not all(task.done() for task in bulk):
+        replies.append(asyncio.create_task(
+            _send(governor, 1000 + index * 1000 + len(replies), "interactive", reply_waits)
+        ))
+        await asyncio.sleep(args.reply_interval)
+    await asyncio.gather(*bulk, *replies)
+    await close_redis()
+    results.put({
+        "elapsed": time.perf_counter() - started,
+        "sent": len(bulk_waits) + len(reply_waits),
+        "bulk": bulk_waits,
+        "reply": reply_waits,
+    })
+
+
+def _worker_process(index: int, args: argparse.Namespace, reserve: int, results: Any) -> None:
+    asyncio.run(_work(index, args, reserve, results))
+
+
+async def _reset() -> None:
+    client = await init_redis()
+    keys = [key async for key in client.scan_iter("telegram:send:*")]
+    if keys:
+        await client.delete(*keys)
+    await close_redis()
+
+
+def run(args: argparse.Namespace, reserve: int) -> Dict[str, Any]:
+    asyncio.run(_reset())
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(i, args, reserve, results))
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    totals: Dict[str, Any] = {"elapsed": 0.0, "sent": 0, "bulk": [], "reply": []}
+    for _ in processes:
+        result = results.get(timeout=600)
+        totals["elapsed"] = max(totals["elapsed"], result["elapsed"])
+        totals["sent"] += result["sent"]
+        totals["bulk"] += result["bulk"]
+        totals["reply"] += result["reply"]
+    for process in processes:
+        process.join()
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bulk", type=int, default=600)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--reply-interval", type=float, default=0.2)
+    args = parser.parse_args()
+
+    rate = send_governor.settings.telegram_send_per_second
+    print(f"{args.bulk} notifications over {args.processes} processes, a reply every "
+          f"{args.reply_interval}s per process, budget {rate:g}/s")
+    print(f"{'reserve':>8} {'sends/s':>8} {'reply p50':>10} {'reply p95':>10} "
+          f"{'bulk p50':>9} {'bulk p95':>9}")
+    for reserve in (0, send_governor.settings.telegram_send_interactive_reserve):
+        totals = run(args, reserve)
+        print(
+            f"{reserve:>8} {totals['sent'] / totals['elapsed']:>8.1f} "
+            f"{_percentile(totals['reply'], 0.5) * 1000:>8.0f}ms "
+            f"{_percentile(totals['reply'], 0.95) * 1000:>8.0f}ms "
+            f"{_percentile(totals['bulk'], 0.5):>8.1f}s {_percentile(totals['bulk'], 0.95):>8.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Measure time-to-first-request for API workers starting together.
+
+Starts ``--workers`` uvicorn processes at once (as a process manager
+would after a deploy) and records, per worker, the time from spawn until
+``--path`` first answers. Run against a migrated database:
+
+    python scripts/benchmarks/bench_startup.py --workers 8
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+import httpx
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def start_worker(
+    app_dir: str,
+    port: int,
+    path: str,
+    timeout: float,
+) -> Optional[float]:
+    """Start one worker and return its time-to-first-request in seconds."""
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "src.api.main:app",
+        "--port", str(port), "--log-level", "warning",
+        cwd=app_dir,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    elapsed: Optional[float] = None
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    response = await client.get(path)
+                    if response.status_code < 500:
+                        elapsed = time.perf_counter() - started
+                        break
+                except httpx.TransportError:
+                    pass
+                if process.returncode is not None:
+                    break
+                await asyncio.sleep(0.01)
+    finally:
+        if process.returncode is None:
+            process.terminate()
+        await process.wait()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--base-port", type=int, default=8100)
+    parser.add_argument("--path", default="/health/ready", help="First request to time")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--app-dir", default=PROJECT_ROOT, help="Checkout to start (compare revisions)")
+    args = parser.parse_args()
+
+    results: List[Optional[float]] = await asyncio.gather(*(
+        start_worker(args.app_dir, args.base_port + i, args.path, args.timeout)
+        for i in range(args.workers)
+    ))
+
+    print(f"workers={args.workers} path={args.path}")
+    for i, elapsed in enumerate(results):
+        print(f"  worker {i}: {elapsed * 1000:.0f} ms" if elapsed is not None else f"  worker {i}: failed")
+
+    timings = [elapsed for elapsed in results if elapsed is not None]
+    if timings:
+        print(
+            f"time-to-first-request: mean {statistics.mean(timings) * 1000:.0f} ms, "
+            f"max {max(timings) * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Compare building bot replies inline with rendering precompiled templates.
+
+The inline versions reproduce how handlers built their text and keyboards
+before ``bot.templates``: an f-string plus a fresh ``InlineKeyboardMarkup``
+on every call. No network or Valkey is needed:
+
+    python scripts/benchmarks/bench_templates.py --number 20000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.bot.messages import CLAIM_FOOD, HELP, MAIN_MENU
+from src.services.notification_service import NEW_FOOD_NEARBY
+
+START = datetime(2024, 1, 1, 18)
+END = START + timedelta(hours=2)
+
+
+def inline_menu():
+    text = f"""
+🏠 **Neighborhood Sharing Platform**
+
+Hello {"Ann"}! What would you like to do today?
+
+**Food Sharing:**
+🍲 Share food with your neighbors
+🔍 Browse available food in your building
+📋 Manage your food posts
+
+Choose an option below:
+        """
+    keyboard = [
+        [
+            InlineKeyboardButton("🍲 Share Food", callback_data="main_menu_share"),
+            InlineKeyboardButton("🔍 Browse Food", callback_data="main_menu_browse"),
+        ],
+        [
+            InlineKeyboardButton("📋 My Posts", callback_data="main_menu_myposts"),
+            InlineKeyboardButton("⭐ My Credits", callback_data="main_menu_credits"),
+        ],
+        [
+            InlineKeyboardButton("👤 Profile", callback_data="main_menu_profile"),
+            InlineKeyboardButton("📊 History", callback_data="main_menu_history"),
+        ],
+        [
+            InlineKeyboardButton("❓ Help", callback_data="main_menu_help"),
+            InlineKeyboardButton("⚙️ Settings", callback_data="main_menu_settings"),
+        ],
+    ]
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+def inline_help():
+    text = """
+📱 **Neighborhood Sharing Platform Help**
+
+**Main Commands:**
+/start - Get started or restart the bot
+/menu - Show main menu
+/help - Show this help message
+    """
+    keyboard = [
+        [
+            InlineKeyboardButton("🍲 Share Food", callback_data="help_share"),
+            InlineKeyboardButton("🔍 Browse Food", callback_data="help_browse"),
+        ],
+        [
+            InlineKeyboardButton("⭐ Credits", callback_data="help_credits"),
+            InlineKeyboardButton("🛡️ Safety", callback_data="help_safety"),
+        ],
+        [InlineKeyboardButton("📞 Contact Support", callback_data="contact_support")],
+    ]
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+def inline_claim():
+    food_id = "1a2b3c4d"
+    text = f"""
+⭐ **Claim Food**
+
+You're about to claim this food item for 1 credit.
+
+**Food ID:** {food_id}
+    """
+    keyboard = [
+        [
+            InlineKeyboardButton("✅ Confirm Claim", callback_data=f"confirm_claim_{food_id}"),
+            InlineKeyboardButton("❌ Cancel", callback_data="cancel_claim"),
+        ],
+    ]
+    return text, InlineKeyboardMarkup(keyboard)
+
+
+def inline_notification():
+    return f"""
+🍽️ **New Food in Your Building!**
+
+**{"Lentil soup"}**
+📍 Pickup: {"Lobby"}
+⏰ Time: {START.strftime('%I:%M %p')} - {END.strftime('%I:%M %p')}
+⭐ Credits: {2}
+
+Browse available food: /browse
+            """.strip()
+
+
+CASES = [
+    ("main menu", inline_menu, lambda: MAIN_MENU.render(first_name="Ann")),
+    ("help", inline_help, lambda: HELP.render()),
+    ("claim", inline_claim, lambda: CLAIM_FOOD.render(food_id="1a2b3c4d")),
+    ("new food notification", inline_notification, lambda: NEW_FOOD_NEARBY.render(
+        title="Lentil soup",
+        pickup_location="Lobby",
+        pickup_start=START,
+        pickup_end=END,
+        credit_value=2,
+    )),
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'reply':<24} {'inline µs':>10} {'template µs':>12} {'speedup':>8}")
+    for name, inline, template in CASES:
+        before = min(timeit.repeat(inline, number=args.number, repeat=3)) / args.number * 1e6
+        after = min(timeit.repeat(template, number=args.number, repeat=3)) / args.number * 1e6
+        print(f"{name:<24} {before:>10.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
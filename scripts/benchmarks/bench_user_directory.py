@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Time Telegram id to user resolution with and without the profile cache.
+
+Seeds ``--users`` users and resolves ``--lookups`` random Telegram ids,
+``--concurrency`` at a time, each in its own session as a request
+would. Runs once querying SQL for every lookup, once with only the
+Valkey tier (as a freshly started process sees it) and once with both
+tiers warm. Run against a disposable database and Valkey; every table is
+dropped and the profile keys deleted:
+
+    REDIS_URL=redis://localhost:6379/9 python scripts/benchmarks/bench_user_directory.py
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+
+from src.core.database import engine, get_db
+from src.core.metrics import metrics
+from src.core.redis import close_redis, init_redis
+from src.models import Base
+from src.services import user_service
+from src.services.load_profiles import LoadProfile
+from src.services.user_directory import KEY_PREFIX, UserDirectory
+from src.services.user_service import UserService
+
+
+async def seed(users: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+        await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(
+            "INSERT INTO users (id, telegram_id, first_name, status, sharing_enabled, "
+            "notifications_enabled, is_phone_verified, created_at, updated_at) "
+            "SELECT gen_random_uuid(), g, 'User', 'verified', true, true, true, now(), now() "
+            "FROM generate_series(1, :users) g"
+        ), {"users": users})
+        await conn.execute(text("ANALYZE"))
+
+
+async def run(
+    resolve: Callable[[UserService, int], Awaitable[object]], args: argparse.Namespace
+) -> Tuple[List[float], float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    rng = random.Random(7)
+    telegram_ids = [rng.randint(1, args.users) for _ in range(args.lookups)]
+
+    async def lookup(telegram_id: int) -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            async with get_db() as db:
+                assert await resolve(UserService(db), telegram_id) is not None
+            return time.perf_counter() - started
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(lookup(telegram_id) for telegram_id in telegram_ids))
+    return timings, time.perf_counter() - started
+
+
+def report(label: str, timings: List[float], elapsed: float) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    # Time spent in the directory itself, without opening the session
+    lookup = metrics.timing_summary("user_directory_lookup_seconds", source=label)
+    print(f"{label:<10} {statistics.median(timings) * 1000:>9.3f} {p95 * 1000:>9.3f} "
+          f"{len(timings) / elapsed:>12.0f} {lookup['p50_ms'] if lookup else '-':>15}")
+
+
+async def clear_keys() -> None:
+    client = await init_redis()
+    keys = [key async for key in client.scan_iter(f"{KEY_PREFIX}:*")]
+    if keys:
+        await client.delete(*keys)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    # Stay under the Valkey client's 20 connections
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    await seed(args.users)
+    await clear_keys()
+
+    print(f"{args.lookups} lookups over {args.users} users, {args.concurrency} at a time")
+    print(f"{'':<10} {'p50 ms':>9} {'p95 ms':>9} {'lookups/s':>12} {'lookup p50 ms':>15}")
+    report("database", *await run(
+        lambda service, telegram_id: service.get_by_telegram_id(telegram_id, profile=LoadProfile.BARE),
+        args,
+    ))
+
+    def resolve(service: UserService, telegram_id: int) -> Awaitable[object]:
+        return service.get_profile_by_telegram_id(telegram_id)
+
+    # Warm Valkey, then measure a process whose own tier keeps nothing
+    directory = UserDirectory(await init_redis(), max_size=0)
+    user_service.user_directory = directory
+    await run(resolve, args)
+    metrics.reset()
+    report("valkey", *await run(resolve, args))
+
+    directory.max_size = args.users
+    await run(resolve, args)
+    metrics.reset()
+    report("local", *await run(resolve, args))
+    print(f"hit rates with both tiers warm: {directory.hit_rates()}")
+
+    await clear_keys()
+    await close_redis()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
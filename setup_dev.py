@@ -114,7 +114,6 @@ def setup_database():
     print("   createdb sharing_platform_test")
     print("3. Update DATABASE_URL in .env file")
     print("4. Run migrations:")
-    print("   alembic revision --autogenerate -m 'Initial migration'")
     print("   alembic upgrade head")
     print("5. Initialize sample data:")
     print("   python scripts/init_db.py")
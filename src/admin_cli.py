@@ -9,10 +9,17 @@ from typing import Optional
 import click
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .core.database import get_async_session
+from .core.config import get_settings
+from .core.database import get_db, get_read_db
+from .core.partitions import PartitionManager
+from .core.redis import close_redis, init_redis
 from .services.admin_service import AdminService
+from .services.analytics_service import AnalyticsService
+from .services.credit_service import CreditService
 from .services.user_service import UserService
 from .services.food_service import FoodService
+from .services.idempotency_service import IdempotencyService
+from .services.load_profiles import LoadProfile
 from .services.exchange_service import ExchangeService
 
 
@@ -27,7 +34,7 @@ def cli():
 def stats(days: int):
     """Show platform statistics."""
     async def show_stats():
-        async with get_async_session() as db:
+        async with get_db() as db:
             admin_service = AdminService(db)
             stats = await admin_service.get_platform_stats(days=days)
             
@@ -55,15 +62,53 @@ def stats(days: int):
             click.echo(f"\n💰 Credits:")
             click.echo(f"   Total in circulation: {stats['credits']['total_in_circulation']}")
             click.echo(f"   Recent transactions: {stats['credits']['recent_transactions']}")
+            
+            click.echo(f"\n🕒 Data age: {stats['data_age_seconds']}s")
+            
+            counts = await AnalyticsService(await init_redis()).get_counts(timedelta(hours=24))
+            if counts:
+                click.echo(f"\n⚡ Live counters (last 24h):")
+                for name, value in counts.items():
+                    click.echo(f"   {name}: {value}")
+            await close_redis()
     
     asyncio.run(show_stats())
 
 
+@cli.command('backfill-analytics')
+@click.option('--days', default=30, help='Days of history to replay')
+def backfill_analytics(days: int):
+    """Rebuild the real-time analytics counters from the database."""
+    async def run_backfill():
+        async with get_db() as db:
+            since = datetime.utcnow() - timedelta(days=days)
+            analytics = AnalyticsService(await init_redis())
+            written = await analytics.backfill(db, since=since)
+            await close_redis()
+            click.echo(f"✅ Rebuilt {written} analytics buckets from the last {days} days")
+    
+    asyncio.run(run_backfill())
+
+
+@cli.command('refresh-stats')
+def refresh_stats():
+    """Refresh the precomputed platform statistics now."""
+    async def run_refresh():
+        async with get_db() as db:
+            refreshed = await AdminService(db).refresh_platform_stats()
+            if refreshed:
+                click.echo("✅ Platform statistics refreshed")
+            else:
+                click.echo("ℹ️  Precomputed statistics need PostgreSQL; nothing to refresh")
+    
+    asyncio.run(run_refresh())
+
+
 @cli.command()
 def health():
     """Check system health."""
     async def check_health():
-        async with get_async_session() as db:
+        async with get_db() as db:
             admin_service = AdminService(db)
             health_data = await admin_service.get_system_health()
             
@@ -96,7 +141,7 @@ def health():
 def alerts(days: int):
     """Show problematic exchanges requiring attention."""
     async def show_alerts():
-        async with get_async_session() as db:
+        async with get_db() as db:
             admin_service = AdminService(db)
             exchanges = await admin_service.get_problematic_exchanges(days=days)
             
@@ -130,7 +175,7 @@ def alerts(days: int):
 def user(user_id: str):
     """Show detailed user activity."""
     async def show_user():
-        async with get_async_session() as db:
+        async with get_db() as db:
             admin_service = AdminService(db)
             activity = await admin_service.get_user_activity(user_id)
             
@@ -178,11 +223,11 @@ def user(user_id: str):
 def exchange(exchange_id: str, action: str, reason: str):
     """Admin intervention on exchange."""
     async def handle_exchange():
-        async with get_async_session() as db:
+        async with get_db() as db:
             exchange_service = ExchangeService(db)
             
             # Get exchange first to verify it exists
-            exchange_obj = await exchange_service.get_exchange_by_id(exchange_id)
+            exchange_obj = await exchange_service.get_exchange_by_id(exchange_id, profile=LoadProfile.BARE)
             if not exchange_obj:
                 click.echo(f"❌ Exchange not found: {exchange_id}")
                 return
@@ -227,12 +272,48 @@ def exchange(exchange_id: str, action: str, reason: str):
     asyncio.run(handle_exchange())
 
 
+@cli.command()
+@click.option('--months-ahead', type=int, default=None, help='Partitions to create ahead (default from settings)')
+@click.option('--retention-months', type=int, default=None, help='Archive partitions older than this (0 keeps all)')
+def partitions(months_ahead: Optional[int], retention_months: Optional[int]):
+    """Create upcoming history partitions and archive expired ones."""
+    settings = get_settings()
+    if months_ahead is None:
+        months_ahead = settings.partition_months_ahead
+    if retention_months is None:
+        retention_months = settings.partition_retention_months
+    
+    async def run_partitions():
+        async with get_db() as db:
+            manager = PartitionManager(db)
+            tables = await manager.partitioned_tables()
+            if not tables:
+                click.echo("ℹ️  History tables are not partitioned (PostgreSQL with migration 0003 needed)")
+                return
+            
+            created = await manager.ensure_partitions(months_ahead)
+            archived = await manager.archive_partitions(retention_months)
+            
+            click.echo(f"🗂️  Created {len(created)} partitions, archived {len(archived)}")
+            for name in archived:
+                click.echo(f"   📦 {name}")
+            for table in tables:
+                table_partitions = await manager.list_partitions(table)
+                if table_partitions:
+                    click.echo(
+                        f"   {table}: {len(table_partitions)} partitions, "
+                        f"{table_partitions[0].month:%Y-%m} to {table_partitions[-1].month:%Y-%m}"
+                    )
+    
+    asyncio.run(run_partitions())
+
+
 @cli.command()
 @click.option('--hours', default=24, help='Hours to look back for cleanup')
 def cleanup(hours: int):
     """Clean up expired food posts and stale exchanges."""
     async def run_cleanup():
-        async with get_async_session() as db:
+        async with get_db() as db:
             food_service = FoodService(db)
             
             click.echo(f"🧹 Running cleanup (last {hours} hours)")
@@ -241,19 +322,52 @@ def cleanup(hours: int):
             expired_count = await food_service.expire_old_posts()
             click.echo(f"   ✅ Expired {expired_count} old food posts")
             
+            # Purge expired idempotency keys
+            purged_count = await IdempotencyService(db).purge_expired()
+            click.echo(f"   ✅ Purged {purged_count} expired idempotency keys")
+            
             await db.commit()
             click.echo("🎉 Cleanup completed!")
     
     asyncio.run(run_cleanup())
 
 
+@cli.command()
+@click.argument('tables', nargs=-1, type=click.Choice(['foods', 'exchanges', 'credit_transactions']))
+@click.option('--output', default='exports', help='Directory for Parquet files and watermarks')
+@click.option('--chunk-size', default=10000, help='Rows fetched per round trip')
+@click.option('--full', is_flag=True, help='Ignore watermarks and export everything')
+@click.option('--lag-seconds', default=60, help='Leave rows newer than this for the next run')
+def export(tables: tuple, output: str, chunk_size: int, full: bool, lag_seconds: int):
+    """Export history tables to Parquet, partitioned by day."""
+    from .services.export_service import EXPORT_TABLES, ExportService
+    
+    async def run_export():
+        # Read from a replica when configured, keeping load off the primary
+        async with get_read_db() as db:
+            export_service = ExportService(db, output, chunk_size=chunk_size)
+            
+            click.echo(f"📦 Exporting to {output}")
+            for table_name in tables or EXPORT_TABLES:
+                result = await export_service.export_table(
+                    table_name, full=full, lag_seconds=lag_seconds
+                )
+                click.echo(
+                    f"   ✅ {table_name}: {result.rows} rows in {result.seconds:.1f}s "
+                    f"({result.rows_per_second:,.0f} rows/s), {len(result.files)} files, "
+                    f"{result.bytes_written / 1024 / 1024:.2f} MB"
+                )
+    
+    asyncio.run(run_export())
+
+
 @cli.command()
 @click.argument('building_id')
 @click.option('--days', default=30, help='Number of days for stats')
 def building(building_id: str, days: int):
     """Show building-specific statistics."""
     async def show_building():
-        async with get_async_session() as db:
+        async with get_db() as db:
             admin_service = AdminService(db)
             stats = await admin_service.get_building_stats(building_id, days=days)
             
@@ -285,5 +399,78 @@ def building(building_id: str, days: int):
     asyncio.run(show_building())
 
 
+@cli.command()
+@click.option('--key', required=True, help='Idempotency key for this grant')
+@click.option('--amount', required=True, type=int, help='Credits per user (negative to deduct)')
+@click.option('--building', 'building_id', default=None, help='Target all users in a building')
+@click.option('--user', 'user_ids', multiple=True, help='Target user ID (repeatable)')
+@click.option('--reason', default=None, help='Reason recorded on the ledger')
+@click.option('--chunk-size', default=1000, help='Accounts per transaction')
+def grant(key: str, amount: int, building_id: Optional[str], user_ids: tuple, reason: Optional[str], chunk_size: int):
+    """Grant or deduct credits in bulk. Safe to re-run with the same key."""
+    async def run_grant():
+        async with get_db() as db:
+            credit_service = CreditService(db)
+            
+            target = f"building {building_id}" if building_id else f"{len(user_ids)} users"
+            click.echo(f"💰 Applying {amount:+d} credits to {target} (key: {key})")
+            
+            if not click.confirm("Are you sure?"):
+                click.echo("Cancelled.")
+                return
+            
+            try:
+                result = await credit_service.bulk_adjust(
+                    operation_key=key,
+                    amount=amount,
+                    user_ids=list(user_ids) or None,
+                    building_id=building_id,
+                    description=f"Admin grant: {reason}" if reason else "Admin grant",
+                    chunk_size=chunk_size,
+                )
+            except ValueError as e:
+                click.echo(f"❌ {e}")
+                return
+            
+            _echo_bulk_result(result)
+    
+    asyncio.run(run_grant())
+
+
+@cli.command(name='init-credits')
+@click.option('--key', required=True, help='Idempotency key for this run')
+@click.option('--building', 'building_id', required=True, help='Building to initialize')
+@click.option('--chunk-size', default=1000, help='Accounts per transaction')
+def init_credits(key: str, building_id: str, chunk_size: int):
+    """Create missing credit accounts with the signup bonus."""
+    async def run_init():
+        async with get_db() as db:
+            credit_service = CreditService(db)
+            
+            click.echo(f"🏦 Initializing credit accounts for building {building_id}")
+            result = await credit_service.bulk_initialize_accounts(
+                operation_key=key,
+                building_id=building_id,
+                chunk_size=chunk_size,
+            )
+            _echo_bulk_result(result)
+    
+    asyncio.run(run_init())
+
+
+def _echo_bulk_result(result: dict) -> None:
+    """Print a bulk credit operation summary."""
+    if result['already_applied']:
+        click.echo(f"ℹ️  Operation {result['operation_key']} was already applied")
+    else:
+        click.echo(f"✅ Operation {result['operation_key']} {result['status']}")
+    
+    click.echo(f"   Applied this run: {result['applied_this_run']}")
+    click.echo(f"   Total applied: {result['processed_total']}")
+    click.echo(f"   Skipped: {result['skipped_total']}")
+    click.echo(f"   Chunks: {result['chunks']}")
+    click.echo(f"   Throughput: {result['rows_per_second']} rows/sec")
+
+
 if __name__ == '__main__':
     cli()
\ No newline at end of file
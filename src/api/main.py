@@ -1,5 +1,6 @@
 """FastAPI application main module."""
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
@@ -9,12 +10,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from ..core.config import get_settings
-from ..core.database import create_tables
-from ..core.logging import configure_logging, log_api_request
-from ..core.redis import close_redis, init_redis
+from ..core.database import replica_router, warm_up_database
+from ..core.db_routing import start_request_routing
+from ..core.events import subscribe, unsubscribe
+from ..core.logging import configure_logging, get_logger, log_api_request
+from ..core.lookup_cache import start_request_stats
+from ..core.redis import close_redis, init_redis, warm_up_redis
+from ..jobs import build_scheduler, flush_analytics, flush_subscriber_index
+from ..services.analytics_service import analytics_recorder
+from ..services.subscriber_index import subscriber_index_updater
+from ..services.user_directory import user_directory
 from .routers import admin, auth, buildings, credits, exchanges, foods, health, users, webhook
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
@@ -23,15 +32,52 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Configure logging
     configure_logging()
     
-    # Initialize Redis
-    await init_redis()
-    
-    # Create database tables
-    await create_tables()
-    
+    # Open Redis and database connections before taking traffic. The
+    # schema is managed by Alembic (`alembic upgrade head`), not here.
+    await asyncio.gather(warm_up_redis(), warm_up_database())
+
+    # Count committed domain events for the real-time dashboard
+    subscribe(analytics_recorder.record)
+    # Keep the food post subscriber index up to date
+    subscribe(subscriber_index_updater.record)
+    # Drop cached user profiles when they change, here and in other processes
+    subscribe(user_directory.record)
+    directory_listener = asyncio.create_task(user_directory.listen())
+
+    # Periodic jobs; a Redis lock keeps them to one worker per interval
+    scheduler = build_scheduler(await init_redis())
+    scheduler.start()
+
+    # Telegram posts updates to /webhook/telegram; the bot handles them
+    # here, or in the bot workers with the stream transport
+    bot = None
+    if settings.telegram_webhook_url:
+        # Imported here so the API alone does not load python-telegram-bot
+        from ..bot.main import bot_instance, register_webhook
+
+        try:
+            if settings.bot_update_transport == "stream":
+                await register_webhook(settings.telegram_webhook_url)
+            else:
+                bot = bot_instance
+                await bot.start_webhook(settings.telegram_webhook_url)
+        except Exception as e:
+            # The webhook answers 503 until a restart; Telegram keeps retrying
+            logger.error("Error starting Telegram bot", error=str(e), exc_info=True)
+
     yield
-    
+
     # Cleanup
+    if bot is not None:
+        await bot.stop()
+    await scheduler.stop()
+    await flush_analytics()
+    await flush_subscriber_index()
+    directory_listener.cancel()
+    await user_directory.drain()
+    unsubscribe(analytics_recorder.record)
+    unsubscribe(subscriber_index_updater.record)
+    unsubscribe(user_directory.record)
     await close_redis()
 
 
@@ -59,6 +105,9 @@ app.add_middleware(
 async def logging_middleware(request: Request, call_next) -> Response:
     """Log all API requests."""
     start_time = time.time()
+    lookup_stats = start_request_stats()
+    if replica_router.enabled:
+        start_request_routing()
     
     response = await call_next(request)
     
@@ -74,6 +123,7 @@ async def logging_middleware(request: Request, call_next) -> Response:
         duration=process_time,
         user_id=user_id,
         query_params=str(request.query_params) if request.query_params else None,
+        queries_saved=lookup_stats.saved_queries,
     )
     
     return response
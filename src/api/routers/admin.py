@@ -1,15 +1,22 @@
 """Admin dashboard endpoints."""
 
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Literal, Optional
+from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import HTMLResponse
+from redis.asyncio import Redis
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db_session
+from ...core.database import get_db_session, get_read_db, get_read_session
 from ...core.logging import get_logger
-from ...services.admin_service import AdminService
+from ...core.redis import get_redis
+from ...models.user import User
+from ...services.admin_service import ACTIVITY_FIELDS, PROBLEMATIC_EXCHANGE_FIELDS, AdminService
+from ...services.analytics_service import BUCKET_STEPS, AnalyticsService
+from ...services.load_profiles import LoadProfile
+from ..streaming import ExportFormat, stream_records
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -18,7 +25,7 @@ logger = get_logger(__name__)
 @router.get("/stats/platform")
 async def get_platform_stats(
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> dict:
     """Get platform-wide statistics."""
     logger.info("Platform stats requested", days=days)
@@ -33,11 +40,37 @@ async def get_platform_stats(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/stats/buildings")
+async def get_buildings_stats(
+    building_ids: Optional[List[str]] = Query(None, alias="id"),
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_read_session),
+) -> dict:
+    """Get statistics for several buildings in one call."""
+    logger.info("Buildings stats requested", building_ids=building_ids, days=days)
+    
+    try:
+        admin_service = AdminService(db)
+        stats = await admin_service.get_buildings_stats(
+            building_ids=building_ids, days=days, limit=limit
+        )
+        return {
+            "buildings": list(stats.values()),
+            "total_count": len(stats),
+            "period_days": days,
+        }
+        
+    except Exception as e:
+        logger.error("Error getting buildings stats", error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/stats/building/{building_id}")
 async def get_building_stats(
     building_id: str,
     days: int = Query(30, ge=1, le=365),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> dict:
     """Get statistics for a specific building."""
     logger.info("Building stats requested", building_id=building_id, days=days)
@@ -61,14 +94,15 @@ async def get_building_stats(
 @router.get("/users/{user_id}/activity")
 async def get_user_activity(
     user_id: str,
+    days: int = Query(90, ge=1, le=3650),
     db: AsyncSession = Depends(get_db_session),
 ) -> dict:
     """Get detailed activity for a specific user."""
-    logger.info("User activity requested", user_id=user_id)
+    logger.info("User activity requested", user_id=user_id, days=days)
     
     try:
         admin_service = AdminService(db)
-        activity = await admin_service.get_user_activity(user_id=user_id)
+        activity = await admin_service.get_user_activity(user_id=user_id, days=days)
         
         if not activity:
             raise HTTPException(status_code=404, detail="User not found")
@@ -82,21 +116,49 @@ async def get_user_activity(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/users/{user_id}/activity/export")
+async def export_user_activity(
+    user_id: str,
+    days: int = Query(90, ge=1, le=3650),
+    format: ExportFormat = Query("ndjson"),
+):
+    """Stream all of a user's activity as NDJSON or CSV."""
+    logger.info("User activity export requested", user_id=user_id, days=days, format=format)
+    
+    # Checked on a short-lived session; the stream opens its own
+    async with get_read_db() as db:
+        exists = await db.scalar(select(User.id).where(User.id == user_id))
+    if not exists:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    async def records():
+        async with get_read_db() as db:
+            async for record in AdminService(db).stream_user_activity(user_id=user_id, days=days):
+                yield record
+    
+    return stream_records(records(), format, ACTIVITY_FIELDS, report="user-activity")
+
+
 @router.get("/exchanges/problematic")
 async def get_problematic_exchanges(
     days: int = Query(7, ge=1, le=30),
+    limit: int = Query(100, ge=1, le=1000),
     db: AsyncSession = Depends(get_db_session),
 ) -> dict:
-    """Get exchanges that may need admin attention."""
-    logger.info("Problematic exchanges requested", days=days)
+    """Get exchanges that may need admin attention, most urgent first."""
+    logger.info("Problematic exchanges requested", days=days, limit=limit)
     
     try:
         admin_service = AdminService(db)
-        exchanges = await admin_service.get_problematic_exchanges(days=days)
+        # One extra row tells whether there are more than ``limit``
+        exchanges = await admin_service.get_problematic_exchanges(days=days, limit=limit + 1)
+        has_more = len(exchanges) > limit
+        exchanges = exchanges[:limit]
         
         return {
             "exchanges": exchanges,
             "total_count": len(exchanges),
+            "has_more": has_more,
             "period_days": days,
             "checked_at": datetime.utcnow(),
         }
@@ -106,6 +168,22 @@ async def get_problematic_exchanges(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/exchanges/problematic/export")
+async def export_problematic_exchanges(
+    days: int = Query(7, ge=1, le=30),
+    format: ExportFormat = Query("ndjson"),
+):
+    """Stream every problematic exchange as NDJSON or CSV."""
+    logger.info("Problematic exchanges export requested", days=days, format=format)
+    
+    async def records():
+        async with get_read_db() as db:
+            async for record in AdminService(db).stream_problematic_exchanges(days=days):
+                yield record
+    
+    return stream_records(records(), format, PROBLEMATIC_EXCHANGE_FIELDS, report="problematic-exchanges")
+
+
 @router.get("/health")
 async def get_system_health(
     db: AsyncSession = Depends(get_db_session),
@@ -149,7 +227,7 @@ async def admin_intervene_exchange(
         notification_service = NotificationService(db)
         
         # Get exchange
-        exchange = await exchange_service.get_exchange_by_id(exchange_id)
+        exchange = await exchange_service.get_exchange_by_id(exchange_id, profile=LoadProfile.BARE)
         if not exchange:
             raise HTTPException(status_code=404, detail="Exchange not found")
         
@@ -214,26 +292,74 @@ async def admin_intervene_exchange(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/stats/realtime")
+async def get_realtime_stats(
+    building_id: Optional[str] = None,
+    granularity: Literal["minute", "hour", "day"] = "minute",
+    buckets: int = Query(60, ge=1, le=1440),
+    redis_client: Redis = Depends(get_redis),
+) -> dict:
+    """Get event counters per time bucket from the analytics pipeline."""
+    logger.info("Realtime stats requested", building_id=building_id, granularity=granularity)
+    
+    try:
+        end = datetime.utcnow()
+        start = end - BUCKET_STEPS[granularity] * (buckets - 1)
+        series = await AnalyticsService(redis_client).get_series(granularity, start, end, building_id)
+        return {
+            "building_id": building_id,
+            "granularity": granularity,
+            "series": [{"bucket": moment, "counts": counts} for moment, counts in series],
+        }
+        
+    except Exception as e:
+        logger.error("Error getting realtime stats", error=str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/stats/active-users")
+async def get_active_user_counts(
+    db: AsyncSession = Depends(get_read_session),
+    redis_client: Redis = Depends(get_redis),
+) -> dict:
+    """Get how many users interacted with the bot in recent windows."""
+    logger.info("Active user counts requested")
+    
+    counts = await AdminService(db, redis_client).get_active_user_counts()
+    if counts is None:
+        raise HTTPException(status_code=503, detail="Activity data unavailable")
+    return {"active_users": counts, "generated_at": datetime.utcnow()}
+
+
 @router.get("/dashboard")
 async def get_dashboard_summary(
     db: AsyncSession = Depends(get_db_session),
+    redis_client: Redis = Depends(get_redis),
 ) -> dict:
     """Get summary data for admin dashboard."""
     logger.info("Dashboard summary requested")
     
     try:
-        admin_service = AdminService(db)
+        admin_service = AdminService(db, redis_client)
         
         # Get key metrics
         platform_stats = await admin_service.get_platform_stats(days=7)
         system_health = await admin_service.get_system_health()
-        problematic_exchanges = await admin_service.get_problematic_exchanges(days=3)
+        problematic_exchanges = await admin_service.get_problematic_exchanges(days=3, limit=5)
+        issues_count = await admin_service.count_problematic_exchanges(days=3)
+        
+        # Live event counters (None if Redis is unavailable)
+        analytics = AnalyticsService(redis_client)
+        activity = {
+            "last_hour": await analytics.get_counts(timedelta(hours=1)),
+            "last_24h": await analytics.get_counts(timedelta(hours=24)),
+            "last_7d": await analytics.get_counts(timedelta(days=7)),
+        }
         
         # Summary counters
         active_users = platform_stats["users"]["active"]
         recent_posts = platform_stats["food_posts"]["recent"]
         success_rate = platform_stats["exchanges"]["success_rate"]
-        issues_count = len(problematic_exchanges)
         
         return {
             "overview": {
@@ -241,12 +367,16 @@ async def get_dashboard_summary(
                 "food_posts_7d": recent_posts,
                 "exchange_success_rate": success_rate,
                 "issues_requiring_attention": issues_count,
+                "data_age_seconds": platform_stats["data_age_seconds"],
             },
             "health": {
                 "status": system_health["status"],
                 "score": system_health["score"],
             },
-            "alerts": problematic_exchanges[:5],  # Top 5 most urgent
+            "activity": activity,
+            # Users seen in the bot per window (None if Redis is unavailable)
+            "users_seen": await admin_service.get_active_user_counts(),
+            "alerts": problematic_exchanges,  # Top 5 most urgent
             "generated_at": datetime.utcnow(),
         }
         
@@ -8,7 +8,7 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from ...core.database import get_db_session
+from ...core.database import get_db_session, get_read_session
 from ...core.logging import get_logger
 from ...models.credit import Credit, CreditTransaction, TransactionType
 from ...models.user import User
@@ -85,7 +85,7 @@ async def get_credit_balance(
         # For now, use sample user for testing
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -120,29 +120,32 @@ async def list_credit_transactions(
     limit: int = Query(20, le=100),
     offset: int = Query(0, ge=0),
     transaction_type: Optional[TransactionType] = Query(None),
+    days: int = Query(90, ge=1, le=3650),
     db: AsyncSession = Depends(get_db_session),
 ) -> dict:
-    """List user's credit transactions."""
+    """List user's credit transactions from the last ``days`` days."""
     logger.info(
         "Credit transactions requested",
         limit=limit,
         offset=offset,
-        transaction_type=transaction_type
+        transaction_type=transaction_type,
+        days=days,
     )
     
     try:
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Build query
+        # Build query; the date bound prunes older monthly partitions
         query = (
             select(CreditTransaction)
             .where(CreditTransaction.user_id == user.id)
+            .where(CreditTransaction.created_at >= datetime.utcnow() - timedelta(days=days))
         )
         
         # Apply transaction type filter
@@ -194,7 +197,7 @@ async def list_credit_transactions(
 async def get_credit_leaderboard(
     building_id: Optional[str] = Query(None),
     limit: int = Query(10, le=50),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> dict:
     """Get credit leaderboard."""
     logger.info("Credit leaderboard requested", building_id=building_id, limit=limit)
@@ -204,7 +207,7 @@ async def get_credit_leaderboard(
         if not building_id:
             from ...services.user_service import UserService
             user_service = UserService(db)
-            user = await user_service.get_by_telegram_id(123456789)
+            user = await user_service.get_profile_by_telegram_id(123456789)
             if user:
                 building_id = user.building_id
         
@@ -260,7 +263,7 @@ async def get_credit_stats(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
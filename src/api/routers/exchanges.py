@@ -3,12 +3,21 @@
 from typing import List, Optional
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db_session
+from ...core.database import get_db_session, get_read_session
 from ...core.logging import get_logger
+from ...core.redis import get_redis
 from ...services.exchange_service import ExchangeService
+from ...services.idempotency_service import (
+    SCOPE_EXCHANGE_COMPLETE,
+    SCOPE_EXCHANGE_CONFIRM,
+    IdempotencyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+)
 from ..schemas.exchange import (
     ExchangeResponse,
     ExchangeSummary,
@@ -120,7 +129,7 @@ async def list_exchanges(
     role: Optional[str] = Query(None, regex="^(sharer|recipient)$"),
     limit: int = Query(20, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> List[ExchangeSummary]:
     """List user's exchanges."""
     logger.info("Exchange list requested", status=status, role=role, limit=limit, offset=offset)
@@ -132,7 +141,7 @@ async def list_exchanges(
         # For now, use sample user for testing
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -156,7 +165,7 @@ async def list_exchanges(
 
 @router.get("/active", response_model=List[ExchangeSummary])
 async def list_active_exchanges(
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> List[ExchangeSummary]:
     """List user's active exchanges (pending/confirmed)."""
     logger.info("Active exchanges requested")
@@ -167,7 +176,7 @@ async def list_active_exchanges(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -201,7 +210,7 @@ async def get_exchange(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -223,18 +232,22 @@ async def get_exchange(
 async def confirm_exchange(
     exchange_id: str,
     confirm_request: ExchangeConfirmRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     """Confirm an exchange."""
     logger.info("Exchange confirmation requested", exchange_id=exchange_id)
     
-    try:
+    # TODO: Get user from JWT token
+    telegram_id = 123456789
+    
+    async def perform_confirm() -> dict:
         exchange_service = ExchangeService(db)
         
-        # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(telegram_id)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -248,15 +261,27 @@ async def confirm_exchange(
         if not success:
             raise HTTPException(status_code=400, detail="Failed to confirm exchange")
         
-        await db.commit()
-        
         return {
             "success": True,
             "message": "Exchange confirmed successfully",
         }
+    
+    try:
+        idempotency_service = IdempotencyService(db, redis)
+        result = await idempotency_service.execute(
+            scope=SCOPE_EXCHANGE_CONFIRM,
+            key=idempotency_key,
+            fingerprint=IdempotencyService.fingerprint(telegram_id, exchange_id, confirm_request.model_dump()),
+            handler=perform_confirm,
+        )
+        return result.body
         
     except HTTPException:
         raise
+    except IdempotencyInProgress:
+        raise HTTPException(status_code=409, detail="A request with this idempotency key is in progress")
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error("Error confirming exchange", exchange_id=exchange_id, error=str(e))
         await db.rollback()
@@ -267,18 +292,22 @@ async def confirm_exchange(
 async def complete_exchange(
     exchange_id: str,
     complete_request: ExchangeCompleteRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     """Mark exchange as completed."""
     logger.info("Exchange completion requested", exchange_id=exchange_id)
     
-    try:
+    # TODO: Get user from JWT token
+    telegram_id = 123456789
+    
+    async def perform_complete() -> dict:
         exchange_service = ExchangeService(db)
         
-        # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(telegram_id)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -293,15 +322,27 @@ async def complete_exchange(
         if not success:
             raise HTTPException(status_code=400, detail="Failed to complete exchange")
         
-        await db.commit()
-        
         return {
             "success": True,
             "message": "Exchange completed successfully",
         }
+    
+    try:
+        idempotency_service = IdempotencyService(db, redis)
+        result = await idempotency_service.execute(
+            scope=SCOPE_EXCHANGE_COMPLETE,
+            key=idempotency_key,
+            fingerprint=IdempotencyService.fingerprint(telegram_id, exchange_id, complete_request.model_dump()),
+            handler=perform_complete,
+        )
+        return result.body
         
     except HTTPException:
         raise
+    except IdempotencyInProgress:
+        raise HTTPException(status_code=409, detail="A request with this idempotency key is in progress")
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error("Error completing exchange", exchange_id=exchange_id, error=str(e))
         await db.rollback()
@@ -323,7 +364,7 @@ async def cancel_exchange(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -367,7 +408,7 @@ async def report_no_show(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
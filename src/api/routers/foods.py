@@ -3,12 +3,30 @@
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Header,
+    Query,
+    File,
+    UploadFile,
+)
+from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db_session
+from ...core.config import get_settings
+from ...core.database import get_db_session, get_read_session
 from ...core.logging import get_logger
+from ...core.redis import get_redis
 from ...services.food_service import FoodService
+from ...services.idempotency_service import (
+    SCOPE_FOOD_CLAIM,
+    IdempotencyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+)
 from ...services.photo_service import PhotoService
 from ...services.notification_service import NotificationService
 from ..schemas.food import (
@@ -25,6 +43,7 @@ from ..schemas.food import (
 from ...models.food import FoodCategory, ServingSize
 
 router = APIRouter()
+settings = get_settings()
 logger = get_logger(__name__)
 
 
@@ -116,6 +135,7 @@ def _convert_food_to_summary(food) -> FoodSummary:
 @router.post("/", response_model=FoodResponse)
 async def create_food_post(
     food_data: FoodCreate,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
 ) -> FoodResponse:
     """Create a new food post."""
@@ -128,7 +148,7 @@ async def create_food_post(
         # For now, use sample user for testing
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -158,6 +178,12 @@ async def create_food_post(
         notification_service = NotificationService(db)
         await notification_service.send_food_posted_confirmation(user.id, food.id)
         
+        # Neighbours are notified after the response is sent
+        if settings.food_post_broadcast_enabled:
+            background_tasks.add_task(
+                notification_service.broadcast_food_post, food, user.telegram_id
+            )
+        
         return _convert_food_to_response(food)
         
     except HTTPException:
@@ -223,7 +249,7 @@ async def browse_available_foods(
     exclude_allergens: Optional[str] = Query(None),  # Comma-separated list
     limit: int = Query(20, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> FoodBrowseResponse:
     """Browse available food posts with filters."""
     logger.info(
@@ -242,7 +268,7 @@ async def browse_available_foods(
         # For now, use sample user for testing
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -318,7 +344,7 @@ async def update_food_post(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -350,18 +376,28 @@ async def update_food_post(
 async def claim_food(
     food_id: str,
     claim_request: ClaimFoodRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: AsyncSession = Depends(get_db_session),
+    redis: Redis = Depends(get_redis),
 ) -> ClaimFoodResponse:
-    """Claim a food post."""
+    """Claim a food post.
+    
+    Retries carrying the same ``Idempotency-Key`` header get the original
+    response back instead of claiming again.
+    """
     logger.info("Food claim requested", food_id=food_id)
     
-    try:
+    # TODO: Get user from JWT token
+    telegram_id = 123456789
+    claimed_exchange = None
+    
+    async def perform_claim() -> dict:
+        nonlocal claimed_exchange
         food_service = FoodService(db)
         
-        # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(telegram_id)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -375,22 +411,7 @@ async def claim_food(
         if not exchange:
             raise HTTPException(status_code=400, detail="Failed to claim food")
         
-        await db.commit()
-        
-        # Send notifications
-        notification_service = NotificationService(db)
-        await notification_service.send_food_request_notification(
-            sharer_id=exchange.sharer_id,
-            recipient_id=exchange.recipient_id,
-            food_id=food_id,
-            exchange_id=exchange.id,
-        )
-        await notification_service.send_request_confirmation(
-            recipient_id=exchange.recipient_id,
-            food_id=food_id,
-            exchange_id=exchange.id,
-        )
-        
+        claimed_exchange = exchange
         return ClaimFoodResponse(
             success=True,
             message="Food claimed successfully",
@@ -400,10 +421,40 @@ async def claim_food(
                 "instructions": exchange.pickup_instructions,
                 "scheduled_time": exchange.scheduled_pickup_at.isoformat(),
             },
+        ).model_dump(mode="json")
+    
+    try:
+        idempotency_service = IdempotencyService(db, redis)
+        result = await idempotency_service.execute(
+            scope=SCOPE_FOOD_CLAIM,
+            key=idempotency_key,
+            fingerprint=IdempotencyService.fingerprint(telegram_id, food_id, claim_request.model_dump()),
+            handler=perform_claim,
         )
         
+        if not result.replayed:
+            # Send notifications
+            notification_service = NotificationService(db)
+            await notification_service.send_food_request_notification(
+                sharer_id=claimed_exchange.sharer_id,
+                recipient_id=claimed_exchange.recipient_id,
+                food_id=food_id,
+                exchange_id=claimed_exchange.id,
+            )
+            await notification_service.send_request_confirmation(
+                recipient_id=claimed_exchange.recipient_id,
+                food_id=food_id,
+                exchange_id=claimed_exchange.id,
+            )
+        
+        return ClaimFoodResponse(**result.body)
+        
     except HTTPException:
         raise
+    except IdempotencyInProgress:
+        raise HTTPException(status_code=409, detail="A request with this idempotency key is in progress")
+    except IdempotencyKeyMismatch as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.error("Error claiming food", food_id=food_id, error=str(e))
         await db.rollback()
@@ -425,7 +476,7 @@ async def unclaim_food(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -469,7 +520,7 @@ async def expire_food_post(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -513,7 +564,7 @@ async def get_user_food_posts(
         # TODO: Get user ID from JWT token
         from ...services.user_service import UserService
         user_service = UserService(db)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
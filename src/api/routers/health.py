@@ -1,12 +1,16 @@
 """Health check endpoints."""
 
-from typing import Dict
+from typing import Any, Dict
 
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ...core.database import get_db_session
+from ...core.database import get_db_session, get_pool_status
+from ...core.metrics import metrics
 from ...core.redis import get_redis
+from ...services.idempotency_service import IdempotencyService
+from ...services.user_directory import UserDirectory
 from redis.asyncio import Redis
 
 router = APIRouter()
@@ -26,7 +30,7 @@ async def readiness_check(
     """Readiness check with database and Redis connectivity."""
     try:
         # Test database connection
-        await db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         
         # Test Redis connection
         await redis.ping()
@@ -40,4 +44,14 @@ async def readiness_check(
         return {
             "status": "not ready",
             "error": str(e),
-        }
\ No newline at end of file
+        }
+
+
+@router.get("/metrics")
+async def metrics_snapshot() -> Dict[str, Any]:
+    """In-process metrics for this API worker."""
+    snapshot = metrics.snapshot()
+    snapshot["idempotency_hit_rates"] = IdempotencyService.hit_rates()
+    snapshot["user_directory_hit_rates"] = UserDirectory.hit_rates()
+    snapshot["database_pool"] = get_pool_status()
+    return snapshot
@@ -9,6 +9,7 @@ from ...core.database import get_db_session
 from ...core.logging import get_logger
 from ...services.user_service import UserService
 from ...services.building_service import BuildingService
+from ...services.load_profiles import LoadProfile
 from ..schemas.user import (
     PhoneVerificationConfirm,
     PhoneVerificationRequest,
@@ -79,7 +80,7 @@ async def get_current_user(
     try:
         user_service = UserService(db)
         # Get sample user for testing (telegram_id: 123456789)
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_by_telegram_id(123456789, profile=LoadProfile.BARE)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -105,7 +106,7 @@ async def update_current_user(
         user_service = UserService(db)
         # TODO: Get user ID from JWT token
         # For now, use sample user for testing
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -168,7 +169,7 @@ async def request_phone_verification(
         user_service = UserService(db)
         # TODO: Get user ID from JWT token
         # For now, use sample user for testing
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -216,7 +217,7 @@ async def confirm_phone_verification(
         user_service = UserService(db)
         # TODO: Get user ID from JWT token
         # For now, use sample user for testing
-        user = await user_service.get_by_telegram_id(123456789)
+        user = await user_service.get_profile_by_telegram_id(123456789)
         
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -1,19 +1,34 @@
 """Telegram webhook endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from telegram import Update
+from typing import TYPE_CHECKING
 
+from fastapi import APIRouter, HTTPException, Request
+
+from ...bot.update_stream import UpdateStreamProducer
 from ...core.config import get_settings
 from ...core.logging import get_logger
+from ...core.redis import init_redis
+
+if TYPE_CHECKING:
+    from telegram import Update
 
 router = APIRouter()
 settings = get_settings()
 logger = get_logger(__name__)
 
+# Telegram backs off on its own; this is a hint for other clients
+RETRY_LATER = {"Retry-After": "1"}
+
 
 @router.post("/telegram")
 async def telegram_webhook(request: Request) -> dict:
-    """Handle Telegram webhook updates."""
+    """Queue a Telegram update for the bot and acknowledge it right away.
+    
+    With the ``stream`` transport the raw update goes to a Valkey stream
+    for the bot workers; otherwise to the bot running in this process.
+    Answers 503 while the bot is not running or is too far behind, so
+    Telegram retries the update later instead of it being dropped.
+    """
     try:
         # Verify webhook secret if configured
         if settings.telegram_webhook_secret:
@@ -22,34 +37,70 @@ async def telegram_webhook(request: Request) -> dict:
                 logger.warning("Invalid webhook secret received")
                 raise HTTPException(status_code=403, detail="Invalid webhook secret")
         
-        # Parse update data
-        update_data = await request.json()
-        update = Update.de_json(update_data, None)
-        
-        if not update:
-            logger.warning("Invalid update received", update_data=update_data)
-            raise HTTPException(status_code=400, detail="Invalid update")
-        
-        # TODO: Process update with bot dispatcher
-        # This will be implemented when we create the bot module
-        logger.info(
-            "Received Telegram update",
-            update_id=update.update_id,
-            user_id=update.effective_user.id if update.effective_user else None,
-            chat_id=update.effective_chat.id if update.effective_chat else None,
-        )
+        if settings.bot_update_transport == "stream":
+            await _publish_update(await request.json())
+        else:
+            await _enqueue_update(await request.json())
         
         return {"status": "ok"}
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Error processing webhook", error=str(e), exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+def _parse_update(update_data: dict) -> "Update":
+    from telegram import Update
+
+    from ...bot.main import bot_instance
+
+    update = Update.de_json(update_data, bot_instance.bot)
+    if not update:
+        logger.warning("Invalid update received", update_data=update_data)
+        raise HTTPException(status_code=400, detail="Invalid update")
+    return update
+
+
+async def _enqueue_update(update_data: dict) -> None:
+    from ...bot.main import bot_instance
+
+    if not bot_instance.running:
+        logger.warning("Webhook update received while the bot is not running")
+        raise HTTPException(status_code=503, detail="Bot not running", headers=RETRY_LATER)
+    
+    update = _parse_update(update_data)
+    if not bot_instance.enqueue_update(update):
+        logger.warning(
+            "Update queue full",
+            update_id=update.update_id,
+            pending=bot_instance.update_processor.pending_updates,
+        )
+        raise HTTPException(status_code=503, detail="Update queue full", headers=RETRY_LATER)
+
+
+async def _publish_update(update_data: dict) -> None:
+    from ...bot.update_processor import chat_key
+
+    update = _parse_update(update_data)
+    producer = UpdateStreamProducer(await init_redis())
+    if await producer.publish(update_data, chat_key(update)) is None:
+        logger.warning("Update stream full", update_id=update.update_id)
+        raise HTTPException(status_code=503, detail="Update stream full", headers=RETRY_LATER)
+
+
 @router.get("/telegram/info")
 async def webhook_info() -> dict:
     """Get webhook configuration info."""
+    from ...bot.main import bot_instance
+
+    processor = bot_instance.update_processor
     return {
         "webhook_url": settings.telegram_webhook_url,
         "secret_configured": bool(settings.telegram_webhook_secret),
+        "update_transport": settings.bot_update_transport,
+        "bot_running": bot_instance.running,
+        "pending_updates": processor.pending_updates if processor else 0,
+        "running_updates": processor.running_updates if processor else 0,
     }
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Streaming NDJSON and CSV responses for large reports.
+
+Records are encoded as they arrive from the database, so memory stays flat
+however many rows a report has. The first record is sent on its own to
+keep time-to-first-byte low; after that output is flushed in chunks of
+about ``FLUSH_BYTES``.
+"""
+
+import csv
+import io
+import json
+import time
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Literal, Sequence
+
+from fastapi.responses import StreamingResponse
+
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+
+logger = get_logger(__name__)
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+FLUSH_BYTES = 64 * 1024
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+async def ndjson_lines(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Encode each record as one JSON line."""
+    async for record in records:
+        yield json.dumps(record, default=_plain, separators=(",", ":")) + "\n"
+
+
+async def csv_lines(
+    records: AsyncIterator[Dict[str, Any]],
+    fields: Sequence[str],
+) -> AsyncIterator[str]:
+    """Encode a header row, then one CSV row per record."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values: Sequence[Any]) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue()
+
+    yield line(fields)
+    async for record in records:
+        yield line(["" if record.get(f) is None else _plain(record.get(f)) for f in fields])
+
+
+async def _chunks(lines: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    pending: List[str] = []
+    size = 0
+    first = True
+    async for text in lines:
+        pending.append(text)
+        size += len(text)
+        if first or size >= FLUSH_BYTES:
+            yield "".join(pending).encode("utf-8")
+            pending = []
+            size = 0
+            first = False
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def stream_records(
+    records: AsyncIterator[Dict[str, Any]],
+    export_format: ExportFormat,
+    fields: Sequence[str],
+    report: str,
+) -> StreamingResponse:
+    """Stream ``records`` as an NDJSON or CSV attachment named after ``report``.
+
+    Records time-to-first-byte, duration and row count per report.
+    """
+    rows = 0
+
+    async def counted() -> AsyncIterator[Dict[str, Any]]:
+        nonlocal rows
+        async for record in records:
+            rows += 1
+            yield record
+
+    if export_format == "csv":
+        lines = csv_lines(counted(), fields)
+    else:
+        lines = ndjson_lines(counted())
+
+    async def body() -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        first_byte = None
+        try:
+            async for chunk in _chunks(lines):
+                if first_byte is None:
+                    first_byte = time.perf_counter() - started
+                    metrics.observe("report_stream.first_byte", first_byte, report=report)
+                yield chunk
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error("Report stream failed", report=report, rows=rows, error=str(e), exc_info=True)
+            raise
+        finally:
+            duration = time.perf_counter() - started
+            metrics.observe("report_stream.duration", duration, report=report)
+            metrics.increment("report_stream.rows", rows, report=report)
+            logger.info(
+                "Report streamed",
+                report=report,
+                format=export_format,
+                rows=rows,
+                first_byte_ms=round((first_byte or duration) * 1000, 1),
+                duration_ms=round(duration * 1000, 1),
+            )
+
+    filename = f"{report}-{datetime.utcnow():%Y%m%dT%H%M%S}.{export_format}"
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
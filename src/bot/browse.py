@@ -0,0 +1,189 @@
+"""Paged food browsing for the bot, cached per user in Valkey.
+
+``/browse`` queries ``FoodService.browse_available_food`` once for
+``bot_browse_prefetch_pages`` pages and stores the rows under a short
+session token. Navigation buttons carry ``br:<token>:<offset>`` callback
+data, so paging edits the same message from the cached rows without
+touching the database. Paging past the cached rows fetches the next
+window, and an expired session is queried again at the same offset.
+"""
+
+import json
+import math
+import secrets
+from datetime import datetime
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from ..core.config import get_settings
+from ..core.database import get_read_db
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.food import Food
+from ..services.food_service import FoodService
+from ..services.load_profiles import LoadProfile
+from ..services.subscriber_index import parse_terms
+from ..services.user_service import UserService
+from .messages import (
+    BROWSE_EMPTY,
+    BROWSE_FOOTER,
+    BROWSE_HEADER,
+    BROWSE_ITEM,
+    BROWSE_NOT_REGISTERED,
+)
+from .templates import RenderedMessage
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+CALLBACK_PREFIX = "br"
+REFRESH_CALLBACK = f"{CALLBACK_PREFIX}:new"
+KEY_PREFIX = "bot:browse"
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+def encode_cursor(token: str, offset: int) -> str:
+    """Callback data for the page of a browse session starting at ``offset``."""
+    return f"{CALLBACK_PREFIX}:{token}:{offset:x}"
+
+
+def decode_cursor(data: Optional[str]) -> Optional[Tuple[str, int]]:
+    """``(token, offset)`` from callback data, or None for a refresh or bad data."""
+    parts = (data or "").split(":")
+    if len(parts) != 3 or parts[0] != CALLBACK_PREFIX:
+        return None
+    try:
+        return parts[1], int(parts[2], 16)
+    except ValueError:
+        return None
+
+
+def browse_key(telegram_id: int, token: str) -> str:
+    """Valkey key of one browse session's cached rows."""
+    return f"{KEY_PREFIX}:{telegram_id}:{token}"
+
+
+def _row(food: Food) -> Dict[str, Any]:
+    return {
+        "id": food.id,
+        "title": food.title,
+        "location": food.pickup_location or "Ask the sharer",
+        "start": food.pickup_start.isoformat(),
+        "end": food.pickup_end.isoformat(),
+        "credits": food.credit_value,
+    }
+
+
+class FoodBrowser:
+    """Render browse pages for a Telegram user, paging from cached rows."""
+
+    def __init__(self, redis_client: Redis, session_factory: SessionFactory = get_read_db) -> None:
+        self.redis = redis_client
+        self.session_factory = session_factory
+        self.page_size = settings.bot_browse_page_size
+        self.window = settings.bot_browse_page_size * settings.bot_browse_prefetch_pages
+
+    async def start(self, telegram_id: int, offset: int = 0) -> RenderedMessage:
+        """Query a new browse session and render the page at ``offset``."""
+        async with self.session_factory() as db:
+            user = await UserService(db).get_by_telegram_id(telegram_id, profile=LoadProfile.BARE)
+            if user is None or not user.building_id:
+                return BROWSE_NOT_REGISTERED.render()
+
+            state = {"user_id": user.id, "allergens": parse_terms(user.allergens), "rows": []}
+            await self._fetch(db, state, max(self.window, offset + self.page_size))
+
+        token = secrets.token_hex(3)
+        await self._store(telegram_id, token, state)
+        return self._render(token, state, offset)
+
+    async def page(self, telegram_id: int, token: str, offset: int) -> RenderedMessage:
+        """Render the page at ``offset`` of a browse session."""
+        state = await self._load(telegram_id, token)
+        if state is None:
+            metrics.increment("bot_browse_pages_total", source="expired")
+            return await self.start(telegram_id, offset)
+
+        if offset >= len(state["rows"]) and state["more"]:
+            metrics.increment("bot_browse_pages_total", source="fetch")
+            async with self.session_factory() as db:
+                await self._fetch(db, state, offset + self.page_size - len(state["rows"]))
+            await self._store(telegram_id, token, state)
+        else:
+            metrics.increment("bot_browse_pages_total", source="cache")
+
+        return self._render(token, state, offset)
+
+    async def _fetch(self, db: AsyncSession, state: Dict[str, Any], at_least: int) -> None:
+        """Append the next rows to ``state``, a whole window at a time."""
+        limit = max(self.window, at_least)
+        foods = await FoodService(db).browse_available_food(
+            state["user_id"],
+            exclude_allergens=state["allergens"] or None,
+            limit=limit + 1,
+            offset=len(state["rows"]),
+            profile=LoadProfile.BARE,
+        )
+        state["rows"].extend(_row(food) for food in foods[:limit])
+        state["more"] = len(foods) > limit
+
+    async def _load(self, telegram_id: int, token: str) -> Optional[Dict[str, Any]]:
+        try:
+            cached = await self.redis.get(browse_key(telegram_id, token))
+        except RedisError as e:
+            logger.warning("Browse cache read failed", telegram_id=telegram_id, error=str(e))
+            return None
+        return json.loads(cached) if cached else None
+
+    async def _store(self, telegram_id: int, token: str, state: Dict[str, Any]) -> None:
+        try:
+            await self.redis.set(
+                browse_key(telegram_id, token),
+                json.dumps(state, separators=(",", ":")),
+                ex=settings.bot_browse_cache_seconds,
+            )
+        except RedisError as e:
+            logger.warning("Browse cache write failed", telegram_id=telegram_id, error=str(e))
+
+    def _render(self, token: str, state: Dict[str, Any], offset: int) -> RenderedMessage:
+        rows: List[Dict[str, Any]] = state["rows"]
+        if not rows:
+            return BROWSE_EMPTY.render()
+
+        size = self.page_size
+        offset = min(max(offset, 0), (len(rows) - 1) // size * size)
+        pages = math.ceil(len(rows) / size)
+
+        text = [BROWSE_HEADER.render(
+            page=offset // size + 1,
+            pages=f"{pages}+" if state["more"] else pages,
+        ).text]
+        claims = []
+        for number, row in enumerate(rows[offset:offset + size], start=offset + 1):
+            text.append(BROWSE_ITEM.render(
+                number=number,
+                title=row["title"],
+                pickup_location=row["location"],
+                pickup_start=datetime.fromisoformat(row["start"]),
+                pickup_end=datetime.fromisoformat(row["end"]),
+                credit_value=row["credits"],
+            ).text)
+            claims.append(InlineKeyboardButton(f"⭐ {number}", callback_data=f"claim_food_{row['id']}"))
+        text.append(BROWSE_FOOTER.render().text)
+
+        navigation = []
+        if offset > 0:
+            navigation.append(InlineKeyboardButton("◀️ Prev", callback_data=encode_cursor(token, offset - size)))
+        navigation.append(InlineKeyboardButton("🔄", callback_data=REFRESH_CALLBACK))
+        if offset + size < len(rows) or state["more"]:
+            navigation.append(InlineKeyboardButton("Next ▶️", callback_data=encode_cursor(token, offset + size)))
+
+        return RenderedMessage(
+            text="\n\n".join(text),
+            reply_markup=InlineKeyboardMarkup([claims, navigation]),
+        )
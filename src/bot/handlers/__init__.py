@@ -4,15 +4,17 @@ from typing import Dict, Any
 from telegram.ext import filters
 
 # Import handlers
-from .basic import echo_handler, unknown_handler
+from .basic import echo_handler, track_activity, unknown_handler
 from .menu import menu_handler, main_menu_callback
 from .food import (
     share_food_handler,
     browse_food_handler, 
     my_posts_handler,
     claim_food_callback,
+    browse_page_callback,
 )
 from .profile import profile_handler, settings_callback
+from .inline import inline_query_handler
 
 # Command handlers mapping
 command_handlers: Dict[str, Any] = {
@@ -27,6 +29,7 @@ command_handlers: Dict[str, Any] = {
 callback_query_handlers: Dict[str, Any] = {
     "^main_menu": main_menu_callback,
     "^claim_food": claim_food_callback,
+    "^br:": browse_page_callback,
     "^settings": settings_callback,
 }
 
@@ -40,4 +43,6 @@ __all__ = [
     "command_handlers",
     "callback_query_handlers", 
     "message_handlers",
+    "inline_query_handler",
+    "track_activity",
 ]
\ No newline at end of file
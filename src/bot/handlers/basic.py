@@ -4,10 +4,19 @@ from telegram import Update
 from telegram.ext import ContextTypes
 
 from ...core.logging import get_logger
+from ...core.redis import init_redis
+from ...services.activity_tracker import ActivityTracker
 
 logger = get_logger(__name__)
 
 
+async def track_activity(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Record the sender's activity before any other handler runs."""
+    user = update.effective_user
+    if user and not user.is_bot:
+        await ActivityTracker(await init_redis()).touch(user.id)
+
+
 async def echo_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle regular text messages."""
     user = update.effective_user
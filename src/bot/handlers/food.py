@@ -1,6 +1,7 @@
 """Food sharing handlers."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import CallbackQuery, Update
+from telegram.error import BadRequest
 from telegram.ext import (
     ContextTypes,
     ConversationHandler,
@@ -11,6 +12,9 @@ from telegram.ext import (
 )
 
 from ...core.logging import get_logger, log_food_action
+from ...core.redis import init_redis
+from ..browse import FoodBrowser, decode_cursor
+from ..messages import CLAIM_FOOD, FOOD_PHOTO_STEP, MY_POSTS, SHARE_FOOD
 
 logger = get_logger(__name__)
 
@@ -24,39 +28,7 @@ async def share_food_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return
     
     try:
-        text = """
-🍲 **Share Food**
-
-Ready to share some delicious food with your neighbors?
-
-I'll guide you through posting your food item step by step:
-1. 📸 Upload a photo  
-2. 📝 Add description and ingredients
-3. ⏰ Set pickup time
-4. 📍 Choose pickup location
-5. ⚠️ List any allergens
-
-**Quick Tips:**
-• Only share food you'd eat yourself
-• Be honest about ingredients
-• Set realistic pickup windows
-• Choose safe meeting spots
-
-Ready to start?
-        """
-        
-        keyboard = [
-            [InlineKeyboardButton("📸 Start Posting", callback_data="start_food_post")],
-            [InlineKeyboardButton("📋 My Posts", callback_data="view_my_posts")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await context.bot.send_message(
-            chat_id=chat.id,
-            text=text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
-        )
+        await context.bot.send_message(chat_id=chat.id, **SHARE_FOOD.render().kwargs)
         
         log_food_action("share_command", user.id)
         
@@ -73,42 +45,43 @@ async def browse_food_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
         return
     
     try:
-        text = """
-🔍 **Browse Available Food**
+        message = await FoodBrowser(await init_redis()).start(user.id)
+        await context.bot.send_message(chat_id=chat.id, **message.kwargs)
+        
+        log_food_action("browse_command", user.id)
+        
+    except Exception as e:
+        logger.error("Error in browse food handler", user_id=user.id, error=str(e), exc_info=True)
 
-Here's what your neighbors are sharing today:
 
-*Loading available food items...*
+async def show_browse_page(query: CallbackQuery, telegram_id: int, data: str = "") -> None:
+    """Edit ``query``'s message into the browse page its callback data points at."""
+    browser = FoodBrowser(await init_redis())
+    cursor = decode_cursor(data)
+    message = await browser.page(telegram_id, *cursor) if cursor else await browser.start(telegram_id)
+    try:
+        await query.edit_message_text(**message.kwargs)
+    except BadRequest as e:
+        # Refreshing a list that has not changed
+        if "not modified" not in str(e).lower():
+            raise
 
-(No food currently available in your building)
 
-**Tips for claiming food:**
-• Act quickly - good food goes fast!
-• Check pickup times carefully
-• Bring something to carry the food
-• Be respectful of pickup instructions
-        """
-        
-        keyboard = [
-            [InlineKeyboardButton("🔄 Refresh List", callback_data="refresh_food_list")],
-            [
-                InlineKeyboardButton("🍲 Share Food", callback_data="main_menu_share"),
-                InlineKeyboardButton("⭐ My Credits", callback_data="main_menu_credits"),
-            ],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await context.bot.send_message(
-            chat_id=chat.id,
-            text=text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
-        )
-        
-        log_food_action("browse_command", user.id)
+async def browse_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle browse navigation and refresh callbacks."""
+    query = update.callback_query
+    user = update.effective_user
+    
+    if not query or not user:
+        return
+    
+    await query.answer()
+    
+    try:
+        await show_browse_page(query, user.id, query.data)
         
     except Exception as e:
-        logger.error("Error in browse food handler", user_id=user.id, error=str(e), exc_info=True)
+        logger.error("Error in browse page callback", user_id=user.id, error=str(e), exc_info=True)
 
 
 async def my_posts_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -120,28 +93,7 @@ async def my_posts_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
     
     try:
-        text = """
-📋 **My Food Posts**
-
-Here are your recent food sharing posts:
-
-*No posts yet*
-
-Want to share something delicious?
-        """
-        
-        keyboard = [
-            [InlineKeyboardButton("🍲 Share New Food", callback_data="start_food_post")],
-            [InlineKeyboardButton("📊 View History", callback_data="main_menu_history")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await context.bot.send_message(
-            chat_id=chat.id,
-            text=text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
-        )
+        await context.bot.send_message(chat_id=chat.id, **MY_POSTS.render().kwargs)
         
     except Exception as e:
         logger.error("Error in my posts handler", user_id=user.id, error=str(e), exc_info=True)
@@ -161,25 +113,7 @@ async def claim_food_callback(update: Update, context: ContextTypes.DEFAULT_TYPE
         # TODO: Extract food ID from callback data and implement claiming logic
         food_id = query.data.replace("claim_food_", "")
         
-        text = f"""
-⭐ **Claim Food**
-
-You're about to claim this food item for 1 credit.
-
-**Food ID:** {food_id}
-
-*Claiming functionality coming soon...*
-        """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Confirm Claim", callback_data=f"confirm_claim_{food_id}"),
-                InlineKeyboardButton("❌ Cancel", callback_data="cancel_claim"),
-            ]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+        await query.edit_message_text(**CLAIM_FOOD.render(food_id=food_id).kwargs)
         
         log_food_action("attempt_claim", user.id, food_id=food_id)
         
@@ -202,20 +136,7 @@ async def start_food_post(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     await query.answer()
     
-    text = """
-📸 **Share Food - Step 1/3**
-
-Let's start by uploading a photo of your food! A good photo helps neighbors know what you're sharing.
-
-**Photo Tips:**
-• Show the food clearly
-• Good lighting helps
-• Include any packaging/containers
-
-Please send me a photo of your food:
-    """
-    
-    await query.edit_message_text(text, parse_mode="Markdown")
+    await query.edit_message_text(**FOOD_PHOTO_STEP.render().kwargs)
     
     return FOOD_PHOTO
 
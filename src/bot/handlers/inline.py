@@ -0,0 +1,62 @@
+"""Inline query handlers."""
+
+import time
+
+from telegram import InlineQueryResultsButton, Update
+from telegram.error import BadRequest
+from telegram.ext import ContextTypes
+
+from ...core.config import get_settings
+from ...core.logging import get_logger
+from ...core.metrics import metrics
+from ...core.redis import init_redis
+from ..inline_search import INLINE_ANSWER_DEADLINE_SECONDS, InlineSearch, build_results
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+async def inline_query_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Handle ``@bot <search>`` inline queries."""
+    query = update.inline_query
+
+    if not query:
+        return
+
+    started = time.perf_counter()
+    try:
+        offset = int(query.offset) if query.offset.isdigit() else 0
+        found = await InlineSearch(await init_redis()).search(query.from_user.id, query.query, offset)
+
+        if found is None:
+            await query.answer(
+                [],
+                cache_time=settings.bot_inline_client_cache_seconds,
+                is_personal=True,
+                button=InlineQueryResultsButton(
+                    text="Join your building to search food", start_parameter="inline"
+                ),
+            )
+        else:
+            results, next_offset = found
+            await query.answer(
+                build_results(results),
+                cache_time=settings.bot_inline_client_cache_seconds,
+                is_personal=True,
+                next_offset=str(next_offset) if next_offset is not None else "",
+            )
+
+    except BadRequest as e:
+        if "too old" in str(e).lower():
+            metrics.increment("bot_inline_late_total")
+        logger.warning("Inline answer rejected", user_id=query.from_user.id, error=str(e))
+
+    except Exception as e:
+        logger.error("Error in inline query handler", user_id=query.from_user.id, error=str(e), exc_info=True)
+
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe("bot_inline_answer_seconds", elapsed)
+        if elapsed > INLINE_ANSWER_DEADLINE_SECONDS:
+            metrics.increment("bot_inline_late_total")
+            logger.warning("Inline answer missed Telegram's deadline", seconds=round(elapsed, 2))
@@ -1,9 +1,11 @@
 """Main menu handlers."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import ContextTypes
 
 from ...core.logging import get_logger, log_bot_interaction
+from ..messages import MAIN_MENU, MENU_SHARE
+from .food import show_browse_page
 
 logger = get_logger(__name__)
 
@@ -27,49 +29,9 @@ async def menu_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         # TODO: Check user registration status
         # For now, assume user is registered
         
-        menu_text = f"""
-🏠 **Neighborhood Sharing Platform**
-
-Hello {user.first_name}! What would you like to do today?
-
-**Food Sharing:**
-🍲 Share food with your neighbors
-🔍 Browse available food in your building
-📋 Manage your food posts
-
-**Your Account:**
-👤 View and edit your profile  
-⭐ Check your credit balance
-📊 View sharing history
-
-Choose an option below:
-        """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("🍲 Share Food", callback_data="main_menu_share"),
-                InlineKeyboardButton("🔍 Browse Food", callback_data="main_menu_browse"),
-            ],
-            [
-                InlineKeyboardButton("📋 My Posts", callback_data="main_menu_myposts"),
-                InlineKeyboardButton("⭐ My Credits", callback_data="main_menu_credits"),
-            ],
-            [
-                InlineKeyboardButton("👤 Profile", callback_data="main_menu_profile"),
-                InlineKeyboardButton("📊 History", callback_data="main_menu_history"),
-            ],
-            [
-                InlineKeyboardButton("❓ Help", callback_data="main_menu_help"),
-                InlineKeyboardButton("⚙️ Settings", callback_data="main_menu_settings"),
-            ],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await context.bot.send_message(
             chat_id=chat.id,
-            text=menu_text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
+            **MAIN_MENU.render(first_name=user.first_name).kwargs,
         )
         
     except Exception as e:
@@ -125,47 +87,12 @@ async def main_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def _handle_share_action(query, context):
     """Handle share food action."""
-    text = """
-🍲 **Share Food**
-
-Ready to share some delicious food with your neighbors?
-
-I'll guide you through posting your food item step by step:
-1. 📸 Upload a photo
-2. 📝 Add description and ingredients  
-3. ⏰ Set pickup time
-4. 📍 Choose pickup location
-5. ⚠️ List any allergens
-
-Let's start! What would you like to share today?
-    """
-    
-    keyboard = [
-        [InlineKeyboardButton("📸 Start Sharing", callback_data="start_food_share")],
-        [InlineKeyboardButton("← Back to Menu", callback_data="back_to_menu")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    await query.edit_message_text(**MENU_SHARE.render().kwargs)
 
 
 async def _handle_browse_action(query, context):
-    """Handle browse food action.""" 
-    text = """
-🔍 **Browse Available Food**
-
-Looking for something tasty? Here's what's available in your building:
-
-Loading available food items...
-    """
-    
-    keyboard = [
-        [InlineKeyboardButton("🔄 Refresh", callback_data="refresh_food_list")],
-        [InlineKeyboardButton("← Back to Menu", callback_data="back_to_menu")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    """Handle browse food action."""
+    await show_browse_page(query, query.from_user.id)
 
 
 async def _handle_myposts_action(query, context):
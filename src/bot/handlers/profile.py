@@ -1,6 +1,6 @@
 """Profile and settings handlers."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import (
     ContextTypes,
     ConversationHandler,
@@ -9,6 +9,7 @@ from telegram.ext import (
 )
 
 from ...core.logging import get_logger
+from ..messages import NOTIFICATION_SETTINGS, PRIVACY_SETTINGS, PROFILE
 
 logger = get_logger(__name__)
 
@@ -23,47 +24,11 @@ async def profile_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     try:
         # TODO: Get user data from database
-        text = f"""
-👤 **Your Profile**
-
-**Name:** {user.first_name} {user.last_name or ''}
-**Username:** @{user.username or 'Not set'}
-**Building:** Sample Apartment Complex
-**Apartment:** 3B
-**Phone:** +1-xxx-xxx-xxxx (verified ✅)
-
-**Account Stats:**
-⭐ Credits: 15
-🍲 Food shared: 8 items  
-🔍 Food claimed: 5 items
-🏆 Community rank: #12
-
-**Dietary Info:**
-🥗 Restrictions: Vegetarian
-⚠️ Allergies: Nuts
-
-Want to update your profile?
-        """
-        
-        keyboard = [
-            [
-                InlineKeyboardButton("✏️ Edit Profile", callback_data="edit_profile"),
-                InlineKeyboardButton("🔔 Notifications", callback_data="settings_notifications"),
-            ],
-            [
-                InlineKeyboardButton("🛡️ Privacy", callback_data="settings_privacy"),
-                InlineKeyboardButton("🏆 Leaderboard", callback_data="view_leaderboard"),
-            ],
-            [InlineKeyboardButton("📋 Back to Menu", callback_data="show_main_menu")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await context.bot.send_message(
-            chat_id=chat.id,
-            text=text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
+        message = PROFILE.render(
+            full_name=user.full_name,
+            username=user.username or "Not set",
         )
+        await context.bot.send_message(chat_id=chat.id, **message.kwargs)
         
     except Exception as e:
         logger.error("Error in profile handler", user_id=user.id, error=str(e), exc_info=True)
@@ -95,60 +60,12 @@ async def settings_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
 async def _handle_notification_settings(query, context):
     """Handle notification settings."""
-    text = """
-🔔 **Notification Settings**
-
-Control what notifications you receive:
-
-✅ New food available (ON)
-✅ Food claimed (ON) 
-✅ Exchange confirmations (ON)
-❌ Daily summaries (OFF)
-✅ Safety alerts (ON)
-
-**Quiet Hours:** 10 PM - 8 AM
-    """
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("🔕 Toggle All", callback_data="toggle_all_notifications"),
-        ],
-        [
-            InlineKeyboardButton("⏰ Quiet Hours", callback_data="set_quiet_hours"),
-            InlineKeyboardButton("📧 Email Settings", callback_data="email_settings"),
-        ],
-        [InlineKeyboardButton("← Back", callback_data="show_profile")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    await query.edit_message_text(**NOTIFICATION_SETTINGS.render().kwargs)
 
 
 async def _handle_privacy_settings(query, context):
     """Handle privacy settings."""
-    text = """
-🛡️ **Privacy Settings**
-
-Control what information other users can see:
-
-✅ Name and apartment (Visible to neighbors)
-✅ Food posts (Public in building)
-❌ Phone number (Only during active exchanges)
-✅ Dietary restrictions (Helps with food matching)
-
-**Profile Visibility:** Building residents only
-    """
-    
-    keyboard = [
-        [
-            InlineKeyboardButton("👁️ Profile Visibility", callback_data="profile_visibility"),
-            InlineKeyboardButton("📱 Phone Privacy", callback_data="phone_privacy"),
-        ],
-        [InlineKeyboardButton("← Back", callback_data="show_profile")],
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
-    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+    await query.edit_message_text(**PRIVACY_SETTINGS.render().kwargs)
 
 
 # Placeholder conversation handler for profile editing
@@ -1,9 +1,10 @@
 """Start command handler."""
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update
 from telegram.ext import ContextTypes
 
 from ...core.logging import get_logger, log_bot_interaction
+from ..messages import ERROR, WELCOME
 
 logger = get_logger(__name__)
 
@@ -28,34 +29,9 @@ async def start_handler(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         # Check if user is already registered
         # TODO: Check user registration status from database
         
-        welcome_text = f"""
-🏠 **Welcome to Neighborhood Sharing Platform!**
-
-Hi {user.first_name}! I'm here to help you share and discover food with your neighbors.
-
-**What you can do:**
-🍲 Share extra food with neighbors
-🔍 Browse available food in your building
-⭐ Earn credits for sharing
-💬 Coordinate pickups easily
-
-To get started, let's set up your profile. I'll need to verify your phone number and building information.
-
-Ready to begin?
-        """
-        
-        # Create inline keyboard
-        keyboard = [
-            [InlineKeyboardButton("📝 Get Started", callback_data="start_registration")],
-            [InlineKeyboardButton("❓ Learn More", callback_data="learn_more")],
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
         await context.bot.send_message(
             chat_id=chat.id,
-            text=welcome_text,
-            reply_markup=reply_markup,
-            parse_mode="Markdown",
+            **WELCOME.render(first_name=user.first_name).kwargs,
         )
         
     except Exception as e:
@@ -66,7 +42,4 @@ Ready to begin?
             exc_info=True
         )
         
-        await context.bot.send_message(
-            chat_id=chat.id,
-            text="Sorry, I encountered an error. Please try again later.",
-        )
\ No newline at end of file
+        await context.bot.send_message(chat_id=chat.id, **ERROR.render().kwargs)
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""Inline query search (``@bot vegan``) over the searcher's building.
+
+Answers come from a short-lived Valkey snapshot of each building's
+available food, with thumbnail URLs resolved, so a burst of inline
+queries from one building costs one database query. The matches for
+each normalized query are cached per building too, so neighbours typing
+the same search share one result; the searcher's own posts are dropped
+afterwards. Telegram pages through the matches with ``next_offset`` and
+may reuse an answer for ``bot_inline_client_cache_seconds``.
+
+Inline mode must be enabled for the bot with BotFather's ``/setinline``.
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from telegram import InlineQueryResultArticle, InputTextMessageContent
+
+from ..core.config import get_settings
+from ..core.database import get_read_db
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.food import Food, FoodCategory
+from ..services.food_service import FoodService
+from ..services.photo_service import thumbnail_url
+from ..services.user_service import UserService
+from .browse import SessionFactory
+from .messages import INLINE_FOOD, INLINE_FOOD_DESCRIPTION
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+KEY_PREFIX = "bot:inline"
+
+# Telegram rejects answers to queries older than this
+INLINE_ANSWER_DEADLINE_SECONDS = 10.0
+
+# Results per answer; Telegram accepts at most 50
+PAGE_SIZE = 20
+
+# Building snapshots being loaded in this process, so concurrent misses share a query
+_loading: Dict[str, "asyncio.Task[List[Dict[str, Any]]]"] = {}
+
+
+def normalize_query(text: Optional[str]) -> str:
+    """Lowercase with single spaces, so equivalent searches share a cache entry."""
+    return " ".join((text or "").lower().split())[:64]
+
+
+def summaries_key(building_id: str) -> str:
+    return f"{KEY_PREFIX}:foods:{building_id}"
+
+
+def results_key(building_id: str, query: str) -> str:
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16]
+    return f"{KEY_PREFIX}:results:{building_id}:{digest}"
+
+
+def _summary(food: Food) -> Dict[str, Any]:
+    photos = json.loads(food.photo_urls) if food.photo_urls else []
+    return {
+        "id": food.id,
+        "sharer": food.sharer_id,
+        "title": food.title,
+        "details": (food.description or food.dietary_info or "Shared by a neighbor")[:200],
+        "search": " ".join(
+            part or ""
+            for part in (food.title, food.description, food.dietary_info, FoodCategory(food.category).value)
+        ).lower().replace("_", " "),
+        "location": food.pickup_location or "Ask the sharer",
+        "start": food.pickup_start.isoformat(),
+        "end": food.pickup_end.isoformat(),
+        "credits": food.credit_value,
+        "thumbnail": thumbnail_url(photos[0]) if photos else None,
+    }
+
+
+def matches(summary: Dict[str, Any], query: str) -> bool:
+    """Whether every word of the normalized query appears in the post."""
+    return all(term in summary["search"] for term in query.split())
+
+
+# Summary fields an inline result is built from
+_ARTICLE_FIELDS = ("id", "title", "details", "location", "start", "end", "credits", "thumbnail")
+
+
+@lru_cache(maxsize=4096)
+def _article(
+    food_id: str,
+    title: str,
+    details: str,
+    location: str,
+    start: str,
+    end: str,
+    credits: int,
+    thumbnail: Optional[str],
+) -> InlineQueryResultArticle:
+    values = {
+        "food_id": food_id,
+        "title": title,
+        "details": details,
+        "pickup_location": location,
+        "pickup_start": datetime.fromisoformat(start),
+        "pickup_end": datetime.fromisoformat(end),
+        "credit_value": credits,
+    }
+    message = INLINE_FOOD.render(**values)
+    return InlineQueryResultArticle(
+        id=food_id,
+        title=title,
+        description=INLINE_FOOD_DESCRIPTION.render(**values).text,
+        thumbnail_url=thumbnail,
+        input_message_content=InputTextMessageContent(message.text, parse_mode=message.parse_mode),
+        reply_markup=message.reply_markup,
+    )
+
+
+def build_results(summaries: List[Dict[str, Any]]) -> List[InlineQueryResultArticle]:
+    """Inline results that post the food, with a claim button, into the chat.
+
+    Results are immutable, so each is built once per version of its post
+    and reused for every search that finds it.
+    """
+    return [_article(*(summary[field] for field in _ARTICLE_FIELDS)) for summary in summaries]
+
+
+class InlineSearch:
+    """Find available food in a Telegram user's building for inline queries."""
+
+    def __init__(self, redis_client: Redis, session_factory: SessionFactory = get_read_db) -> None:
+        self.redis = redis_client
+        self.session_factory = session_factory
+
+    async def search(
+        self, telegram_id: int, query: str, offset: int = 0
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """One page of matches and the next offset, or None if the user has no building."""
+        member = await self._member(telegram_id)
+        if member is None:
+            return None
+        user_id, building_id = member
+
+        found = [
+            summary
+            for summary in await self._matches(building_id, normalize_query(query))
+            if summary["sharer"] != user_id
+        ]
+        page = found[offset:offset + PAGE_SIZE]
+        next_offset = offset + PAGE_SIZE if offset + PAGE_SIZE < len(found) else None
+        return page, next_offset
+
+    async def _member(self, telegram_id: int) -> Optional[Tuple[str, str]]:
+        async with self.session_factory() as db:
+            user = await UserService(db).get_profile_by_telegram_id(telegram_id)
+        if user is None or not user.building_id:
+            return None
+        return user.id, user.building_id
+
+    async def _matches(self, building_id: str, query: str) -> List[Dict[str, Any]]:
+        key = results_key(building_id, query)
+        cached = await self._get(key)
+        if cached is not None:
+            metrics.increment("bot_inline_cache_total", result="hit")
+            return cached
+
+        metrics.increment("bot_inline_cache_total", result="miss")
+        found = [
+            summary for summary in await self._summaries(building_id) if matches(summary, query)
+        ]
+        await self._set(key, found, settings.bot_inline_cache_seconds)
+        return found
+
+    async def _summaries(self, building_id: str) -> List[Dict[str, Any]]:
+        cached = await self._get(summaries_key(building_id))
+        if cached is not None:
+            return cached
+
+        task = _loading.get(building_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load_summaries(building_id))
+            _loading[building_id] = task
+            task.add_done_callback(lambda _: _loading.pop(building_id, None))
+        return await asyncio.shield(task)
+
+    async def _load_summaries(self, building_id: str) -> List[Dict[str, Any]]:
+        async with self.session_factory() as db:
+            foods = await FoodService(db).get_building_food(
+                building_id, limit=settings.bot_inline_max_results
+            )
+        summaries = [_summary(food) for food in foods]
+        await self._set(summaries_key(building_id), summaries, settings.bot_inline_cache_seconds)
+        return summaries
+
+    async def _get(self, key: str) -> Any:
+        try:
+            cached = await self.redis.get(key)
+        except RedisError as e:
+            logger.warning("Inline search cache read failed", key=key, error=str(e))
+            return None
+        return json.loads(cached) if cached is not None else None
+
+    async def _set(self, key: str, value: Any, ttl_seconds: int) -> None:
+        try:
+            await self.redis.set(key, json.dumps(value, separators=(",", ":")), ex=ttl_seconds)
+        except RedisError as e:
+            logger.warning("Inline search cache write failed", key=key, error=str(e))
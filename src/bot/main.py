@@ -1,23 +1,35 @@
 """Main Telegram bot implementation."""
 
+import asyncio
 from typing import Optional
 
 from telegram import Bot, Update
-from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters
+from telegram.ext import (
+    Application,
+    ApplicationBuilder,
+    CommandHandler,
+    InlineQueryHandler,
+    MessageHandler,
+    TypeHandler,
+    filters,
+)
 
 from ..core.config import get_settings
 from ..core.logging import configure_logging, get_logger
 from .handlers import (
     command_handlers,
-    conversation_handlers, 
     message_handlers,
     callback_query_handlers,
+    inline_query_handler,
+    track_activity,
 )
 from .handlers.start import start_handler
 from .handlers.help import help_handler
 from .handlers.registration import registration_conversation
 from .handlers.food import food_conversation
 from .handlers.profile import profile_conversation
+from .send_governor import get_send_governor
+from .update_processor import OrderedUpdateProcessor, time_handlers
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -29,30 +41,57 @@ class SharingBot:
     def __init__(self) -> None:
         self.bot: Optional[Bot] = None
         self.application: Optional[Application] = None
+        self.update_processor: Optional[OrderedUpdateProcessor] = None
+    
+    @property
+    def running(self) -> bool:
+        """Whether the application is started and taking updates."""
+        return self.application is not None and self.application.running
     
-    async def setup(self) -> None:
-        """Set up the bot application."""
+    async def setup(self, polling: bool = True) -> None:
+        """Set up the bot application.
+        
+        Without ``polling`` there is no updater; updates arrive through
+        ``enqueue_update`` from the API's webhook endpoint.
+        """
         logger.info("Setting up Telegram bot...")
         
+        self.update_processor = OrderedUpdateProcessor(
+            concurrent_updates=settings.bot_concurrent_updates,
+            max_pending_updates=settings.bot_update_queue_size,
+        )
+        
         # Create application
-        self.application = (
+        builder = (
             ApplicationBuilder()
             .token(settings.telegram_bot_token)
-            .build()
+            .update_queue(asyncio.Queue(maxsize=settings.bot_update_queue_size))
+            .concurrent_updates(self.update_processor)
+            .rate_limiter(get_send_governor())
         )
+        if not polling:
+            builder = builder.updater(None)
+        self.application = builder.build()
         
         self.bot = self.application.bot
         
         # Add handlers
         await self._add_handlers()
+        for handlers in self.application.handlers.values():
+            for handler in handlers:
+                time_handlers(handler)
         
-        logger.info("Bot setup completed", bot_username=self.bot.username)
+        # The username is only known once the application is initialized
+        logger.info("Bot setup completed")
     
     async def _add_handlers(self) -> None:
         """Add all command and message handlers."""
         if not self.application:
             return
         
+        # Record activity for every update, ahead of the handler that answers it
+        self.application.add_handler(TypeHandler(Update, track_activity), group=-1)
+        
         # Add conversation handlers first (they have priority)
         self.application.add_handler(registration_conversation)
         self.application.add_handler(food_conversation)
@@ -71,6 +110,8 @@ class SharingBot:
             from telegram.ext import CallbackQueryHandler
             self.application.add_handler(CallbackQueryHandler(handler, pattern=pattern))
         
+        self.application.add_handler(InlineQueryHandler(inline_query_handler))
+        
         # Add message handlers (catch-all, so add last)
         for filter_type, handler in message_handlers.items():
             self.application.add_handler(MessageHandler(filter_type, handler))
@@ -87,36 +128,62 @@ class SharingBot:
         await self.application.start()
         await self.application.updater.start_polling()
     
-    async def start_webhook(self, webhook_url: str, port: int = 8443) -> None:
-        """Start bot with webhook."""
+    async def start_webhook(self, webhook_url: str) -> None:
+        """Start processing updates posted to the API's webhook endpoint."""
         if not self.application:
-            await self.setup()
+            await self.setup(polling=False)
         
-        logger.info("Starting bot webhook", webhook_url=webhook_url, port=port)
+        logger.info("Starting bot webhook", webhook_url=webhook_url)
         await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_webhook(
-            listen="0.0.0.0",
-            port=port,
-            url_path="webhook/telegram",
-            webhook_url=webhook_url,
-            secret_token=settings.telegram_webhook_secret,
+        logger.info("Bot started", bot_username=self.bot.username)
+        await self.bot.set_webhook(
+            url=webhook_url,
+            secret_token=settings.telegram_webhook_secret or None,
         )
     
+    def enqueue_update(self, update: Update) -> bool:
+        """Queue a webhook update for processing without waiting for it.
+        
+        Returns False when the bot is not running or already has
+        ``bot_update_queue_size`` updates in hand; the caller should ask
+        Telegram to retry later.
+        """
+        if not self.running or not self.update_processor.admit(update):
+            return False
+        try:
+            self.application.update_queue.put_nowait(update)
+        except asyncio.QueueFull:
+            self.update_processor.release(update)
+            return False
+        return True
+    
     async def stop(self) -> None:
         """Stop the bot."""
         if self.application:
             logger.info("Stopping bot...")
-            await self.application.updater.stop()
-            await self.application.stop()
+            if self.application.updater and self.application.updater.running:
+                await self.application.updater.stop()
+            if self.application.running:
+                await self.application.stop()
             await self.application.shutdown()
     
     async def process_update(self, update: Update) -> None:
-        """Process a single update (for webhook mode)."""
+        """Process a single update right away, bypassing the queue."""
         if self.application:
             await self.application.process_update(update)
 
 
+async def register_webhook(webhook_url: str) -> None:
+    """Point Telegram at ``webhook_url`` without starting the bot here."""
+    async with Bot(settings.telegram_bot_token) as bot:
+        await bot.set_webhook(
+            url=webhook_url,
+            secret_token=settings.telegram_webhook_secret or None,
+        )
+    logger.info("Registered Telegram webhook", webhook_url=webhook_url)
+
+
 # Global bot instance
 bot_instance = SharingBot()
 
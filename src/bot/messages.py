@@ -0,0 +1,344 @@
+"""Templates for the bot's command and menu replies.
+
+Headings use legacy Markdown bold (``*text*``); ``**text**`` renders as
+plain text in Telegram's ``Markdown`` mode.
+"""
+
+from .templates import templates
+
+WELCOME = templates.add(
+    "start.welcome",
+    """
+    🏠 *Welcome to Neighborhood Sharing Platform!*
+
+    Hi {first_name}! I'm here to help you share and discover food with your neighbors.
+
+    *What you can do:*
+    🍲 Share extra food with neighbors
+    🔍 Browse available food in your building
+    ⭐ Earn credits for sharing
+    💬 Coordinate pickups easily
+
+    To get started, let's set up your profile. I'll need to verify your phone number and building information.
+
+    Ready to begin?
+    """,
+    keyboard=[
+        [("📝 Get Started", "start_registration")],
+        [("❓ Learn More", "learn_more")],
+    ],
+)
+
+MAIN_MENU = templates.add(
+    "menu.main",
+    """
+    🏠 *Neighborhood Sharing Platform*
+
+    Hello {first_name}! What would you like to do today?
+
+    *Food Sharing:*
+    🍲 Share food with your neighbors
+    🔍 Browse available food in your building
+    📋 Manage your food posts
+
+    *Your Account:*
+    👤 View and edit your profile
+    ⭐ Check your credit balance
+    📊 View sharing history
+
+    Choose an option below:
+    """,
+    keyboard=[
+        [("🍲 Share Food", "main_menu_share"), ("🔍 Browse Food", "main_menu_browse")],
+        [("📋 My Posts", "main_menu_myposts"), ("⭐ My Credits", "main_menu_credits")],
+        [("👤 Profile", "main_menu_profile"), ("📊 History", "main_menu_history")],
+        [("❓ Help", "main_menu_help"), ("⚙️ Settings", "main_menu_settings")],
+    ],
+)
+
+MENU_SHARE = templates.add(
+    "menu.share",
+    """
+    🍲 *Share Food*
+
+    Ready to share some delicious food with your neighbors?
+
+    I'll guide you through posting your food item step by step:
+    1. 📸 Upload a photo
+    2. 📝 Add description and ingredients
+    3. ⏰ Set pickup time
+    4. 📍 Choose pickup location
+    5. ⚠️ List any allergens
+
+    Let's start! What would you like to share today?
+    """,
+    keyboard=[
+        [("📸 Start Sharing", "start_food_share")],
+        [("← Back to Menu", "back_to_menu")],
+    ],
+)
+
+HELP = templates.add(
+    "help.main",
+    """
+    📱 *Neighborhood Sharing Platform Help*
+
+    *Main Commands:*
+    /start - Get started or restart the bot
+    /menu - Show main menu
+    /share - Share food with neighbors
+    /browse - Browse available food
+    /myposts - View your food posts
+    /profile - Manage your profile
+    /help - Show this help message
+
+    *How it works:*
+    1. 🏠 *Register* - Verify your phone and building
+    2. 🍲 *Share Food* - Post excess food with photos and details
+    3. ⭐ *Earn Credits* - Get credits when neighbors claim your food
+    4. 🔍 *Browse & Claim* - Use credits to claim food from others
+    5. 🤝 *Coordinate* - Chat with neighbors to arrange pickup
+
+    *Safety Guidelines:*
+    • Only share food you would eat yourself
+    • List all ingredients and allergens
+    • Follow pickup time windows
+    • Meet in safe, common areas
+
+    *Credit System:*
+    • Earn 1 credit per successful share
+    • Spend 1 credit to claim food
+    • New users get 10 starter credits
+
+    *Need Help?*
+    Contact our support team or check the safety guidelines for food sharing best practices.
+    """,
+    keyboard=[
+        [("🍲 Share Food", "help_share"), ("🔍 Browse Food", "help_browse")],
+        [("⭐ Credits", "help_credits"), ("🛡️ Safety", "help_safety")],
+        [("📞 Contact Support", "contact_support")],
+    ],
+)
+
+ERROR = templates.add(
+    "error.generic",
+    "Sorry, I encountered an error. Please try again later.",
+    parse_mode=None,
+)
+
+SHARE_FOOD = templates.add(
+    "food.share",
+    """
+    🍲 *Share Food*
+
+    Ready to share some delicious food with your neighbors?
+
+    I'll guide you through posting your food item step by step:
+    1. 📸 Upload a photo
+    2. 📝 Add description and ingredients
+    3. ⏰ Set pickup time
+    4. 📍 Choose pickup location
+    5. ⚠️ List any allergens
+
+    *Quick Tips:*
+    • Only share food you'd eat yourself
+    • Be honest about ingredients
+    • Set realistic pickup windows
+    • Choose safe meeting spots
+
+    Ready to start?
+    """,
+    keyboard=[
+        [("📸 Start Posting", "start_food_post")],
+        [("📋 My Posts", "view_my_posts")],
+    ],
+)
+
+BROWSE_HEADER = templates.add(
+    "food.browse_header",
+    "🔍 *Available Food* · page {page} of {pages}",
+)
+
+BROWSE_ITEM = templates.add(
+    "food.browse_item",
+    """
+    {number}. *{title}*
+    📍 {pickup_location} · ⏰ {pickup_start:%I:%M %p} - {pickup_end:%I:%M %p} · ⭐ {credit_value}
+    """,
+)
+
+BROWSE_FOOTER = templates.add(
+    "food.browse_footer",
+    "Tap a number to claim that food.",
+)
+
+BROWSE_EMPTY = templates.add(
+    "food.browse_empty",
+    """
+    🔍 *Browse Available Food*
+
+    No food is available in your building right now.
+
+    *Tips for claiming food:*
+    • Act quickly - good food goes fast!
+    • Check pickup times carefully
+    • Bring something to carry the food
+    • Be respectful of pickup instructions
+    """,
+    keyboard=[
+        [("🔄 Refresh List", "br:new")],
+        [("🍲 Share Food", "main_menu_share"), ("⭐ My Credits", "main_menu_credits")],
+    ],
+)
+
+BROWSE_NOT_REGISTERED = templates.add(
+    "food.browse_not_registered",
+    """
+    🔍 *Browse Available Food*
+
+    Join your building first and you'll see what your neighbors are sharing.
+
+    Use /start to set up your profile.
+    """,
+)
+
+INLINE_FOOD = templates.add(
+    "food.inline",
+    """
+    🍲 *{title}*
+
+    {details}
+
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {pickup_start:%I:%M %p} - {pickup_end:%I:%M %p}
+    ⭐ Credits: {credit_value}
+    """,
+    keyboard=[[("⭐ Claim", "claim_food_{food_id}")]],
+)
+
+INLINE_FOOD_DESCRIPTION = templates.add(
+    "food.inline_description",
+    "📍 {pickup_location} · ⏰ {pickup_start:%I:%M %p} · ⭐ {credit_value} · {details}",
+    parse_mode=None,
+)
+
+MY_POSTS = templates.add(
+    "food.my_posts",
+    """
+    📋 *My Food Posts*
+
+    Here are your recent food sharing posts:
+
+    _No posts yet_
+
+    Want to share something delicious?
+    """,
+    keyboard=[
+        [("🍲 Share New Food", "start_food_post")],
+        [("📊 View History", "main_menu_history")],
+    ],
+)
+
+CLAIM_FOOD = templates.add(
+    "food.claim",
+    """
+    ⭐ *Claim Food*
+
+    You're about to claim this food item for 1 credit.
+
+    *Food ID:* {food_id}
+
+    _Claiming functionality coming soon..._
+    """,
+    keyboard=[
+        [("✅ Confirm Claim", "confirm_claim_{food_id}"), ("❌ Cancel", "cancel_claim")],
+    ],
+)
+
+FOOD_PHOTO_STEP = templates.add(
+    "food.photo_step",
+    """
+    📸 *Share Food - Step 1/3*
+
+    Let's start by uploading a photo of your food! A good photo helps neighbors know what you're sharing.
+
+    *Photo Tips:*
+    • Show the food clearly
+    • Good lighting helps
+    • Include any packaging/containers
+
+    Please send me a photo of your food:
+    """,
+)
+
+PROFILE = templates.add(
+    "profile.main",
+    """
+    👤 *Your Profile*
+
+    *Name:* {full_name}
+    *Username:* @{username}
+    *Building:* Sample Apartment Complex
+    *Apartment:* 3B
+    *Phone:* +1-xxx-xxx-xxxx (verified ✅)
+
+    *Account Stats:*
+    ⭐ Credits: 15
+    🍲 Food shared: 8 items
+    🔍 Food claimed: 5 items
+    🏆 Community rank: #12
+
+    *Dietary Info:*
+    🥗 Restrictions: Vegetarian
+    ⚠️ Allergies: Nuts
+
+    Want to update your profile?
+    """,
+    keyboard=[
+        [("✏️ Edit Profile", "edit_profile"), ("🔔 Notifications", "settings_notifications")],
+        [("🛡️ Privacy", "settings_privacy"), ("🏆 Leaderboard", "view_leaderboard")],
+        [("📋 Back to Menu", "show_main_menu")],
+    ],
+)
+
+NOTIFICATION_SETTINGS = templates.add(
+    "profile.notification_settings",
+    """
+    🔔 *Notification Settings*
+
+    Control what notifications you receive:
+
+    ✅ New food available (ON)
+    ✅ Food claimed (ON)
+    ✅ Exchange confirmations (ON)
+    ❌ Daily summaries (OFF)
+    ✅ Safety alerts (ON)
+
+    *Quiet Hours:* 10 PM - 8 AM
+    """,
+    keyboard=[
+        [("🔕 Toggle All", "toggle_all_notifications")],
+        [("⏰ Quiet Hours", "set_quiet_hours"), ("📧 Email Settings", "email_settings")],
+        [("← Back", "show_profile")],
+    ],
+)
+
+PRIVACY_SETTINGS = templates.add(
+    "profile.privacy_settings",
+    """
+    🛡️ *Privacy Settings*
+
+    Control what information other users can see:
+
+    ✅ Name and apartment (Visible to neighbors)
+    ✅ Food posts (Public in building)
+    ❌ Phone number (Only during active exchanges)
+    ✅ Dietary restrictions (Helps with food matching)
+
+    *Profile Visibility:* Building residents only
+    """,
+    keyboard=[
+        [("👁️ Profile Visibility", "profile_visibility"), ("📱 Phone Privacy", "phone_privacy")],
+        [("← Back", "show_profile")],
+    ],
+)
@@ -0,0 +1,212 @@
+"""Outbound Telegram request throttling shared by every bot and API process.
+
+Requests that target a chat take a token from a global bucket and from the
+chat's own bucket, both kept in Valkey so all processes share the budgets
+Telegram enforces per bot. Interactive replies (the default) may drain the
+global bucket; bulk notifications (``rate_limit_args={"priority": "bulk"}``)
+leave ``telegram_send_interactive_reserve`` tokens behind, so replies are
+not stuck behind a broadcast. A ``RetryAfter`` from Telegram pauses every
+process for the requested time before the request is retried.
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Union
+
+from redis.exceptions import RedisError
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..core.redis import init_redis
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+
+BUCKET_KEY_PREFIX = "telegram:send:bucket:"
+GLOBAL_BUCKET_KEY = f"{BUCKET_KEY_PREFIX}global"
+PAUSE_KEY = "telegram:send:pause"
+
+# Longest single sleep, so a freed budget is noticed soon
+MAX_WAIT_SECONDS = 1.0
+
+# Take a token from the global and the chat bucket, or neither. Returns 0
+# when taken, otherwise the milliseconds to wait: positive while the global
+# budget (or a flood pause) is short, negative while only the chat's is.
+#   KEYS: global bucket, chat bucket, pause key
+#   ARGV: global rate/s, global burst, chat rate/s, chat burst,
+#         global tokens to leave behind
+_TAKE_SCRIPT = """
+local paused = redis.call('PTTL', KEYS[3])
+if paused > 0 then
+    return paused
+end
+
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+
+local function level(key, rate, burst)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    return math.min(burst, tokens + math.max(now - ts, 0) * rate / 1000)
+end
+
+local function save(key, tokens, rate, burst)
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+end
+
+local global_rate, global_burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+local chat_rate, chat_burst = tonumber(ARGV[3]), tonumber(ARGV[4])
+local needed = tonumber(ARGV[5]) + 1
+
+local global = level(KEYS[1], global_rate, global_burst)
+local chat = level(KEYS[2], chat_rate, chat_burst)
+if global < needed then
+    return math.ceil((needed - global) * 1000 / global_rate)
+end
+if chat < 1 then
+    return -math.ceil((1 - chat) * 1000 / chat_rate)
+end
+
+save(KEYS[1], global - 1, global_rate, global_burst)
+save(KEYS[2], chat - 1, chat_rate, chat_burst)
+return 0
+"""
+
+Result = Union[bool, Dict[str, Any], List[Dict[str, Any]]]
+
+
+def chat_bucket_key(chat_id: Union[int, str]) -> str:
+    return f"{BUCKET_KEY_PREFIX}chat:{chat_id}"
+
+
+class SendGovernor(BaseRateLimiter):
+    """Rate limiter for ``ExtBot`` enforcing the global and per-chat budgets.
+
+    ``waiting`` reports requests of this process held back, per priority.
+    """
+
+    def __init__(self, max_retries: Optional[int] = None) -> None:
+        self.max_retries = settings.telegram_send_max_retries if max_retries is None else max_retries
+        self._waiting: Dict[str, int] = {priority: 0 for priority in PRIORITIES}
+        # One waiter per priority polls Valkey while the global budget is short
+        self._gates: Dict[str, asyncio.Lock] = {priority: asyncio.Lock() for priority in PRIORITIES}
+
+    @property
+    def waiting(self) -> Dict[str, int]:
+        """Requests of this process waiting for a token, per priority."""
+        return dict(self._waiting)
+
+    async def initialize(self) -> None:
+        """Nothing to set up; Valkey is connected on first use."""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down."""
+
+    async def process_request(
+        self,
+        callback: Callable[..., Coroutine[Any, Any, Result]],
+        args: Any,
+        kwargs: Dict[str, Any],
+        endpoint: str,
+        data: Dict[str, Any],
+        rate_limit_args: Optional[Dict[str, Any]],
+    ) -> Result:
+        """Wait for the send budgets, then call Telegram, retrying after flood waits."""
+        chat_id = data.get("chat_id")
+        priority = (rate_limit_args or {}).get("priority", INTERACTIVE)
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown send priority: {priority}")
+
+        attempt = 0
+        while True:
+            if chat_id is not None:
+                await self._acquire(chat_id, priority)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                attempt += 1
+                metrics.increment("telegram_retry_after_total", endpoint=endpoint)
+                logger.warning(
+                    "Telegram flood control",
+                    endpoint=endpoint,
+                    chat_id=chat_id,
+                    retry_after=e.retry_after,
+                    attempt=attempt,
+                )
+                if attempt > self.max_retries:
+                    raise
+                await self._pause(e.retry_after)
+
+    async def _acquire(self, chat_id: Union[int, str], priority: str) -> None:
+        # Groups and channels have ids below zero and a lower budget
+        if isinstance(chat_id, int) and chat_id > 0:
+            chat_rate = settings.telegram_send_per_chat_per_second
+        else:
+            chat_rate = settings.telegram_send_per_group_per_minute / 60
+        reserve = settings.telegram_send_interactive_reserve if priority == BULK else 0
+
+        started = time.perf_counter()
+        self._waiting[priority] += 1
+        metrics.set_gauge("telegram_send_waiting", self._waiting[priority], priority=priority)
+        try:
+            redis_client = await init_redis()
+            while True:
+                async with self._gates[priority]:
+                    wait_ms = int(await redis_client.eval(
+                        _TAKE_SCRIPT,
+                        3,
+                        GLOBAL_BUCKET_KEY,
+                        chat_bucket_key(chat_id),
+                        PAUSE_KEY,
+                        settings.telegram_send_per_second,
+                        settings.telegram_send_per_second,
+                        chat_rate,
+                        settings.telegram_send_chat_burst,
+                        reserve,
+                    ))
+                    if wait_ms > 0:
+                        await asyncio.sleep(min(wait_ms / 1000, MAX_WAIT_SECONDS))
+                        continue
+                if not wait_ms:
+                    break
+                # Only this chat is over budget; let other chats through meanwhile
+                await asyncio.sleep(min(-wait_ms / 1000, MAX_WAIT_SECONDS))
+        except RedisError as e:
+            # Sending unthrottled beats not sending at all
+            metrics.increment("telegram_send_governor_errors_total")
+            logger.warning("Send governor unavailable", chat_id=chat_id, error=str(e))
+        finally:
+            self._waiting[priority] -= 1
+            metrics.set_gauge("telegram_send_waiting", self._waiting[priority], priority=priority)
+            metrics.observe(
+                "telegram_send_wait_seconds", time.perf_counter() - started, priority=priority
+            )
+
+    async def _pause(self, retry_after: float) -> None:
+        """Hold every process's sends for ``retry_after`` seconds, then return."""
+        try:
+            redis_client = await init_redis()
+            await redis_client.set(PAUSE_KEY, "1", px=max(int(retry_after * 1000), 1))
+        except RedisError as e:
+            logger.warning("Error recording Telegram flood wait", error=str(e))
+        await asyncio.sleep(retry_after)
+
+
+_send_governor: Optional[SendGovernor] = None
+
+
+def get_send_governor() -> SendGovernor:
+    """The process-wide governor used by the bot and the notification service."""
+    global _send_governor
+    if _send_governor is None:
+        _send_governor = SendGovernor()
+    return _send_governor
@@ -0,0 +1,206 @@
+"""Message templates for bot replies and notifications, compiled once.
+
+Templates are declared at import time (see ``bot.messages``). Static text
+and keyboards are built once and the same frozen objects returned on every
+render; dynamic ones are parsed into literal and field parts up front, so
+rendering is a join. Field values are escaped for the template's parse
+mode, so a user named ``snake_case`` cannot break the Markdown.
+
+Field specs work as in ``str.format`` and are applied before escaping,
+e.g. ``{pickup_start:%I:%M %p}``.
+
+python-telegram-bot is only imported once a keyboard is rendered, so the
+API can declare and render notification texts without loading it.
+"""
+
+import textwrap
+from dataclasses import dataclass
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from telegram import InlineKeyboardMarkup
+
+# Values of ``telegram.constants.ParseMode``, which compares equal to them
+MARKDOWN = "Markdown"
+MARKDOWN_V2 = "MarkdownV2"
+HTML = "HTML"
+
+# (literal text, field name or None, format spec)
+_Part = Tuple[str, Optional[str], str]
+
+
+def _compile(text: str) -> Tuple[_Part, ...]:
+    parts = []
+    for literal, field, spec, conversion in Formatter().parse(text):
+        if field is not None and not field.isidentifier():
+            raise ValueError(f"Template fields must be plain names, got {{{field}}}")
+        if conversion:
+            raise ValueError(f"Template fields do not support conversions: {{{field}!{conversion}}}")
+        parts.append((literal, field, spec or ""))
+    return tuple(parts)
+
+
+def _fields(parts: Sequence[_Part]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(field for _, field, _ in parts if field))
+
+
+# Same characters as ``telegram.helpers.escape_markdown``, as translate tables
+_ESCAPES: Dict[Optional[str], Dict[int, str]] = {
+    MARKDOWN: {ord(char): "\\" + char for char in "_*`["},
+    MARKDOWN_V2: {ord(char): "\\" + char for char in r"\_*[]()~`>#+-=|{}.!"},
+    HTML: {ord("&"): "&amp;", ord("<"): "&lt;", ord(">"): "&gt;"},
+}
+
+
+def _render(parts: Sequence[_Part], values: Dict[str, Any], parse_mode: Optional[str]) -> str:
+    table = _ESCAPES.get(parse_mode)
+    out: List[str] = []
+    for literal, field, spec in parts:
+        out.append(literal)
+        if field is not None:
+            value = values[field]
+            text = value if spec == "" and type(value) is str else format(value, spec)
+            out.append(text.translate(table) if table else text)
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class RenderedMessage:
+    """Text and markup ready for ``send_message`` or ``edit_message_text``."""
+
+    text: str
+    reply_markup: Optional["InlineKeyboardMarkup"] = None
+    parse_mode: Optional[str] = MARKDOWN
+
+    @property
+    def kwargs(self) -> Dict[str, Any]:
+        return {"text": self.text, "reply_markup": self.reply_markup, "parse_mode": self.parse_mode}
+
+
+class KeyboardTemplate:
+    """Inline keyboard whose callback data may contain ``{fields}``.
+
+    Rows are sequences of ``(label, callback_data)`` pairs.
+    """
+
+    __slots__ = ("rows", "fields", "_markup")
+
+    def __init__(self, rows: Sequence[Sequence[Tuple[str, str]]]) -> None:
+        self.rows = tuple(
+            tuple((label, _compile(data)) for label, data in row) for row in rows
+        )
+        self.fields = tuple(dict.fromkeys(
+            field for row in self.rows for _, parts in row for field in _fields(parts)
+        ))
+        # Static keyboards are built on first render, then reused
+        self._markup: Optional["InlineKeyboardMarkup"] = None
+
+    def render(self, values: Dict[str, Any]) -> "InlineKeyboardMarkup":
+        if self._markup is not None:
+            return self._markup
+        markup = self._build(values)
+        if not self.fields:
+            self._markup = markup
+        return markup
+
+    def _build(self, values: Dict[str, Any]) -> "InlineKeyboardMarkup":
+        from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+        return InlineKeyboardMarkup([
+            [
+                InlineKeyboardButton(label, callback_data=_render(parts, values, None))
+                for label, parts in row
+            ]
+            for row in self.rows
+        ])
+
+
+class MessageTemplate:
+    """Message text, optionally with a keyboard, compiled for fast rendering."""
+
+    __slots__ = ("name", "parse_mode", "keyboard", "fields", "_field_set", "_parts", "_static")
+
+    def __init__(
+        self,
+        name: str,
+        text: str,
+        keyboard: Optional[KeyboardTemplate] = None,
+        parse_mode: Optional[str] = MARKDOWN,
+    ) -> None:
+        self.name = name
+        self.parse_mode = parse_mode
+        self.keyboard = keyboard
+        self._parts = _compile(textwrap.dedent(text).strip())
+        self.fields = tuple(dict.fromkeys(
+            _fields(self._parts) + (keyboard.fields if keyboard else ())
+        ))
+        self._field_set = frozenset(self.fields)
+        self._static: Optional[RenderedMessage] = None
+        if not self.fields:
+            self._static = self._build({})
+
+    @property
+    def is_static(self) -> bool:
+        return self._static is not None
+
+    def render(self, **values: Any) -> RenderedMessage:
+        """Fill in ``values``; raises KeyError naming a missing field."""
+        if self._static is not None:
+            return self._static
+        if not self._field_set <= values.keys():
+            missing = [field for field in self.fields if field not in values]
+            raise KeyError(f"Template {self.name!r} is missing {', '.join(missing)}")
+        return self._build(values)
+
+    def _build(self, values: Dict[str, Any]) -> RenderedMessage:
+        return RenderedMessage(
+            text=_render(self._parts, values, self.parse_mode),
+            reply_markup=self.keyboard.render(values) if self.keyboard else None,
+            parse_mode=self.parse_mode,
+        )
+
+
+class TemplateRegistry:
+    """Every compiled template, by name."""
+
+    def __init__(self) -> None:
+        self._templates: Dict[str, MessageTemplate] = {}
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        keyboard: Optional[Sequence[Sequence[Tuple[str, str]]]] = None,
+        parse_mode: Optional[str] = MARKDOWN,
+    ) -> MessageTemplate:
+        """Compile and register a template; names must be unique."""
+        if name in self._templates:
+            raise ValueError(f"Template {name!r} is already registered")
+        template = MessageTemplate(
+            name,
+            text,
+            keyboard=KeyboardTemplate(keyboard) if keyboard else None,
+            parse_mode=parse_mode,
+        )
+        self._templates[name] = template
+        return template
+
+    def get(self, name: str) -> MessageTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, /, **values: Any) -> RenderedMessage:
+        return self._templates[name].render(**values)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def __iter__(self) -> Iterator[MessageTemplate]:
+        return iter(self._templates.values())
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+# Process-wide registry the bot and notification templates are added to
+templates = TemplateRegistry()
@@ -0,0 +1,179 @@
+"""Concurrent update processing with per-chat ordering and admission control.
+
+Updates from different chats are handled concurrently, up to
+``concurrent_updates`` at a time; updates from the same chat run one after
+another in arrival order, so conversation state is never raced. Updates
+are admitted (``admit``) before they are queued and count against
+``max_pending_updates`` until their handler finishes. The webhook uses that
+to push back on Telegram once the bot falls behind.
+
+``time_handlers`` wraps handler callbacks to record latency per handler.
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from telegram.ext import BaseHandler, BaseUpdateProcessor, ConversationHandler
+
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Update fields used as the metric label, in order of precedence
+UPDATE_TYPES = (
+    "message",
+    "edited_message",
+    "callback_query",
+    "inline_query",
+    "chosen_inline_result",
+    "my_chat_member",
+)
+
+
+def update_type(update: object) -> str:
+    """Short label for what kind of update this is."""
+    for name in UPDATE_TYPES:
+        if getattr(update, name, None) is not None:
+            return name
+    return "other"
+
+
+def chat_key(update: object) -> Optional[int]:
+    """Chat whose updates must stay in order, falling back to the user."""
+    chat = getattr(update, "effective_chat", None)
+    if chat is not None:
+        return chat.id
+    user = getattr(update, "effective_user", None)
+    return user.id if user is not None else None
+
+
+def _timed(callback: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    if getattr(callback, "_timed", False):
+        return callback
+
+    @functools.wraps(callback)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with metrics.timer("bot_handler_seconds", handler=callback.__name__):
+            return await callback(*args, **kwargs)
+
+    wrapper._timed = True
+    return wrapper
+
+
+def time_handlers(handler: BaseHandler) -> BaseHandler:
+    """Record ``bot_handler_seconds`` per callback, including inside conversations."""
+    if isinstance(handler, ConversationHandler):
+        for inner in handler.entry_points + handler.fallbacks:
+            time_handlers(inner)
+        for state_handlers in handler.states.values():
+            for inner in state_handlers:
+                time_handlers(inner)
+    else:
+        handler.callback = _timed(handler.callback)
+    return handler
+
+
+class OrderedUpdateProcessor(BaseUpdateProcessor):
+    """Update processor that keeps each chat's updates in order.
+
+    PTB's semaphore is sized to ``max_pending_updates`` so it never blocks;
+    handler concurrency is limited after the chat lock is taken instead,
+    so updates waiting behind their own chat do not hold handler slots.
+    """
+
+    def __init__(self, concurrent_updates: int, max_pending_updates: int) -> None:
+        super().__init__(max_pending_updates)
+        self.concurrent_updates = concurrent_updates
+        self._handler_slots = asyncio.Semaphore(concurrent_updates)
+        self._chat_locks: Dict[int, asyncio.Lock] = {}
+        self._chat_waiters: Dict[int, int] = {}
+        # update_id -> when the update was admitted
+        self._admitted: Dict[int, float] = {}
+        self._running = 0
+
+    @property
+    def pending_updates(self) -> int:
+        """Updates admitted whose handlers have not finished."""
+        return len(self._admitted)
+
+    @property
+    def running_updates(self) -> int:
+        """Updates whose handlers are running now."""
+        return self._running
+
+    @property
+    def waiting_updates(self) -> int:
+        """Updates queued or waiting on their chat or a handler slot."""
+        return len(self._admitted) - self._running
+
+    def admit(self, update: Any) -> bool:
+        """Reserve room for ``update``; False when the bot is too far behind."""
+        if len(self._admitted) >= self.max_concurrent_updates:
+            metrics.increment("bot_updates_rejected_total")
+            return False
+        self._admitted[update.update_id] = time.perf_counter()
+        metrics.set_gauge("bot_updates_pending", len(self._admitted))
+        return True
+
+    def release(self, update: Any) -> None:
+        """Give back the room reserved for an update that will not be processed."""
+        self._admitted.pop(update.update_id, None)
+        metrics.set_gauge("bot_updates_pending", len(self._admitted))
+
+    async def initialize(self) -> None:
+        """Nothing to allocate."""
+
+    async def shutdown(self) -> None:
+        """Forget updates that were admitted but never processed."""
+        if self._admitted:
+            logger.warning("Dropping unprocessed updates", count=len(self._admitted))
+        self._admitted.clear()
+        metrics.set_gauge("bot_updates_pending", 0)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Run ``coroutine`` after earlier updates from the same chat."""
+        update_id = getattr(update, "update_id", None)
+        if update_id is not None and update_id not in self._admitted:
+            # Polled updates skip ``admit``; count them from here
+            self._admitted[update_id] = time.perf_counter()
+            metrics.set_gauge("bot_updates_pending", len(self._admitted))
+        chat_id = chat_key(update)
+        try:
+            if chat_id is None:
+                await self._handle(update, coroutine)
+                return
+
+            lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+            self._chat_waiters[chat_id] = self._chat_waiters.get(chat_id, 0) + 1
+            try:
+                async with lock:
+                    await self._handle(update, coroutine)
+            finally:
+                self._chat_waiters[chat_id] -= 1
+                if not self._chat_waiters[chat_id]:
+                    del self._chat_waiters[chat_id]
+                    del self._chat_locks[chat_id]
+        finally:
+            self.release(update)
+
+    async def _handle(self, update: object, coroutine: Awaitable[Any]) -> None:
+        kind = update_type(update)
+        async with self._handler_slots:
+            admitted_at = self._admitted.get(getattr(update, "update_id", None))
+            if admitted_at is not None:
+                metrics.observe(
+                    "bot_update_latency_seconds",
+                    time.perf_counter() - admitted_at,
+                    type=kind,
+                )
+            self._running += 1
+            metrics.set_gauge("bot_updates_running", self._running)
+            try:
+                with metrics.timer("bot_update_handle_seconds", type=kind):
+                    await coroutine
+            finally:
+                self._running -= 1
+                metrics.set_gauge("bot_updates_running", self._running)
@@ -0,0 +1,338 @@
+"""Telegram updates carried through Valkey streams to a pool of bot workers.
+
+The webhook appends each raw update to one of ``bot_update_stream_partitions``
+streams, chosen by chat id. Each worker process leases a fair share of the
+partitions (a ``SET NX PX`` key per partition, renewed while held) and
+reads its partitions through the ``bot-workers`` consumer group. Entries of
+one partition are handled one at a time and acknowledged (and deleted)
+after their handler returns, so each chat's updates stay in order.
+
+A worker taking over a partition first claims the entries its previous
+owner read but never acknowledged, so delivery is at least once.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+STREAM_KEY_PREFIX = "bot:updates:"
+LEASE_KEY_PREFIX = "bot:updates:lease:"
+WORKERS_KEY = "bot:workers"
+CONSUMER_GROUP = "bot-workers"
+
+# Entries read per round trip, and how long an idle read waits
+READ_BATCH_SIZE = 100
+READ_BLOCK_MS = 1000
+
+# Append unless the partition already holds ARGV[1] unhandled entries
+_PUBLISH_SCRIPT = """
+if redis.call('XLEN', KEYS[1]) >= tonumber(ARGV[1]) then
+    return false
+end
+return redis.call('XADD', KEYS[1], '*', 'update', ARGV[2])
+"""
+
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+UpdateHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def stream_key(partition: int) -> str:
+    return f"{STREAM_KEY_PREFIX}{partition}"
+
+
+def lease_key(partition: int) -> str:
+    return f"{LEASE_KEY_PREFIX}{partition}"
+
+
+def partition_for(chat_id: Optional[int], partitions: int) -> int:
+    """Partition holding a chat's updates; updates without a chat share 0."""
+    return (chat_id or 0) % partitions
+
+
+class UpdateStreamProducer:
+    """Append raw webhook updates to their chat's partition."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        partitions: Optional[int] = None,
+        max_length: Optional[int] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.partitions = partitions or settings.bot_update_stream_partitions
+        self.max_length = max_length or settings.bot_update_stream_max_length
+
+    async def publish(self, update_data: Dict[str, Any], chat_id: Optional[int]) -> Optional[str]:
+        """Append an update; returns its entry id, or None if the partition is full."""
+        entry_id = await self.redis.eval(
+            _PUBLISH_SCRIPT,
+            1,
+            stream_key(partition_for(chat_id, self.partitions)),
+            self.max_length,
+            json.dumps(update_data, separators=(",", ":")),
+        )
+        if entry_id is None:
+            metrics.increment("bot_stream_rejected_total")
+            return None
+        metrics.increment("bot_stream_published_total")
+        return entry_id
+
+
+class UpdateStreamWorker:
+    """Lease a share of the partitions and handle their updates in order.
+
+    ``handle`` receives the update as posted by Telegram. Call ``run`` to
+    work until ``stop`` is called.
+    """
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        handle: UpdateHandler,
+        consumer: Optional[str] = None,
+        partitions: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+    ) -> None:
+        self.redis = redis_client
+        self.handle = handle
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.partitions = partitions or settings.bot_update_stream_partitions
+        self.lease_seconds = lease_seconds or settings.bot_worker_lease_seconds
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Partitions finishing their current batch before their lease is released
+        self._hand_backs: Dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+
+    @property
+    def owned_partitions(self) -> List[int]:
+        return sorted(p for p in self._tasks if p not in self._hand_backs)
+
+    async def run(self) -> None:
+        """Rebalance every third of a lease until stopped."""
+        logger.info("Bot stream worker started", consumer=self.consumer)
+        while not self._stopping.is_set():
+            try:
+                await self.rebalance()
+            except RedisError as e:
+                logger.warning("Bot stream rebalance failed", consumer=self.consumer, error=str(e))
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.lease_seconds / 3)
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self) -> None:
+        """Finish the current entries, then give up every partition."""
+        self._stopping.set()
+        for partition in self.owned_partitions:
+            self._start_hand_back(partition)
+        # The last batches may outlast a lease, so keep renewing until they finish
+        while self._hand_backs:
+            await asyncio.wait(list(self._hand_backs.values()), timeout=self.lease_seconds / 3)
+            try:
+                await self._renew()
+            except RedisError as e:
+                logger.warning("Error renewing bot stream leases", consumer=self.consumer, error=str(e))
+        try:
+            await self.redis.zrem(WORKERS_KEY, self.consumer)
+        except RedisError as e:
+            logger.warning("Error leaving bot worker pool", consumer=self.consumer, error=str(e))
+        logger.info("Bot stream worker stopped", consumer=self.consumer)
+
+    async def rebalance(self) -> None:
+        """Renew held leases, then hand back or claim partitions to reach a fair share."""
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zadd(WORKERS_KEY, {self.consumer: now})
+        pipe.zremrangebyscore(WORKERS_KEY, 0, now - self.lease_seconds)
+        pipe.zcard(WORKERS_KEY)
+        _, _, live_workers = await pipe.execute()
+        share = math.ceil(self.partitions / max(live_workers, 1))
+
+        await self._renew()
+
+        # Handed back in the background, so the next rebalance still renews
+        # every lease while a surplus partition finishes its batch
+        for partition in self.owned_partitions[share:]:
+            self._start_hand_back(partition)
+
+        lease_ms = int(self.lease_seconds * 1000)
+        offset = random.randrange(self.partitions)
+        for step in range(self.partitions):
+            if len(self.owned_partitions) >= share:
+                break
+            partition = (offset + step) % self.partitions
+            if partition in self._tasks:
+                continue
+            if await self.redis.set(lease_key(partition), self.consumer, nx=True, px=lease_ms):
+                self._tasks[partition] = asyncio.create_task(self._consume(partition))
+        metrics.set_gauge("bot_stream_partitions_owned", len(self.owned_partitions), consumer=self.consumer)
+
+    async def _renew(self) -> None:
+        """Extend every held lease, including those being handed back."""
+        lease_ms = int(self.lease_seconds * 1000)
+        for partition, task in list(self._tasks.items()):
+            handing_back = partition in self._hand_backs
+            if task.done():
+                # A hand-back releases its own partition
+                if not handing_back:
+                    self._tasks.pop(partition)
+                    await self._release(partition)
+            elif not await self.redis.eval(
+                _RENEW_SCRIPT, 1, lease_key(partition), self.consumer, lease_ms
+            ):
+                # Another worker owns it now; stop reading right away
+                logger.warning("Bot stream lease lost", consumer=self.consumer, partition=partition)
+                task.cancel()
+                if not handing_back:
+                    self._tasks.pop(partition)
+
+    def _start_hand_back(self, partition: int) -> None:
+        self._hand_backs[partition] = asyncio.create_task(self._hand_back(partition))
+
+    async def _hand_back(self, partition: int) -> None:
+        try:
+            # The loop checks ownership between batches
+            await asyncio.gather(self._tasks[partition], return_exceptions=True)
+            await self._release(partition)
+        finally:
+            self._tasks.pop(partition, None)
+            self._hand_backs.pop(partition, None)
+
+    async def _release(self, partition: int) -> None:
+        try:
+            await self.redis.eval(_RELEASE_SCRIPT, 1, lease_key(partition), self.consumer)
+        except RedisError as e:
+            logger.warning("Error releasing bot stream lease", partition=partition, error=str(e))
+
+    def _owns(self, partition: int) -> bool:
+        return (
+            partition in self._tasks
+            and partition not in self._hand_backs
+            and not self._stopping.is_set()
+        )
+
+    async def _holds(self, partition: int) -> bool:
+        """Renew the partition's lease before a batch; False once it is lost."""
+        if await self.redis.eval(
+            _RENEW_SCRIPT, 1, lease_key(partition), self.consumer, int(self.lease_seconds * 1000)
+        ):
+            return True
+        logger.warning("Bot stream lease lost", consumer=self.consumer, partition=partition)
+        return False
+
+    async def _consume(self, partition: int) -> None:
+        key = stream_key(partition)
+        try:
+            await self._ensure_group(key)
+
+            # Entries a previous owner read but never acknowledged come first
+            start = "0-0"
+            while self._owns(partition) and await self._holds(partition):
+                result = await self.redis.xautoclaim(
+                    key, CONSUMER_GROUP, self.consumer, 0, start_id=start, count=READ_BATCH_SIZE
+                )
+                start, entries = result[0], result[1]
+                await self._handle_entries(key, entries)
+                if start == "0-0":
+                    break
+
+            while self._owns(partition):
+                response = await self.redis.xreadgroup(
+                    CONSUMER_GROUP,
+                    self.consumer,
+                    {key: ">"},
+                    count=READ_BATCH_SIZE,
+                    block=READ_BLOCK_MS,
+                )
+                for _, entries in response or ():
+                    # The lease may have lapsed while the read was blocked;
+                    # its new owner claims these entries instead
+                    if entries and not await self._holds(partition):
+                        return
+                    await self._handle_entries(key, entries)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The lease is released on the next rebalance and re-claimed
+            logger.error("Bot stream consumer failed", partition=partition, error=str(e), exc_info=True)
+
+    async def _ensure_group(self, key: str) -> None:
+        try:
+            await self.redis.xgroup_create(key, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def _handle_entries(
+        self,
+        key: str,
+        entries: Sequence[Tuple[str, Optional[Dict[str, str]]]],
+    ) -> None:
+        if not entries:
+            return
+        done: List[str] = []
+        for entry_id, fields in entries:
+            # Deleted entries are claimed without fields
+            if fields:
+                await self._handle_entry(entry_id, fields)
+                done.append(entry_id)
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.xack(key, CONSUMER_GROUP, entry_id)
+                pipe.xdel(key, entry_id)
+                await pipe.execute()
+            else:
+                await self.redis.xack(key, CONSUMER_GROUP, entry_id)
+        metrics.increment("bot_stream_handled_total", len(done))
+
+    async def _handle_entry(self, entry_id: str, fields: Dict[str, str]) -> None:
+        update_data = json.loads(fields["update"])
+        kind = next((name for name in update_data if name != "update_id"), "other")
+        # Entry ids start with the time they were added, in milliseconds
+        added_ms = int(entry_id.split("-", 1)[0])
+        metrics.observe(
+            "bot_update_latency_seconds",
+            max(time.time() * 1000 - added_ms, 0) / 1000,
+            type=kind,
+        )
+        try:
+            with metrics.timer("bot_update_handle_seconds", type=kind):
+                await self.handle(update_data)
+        except Exception as e:
+            # Acknowledged anyway, so one bad update cannot wedge its chat
+            metrics.increment("bot_stream_failures_total")
+            logger.error(
+                "Bot stream update failed",
+                entry_id=entry_id,
+                update_id=update_data.get("update_id"),
+                error=str(e),
+                exc_info=True,
+            )
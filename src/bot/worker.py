@@ -0,0 +1,94 @@
+"""Bot worker processes handling webhook updates from the Valkey streams.
+
+Used with ``BOT_UPDATE_TRANSPORT=stream``: the API only appends updates,
+and any number of these processes, on any number of hosts, handle them.
+
+    python -m src.bot.worker --processes 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+from typing import Any, Dict
+
+from telegram import Update
+
+from ..core.config import get_settings
+from ..core.events import subscribe
+from ..core.logging import configure_logging, get_logger
+from ..core.redis import close_redis, init_redis
+from ..services.user_directory import user_directory
+from .main import SharingBot
+from .update_stream import UpdateStreamWorker
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+async def run_worker() -> None:
+    """Run one worker until SIGTERM or SIGINT."""
+    configure_logging()
+    subscribe(user_directory.record)
+    directory_listener = asyncio.create_task(user_directory.listen())
+    bot = SharingBot()
+    await bot.setup(polling=False)
+    application = bot.application
+    await application.initialize()
+    await application.start()
+
+    async def handle(update_data: Dict[str, Any]) -> None:
+        await application.process_update(Update.de_json(update_data, application.bot))
+
+    worker = UpdateStreamWorker(await init_redis(), handle)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(worker.stop()))
+
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        await bot.stop()
+        directory_listener.cancel()
+        await user_directory.drain()
+        await close_redis()
+
+
+def _run_process() -> None:
+    asyncio.run(run_worker())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run bot worker processes")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=settings.bot_worker_processes or os.cpu_count() or 1,
+    )
+    args = parser.parse_args()
+
+    if args.processes == 1:
+        _run_process()
+        return
+
+    processes = [
+        multiprocessing.Process(target=_run_process, name=f"bot-worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logger.info("Started bot workers", processes=args.processes)
+
+    # Children get SIGINT from the terminal themselves; pass SIGTERM on
+    signal.signal(
+        signal.SIGTERM,
+        lambda *_: [process.terminate() for process in processes if process.is_alive()],
+    )
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """Application configuration."""
 
 from functools import lru_cache
-from typing import List
+from typing import List, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,14 +21,109 @@ class Settings(BaseSettings):
     database_test_url: str = Field(
         default="", description="Test database connection URL"
     )
+    database_pool_size: int = Field(default=10, description="Connections kept open per process")
+    database_max_overflow: int = Field(default=20, description="Extra connections opened under load")
+    database_pool_timeout: float = Field(default=10.0, description="Seconds to wait for a free connection")
+    database_pool_recycle: int = Field(default=1800, description="Reconnect after this many seconds")
+    database_statement_cache_size: int = Field(
+        default=100, description="asyncpg prepared statement cache size (0 behind PgBouncer)"
+    )
+    database_pre_ping: Literal["always", "idle", "never"] = Field(
+        default="idle", description="When to check connections on checkout"
+    )
+    database_pre_ping_idle_seconds: float = Field(
+        default=30.0, description="Idle time after which a connection is pinged"
+    )
+    database_pool_warmup: int = Field(
+        default=2, description="Connections opened per engine at startup"
+    )
+    database_replica_urls: str = Field(
+        default="", description="Comma-separated read replica connection URLs"
+    )
+    database_replica_max_lag_seconds: float = Field(
+        default=5.0, description="Replication lag above which reads use the primary"
+    )
+    database_replica_check_seconds: float = Field(
+        default=2.0, description="How often replica lag is measured"
+    )
+    database_test_replica_url: str = Field(
+        default="", description="Test read replica connection URL"
+    )
     
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0")
     
+    # Telegram id to user profile cache
+    user_directory_local_size: int = Field(
+        default=10000, description="Profiles kept in each process's LRU"
+    )
+    user_directory_local_ttl_seconds: float = Field(
+        default=30.0, description="How long a process serves a profile before asking Valkey"
+    )
+    user_directory_ttl_seconds: int = Field(
+        default=600, description="How long a profile is kept in Valkey"
+    )
+    
     # Telegram Bot
     telegram_bot_token: str = Field(..., description="Telegram bot token")
     telegram_webhook_url: str = Field(default="", description="Webhook URL")
     telegram_webhook_secret: str = Field(default="", description="Webhook secret")
+    bot_update_queue_size: int = Field(
+        default=1000, description="Updates held before the webhook answers 503"
+    )
+    bot_concurrent_updates: int = Field(
+        default=32, description="Updates handled at once; each chat's stay in order"
+    )
+    bot_update_transport: Literal["queue", "stream"] = Field(
+        default="queue",
+        description="queue: the API runs the bot; stream: bot workers read Valkey streams",
+    )
+    bot_update_stream_partitions: int = Field(
+        default=16, description="Streams updates are spread over by chat id"
+    )
+    bot_update_stream_max_length: int = Field(
+        default=10000, description="Unhandled updates per partition before the webhook answers 503"
+    )
+    bot_worker_lease_seconds: float = Field(
+        default=10.0, description="How long a worker holds a partition without renewing"
+    )
+    bot_worker_processes: int = Field(
+        default=0, description="Bot worker processes to start (0 = one per CPU)"
+    )
+    telegram_send_per_second: float = Field(
+        default=30.0, description="Messages per second across all chats and processes"
+    )
+    telegram_send_per_chat_per_second: float = Field(
+        default=1.0, description="Messages per second to one private chat"
+    )
+    telegram_send_per_group_per_minute: float = Field(
+        default=20.0, description="Messages per minute to one group or channel"
+    )
+    telegram_send_chat_burst: int = Field(
+        default=3, description="Messages a chat may get back to back before its rate applies"
+    )
+    telegram_send_interactive_reserve: int = Field(
+        default=5, description="Global send tokens bulk notifications leave for replies"
+    )
+    telegram_send_max_retries: int = Field(
+        default=2, description="Retries after Telegram answers with a flood wait"
+    )
+    bot_browse_page_size: int = Field(default=5, description="Food posts per browse page")
+    bot_browse_prefetch_pages: int = Field(
+        default=4, description="Browse pages fetched per query and cached for paging"
+    )
+    bot_browse_cache_seconds: int = Field(
+        default=300, description="How long a user's browse results are paged from Valkey"
+    )
+    bot_inline_cache_seconds: int = Field(
+        default=15, description="How long inline search results are shared within a building"
+    )
+    bot_inline_client_cache_seconds: int = Field(
+        default=30, description="cache_time Telegram may reuse an inline answer for"
+    )
+    bot_inline_max_results: int = Field(
+        default=100, description="Available posts per building inline queries search"
+    )
     
     # Security
     secret_key: str = Field(..., description="Secret key for JWT")
@@ -48,6 +143,20 @@ class Settings(BaseSettings):
     credit_initial_balance: int = Field(default=10)
     food_post_expiry_hours: int = Field(default=24)
     
+    # New food post broadcasts
+    food_post_broadcast_enabled: bool = Field(
+        default=False, description="Notify compatible neighbours when food is posted"
+    )
+    notification_batch_concurrency: int = Field(
+        default=50, description="Notifications of one batch in flight at once"
+    )
+    subscriber_index_flush_seconds: float = Field(
+        default=1.0, description="How often changed subscribers are written to the index"
+    )
+    subscriber_index_rebuild_seconds: int = Field(
+        default=3600, description="How often the subscriber index is rebuilt from SQL"
+    )
+    
     # Admin
     admin_username: str = Field(default="admin")
     admin_password: str = Field(..., description="Admin password")
@@ -70,6 +179,49 @@ class Settings(BaseSettings):
     rate_limit_per_minute: int = Field(default=30)
     rate_limit_burst: int = Field(default=10)
     
+    # Idempotency
+    idempotency_ttl_seconds: int = Field(default=86400)
+    idempotency_lock_seconds: int = Field(default=30)
+    
+    # Admin dashboard statistics
+    platform_stats_refresh_seconds: int = Field(
+        default=60, description="How often the platform stats view is refreshed"
+    )
+    platform_stats_max_staleness_seconds: int = Field(
+        default=300, description="Oldest precomputed stats served before computing live"
+    )
+    analytics_flush_seconds: float = Field(
+        default=1.0, description="How often buffered analytics counters are written to Redis"
+    )
+    activity_flush_seconds: float = Field(
+        default=30.0, description="How often users' last activity is written from Valkey to SQL"
+    )
+    activity_retention_days: int = Field(
+        default=30, description="Days a user's last activity is kept in Valkey for active counts"
+    )
+    
+    # History table partitions
+    partition_months_ahead: int = Field(
+        default=3, description="Monthly partitions kept created ahead of time"
+    )
+    partition_retention_months: int = Field(
+        default=24, description="Months kept before partitions are archived (0 keeps all)"
+    )
+    partition_maintenance_seconds: int = Field(
+        default=3600, description="How often partitions are created and archived"
+    )
+    
+    # Problematic exchange alerts
+    exchange_alert_detect_seconds: int = Field(
+        default=60, description="How often overdue and long-pending exchanges are detected"
+    )
+    exchange_alert_window_days: int = Field(
+        default=30, description="How far back the detector looks for problematic exchanges"
+    )
+    exchange_alert_claim_lead_days: int = Field(
+        default=7, description="Longest expected gap between claiming an exchange and its pickup"
+    )
+    
     @property
     def admin_telegram_id_list(self) -> List[int]:
         """Get list of admin Telegram IDs."""
@@ -77,6 +229,13 @@ class Settings(BaseSettings):
             return []
         return [int(id_str.strip()) for id_str in self.admin_telegram_ids.split(",")]
     
+    @property
+    def database_replica_url_list(self) -> List[str]:
+        """Get list of read replica URLs."""
+        if not self.database_replica_urls:
+            return []
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
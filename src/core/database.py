@@ -1,28 +1,85 @@
 """Database configuration and session management."""
 
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
-
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from .config import get_settings
+from .db_pool import InstrumentedAsyncPool, install_idle_pre_ping, pool_status
+from .db_routing import REPLICA_BIND_KEY, ReplicaRouter, RoutingSession
+from .logging import get_logger
+from .lookup_cache import attach_lookup_cache
 
 settings = get_settings()
+logger = get_logger(__name__)
+
+
+def create_database_engine(
+    url: str,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pre_ping: Optional[str] = None,
+    name: str = "primary",
+) -> AsyncEngine:
+    """Create an async engine with the configured pool settings.
+
+    ``name`` labels the pool in metrics.
+    """
+    pre_ping = pre_ping or settings.database_pre_ping
+    options: Dict[str, Any] = {
+        "echo": settings.debug,
+        "future": True,
+        "pool_pre_ping": pre_ping == "always",
+    }
+
+    if not url.startswith("sqlite"):
+        options.update(
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.database_pool_size if pool_size is None else pool_size,
+            max_overflow=settings.database_max_overflow if max_overflow is None else max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+            pool_logging_name=name,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": settings.database_statement_cache_size,
+        }
+
+    db_engine = create_async_engine(url, **options)
+    if pre_ping == "idle":
+        install_idle_pre_ping(db_engine.sync_engine, settings.database_pre_ping_idle_seconds)
+    return db_engine
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-    pool_pre_ping=True,
-    pool_recycle=300,
+engine = create_database_engine(settings.database_url)
+
+# Read replicas; reads fall back to the primary when none is usable
+replica_engines = [
+    create_database_engine(url, name=f"replica{i}")
+    for i, url in enumerate(settings.database_replica_url_list)
+]
+replica_router = ReplicaRouter(
+    replica_engines,
+    max_lag_seconds=settings.database_replica_max_lag_seconds,
+    check_interval=settings.database_replica_check_seconds,
 )
 
 # Create async session factory
 async_session = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
 )
 
@@ -36,6 +93,28 @@ class Base(DeclarativeBase):
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
     async with async_session() as session:
+        attach_lookup_cache(session)
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get a session for read-only endpoints.
+
+    Queries go to a replica within the lag bound, or to the primary if
+    there is none or the request already wrote something.
+    """
+    async with async_session() as session:
+        attach_lookup_cache(session)
+        replica = await replica_router.choose() if replica_router.enabled else None
+        if replica is not None:
+            session.info[REPLICA_BIND_KEY] = replica
         try:
             yield session
             await session.commit()
@@ -60,8 +139,58 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Context manager for a read-only session, on a replica when one is usable."""
+    async with async_session() as session:
+        replica = await replica_router.choose() if replica_router.enabled else None
+        if replica is not None:
+            session.info[REPLICA_BIND_KEY] = replica
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def warm_up_database() -> None:
+    """Open pool connections before the first requests arrive.
+
+    Failures are logged rather than raised so a worker still starts while
+    the database is unavailable; the readiness check reports it.
+    """
+    async def open_connection(db_engine: AsyncEngine) -> Any:
+        conn = await db_engine.connect().start()
+        await conn.execute(text("SELECT 1"))
+        return conn
+
+    for db_engine in [engine, *replica_engines]:
+        count = settings.database_pool_warmup
+        if isinstance(db_engine.sync_engine.pool, InstrumentedAsyncPool):
+            count = min(count, db_engine.sync_engine.pool.size())
+
+        results = await asyncio.gather(
+            *(open_connection(db_engine) for _ in range(count)),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, Exception)]
+        for conn in results:
+            if not isinstance(conn, Exception):
+                await conn.close()
+
+        if errors:
+            logger.warning(
+                "Database warmup failed",
+                pool=db_engine.sync_engine.pool.logging_name,
+                error=str(errors[0]),
+            )
+
+
 async def create_tables() -> None:
-    """Create all database tables."""
+    """Create all database tables (tests and local scripts; deployments use Alembic)."""
     async with engine.begin() as conn:
         # Import all models to ensure they're registered
         from ..models import Base as ModelsBase  # noqa: F401
@@ -72,4 +201,15 @@ async def create_tables() -> None:
 async def drop_tables() -> None:
     """Drop all database tables."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """Get connection pool statistics for the primary and replicas."""
+    status = pool_status(engine.sync_engine)
+    if replica_engines:
+        status["replicas"] = [
+            dict(pool_status(replica.sync_engine), **state)
+            for replica, state in zip(replica_engines, replica_router.status())
+        ]
+    return status
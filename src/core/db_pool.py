@@ -0,0 +1,111 @@
+"""Database connection pool instrumentation and liveness checks."""
+
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import queue as sqla_queue
+
+from .logging import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+POOL_WAIT_METRIC = "db_pool_wait_seconds"
+POOL_TIMEOUTS_METRIC = "db_pool_timeouts_total"
+
+
+class _InstrumentedQueue(sqla_queue.AsyncAdaptedQueue):
+    """Pool queue that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+        self.label = "primary"
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if not block or not self.empty():
+            return super().get(block, timeout)
+
+        # Every connection is checked out; this checkout has to wait
+        self.waiters += 1
+        started = time.perf_counter()
+        try:
+            return super().get(block, timeout)
+        except sqla_queue.Empty:
+            metrics.increment(POOL_TIMEOUTS_METRIC, pool=self.label)
+            raise
+        finally:
+            self.waiters -= 1
+            metrics.observe(POOL_WAIT_METRIC, time.perf_counter() - started, pool=self.label)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Async queue pool that tracks waiting checkouts."""
+
+    _queue_class = _InstrumentedQueue
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Metrics label; survives pool recreation via logging_name
+        self._pool.label = self.logging_name or "primary"
+
+    def waiters(self) -> int:
+        """Number of checkouts currently waiting for a connection."""
+        return self._pool.waiters
+
+    def stats(self) -> Dict[str, int]:
+        """Current pool occupancy."""
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "waiters": self.waiters(),
+        }
+
+
+def install_idle_pre_ping(engine: Engine, idle_seconds: float) -> None:
+    """Ping connections on checkout only if they sat idle in the pool.
+
+    Connections returned recently are handed out without a round trip;
+    a failed ping raises ``DisconnectionError`` so the pool replaces the
+    connection and retries the checkout.
+    """
+
+    @event.listens_for(engine, "checkin")
+    def _record_checkin(dbapi_connection, connection_record) -> None:
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy) -> None:
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+
+        try:
+            alive = engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            logger.warning("Idle connection failed pre-ping", error=str(e))
+            alive = False
+
+        if not alive:
+            metrics.increment("db_pool_stale_connections_total")
+            raise exc.DisconnectionError("Idle connection failed pre-ping")
+
+
+def pool_status(engine: Engine) -> Dict[str, Any]:
+    """Pool occupancy plus checkout wait statistics."""
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedAsyncPool):
+        return {"status": pool.status()}
+
+    label = pool.logging_name or "primary"
+    status: Dict[str, Any] = pool.stats()
+    status["timeouts"] = metrics.counter_value(POOL_TIMEOUTS_METRIC, pool=label)
+    status["wait"] = metrics.timing_summary(POOL_WAIT_METRIC, pool=label)
+    return status
@@ -0,0 +1,191 @@
+"""Read-replica routing for database sessions."""
+
+import itertools
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import Delete, Insert, Update, visitors
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.selectable import CTE
+
+from .logging import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+# Session.info keys
+REPLICA_BIND_KEY = "replica_bind"
+PINNED_KEY = "pinned_to_primary"
+
+# Seconds since the last replayed transaction; 0 when fully caught up or
+# when the server is not a standby at all
+_LAG_QUERY = text("""
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+""")
+
+
+@dataclass
+class RequestRouting:
+    """Routing state shared by every session of one request."""
+    wrote: bool = False
+
+
+# Set by the request middleware; a write in any session of the request
+# sends later reads in the same request to the primary
+_request_routing: ContextVar[Optional[RequestRouting]] = ContextVar("request_routing", default=None)
+
+
+def start_request_routing() -> RequestRouting:
+    """Start tracking writes for the current request."""
+    routing = RequestRouting()
+    _request_routing.set(routing)
+    return routing
+
+
+def mark_request_wrote() -> None:
+    """Record that the current request changed data on the primary."""
+    routing = _request_routing.get()
+    if routing is not None:
+        routing.wrote = True
+
+
+def request_wrote() -> bool:
+    """Check if the current request already wrote to the primary."""
+    routing = _request_routing.get()
+    return routing is not None and routing.wrote
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica when one was assigned.
+
+    A replica is only used if the session was opened for reading
+    (``info[REPLICA_BIND_KEY]`` is set). Flushes and DML always go to the
+    primary, and once the session or its request has written, every later
+    statement does too so the caller reads its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Any:
+        replica = self.info.get(REPLICA_BIND_KEY)
+        if replica is not None:
+            if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+                self.info[PINNED_KEY] = True
+            elif not self.info.get(PINNED_KEY) and not request_wrote():
+                return replica.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+def _is_write(statement: Any) -> bool:
+    """Check for DML, including data-modifying CTEs inside a SELECT."""
+    if isinstance(statement, UpdateBase):
+        return True
+    return any(
+        isinstance(element, CTE) and isinstance(element.element, UpdateBase)
+        for element in visitors.iterate(statement)
+    )
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_statement_writes(orm_execute_state: ORMExecuteState) -> None:
+    session = orm_execute_state.session
+    routing = _request_routing.get()
+    tracking = routing is not None and not routing.wrote
+    if not tracking and REPLICA_BIND_KEY not in session.info:
+        return
+
+    if not orm_execute_state.is_select or _is_write(orm_execute_state.statement):
+        mark_request_wrote()
+        session.info[PINNED_KEY] = True
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush_writes(session: Session, flush_context: Any) -> None:
+    mark_request_wrote()
+    session.info[PINNED_KEY] = True
+
+
+@dataclass
+class _ReplicaState:
+    engine: AsyncEngine
+    lag_seconds: Optional[float] = None
+    healthy: bool = False
+    checked_at: float = field(default=-1.0)
+
+
+class ReplicaRouter:
+    """Pick a replica whose replication lag is within bounds.
+
+    Lag is measured at most once per ``check_interval`` per replica; a
+    replica that fails the check or lags too far is skipped until the next
+    check, and reads fall back to the primary when none qualifies.
+    """
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        max_lag_seconds: float,
+        check_interval: float,
+    ) -> None:
+        self._replicas = [_ReplicaState(engine) for engine in engines]
+        self._order = itertools.cycle(range(len(self._replicas))) if self._replicas else None
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._replicas)
+
+    async def choose(self) -> Optional[AsyncEngine]:
+        """Get a replica engine for the next read, or None for the primary."""
+        if request_wrote():
+            metrics.increment("db_read_sessions_total", target="primary", reason="pinned")
+            return None
+
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[next(self._order)]
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                await self._check(replica)
+            if replica.healthy:
+                metrics.increment("db_read_sessions_total", target="replica")
+                return replica.engine
+
+        if self._replicas:
+            metrics.increment("db_read_sessions_total", target="primary", reason="lag")
+        return None
+
+    async def _check(self, replica: _ReplicaState) -> None:
+        replica.checked_at = time.monotonic()
+        host = replica.engine.url.host or "local"
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float((await conn.execute(_LAG_QUERY)).scalar() or 0)
+        except Exception as e:
+            logger.warning("Replica lag check failed", replica=host, error=str(e))
+            replica.lag_seconds = None
+            replica.healthy = False
+            return
+
+        replica.lag_seconds = lag
+        replica.healthy = lag <= self.max_lag_seconds
+        metrics.set_gauge("db_replica_lag_seconds", lag, replica=host)
+        if not replica.healthy:
+            logger.warning("Replica lagging, reading from primary", replica=host, lag_seconds=lag)
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Last known state of each replica."""
+        return [
+            {
+                "replica": replica.engine.url.host or "local",
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+            }
+            for replica in self._replicas
+        ]
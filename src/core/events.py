@@ -0,0 +1,88 @@
+"""Domain events published after the database transaction commits.
+
+Services call ``record_event`` with their session. Events are held on the
+session and handed to subscribers only once the outer transaction commits,
+so work that is rolled back is never reported.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+PENDING_EVENTS_KEY = "pending_events"
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Something that happened, e.g. a food post or a credit transfer."""
+
+    name: str
+    building_id: Optional[str] = None
+    amount: int = 0
+    # The record the event is about, e.g. the user whose profile changed
+    subject_id: Optional[str] = None
+    occurred_at: datetime = field(default_factory=datetime.utcnow)
+
+
+EventHandler = Callable[[DomainEvent], None]
+
+_subscribers: List[EventHandler] = []
+
+
+def subscribe(handler: EventHandler) -> None:
+    """Register a handler for committed events. Handlers must not block."""
+    if handler not in _subscribers:
+        _subscribers.append(handler)
+
+
+def unsubscribe(handler: EventHandler) -> None:
+    """Remove a previously registered handler."""
+    if handler in _subscribers:
+        _subscribers.remove(handler)
+
+
+def record_event(
+    session: Any,
+    name: str,
+    building_id: Optional[str] = None,
+    amount: int = 0,
+    subject_id: Optional[str] = None,
+) -> None:
+    """Queue an event to be published when ``session`` commits."""
+    info = getattr(session, "info", None)
+    if not isinstance(info, dict):
+        return
+    info.setdefault(PENDING_EVENTS_KEY, []).append(
+        DomainEvent(name=name, building_id=building_id, amount=amount, subject_id=subject_id)
+    )
+
+
+def publish(events: Iterable[DomainEvent]) -> None:
+    """Hand events to every subscriber; handler errors are logged."""
+    for domain_event in events:
+        for handler in _subscribers:
+            try:
+                handler(domain_event)
+            except Exception as e:
+                logger.error("Event handler failed", event_name=domain_event.name, error=str(e))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    events = session.info.pop(PENDING_EVENTS_KEY, None)
+    if events:
+        publish(events)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session: Session, previous_transaction: Any) -> None:
+    # Savepoint rollbacks keep the events of the enclosing transaction
+    if getattr(previous_transaction, "parent", None) is None:
+        session.info.pop(PENDING_EVENTS_KEY, None)
@@ -135,7 +135,7 @@ def log_exchange_event(
     logger = get_logger("exchange")
     logger.info(
         "Exchange event",
-        event=event,
+        exchange_event=event,
         exchange_id=exchange_id,
         sharer_id=sharer_id,
         recipient_id=recipient_id,
@@ -0,0 +1,168 @@
+"""Request-scoped lookup cache for database sessions."""
+
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+SESSION_INFO_KEY = "lookup_cache"
+
+LookupKey = Tuple[type, str, Any]
+
+
+@dataclass
+class LookupStats:
+    """Lookup counts for one request."""
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+
+    @property
+    def saved_queries(self) -> int:
+        """Queries answered without touching the database."""
+        return self.hits + self.coalesced
+
+
+# Set by the request middleware so the log line can report the savings
+_request_stats: ContextVar[Optional[LookupStats]] = ContextVar("lookup_stats", default=None)
+
+
+def start_request_stats() -> LookupStats:
+    """Start collecting lookup stats for the current request."""
+    stats = LookupStats()
+    _request_stats.set(stats)
+    return stats
+
+
+class LookupCache:
+    """Deduplicate single-row lookups within one session.
+
+    Entries are keyed by (model, attribute, value) and also by primary key,
+    so a user fetched by Telegram ID is served to a later lookup by ID.
+    Each entry remembers how much of the object graph was loaded (``level``);
+    a lookup asking for more reloads and upgrades the entry. Concurrent
+    identical lookups share one query. Misses are not cached.
+    """
+
+    def __init__(self, stats: Optional[LookupStats] = None) -> None:
+        self.stats = stats or _request_stats.get() or LookupStats()
+        self._entries: Dict[LookupKey, Tuple[Any, int]] = {}
+        self._pending: Dict[LookupKey, Tuple["asyncio.Future[Any]", int]] = {}
+
+    async def get_or_load(
+        self,
+        model: type,
+        attribute: str,
+        value: Any,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        level: int = 0,
+    ) -> Optional[T]:
+        """Return the cached object for ``model.attribute == value`` or load it."""
+        key = (model, attribute, value)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] >= level:
+            self.stats.hits += 1
+            return entry[0]
+
+        pending = self._pending.get(key)
+        if pending is not None and pending[1] >= level:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending[0])
+
+        future: "asyncio.Future[Any]" = asyncio.get_running_loop().create_future()
+        self._pending[key] = (future, level)
+        self.stats.misses += 1
+        try:
+            obj = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved; waiters (if any) still receive it
+            future.exception()
+            raise
+        finally:
+            if self._pending.get(key, (None,))[0] is future:
+                del self._pending[key]
+
+        future.set_result(obj)
+        if obj is not None:
+            self.store(obj, level, key)
+        return obj
+
+    def store(self, obj: Any, level: int = 0, *keys: LookupKey) -> None:
+        """Cache ``obj`` under its primary key and any extra keys."""
+        primary_key = inspect(obj).mapper.primary_key_from_instance(obj)
+        if len(primary_key) == 1 and primary_key[0] is not None:
+            keys = keys + ((type(obj), "id", primary_key[0]),)
+
+        for key in keys:
+            current = self._entries.get(key)
+            if current is None or current[1] <= level:
+                self._entries[key] = (obj, level)
+
+    def evict(self, obj: Any) -> None:
+        """Drop every entry holding ``obj``."""
+        for key in [k for k, (cached, _) in self._entries.items() if cached is obj]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def attach_lookup_cache(session: AsyncSession) -> LookupCache:
+    """Attach a lookup cache to ``session``.
+
+    The cache is cleared on rollback and deleted objects are evicted on
+    flush, so it never serves rows the session no longer considers valid.
+    """
+    cache = LookupCache()
+    session.info[SESSION_INFO_KEY] = cache
+
+    sync_session = session.sync_session
+
+    @event.listens_for(sync_session, "after_soft_rollback")
+    def _clear_on_rollback(session, previous_transaction) -> None:
+        cache.clear()
+
+    @event.listens_for(sync_session, "after_flush")
+    def _evict_deleted(session, flush_context) -> None:
+        for obj in session.deleted:
+            cache.evict(obj)
+
+    return cache
+
+
+def get_lookup_cache(session: Any) -> Optional[LookupCache]:
+    """Get the lookup cache attached to ``session``, if any."""
+    info = getattr(session, "info", None)
+    if not isinstance(info, dict):
+        return None
+    cache = info.get(SESSION_INFO_KEY)
+    return cache if isinstance(cache, LookupCache) else None
+
+
+async def cached_lookup(
+    session: Any,
+    model: type,
+    attribute: str,
+    value: Any,
+    loader: Callable[[], Awaitable[Optional[T]]],
+    level: int = 0,
+) -> Optional[T]:
+    """Run ``loader`` through the session's lookup cache when it has one."""
+    cache = get_lookup_cache(session)
+    if cache is None:
+        return await loader()
+    return await cache.get_or_load(model, attribute, value, loader, level)
@@ -0,0 +1,144 @@
+"""In-process metrics (counters, gauges and timings)."""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+# Number of recent samples kept per timing for percentiles
+TIMING_SAMPLE_SIZE = 1024
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_key(key: MetricKey) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in labels)
+    return f"{name}{{{label_str}}}"
+
+
+class _Timing:
+    """Running summary of observed durations."""
+
+    __slots__ = ("count", "total", "max", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: Deque[float] = deque(maxlen=TIMING_SAMPLE_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(percentile(0.50) * 1000, 3),
+            "p95_ms": round(percentile(0.95) * 1000, 3),
+            "p99_ms": round(percentile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class MetricsRegistry:
+    """Process-local metrics registry.
+
+    Values live in memory and are exposed through the health endpoints;
+    each process (API, bot, workers) reports its own numbers.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[MetricKey, float] = {}
+        self._gauges: Dict[MetricKey, float] = {}
+        self._timings: Dict[MetricKey, _Timing] = {}
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Increment a counter."""
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to the current value."""
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, seconds: float, **labels: Any) -> None:
+        """Record a duration in seconds."""
+        key = _key(name, labels)
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = self._timings[key] = _Timing()
+            timing.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """Time the enclosed block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter_value(self, name: str, **labels: Any) -> float:
+        """Get the current value of a counter."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def gauge_value(self, name: str, **labels: Any) -> Optional[float]:
+        """Get the current value of a gauge."""
+        with self._lock:
+            return self._gauges.get(_key(name, labels))
+
+    def timing_summary(self, name: str, **labels: Any) -> Optional[Dict[str, float]]:
+        """Get the summary of a timing, if anything was observed."""
+        with self._lock:
+            timing = self._timings.get(_key(name, labels))
+            return timing.summary() if timing is not None else None
+
+    def hit_rate(self, name: str, **labels: Any) -> Optional[float]:
+        """Compute hits / (hits + misses) for a counter with a ``result`` label."""
+        hits = self.counter_value(name, result="hit", **labels)
+        misses = self.counter_value(name, result="miss", **labels)
+        total = hits + misses
+        return round(hits / total, 4) if total else None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get all current metric values."""
+        with self._lock:
+            return {
+                "counters": {_format_key(k): v for k, v in sorted(self._counters.items())},
+                "gauges": {_format_key(k): v for k, v in sorted(self._gauges.items())},
+                "timings": {_format_key(k): t.summary() for k, t in sorted(self._timings.items())},
+            }
+
+    def reset(self) -> None:
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,194 @@
+"""Monthly range partitions for the history tables.
+
+``exchanges`` and ``credit_transactions`` are partitioned by month on
+``created_at`` (migration 0003). ``PartitionManager`` creates partitions
+ahead of time and moves partitions past the retention window out of the
+live table into the ``archive`` schema, where they can be dumped or dropped.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+PARTITIONED_TABLES = ("exchanges", "credit_transactions")
+ARCHIVE_SCHEMA = "archive"
+
+# Catalog locks queue behind long queries; give up rather than block traffic
+LOCK_TIMEOUT = "5s"
+
+_PARTITION_NAME = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def month_start(moment: datetime) -> date:
+    """First day of the month containing ``moment``."""
+    return date(moment.year, moment.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    """Shift a month start by ``count`` months."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding ``month``, e.g. ``exchanges_p2026_10``."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def is_partition_name(name: str) -> bool:
+    """Check whether a table name is one of the monthly partitions."""
+    match = _PARTITION_NAME.match(name)
+    return bool(match) and match.group("table") in PARTITIONED_TABLES
+
+
+def include_name(name: Optional[str], type_: str, parent_names: Any) -> bool:
+    """Alembic hook leaving partitions out of autogenerate comparisons."""
+    return not (type_ == "table" and name and is_partition_name(name))
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One monthly partition of a history table."""
+
+    table: str
+    name: str
+    month: date
+
+    @property
+    def upper(self) -> date:
+        return add_months(self.month, 1)
+
+
+class PartitionManager:
+    """Create upcoming partitions and archive expired ones."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def partitioned_tables(self) -> List[str]:
+        """History tables that are partitioned in this database.
+
+        Empty on SQLite and before migration 0003 has run.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return []
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                "WHERE n.nspname = current_schema()"
+            )
+        )
+        partitioned = set(result.scalars())
+        return [table for table in PARTITIONED_TABLES if table in partitioned]
+
+    async def list_partitions(self, table: str) -> List[Partition]:
+        """Attached monthly partitions of ``table``, oldest first."""
+        result = await self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_namespace n ON n.oid = parent.relnamespace "
+                "WHERE parent.relname = :table AND n.nspname = current_schema()"
+            ),
+            {"table": table},
+        )
+        partitions = []
+        for name in result.scalars():
+            match = _PARTITION_NAME.match(name)
+            if match and match.group("table") == table:
+                month = date(int(match.group("year")), int(match.group("month")), 1)
+                partitions.append(Partition(table=table, name=name, month=month))
+        return sorted(partitions, key=lambda partition: partition.month)
+
+    async def ensure_partitions(
+        self,
+        months_ahead: int,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """Create any missing partitions from this month to ``months_ahead``.
+
+        Inserts fail when no partition covers their ``created_at``, so this
+        runs at startup and periodically after that.
+        """
+        tables = await self.partitioned_tables()
+        if not tables:
+            return []
+
+        current = month_start(now or datetime.utcnow())
+        created = []
+        await self.db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        for table in tables:
+            existing = {partition.month for partition in await self.list_partitions(table)}
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                if month in existing:
+                    continue
+                name = partition_name(table, month)
+                await self.db.execute(text(
+                    f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+                ))
+                created.append(name)
+        await self.db.commit()
+
+        if created:
+            logger.info("Partitions created", partitions=created)
+        return created
+
+    async def archive_partitions(
+        self,
+        retention_months: int,
+        now: Optional[datetime] = None,
+    ) -> List[str]:
+        """Detach partitions older than ``retention_months`` into the archive schema.
+
+        Archived rows no longer appear in queries on the live tables. A
+        retention of 0 keeps everything.
+        """
+        tables = await self.partitioned_tables()
+        if retention_months <= 0 or not tables:
+            return []
+
+        cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+        archived = []
+        await self.db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+        await self.db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"'))
+        for table in tables:
+            for partition in await self.list_partitions(table):
+                if partition.upper > cutoff:
+                    break
+                await self.db.execute(text(
+                    f'ALTER TABLE "{table}" DETACH PARTITION "{partition.name}"'
+                ))
+                # Archived rows must not block deleting users or food posts
+                foreign_keys = await self.db.execute(
+                    text(
+                        "SELECT conname FROM pg_constraint "
+                        "WHERE conrelid = CAST(:name AS regclass) AND contype = 'f'"
+                    ),
+                    {"name": partition.name},
+                )
+                for constraint in foreign_keys.scalars().all():
+                    await self.db.execute(text(
+                        f'ALTER TABLE "{partition.name}" DROP CONSTRAINT "{constraint}"'
+                    ))
+                await self.db.execute(text(
+                    f'ALTER TABLE "{partition.name}" SET SCHEMA "{ARCHIVE_SCHEMA}"'
+                ))
+                archived.append(f"{ARCHIVE_SCHEMA}.{partition.name}")
+        await self.db.commit()
+
+        if archived:
+            logger.info("Partitions archived", partitions=archived, cutoff=cutoff.isoformat())
+        return archived
@@ -6,8 +6,10 @@ import redis.asyncio as redis
 from redis.asyncio import Redis
 
 from .config import get_settings
+from .logging import get_logger
 
 settings = get_settings()
+logger = get_logger(__name__)
 
 # Redis connection pool
 redis_pool: Optional[Redis] = None
@@ -26,6 +28,17 @@ async def init_redis() -> Redis:
     return redis_pool
 
 
+async def warm_up_redis() -> bool:
+    """Open the first Redis connection ahead of requests."""
+    try:
+        client = await init_redis()
+        await client.ping()
+        return True
+    except Exception as e:
+        logger.warning("Redis warmup failed", error=str(e))
+        return False
+
+
 async def get_redis() -> AsyncGenerator[Redis, None]:
     """Dependency to get Redis connection."""
     redis_client = await init_redis()
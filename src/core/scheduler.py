@@ -0,0 +1,108 @@
+"""Periodic background jobs.
+
+Every API worker runs the same scheduler; a Redis lock per job and
+interval makes sure only one of them does the work each time.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from redis.asyncio import Redis
+
+from .logging import get_logger
+from .metrics import metrics
+
+logger = get_logger(__name__)
+
+JOB_LOCK_PREFIX = "scheduler:lock:"
+
+
+@dataclass
+class ScheduledJob:
+    """A coroutine function run every ``interval`` seconds.
+
+    Exclusive jobs run in one worker per interval; the others run in every
+    worker (e.g. flushing per-process buffers).
+    """
+
+    name: str
+    interval: float
+    func: Callable[[], Awaitable[object]]
+    run_immediately: bool = True
+    exclusive: bool = True
+
+
+class Scheduler:
+    """Run registered jobs on fixed intervals until stopped."""
+
+    def __init__(self, redis_client: Optional[Redis] = None) -> None:
+        self.redis = redis_client
+        self.jobs: Dict[str, ScheduledJob] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable[object]],
+        run_immediately: bool = True,
+        exclusive: bool = True,
+    ) -> None:
+        """Register a job. Must be called before start()."""
+        self.jobs[name] = ScheduledJob(name, interval, func, run_immediately, exclusive)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start one task per registered job."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self.jobs.values()]
+        logger.info("Scheduler started", jobs=list(self.jobs))
+
+    async def stop(self) -> None:
+        """Cancel all job tasks and wait for them to finish."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self, job: ScheduledJob) -> bool:
+        """Run ``job`` if this worker wins the lock. Returns whether it ran."""
+        if not await self._acquire(job):
+            return False
+
+        with metrics.timer("scheduler_job_seconds", job=job.name):
+            try:
+                await job.func()
+            except Exception as e:
+                metrics.increment("scheduler_job_failures_total", job=job.name)
+                logger.error("Scheduled job failed", job=job.name, error=str(e), exc_info=True)
+        return True
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        if not job.run_immediately:
+            await asyncio.sleep(job.interval)
+        while True:
+            await self.run_once(job)
+            await asyncio.sleep(job.interval)
+
+    async def _acquire(self, job: ScheduledJob) -> bool:
+        """Take the job's lock for one interval; without Redis, always run."""
+        if self.redis is None or not job.exclusive:
+            return True
+        try:
+            # Held for the whole interval so other workers skip this round
+            acquired = await self.redis.set(
+                f"{JOB_LOCK_PREFIX}{job.name}",
+                "1",
+                nx=True,
+                px=max(int(job.interval * 1000), 1),
+            )
+            return bool(acquired)
+        except Exception as e:
+            logger.warning("Scheduler lock unavailable, running job locally", job=job.name, error=str(e))
+            return True
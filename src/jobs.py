@@ -0,0 +1,108 @@
+"""Background jobs run by the API's scheduler."""
+
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from .core.config import get_settings
+from .core.database import get_db
+from .core.partitions import PartitionManager
+from .core.redis import init_redis
+from .core.scheduler import Scheduler
+from .services.activity_tracker import ActivityTracker
+from .services.admin_service import AdminService
+from .services.analytics_service import analytics_recorder
+from .services.subscriber_index import SubscriberIndex, subscriber_index_updater
+
+settings = get_settings()
+
+
+async def refresh_platform_stats() -> None:
+    """Refresh the materialized platform statistics."""
+    async with get_db() as db:
+        await AdminService(db).refresh_platform_stats()
+
+
+async def refresh_exchange_alerts() -> None:
+    """Detect overdue and long-pending exchanges for the admin reports."""
+    async with get_db() as db:
+        await AdminService(db).refresh_exchange_alerts()
+
+
+async def flush_analytics() -> None:
+    """Write this worker's buffered analytics counters to Redis."""
+    await analytics_recorder.flush(await init_redis())
+
+
+async def flush_user_activity() -> None:
+    """Write users' last activity recorded in Valkey to the users table."""
+    async with get_db() as db:
+        await ActivityTracker(await init_redis()).flush(db)
+
+
+async def flush_subscriber_index() -> None:
+    """Write subscriber changes committed by this worker to the index."""
+    if not subscriber_index_updater.pending:
+        return
+    async with get_db() as db:
+        await subscriber_index_updater.flush(db, await init_redis())
+
+
+async def rebuild_subscriber_index() -> None:
+    """Recreate the food post subscriber index from the users table."""
+    async with get_db() as db:
+        await SubscriberIndex(await init_redis()).rebuild(db)
+
+
+async def maintain_partitions() -> None:
+    """Create upcoming history partitions and archive expired ones."""
+    async with get_db() as db:
+        manager = PartitionManager(db)
+        await manager.ensure_partitions(settings.partition_months_ahead)
+        await manager.archive_partitions(settings.partition_retention_months)
+
+
+def build_scheduler(redis_client: Optional[Redis] = None) -> Scheduler:
+    """Create the scheduler with every periodic job registered."""
+    scheduler = Scheduler(redis_client)
+    scheduler.add_job(
+        "refresh_platform_stats",
+        settings.platform_stats_refresh_seconds,
+        refresh_platform_stats,
+    )
+    scheduler.add_job(
+        "refresh_exchange_alerts",
+        settings.exchange_alert_detect_seconds,
+        refresh_exchange_alerts,
+    )
+    scheduler.add_job(
+        "maintain_partitions",
+        settings.partition_maintenance_seconds,
+        maintain_partitions,
+    )
+    scheduler.add_job(
+        "flush_analytics",
+        settings.analytics_flush_seconds,
+        flush_analytics,
+        run_immediately=False,
+        exclusive=False,
+    )
+    scheduler.add_job(
+        "flush_user_activity",
+        settings.activity_flush_seconds,
+        flush_user_activity,
+        run_immediately=False,
+    )
+    scheduler.add_job(
+        "rebuild_subscriber_index",
+        settings.subscriber_index_rebuild_seconds,
+        rebuild_subscriber_index,
+    )
+    scheduler.add_job(
+        "flush_subscriber_index",
+        settings.subscriber_index_flush_seconds,
+        flush_subscriber_index,
+        run_immediately=False,
+        exclusive=False,
+    )
+    return scheduler
@@ -1,10 +1,12 @@
 """Database models."""
 
 from ..core.database import Base
+from .alert import ExchangeAlert
 from .building import Building
-from .credit import Credit, CreditTransaction
+from .credit import Credit, CreditOperation, CreditTransaction
 from .exchange import Exchange
 from .food import Food
+from .idempotency import IdempotencyKey
 from .user import User
 
 __all__ = [
@@ -13,6 +15,9 @@ __all__ = [
     "Building", 
     "Food",
     "Exchange",
+    "ExchangeAlert",
     "Credit",
     "CreditTransaction",
+    "CreditOperation",
+    "IdempotencyKey",
 ]
\ No newline at end of file
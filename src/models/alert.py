@@ -0,0 +1,54 @@
+"""Exchange alert model."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, SmallInteger, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class ExchangeAlert(Base):
+    """An exchange that currently needs admin attention.
+
+    Maintained by ``AdminService.refresh_exchange_alerts``; the admin
+    reports read this table instead of scanning exchanges. ``exchanges`` is
+    partitioned, so the exchange is identified by ``(exchange_id,
+    exchange_created_at)`` without a foreign key.
+    """
+
+    __tablename__ = "exchange_alerts"
+    __table_args__ = (
+        # Most urgent first: the order the admin reports read in
+        Index(
+            "ix_exchange_alerts_severity_rank_created_at",
+            "severity_rank",
+            "exchange_created_at",
+            "exchange_id",
+        ),
+    )
+
+    exchange_id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True)
+    exchange_created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    # "overdue" or "long_pending"; severity "high" (rank 0) or "medium" (rank 1)
+    alert_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    severity: Mapped[str] = mapped_column(String(10), nullable=False)
+    severity_rank: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+    # When the exchange crossed its deadline
+    due_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    scheduled_pickup_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    # Timestamps
+    detected_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<ExchangeAlert(exchange_id='{self.exchange_id}', severity='{self.severity}')>"
@@ -5,7 +5,7 @@ from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -25,6 +25,12 @@ class TransactionType(str, Enum):
     PENALTY_VIOLATION = "penalty_violation" # Penalty for rule violation
 
 
+class CreditOperationStatus(str, Enum):
+    """Bulk credit operation status enumeration."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
 class Credit(Base):
     """User credit account model."""
     
@@ -69,7 +75,6 @@ class Credit(Base):
     def __repr__(self) -> str:
         return f"<Credit(user_id='{self.user_id}', balance={self.balance})>"
     
-    @property
     def can_spend(self, amount: int) -> bool:
         """Check if user can spend specified amount."""
         return self.balance >= amount
@@ -94,9 +99,17 @@ class Credit(Base):
 
 
 class CreditTransaction(Base):
-    """Credit transaction history model."""
+    """Credit transaction history model.
+    
+    The table is range partitioned by month on ``created_at`` (migration
+    0003), so ``created_at`` is part of the primary key and queries should
+    bound it to let the planner prune partitions.
+    """
     
     __tablename__ = "credit_transactions"
+    __table_args__ = (
+        Index("ix_credit_transactions_user_id_created_at", "user_id", "created_at"),
+    )
     
     # Primary key
     id: Mapped[str] = mapped_column(
@@ -130,28 +143,37 @@ class CreditTransaction(Base):
         UUID(as_uuid=False),
         ForeignKey("foods.id"),
     )
-    exchange_id: Mapped[Optional[str]] = mapped_column(
-        UUID(as_uuid=False),
-        ForeignKey("exchanges.id"),
-    )
+    # No foreign key: exchanges is partitioned and keyed on (id, created_at)
+    exchange_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
     
     # Administrative
     created_by_id: Mapped[Optional[str]] = mapped_column(
         UUID(as_uuid=False),
         ForeignKey("users.id"),
     )
+    operation_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("credit_operations.id"),
+    )
     
-    # Timestamps
+    # Timestamps (partition key)
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         server_default=func.now(),
         nullable=False
     )
     
+    # Rows are identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
+    
     # Relationships
     user = relationship("User", foreign_keys=[user_id], back_populates="credit_transactions")
     food = relationship("Food", foreign_keys=[food_id])
-    exchange = relationship("Exchange", foreign_keys=[exchange_id])
+    exchange = relationship(
+        "Exchange",
+        primaryjoin="foreign(CreditTransaction.exchange_id) == Exchange.id",
+    )
     created_by = relationship("User", foreign_keys=[created_by_id])
     
     def __repr__(self) -> str:
@@ -193,4 +215,75 @@ class CreditTransaction(Base):
             food_id=food_id,
             exchange_id=exchange_id,
             created_by_id=created_by_id,
-        )
\ No newline at end of file
+        )
+
+
+class CreditOperation(Base):
+    """Bulk credit operation (admin grants, initial balances).
+    
+    The operation key makes a bulk run idempotent: a completed key is never
+    applied twice, and an interrupted run resumes after ``last_user_id``.
+    """
+    
+    __tablename__ = "credit_operations"
+    
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+    )
+    
+    # Idempotency
+    operation_key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    target_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    
+    # Operation details
+    transaction_type: Mapped[TransactionType] = mapped_column(
+        String(50),
+        nullable=False
+    )
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    building_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("buildings.id"),
+    )
+    description: Mapped[Optional[str]] = mapped_column(String(255))
+    
+    # Progress
+    status: Mapped[CreditOperationStatus] = mapped_column(
+        String(20),
+        default=CreditOperationStatus.RUNNING,
+        nullable=False
+    )
+    last_user_id: Mapped[Optional[str]] = mapped_column(UUID(as_uuid=False))
+    processed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    skipped_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Administrative
+    created_by_id: Mapped[Optional[str]] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id"),
+    )
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    
+    def __repr__(self) -> str:
+        return f"<CreditOperation(key='{self.operation_key}', status='{self.status}')>"
+    
+    @property
+    def is_completed(self) -> bool:
+        """Check if operation has been fully applied."""
+        return self.status == CreditOperationStatus.COMPLETED
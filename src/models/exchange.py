@@ -1,16 +1,18 @@
 """Exchange model and related schemas."""
 
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Dict, FrozenSet, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from ..core.database import Base
+from .food import FoodStatus
 
 
 class ExchangeStatus(str, Enum):
@@ -24,10 +26,89 @@ class ExchangeStatus(str, Enum):
     NO_SHOW = "no_show"       # Recipient didn't show up
 
 
+class ExchangeAction(str, Enum):
+    """Exchange state transition enumeration."""
+    CONFIRM = "confirm"
+    COMPLETE = "complete"
+    CANCEL = "cancel"
+    NO_SHOW = "no_show"
+    EXPIRE = "expire"
+
+
+@dataclass(frozen=True)
+class ExchangeTransition:
+    """Declarative description of an exchange state transition."""
+    action: ExchangeAction
+    from_statuses: FrozenSet[ExchangeStatus]
+    # None when the target depends on the row (confirm waits for both parties)
+    to_status: Optional[ExchangeStatus]
+    participant_only: bool = True
+    requires_confirmation: bool = False
+    # Food update applied with the transition; an empty set matches any status
+    food_to_status: Optional[FoodStatus] = None
+    food_from_statuses: FrozenSet[FoodStatus] = frozenset()
+    release_food_claim: bool = False
+
+
+ACTIVE_EXCHANGE_STATUSES = frozenset({
+    ExchangeStatus.PENDING,
+    ExchangeStatus.CONFIRMED,
+    ExchangeStatus.IN_PROGRESS,
+})
+
+EXCHANGE_TRANSITIONS: Dict[ExchangeAction, ExchangeTransition] = {
+    ExchangeAction.CONFIRM: ExchangeTransition(
+        action=ExchangeAction.CONFIRM,
+        from_statuses=frozenset({ExchangeStatus.PENDING, ExchangeStatus.CONFIRMED}),
+        to_status=None,
+    ),
+    ExchangeAction.COMPLETE: ExchangeTransition(
+        action=ExchangeAction.COMPLETE,
+        from_statuses=frozenset({ExchangeStatus.CONFIRMED, ExchangeStatus.IN_PROGRESS}),
+        to_status=ExchangeStatus.COMPLETED,
+        requires_confirmation=True,
+        food_to_status=FoodStatus.COMPLETED,
+    ),
+    ExchangeAction.CANCEL: ExchangeTransition(
+        action=ExchangeAction.CANCEL,
+        from_statuses=ACTIVE_EXCHANGE_STATUSES,
+        to_status=ExchangeStatus.CANCELLED,
+        food_to_status=FoodStatus.AVAILABLE,
+        food_from_statuses=frozenset({FoodStatus.CLAIMED}),
+        release_food_claim=True,
+    ),
+    ExchangeAction.NO_SHOW: ExchangeTransition(
+        action=ExchangeAction.NO_SHOW,
+        from_statuses=ACTIVE_EXCHANGE_STATUSES,
+        to_status=ExchangeStatus.NO_SHOW,
+    ),
+    ExchangeAction.EXPIRE: ExchangeTransition(
+        action=ExchangeAction.EXPIRE,
+        from_statuses=frozenset({ExchangeStatus.PENDING}),
+        to_status=ExchangeStatus.CANCELLED,
+        participant_only=False,
+        food_to_status=FoodStatus.AVAILABLE,
+        food_from_statuses=frozenset({FoodStatus.CLAIMED}),
+        release_food_claim=True,
+    ),
+}
+
+
 class Exchange(Base):
-    """Exchange model representing a food sharing transaction."""
+    """Exchange model representing a food sharing transaction.
+    
+    The table is range partitioned by month on ``created_at`` (migration
+    0003), so ``created_at`` is part of the primary key and queries should
+    bound it to let the planner prune partitions.
+    """
     
     __tablename__ = "exchanges"
+    __table_args__ = (
+        Index("ix_exchanges_sharer_id_created_at", "sharer_id", "created_at"),
+        Index("ix_exchanges_recipient_id_created_at", "recipient_id", "created_at"),
+        Index("ix_exchanges_status_created_at", "status", "created_at"),
+        Index("ix_exchanges_food_id", "food_id"),
+    )
     
     # Primary key
     id: Mapped[str] = mapped_column(
@@ -94,9 +175,10 @@ class Exchange(Base):
     )
     cancellation_reason: Mapped[Optional[str]] = mapped_column(Text)
     
-    # Timestamps
+    # Timestamps (created_at is the partition key)
     created_at: Mapped[datetime] = mapped_column(
         DateTime,
+        primary_key=True,
         server_default=func.now(),
         nullable=False
     )
@@ -107,6 +189,9 @@ class Exchange(Base):
         nullable=False
     )
     
+    # Rows are identified by id alone
+    __mapper_args__ = {"primary_key": [id]}
+    
     # Relationships
     sharer = relationship("User", foreign_keys=[sharer_id], back_populates="given_exchanges")
     recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_exchanges")
@@ -124,11 +209,7 @@ class Exchange(Base):
     @property
     def is_active(self) -> bool:
         """Check if exchange is in an active state."""
-        return self.status in [
-            ExchangeStatus.PENDING,
-            ExchangeStatus.CONFIRMED,
-            ExchangeStatus.IN_PROGRESS,
-        ]
+        return self.status in ACTIVE_EXCHANGE_STATUSES
     
     @property
     def is_completed(self) -> bool:
@@ -140,35 +221,51 @@ class Exchange(Base):
         """Check if exchange is cancelled."""
         return self.status in [ExchangeStatus.CANCELLED, ExchangeStatus.FAILED, ExchangeStatus.NO_SHOW]
     
-    @property
+    def is_participant(self, user_id: str) -> bool:
+        """Check if user is the sharer or recipient."""
+        return user_id in (self.sharer_id, self.recipient_id)
+    
+    def allows(self, action: ExchangeAction, user_id: Optional[str] = None) -> bool:
+        """Check if a transition is allowed from the current state."""
+        transition = EXCHANGE_TRANSITIONS[action]
+        if self.status not in transition.from_statuses:
+            return False
+        if transition.participant_only and not self.is_participant(user_id):
+            return False
+        if transition.requires_confirmation and not self.is_confirmed:
+            return False
+        return True
+    
     def can_be_cancelled_by(self, user_id: str) -> bool:
         """Check if exchange can be cancelled by a specific user."""
-        return (
-            self.is_active
-            and (self.sharer_id == user_id or self.recipient_id == user_id)
-        )
+        return self.allows(ExchangeAction.CANCEL, user_id)
     
     def confirm_by_user(self, user_id: str) -> bool:
         """Confirm exchange by a specific user."""
+        if not self.allows(ExchangeAction.CONFIRM, user_id):
+            return False
+        
         now = datetime.utcnow()
         
         if user_id == self.sharer_id and not self.sharer_confirmed:
             self.sharer_confirmed = True
             self.sharer_confirmed_at = now
-            return True
         elif user_id == self.recipient_id and not self.recipient_confirmed:
             self.recipient_confirmed = True
             self.recipient_confirmed_at = now
-            return True
+        else:
+            return False
         
-        return False
+        if self.is_confirmed:
+            self.status = ExchangeStatus.CONFIRMED
+        return True
     
     def cancel_by_user(self, user_id: str, reason: str) -> bool:
         """Cancel exchange by a specific user."""
         if not self.can_be_cancelled_by(user_id):
             return False
         
-        self.status = ExchangeStatus.CANCELLED
+        self.status = EXCHANGE_TRANSITIONS[ExchangeAction.CANCEL].to_status
         self.cancelled_by_id = user_id
         self.cancelled_at = datetime.utcnow()
         self.cancellation_reason = reason
@@ -176,10 +273,11 @@ class Exchange(Base):
     
     def complete(self) -> bool:
         """Mark exchange as completed."""
-        if not self.is_confirmed:
+        transition = EXCHANGE_TRANSITIONS[ExchangeAction.COMPLETE]
+        if self.status not in transition.from_statuses or not self.is_confirmed:
             return False
         
-        self.status = ExchangeStatus.COMPLETED
+        self.status = transition.to_status
         self.completed_at = datetime.utcnow()
         self.actual_pickup_at = datetime.utcnow()
         return True
\ No newline at end of file
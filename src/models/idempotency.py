@@ -0,0 +1,57 @@
+"""Idempotency key model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from ..core.database import Base
+
+
+class IdempotencyKey(Base):
+    """Stored result of an idempotent request.
+    
+    Written in the same transaction as the state change it describes, so a
+    retried request can be answered from here even if the Valkey copy has
+    expired or been evicted.
+    """
+    
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+    )
+    
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+    )
+    
+    # Request identity
+    scope: Mapped[str] = mapped_column(String(50), nullable=False)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    request_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    
+    # Stored response
+    status_code: Mapped[int] = mapped_column(Integer, default=200, nullable=False)
+    response_body: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        server_default=func.now(),
+        nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(scope='{self.scope}', key='{self.key}')>"
+    
+    @property
+    def is_expired(self) -> bool:
+        """Check if stored result has expired."""
+        return datetime.utcnow() > self.expires_at
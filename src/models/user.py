@@ -107,6 +107,7 @@ class User(Base):
     )
     credit_transactions: Mapped[List["CreditTransaction"]] = relationship(
         "CreditTransaction",
+        foreign_keys="CreditTransaction.user_id",
         back_populates="user",
     )
     
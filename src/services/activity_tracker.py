@@ -0,0 +1,170 @@
+"""Users' last activity, recorded in Valkey and written to SQL in batches.
+
+Each bot interaction calls ``ActivityTracker.touch``, which keeps the
+user's latest timestamp in two places: a sorted set of every user seen
+within ``activity_retention_days``, which serves active-user counts, and
+a hash of changes since the last flush, so any number of touches per
+user cost one row. ``flush`` drains the hash and writes it to
+``users.last_active_at`` with one ``UPDATE ... FROM (VALUES ...)``.
+Users are keyed by Telegram id, the identity every interaction carries.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Mapping, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import DateTime, Integer, column, or_, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.user import User
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+LAST_SEEN_KEY = "user_activity:last_seen"
+PENDING_KEY = "user_activity:pending"
+
+# Windows reported by ``ActivityTracker.active_counts``
+ACTIVE_WINDOWS = {
+    "last_15m": timedelta(minutes=15),
+    "last_hour": timedelta(hours=1),
+    "last_24h": timedelta(hours=24),
+    "last_7d": timedelta(days=7),
+    "last_30d": timedelta(days=30),
+}
+
+# Rows per UPDATE statement, well under asyncpg's 32767 parameters
+WRITE_CHUNK_SIZE = 5000
+
+# Keep the newest timestamp for the user in both the set and the pending hash
+_TOUCH_SCRIPT = """
+redis.call('ZADD', KEYS[1], 'GT', ARGV[2], ARGV[1])
+local pending = tonumber(redis.call('HGET', KEYS[2], ARGV[1]))
+if not pending or pending < tonumber(ARGV[2]) then
+    redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+end
+return 1
+"""
+
+# Take and clear the pending hash in one step
+_TAKE_SCRIPT = """
+local pending = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return pending
+"""
+
+# Put back timestamps that failed to write, unless newer ones arrived
+_RESTORE_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    local pending = tonumber(redis.call('HGET', KEYS[1], ARGV[i]))
+    if not pending or pending < tonumber(ARGV[i + 1]) then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+return #ARGV / 2
+"""
+
+
+async def write_last_seen(db: AsyncSession, seen: Mapping[int, datetime]) -> int:
+    """Set ``last_active_at`` from ``{telegram_id: timestamp}``. Returns rows updated.
+
+    Timestamps only move forward, so a late flush never rewinds one.
+    """
+    updated = 0
+    items = list(seen.items())
+    for start in range(0, len(items), WRITE_CHUNK_SIZE):
+        rows = values(
+            column("telegram_id", Integer), column("seen_at", DateTime), name="seen"
+        ).data(items[start:start + WRITE_CHUNK_SIZE])
+        result = await db.execute(
+            update(User)
+            .where(User.telegram_id == rows.c.telegram_id)
+            .where(or_(User.last_active_at.is_(None), User.last_active_at < rows.c.seen_at))
+            .values(last_active_at=rows.c.seen_at)
+            .execution_options(synchronize_session=False)
+        )
+        updated += result.rowcount
+    return updated
+
+
+class ActivityTracker:
+    """Record user activity in Valkey and flush it to SQL."""
+
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis = redis_client
+
+    async def touch(self, telegram_id: int, at: Optional[float] = None) -> None:
+        """Record that a user was active now (or at epoch seconds ``at``)."""
+        try:
+            await self.redis.eval(
+                _TOUCH_SCRIPT, 2, LAST_SEEN_KEY, PENDING_KEY,
+                telegram_id, int(at if at is not None else time.time()),
+            )
+        except Exception as e:
+            metrics.increment("user_activity_touch_failures_total")
+            logger.warning("Failed to record user activity", telegram_id=telegram_id, error=str(e))
+
+    async def active_counts(
+        self, windows: Optional[Mapping[str, timedelta]] = None
+    ) -> Optional[Dict[str, int]]:
+        """Users active within each window, or None if Valkey is unavailable."""
+        windows = windows or ACTIVE_WINDOWS
+        now = time.time()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for window in windows.values():
+                pipe.zcount(LAST_SEEN_KEY, now - window.total_seconds(), "+inf")
+            counts = await pipe.execute()
+        except Exception as e:
+            logger.warning("Failed to read active user counts", error=str(e))
+            return None
+        return dict(zip(windows, counts))
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write pending timestamps to SQL and commit. Returns users written.
+
+        On failure the timestamps go back to the pending hash for the next
+        flush. Entries older than the retention are dropped from the set.
+        """
+        try:
+            taken = await self.redis.eval(_TAKE_SCRIPT, 1, PENDING_KEY)
+        except Exception as e:
+            logger.warning("Failed to take pending user activity", error=str(e))
+            return 0
+        if not taken:
+            return 0
+
+        pending = dict(zip(taken[::2], taken[1::2]))
+        seen = {
+            int(telegram_id): datetime.utcfromtimestamp(int(at))
+            for telegram_id, at in pending.items()
+        }
+        try:
+            with metrics.timer("user_activity_flush_seconds"):
+                written = await write_last_seen(db, seen)
+                await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await self._restore(pending)
+            metrics.increment("user_activity_flush_failures_total")
+            logger.warning("User activity flush failed", pending=len(pending), error=str(e))
+            return 0
+
+        metrics.increment("user_activity_flushed_total", len(seen))
+        retention = timedelta(days=settings.activity_retention_days).total_seconds()
+        try:
+            await self.redis.zremrangebyscore(LAST_SEEN_KEY, "-inf", time.time() - retention)
+        except Exception as e:
+            logger.warning("Failed to trim user activity", error=str(e))
+        return written
+
+    async def _restore(self, pending: Mapping[str, str]) -> None:
+        args: List[str] = [value for item in pending.items() for value in item]
+        try:
+            await self.redis.eval(_RESTORE_SCRIPT, 1, PENDING_KEY, *args)
+        except Exception as e:
+            logger.error("Lost pending user activity", users=len(pending), error=str(e))
@@ -1,244 +1,443 @@
 """Admin service for platform monitoring and management."""
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any
-from sqlalchemy import select, func, desc, and_, or_
+from typing import AsyncIterator, List, Dict, Mapping, Optional, Any, Sequence, Tuple
+from sqlalchemy import (
+    and_, case, column, delete, desc, exists, func, literal, literal_column, null, or_, select,
+    table, text, union_all,
+)
+from redis.asyncio import Redis
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
 
+from ..core.config import get_settings
 from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.alert import ExchangeAlert
 from ..models.user import User
 from ..models.building import Building
 from ..models.food import Food, FoodStatus
 from ..models.exchange import Exchange, ExchangeStatus
 from ..models.credit import Credit, CreditTransaction, TransactionType
+from .activity_tracker import ActivityTracker
+from .load_profiles import USER_LOAD_OPTIONS, LoadProfile
 
+settings = get_settings()
 logger = get_logger(__name__)
 
+# Windows (days) precomputed by the platform_stats_mv materialized view
+PLATFORM_STATS_WINDOWS = (1, 7, 30, 90)
+
+platform_stats_view = table(
+    "platform_stats_mv",
+    column("window_days"),
+    column("total_users"),
+    column("active_users"),
+    column("total_buildings"),
+    column("total_food_posts"),
+    column("recent_food_posts"),
+    column("active_food_posts"),
+    column("total_exchanges"),
+    column("completed_exchanges"),
+    column("total_credits"),
+    column("recent_transactions"),
+    column("refreshed_at"),
+)
+
+
+# Columns of each record yielded by AdminService.stream_user_activity
+ACTIVITY_FIELDS = ("kind", "id", "created_at", "status", "amount", "description", "role")
+
+# Columns of each problematic exchange record
+PROBLEMATIC_EXCHANGE_FIELDS = (
+    "id",
+    "type",
+    "severity",
+    "description",
+    "food_title",
+    "sharer_name",
+    "recipient_name",
+    "scheduled_pickup",
+    "created_at",
+)
+
+# Rows fetched per round trip by the streaming reports
+STREAM_CHUNK_SIZE = 1000
+
+
+def _display_name(user: Any) -> Any:
+    """SQL equivalent of ``User.display_name``."""
+    return func.coalesce(
+        user.preferred_name,
+        user.first_name + " " + user.last_name,
+        user.first_name,
+    )
+
 
 class AdminService:
     """Service for admin dashboard functionality."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis_client: Optional[Redis] = None):
         self.db = db
+        self.redis = redis_client
+
+    async def get_active_user_counts(self) -> Optional[Dict[str, int]]:
+        """Users seen in the bot per window, read from Valkey without touching SQL.
+
+        None if no Valkey client was given or it is unavailable.
+        """
+        if self.redis is None:
+            return None
+        return await ActivityTracker(self.redis).active_counts()
 
     async def get_platform_stats(self, days: int = 30) -> Dict[str, Any]:
-        """Get platform-wide statistics."""
+        """Get platform-wide statistics.
+
+        Served from the ``platform_stats_mv`` materialized view when it has
+        a row for ``days`` that is fresher than the staleness bound,
+        otherwise computed live.
+        """
         logger.info("Getting platform stats", days=days)
         
         try:
-            # Date range for stats
-            start_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Total users
-            total_users_result = await self.db.execute(select(func.count(User.id)))
-            total_users = total_users_result.scalar()
-            
-            # Active users (posted or claimed food in period)
-            active_users_query = select(func.count(func.distinct(User.id))).select_from(
-                User
-            ).join(Food, or_(
-                Food.sharer_id == User.id,
-                Food.claimed_by_id == User.id
-            )).where(Food.created_at >= start_date)
-            
-            active_users_result = await self.db.execute(active_users_query)
-            active_users = active_users_result.scalar() or 0
-            
-            # Total buildings
-            total_buildings_result = await self.db.execute(select(func.count(Building.id)))
-            total_buildings = total_buildings_result.scalar()
-            
-            # Food posts stats
-            total_food_posts_result = await self.db.execute(select(func.count(Food.id)))
-            total_food_posts = total_food_posts_result.scalar()
-            
-            recent_food_posts_result = await self.db.execute(
-                select(func.count(Food.id)).where(Food.created_at >= start_date)
-            )
-            recent_food_posts = recent_food_posts_result.scalar()
-            
-            # Active food posts
-            active_food_posts_result = await self.db.execute(
-                select(func.count(Food.id)).where(Food.status == FoodStatus.AVAILABLE)
-            )
-            active_food_posts = active_food_posts_result.scalar()
-            
-            # Exchange stats
-            total_exchanges_result = await self.db.execute(select(func.count(Exchange.id)))
-            total_exchanges = total_exchanges_result.scalar()
+            snapshot = await self._get_platform_stats_snapshot(days)
+            if snapshot is not None:
+                return snapshot
+            return await self._compute_platform_stats(days)
             
-            completed_exchanges_result = await self.db.execute(
-                select(func.count(Exchange.id)).where(
-                    and_(
-                        Exchange.status == ExchangeStatus.COMPLETED,
-                        Exchange.completed_at >= start_date
-                    )
-                )
-            )
-            completed_exchanges = completed_exchanges_result.scalar()
-            
-            # Credit stats
-            total_credits_result = await self.db.execute(
-                select(func.sum(Credit.balance))
-            )
-            total_credits_in_circulation = total_credits_result.scalar() or 0
-            
-            total_transactions_result = await self.db.execute(
-                select(func.count(CreditTransaction.id)).where(
-                    CreditTransaction.created_at >= start_date
+        except Exception as e:
+            logger.error("Error getting platform stats", error=str(e), exc_info=True)
+            raise
+
+    async def refresh_platform_stats(self) -> bool:
+        """Refresh the platform stats view without blocking readers.
+
+        Returns False on databases without the view (SQLite).
+        """
+        if not self._uses_postgres():
+            return False
+        
+        try:
+            with metrics.timer("platform_stats_refresh_seconds"):
+                await self.db.execute(
+                    text("REFRESH MATERIALIZED VIEW CONCURRENTLY platform_stats_mv")
                 )
-            )
-            recent_transactions = total_transactions_result.scalar()
-            
-            return {
-                "period_days": days,
-                "users": {
-                    "total": total_users,
-                    "active": active_users,
-                    "activation_rate": round((active_users / total_users * 100) if total_users > 0 else 0, 1)
-                },
-                "buildings": {
-                    "total": total_buildings
-                },
-                "food_posts": {
-                    "total": total_food_posts,
-                    "recent": recent_food_posts,
-                    "active": active_food_posts
-                },
-                "exchanges": {
-                    "total": total_exchanges,
-                    "completed_recent": completed_exchanges,
-                    "success_rate": round((completed_exchanges / recent_food_posts * 100) if recent_food_posts > 0 else 0, 1)
-                },
-                "credits": {
-                    "total_in_circulation": total_credits_in_circulation,
-                    "recent_transactions": recent_transactions
-                },
-                "updated_at": datetime.utcnow()
-            }
+            logger.info("Refreshed platform stats view")
+            return True
             
         except Exception as e:
-            logger.error("Error getting platform stats", error=str(e), exc_info=True)
+            logger.error("Error refreshing platform stats", error=str(e), exc_info=True)
             raise
 
-    async def get_building_stats(self, building_id: str, days: int = 30) -> Dict[str, Any]:
+    def _uses_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    async def _get_platform_stats_snapshot(self, days: int) -> Optional[Dict[str, Any]]:
+        """Read precomputed stats for ``days``, or None if unavailable or stale."""
+        if days not in PLATFORM_STATS_WINDOWS or not self._uses_postgres():
+            return None
+        
+        age = func.extract(
+            "epoch", func.timezone("utc", func.now()) - platform_stats_view.c.refreshed_at
+        ).label("age_seconds")
+        result = await self.db.execute(
+            select(platform_stats_view, age).where(platform_stats_view.c.window_days == days)
+        )
+        row = result.mappings().first()
+        if row is None:
+            return None
+        
+        data_age = float(row["age_seconds"])
+        if data_age > settings.platform_stats_max_staleness_seconds:
+            metrics.increment("platform_stats_stale_total")
+            logger.warning("Platform stats view is stale", days=days, data_age_seconds=round(data_age))
+            return None
+        
+        return self._format_platform_stats(
+            days=days,
+            counts=row,
+            updated_at=row["refreshed_at"],
+            data_age_seconds=round(data_age, 1),
+        )
+
+    async def _compute_platform_stats(self, days: int) -> Dict[str, Any]:
+        """Compute platform stats with live queries."""
+        # Date range for stats
+        start_date = datetime.utcnow() - timedelta(days=days)
+        
+        # Total users
+        total_users_result = await self.db.execute(select(func.count(User.id)))
+        total_users = total_users_result.scalar()
+        
+        # Active users (posted or claimed food in period)
+        active_users_query = select(func.count(func.distinct(User.id))).select_from(
+            User
+        ).join(Food, or_(
+            Food.sharer_id == User.id,
+            Food.claimed_by_id == User.id
+        )).where(Food.created_at >= start_date)
+        
+        active_users_result = await self.db.execute(active_users_query)
+        active_users = active_users_result.scalar() or 0
+        
+        # Total buildings
+        total_buildings_result = await self.db.execute(select(func.count(Building.id)))
+        total_buildings = total_buildings_result.scalar()
+        
+        # Food posts stats
+        total_food_posts_result = await self.db.execute(select(func.count(Food.id)))
+        total_food_posts = total_food_posts_result.scalar()
+        
+        recent_food_posts_result = await self.db.execute(
+            select(func.count(Food.id)).where(Food.created_at >= start_date)
+        )
+        recent_food_posts = recent_food_posts_result.scalar()
+        
+        # Active food posts
+        active_food_posts_result = await self.db.execute(
+            select(func.count(Food.id)).where(Food.status == FoodStatus.AVAILABLE)
+        )
+        active_food_posts = active_food_posts_result.scalar()
+        
+        # Exchange stats
+        total_exchanges_result = await self.db.execute(select(func.count(Exchange.id)))
+        total_exchanges = total_exchanges_result.scalar()
+        
+        completed_exchanges_result = await self.db.execute(
+            select(func.count(Exchange.id)).where(
+                and_(
+                    Exchange.status == ExchangeStatus.COMPLETED,
+                    Exchange.completed_at >= start_date
+                )
+            )
+        )
+        completed_exchanges = completed_exchanges_result.scalar()
+        
+        # Credit stats
+        total_credits_result = await self.db.execute(
+            select(func.sum(Credit.balance))
+        )
+        total_credits_in_circulation = total_credits_result.scalar() or 0
+        
+        total_transactions_result = await self.db.execute(
+            select(func.count(CreditTransaction.id)).where(
+                CreditTransaction.created_at >= start_date
+            )
+        )
+        recent_transactions = total_transactions_result.scalar()
+        
+        return self._format_platform_stats(
+            days=days,
+            counts={
+                "total_users": total_users,
+                "active_users": active_users,
+                "total_buildings": total_buildings,
+                "total_food_posts": total_food_posts,
+                "recent_food_posts": recent_food_posts,
+                "active_food_posts": active_food_posts,
+                "total_exchanges": total_exchanges,
+                "completed_exchanges": completed_exchanges,
+                "total_credits": total_credits_in_circulation,
+                "recent_transactions": recent_transactions,
+            },
+            updated_at=datetime.utcnow(),
+            data_age_seconds=0.0,
+        )
+
+    @staticmethod
+    def _format_platform_stats(
+        days: int,
+        counts: Mapping[str, Any],
+        updated_at: datetime,
+        data_age_seconds: float,
+    ) -> Dict[str, Any]:
+        total_users = counts["total_users"]
+        active_users = counts["active_users"]
+        recent_food_posts = counts["recent_food_posts"]
+        completed_exchanges = counts["completed_exchanges"]
+        
+        return {
+            "period_days": days,
+            "users": {
+                "total": total_users,
+                "active": active_users,
+                "activation_rate": round((active_users / total_users * 100) if total_users > 0 else 0, 1)
+            },
+            "buildings": {
+                "total": counts["total_buildings"]
+            },
+            "food_posts": {
+                "total": counts["total_food_posts"],
+                "recent": recent_food_posts,
+                "active": counts["active_food_posts"]
+            },
+            "exchanges": {
+                "total": counts["total_exchanges"],
+                "completed_recent": completed_exchanges,
+                "success_rate": round((completed_exchanges / recent_food_posts * 100) if recent_food_posts > 0 else 0, 1)
+            },
+            "credits": {
+                "total_in_circulation": counts["total_credits"],
+                "recent_transactions": counts["recent_transactions"]
+            },
+            "updated_at": updated_at,
+            "data_age_seconds": data_age_seconds
+        }
+
+    async def get_building_stats(self, building_id: str, days: int = 30) -> Optional[Dict[str, Any]]:
         """Get statistics for a specific building."""
-        logger.info("Getting building stats", building_id=building_id, days=days)
+        stats = await self.get_buildings_stats([building_id], days=days)
+        return stats.get(building_id)
+
+    async def get_buildings_stats(
+        self,
+        building_ids: Optional[Sequence[str]] = None,
+        days: int = 30,
+        limit: int = 100,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for many buildings at once, keyed by building ID.
+
+        Issues a fixed number of grouped queries (one per table) however
+        many buildings are requested. Without ``building_ids`` the first
+        ``limit`` buildings by name are returned.
+        """
+        logger.info("Getting building stats", building_count=len(building_ids) if building_ids else None, days=days)
         
         try:
             start_date = datetime.utcnow() - timedelta(days=days)
             
             # Building info
-            building_result = await self.db.execute(
-                select(Building).where(Building.id == building_id)
-            )
-            building = building_result.scalar_one_or_none()
-            
-            if not building:
-                return None
-            
-            # Users in building
-            total_users_result = await self.db.execute(
-                select(func.count(User.id)).where(User.building_id == building_id)
-            )
-            total_users = total_users_result.scalar()
-            
-            # Active users
-            active_users_result = await self.db.execute(
-                select(func.count(func.distinct(User.id))).select_from(User)
-                .join(Food, Food.sharer_id == User.id)
-                .where(
-                    and_(
-                        User.building_id == building_id,
-                        Food.created_at >= start_date
+            buildings_query = select(Building.id, Building.name, Building.address)
+            if building_ids is not None:
+                buildings_query = buildings_query.where(Building.id.in_(building_ids))
+            else:
+                buildings_query = buildings_query.order_by(Building.name).limit(limit)
+            buildings = (await self.db.execute(buildings_query)).all()
+            if not buildings:
+                return {}
+            ids = [row.id for row in buildings]
+            
+            # Users: total and active (posted in period) per building
+            recent_post = and_(Food.sharer_id == User.id, Food.created_at >= start_date)
+            user_counts = {
+                row.building_id: row
+                for row in await self.db.execute(
+                    select(
+                        User.building_id,
+                        func.count(func.distinct(User.id)).label("total_users"),
+                        func.count(func.distinct(Food.sharer_id)).label("active_users"),
                     )
+                    .select_from(User)
+                    .outerjoin(Food, recent_post)
+                    .where(User.building_id.in_(ids))
+                    .group_by(User.building_id)
                 )
-            )
-            active_users = active_users_result.scalar() or 0
+            }
             
-            # Food posts in building
-            food_posts_result = await self.db.execute(
-                select(func.count(Food.id)).where(
-                    and_(
-                        Food.building_id == building_id,
-                        Food.created_at >= start_date
+            # Food posts and completed exchanges per building
+            activity_counts = {
+                row.building_id: row
+                for row in await self.db.execute(
+                    select(
+                        Food.building_id,
+                        func.count(func.distinct(Food.id))
+                        .filter(Food.created_at >= start_date)
+                        .label("food_posts"),
+                        func.count(func.distinct(Exchange.id))
+                        .filter(
+                            and_(
+                                Exchange.status == ExchangeStatus.COMPLETED,
+                                Exchange.completed_at >= start_date
+                            )
+                        )
+                        .label("completed_exchanges"),
                     )
+                    .select_from(Food)
+                    .outerjoin(Exchange, Exchange.food_id == Food.id)
+                    .where(Food.building_id.in_(ids))
+                    .group_by(Food.building_id)
                 )
-            )
-            food_posts = food_posts_result.scalar()
+            }
             
-            # Completed exchanges
-            completed_exchanges_result = await self.db.execute(
-                select(func.count(Exchange.id))
-                .select_from(Exchange)
-                .join(Food, Food.id == Exchange.food_id)
-                .where(
-                    and_(
-                        Food.building_id == building_id,
-                        Exchange.status == ExchangeStatus.COMPLETED,
-                        Exchange.completed_at >= start_date
-                    )
+            # Top five sharers per building
+            display_name = _display_name(User)
+            food_count = func.count(Food.id)
+            ranked = (
+                select(
+                    User.building_id,
+                    User.id,
+                    display_name.label("display_name"),
+                    User.apartment_number,
+                    food_count.label("food_count"),
+                    func.row_number().over(
+                        partition_by=User.building_id,
+                        order_by=(food_count.desc(), User.id),
+                    ).label("rank"),
                 )
-            )
-            completed_exchanges = completed_exchanges_result.scalar()
-            
-            # Top sharers
-            top_sharers_result = await self.db.execute(
-                select(User.id, User.display_name, User.apartment_number, func.count(Food.id).label("food_count"))
                 .select_from(User)
                 .join(Food, Food.sharer_id == User.id)
                 .where(
                     and_(
-                        User.building_id == building_id,
+                        User.building_id.in_(ids),
                         Food.created_at >= start_date
                     )
                 )
-                .group_by(User.id, User.display_name, User.apartment_number)
-                .order_by(desc("food_count"))
-                .limit(5)
+                .group_by(User.building_id, User.id)
+                .subquery()
             )
-            top_sharers = [
-                {
+            top_sharers: Dict[str, List[Dict[str, Any]]] = {building_id: [] for building_id in ids}
+            for row in await self.db.execute(
+                select(ranked).where(ranked.c.rank <= 5).order_by(ranked.c.building_id, ranked.c.rank)
+            ):
+                top_sharers[row.building_id].append({
                     "user_id": row.id,
                     "name": row.display_name,
                     "apartment": row.apartment_number,
                     "posts_count": row.food_count
-                }
-                for row in top_sharers_result.all()
-            ]
+                })
             
-            return {
-                "building": {
-                    "id": building.id,
-                    "name": building.name,
-                    "address": building.address
-                },
-                "period_days": days,
-                "users": {
-                    "total": total_users,
-                    "active": active_users
-                },
-                "activity": {
-                    "food_posts": food_posts,
-                    "completed_exchanges": completed_exchanges
-                },
-                "top_sharers": top_sharers,
-                "updated_at": datetime.utcnow()
-            }
+            updated_at = datetime.utcnow()
+            stats = {}
+            for building in buildings:
+                users = user_counts.get(building.id)
+                activity = activity_counts.get(building.id)
+                stats[building.id] = {
+                    "building": {
+                        "id": building.id,
+                        "name": building.name,
+                        "address": building.address
+                    },
+                    "period_days": days,
+                    "users": {
+                        "total": users.total_users if users else 0,
+                        "active": users.active_users if users else 0
+                    },
+                    "activity": {
+                        "food_posts": activity.food_posts if activity else 0,
+                        "completed_exchanges": activity.completed_exchanges if activity else 0
+                    },
+                    "top_sharers": top_sharers[building.id],
+                    "updated_at": updated_at
+                }
+            return stats
             
         except Exception as e:
-            logger.error("Error getting building stats", building_id=building_id, error=str(e), exc_info=True)
+            logger.error("Error getting building stats", building_ids=building_ids, error=str(e), exc_info=True)
             raise
 
-    async def get_user_activity(self, user_id: str) -> Dict[str, Any]:
-        """Get detailed activity for a specific user."""
-        logger.info("Getting user activity", user_id=user_id)
+    async def get_user_activity(self, user_id: str, days: int = 90) -> Dict[str, Any]:
+        """Get detailed activity for a specific user over the last ``days`` days."""
+        logger.info("Getting user activity", user_id=user_id, days=days)
         
         try:
+            # Bounding created_at prunes older exchange and transaction partitions
+            since = datetime.utcnow() - timedelta(days=days)
+            
             # User info
             user_result = await self.db.execute(
-                select(User).options(selectinload(User.building))
+                select(User).options(*USER_LOAD_OPTIONS[LoadProfile.SUMMARY])
                 .where(User.id == user_id)
             )
             user = user_result.scalar_one_or_none()
@@ -260,23 +459,19 @@ class AdminService:
             )
             food_posts = food_posts_result.scalars().all()
             
-            # Exchanges as sharer
+            # Exchanges as sharer (only counted)
             sharer_exchanges_result = await self.db.execute(
-                select(Exchange).options(
-                    selectinload(Exchange.food),
-                    selectinload(Exchange.recipient)
-                ).where(Exchange.sharer_id == user_id)
+                select(Exchange)
+                .where(Exchange.sharer_id == user_id, Exchange.created_at >= since)
                 .order_by(desc(Exchange.created_at))
                 .limit(10)
             )
             sharer_exchanges = sharer_exchanges_result.scalars().all()
             
-            # Exchanges as recipient
+            # Exchanges as recipient (only counted)
             recipient_exchanges_result = await self.db.execute(
-                select(Exchange).options(
-                    selectinload(Exchange.food),
-                    selectinload(Exchange.sharer)
-                ).where(Exchange.recipient_id == user_id)
+                select(Exchange)
+                .where(Exchange.recipient_id == user_id, Exchange.created_at >= since)
                 .order_by(desc(Exchange.created_at))
                 .limit(10)
             )
@@ -285,7 +480,7 @@ class AdminService:
             # Recent transactions
             transactions_result = await self.db.execute(
                 select(CreditTransaction)
-                .where(CreditTransaction.user_id == user_id)
+                .where(CreditTransaction.user_id == user_id, CreditTransaction.created_at >= since)
                 .order_by(desc(CreditTransaction.created_at))
                 .limit(10)
             )
@@ -295,7 +490,6 @@ class AdminService:
                 "user": {
                     "id": user.id,
                     "name": user.display_name,
-                    "email": user.email,
                     "phone": user.phone_number,
                     "apartment": user.apartment_number,
                     "building": {
@@ -341,81 +535,310 @@ class AdminService:
             logger.error("Error getting user activity", user_id=user_id, error=str(e), exc_info=True)
             raise
 
-    async def get_problematic_exchanges(self, days: int = 7) -> List[Dict[str, Any]]:
-        """Get exchanges that may need admin attention."""
-        logger.info("Getting problematic exchanges", days=days)
+    async def stream_user_activity(
+        self,
+        user_id: str,
+        days: int = 90,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a user's food posts, exchanges and transactions, newest first.
+
+        Each record has the ``ACTIVITY_FIELDS`` keys. Rows are fetched from a
+        server-side cursor ``chunk_size`` at a time.
+        """
+        logger.info("Streaming user activity", user_id=user_id, days=days)
         
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=days)
-            
-            # Overdue exchanges (confirmed but past pickup time)
-            overdue_result = await self.db.execute(
-                select(Exchange).options(
-                    selectinload(Exchange.food),
-                    selectinload(Exchange.sharer),
-                    selectinload(Exchange.recipient)
-                ).where(
-                    and_(
-                        Exchange.status == ExchangeStatus.CONFIRMED,
-                        Exchange.scheduled_pickup_at < datetime.utcnow(),
-                        Exchange.scheduled_pickup_at > cutoff_date
-                    )
-                )
+            since = datetime.utcnow() - timedelta(days=days)
+            result = await self.db.stream(
+                self._user_activity_query(user_id, since)
+                .execution_options(yield_per=chunk_size)
             )
-            
-            # Long pending exchanges
-            long_pending_result = await self.db.execute(
-                select(Exchange).options(
-                    selectinload(Exchange.food),
-                    selectinload(Exchange.sharer),
-                    selectinload(Exchange.recipient)
-                ).where(
-                    and_(
-                        Exchange.status == ExchangeStatus.PENDING,
-                        Exchange.created_at < datetime.utcnow() - timedelta(hours=24)
-                    )
-                )
+            async for row in result.mappings():
+                yield dict(row)
+                
+        except Exception as e:
+            logger.error("Error streaming user activity", user_id=user_id, error=str(e), exc_info=True)
+            raise
+
+    @staticmethod
+    def _user_activity_query(user_id: str, since: datetime) -> Select:
+        food_posts = select(
+            literal("food_post").label("kind"),
+            Food.id.label("id"),
+            Food.created_at.label("created_at"),
+            Food.status.label("status"),
+            Food.credit_value.label("amount"),
+            Food.title.label("description"),
+            literal("sharer").label("role"),
+        ).where(Food.sharer_id == user_id, Food.created_at >= since)
+        
+        exchanges = (
+            select(
+                literal("exchange"),
+                Exchange.id,
+                Exchange.created_at,
+                Exchange.status,
+                Exchange.credit_amount,
+                Food.title,
+                case((Exchange.sharer_id == user_id, "sharer"), else_="recipient"),
             )
+            .select_from(Exchange)
+            .outerjoin(Food, Food.id == Exchange.food_id)
+            .where(
+                or_(Exchange.sharer_id == user_id, Exchange.recipient_id == user_id),
+                Exchange.created_at >= since,
+            )
+        )
+        
+        transactions = select(
+            literal("transaction"),
+            CreditTransaction.id,
+            CreditTransaction.created_at,
+            CreditTransaction.transaction_type,
+            CreditTransaction.amount,
+            CreditTransaction.description,
+            null(),
+        ).where(CreditTransaction.user_id == user_id, CreditTransaction.created_at >= since)
+        
+        activity = union_all(food_posts, exchanges, transactions).subquery()
+        return select(activity).order_by(activity.c.created_at.desc(), activity.c.id)
+
+    async def get_problematic_exchanges(
+        self,
+        days: int = 7,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get exchanges that may need admin attention, most urgent first."""
+        logger.info("Getting problematic exchanges", days=days, limit=limit)
+        
+        try:
+            now = datetime.utcnow()
+            query = self._problematic_exchanges_query(days, now)
+            if limit is not None:
+                query = query.limit(limit)
             
-            problematic = []
-            
-            for exchange in overdue_result.scalars().all():
-                hours_overdue = (datetime.utcnow() - exchange.scheduled_pickup_at).total_seconds() / 3600
-                problematic.append({
-                    "id": exchange.id,
-                    "type": "overdue",
-                    "severity": "high" if hours_overdue > 24 else "medium",
-                    "description": f"Exchange overdue by {int(hours_overdue)} hours",
-                    "food_title": exchange.food.title if exchange.food else "Unknown",
-                    "sharer_name": exchange.sharer.display_name if exchange.sharer else "Unknown",
-                    "recipient_name": exchange.recipient.display_name if exchange.recipient else "Unknown",
-                    "scheduled_pickup": exchange.scheduled_pickup_at,
-                    "created_at": exchange.created_at
-                })
-            
-            for exchange in long_pending_result.scalars().all():
-                hours_pending = (datetime.utcnow() - exchange.created_at).total_seconds() / 3600
-                problematic.append({
-                    "id": exchange.id,
-                    "type": "long_pending",
-                    "severity": "medium",
-                    "description": f"Exchange pending for {int(hours_pending)} hours",
-                    "food_title": exchange.food.title if exchange.food else "Unknown",
-                    "sharer_name": exchange.sharer.display_name if exchange.sharer else "Unknown",
-                    "recipient_name": exchange.recipient.display_name if exchange.recipient else "Unknown",
-                    "created_at": exchange.created_at
-                })
+            result = await self.db.execute(query)
+            return [self._problematic_exchange_record(row, now) for row in result]
             
-            # Sort by severity and creation time
-            severity_order = {"high": 0, "medium": 1, "low": 2}
-            problematic.sort(key=lambda x: (severity_order[x["severity"]], x["created_at"]))
+        except Exception as e:
+            logger.error("Error getting problematic exchanges", error=str(e), exc_info=True)
+            raise
+
+    async def count_problematic_exchanges(self, days: int = 7) -> int:
+        """Count exchanges that may need admin attention."""
+        try:
+            query = self._problematic_exchanges_query(days, datetime.utcnow()).order_by(None)
+            result = await self.db.execute(select(func.count()).select_from(query.subquery()))
+            return result.scalar_one()
             
-            return problematic
+        except Exception as e:
+            logger.error("Error counting problematic exchanges", error=str(e), exc_info=True)
+            raise
+
+    async def stream_problematic_exchanges(
+        self,
+        days: int = 7,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every problematic exchange, most urgent first.
+
+        Rows are fetched from a server-side cursor ``chunk_size`` at a time.
+        """
+        logger.info("Streaming problematic exchanges", days=days)
+        
+        try:
+            now = datetime.utcnow()
+            result = await self.db.stream(
+                self._problematic_exchanges_query(days, now)
+                .execution_options(yield_per=chunk_size)
+            )
+            async for row in result:
+                yield self._problematic_exchange_record(row, now)
+                
+        except Exception as e:
+            logger.error("Error streaming problematic exchanges", error=str(e), exc_info=True)
+            raise
+
+    async def refresh_exchange_alerts(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Bring ``exchange_alerts`` up to date with the exchanges.
+
+        Alerts whose exchange no longer qualifies are deleted, checking only
+        the alerted exchanges. One upsert then adds newly problematic
+        exchanges and rewrites only alerts whose grade changed. Each new
+        alert's detection latency (time since its deadline) is recorded.
+        """
+        now = now or datetime.utcnow()
+        
+        try:
+            with metrics.timer("exchange_alerts_refresh_seconds"):
+                overdue, long_pending, _ = self._problematic_conditions(now)
+                resolved = await self.db.execute(
+                    delete(ExchangeAlert).where(~exists().where(
+                        Exchange.id == ExchangeAlert.exchange_id,
+                        Exchange.created_at == ExchangeAlert.exchange_created_at,
+                        or_(overdue, long_pending),
+                    ))
+                )
+                
+                detected = self._detect_problematic_exchanges_query(now).subquery()
+                insert_stmt = pg_insert(ExchangeAlert).from_select(
+                    [c.name for c in detected.c],
+                    select(detected),
+                )
+                graded = ("alert_type", "severity", "severity_rank", "due_at", "scheduled_pickup_at")
+                upsert = insert_stmt.on_conflict_do_update(
+                    index_elements=[ExchangeAlert.exchange_id],
+                    set_={name: insert_stmt.excluded[name] for name in graded},
+                    where=or_(*(
+                        ExchangeAlert.__table__.c[name].is_distinct_from(insert_stmt.excluded[name])
+                        for name in graded
+                    )),
+                ).returning(
+                    ExchangeAlert.alert_type,
+                    ExchangeAlert.due_at,
+                    # xmax is 0 for rows this statement inserted
+                    literal_column("xmax = 0").label("inserted"),
+                )
+                rows = (await self.db.execute(upsert)).all()
+            
+            new_alerts = [row for row in rows if row.inserted]
+            for row in new_alerts:
+                metrics.observe(
+                    "exchange_alert_detection_latency_seconds",
+                    (now - row.due_at).total_seconds(),
+                    type=row.alert_type,
+                )
+            counts = {
+                "new": len(new_alerts),
+                "regraded": len(rows) - len(new_alerts),
+                "resolved": resolved.rowcount,
+            }
+            logger.info("Refreshed exchange alerts", **counts)
+            return counts
             
         except Exception as e:
-            logger.error("Error getting problematic exchanges", error=str(e), exc_info=True)
+            logger.error("Error refreshing exchange alerts", error=str(e), exc_info=True)
             raise
 
+    @staticmethod
+    def _problematic_conditions(now: datetime) -> Tuple[Any, Any, Any]:
+        """Overdue, long-pending and high-severity conditions on ``Exchange``."""
+        cutoff_date = now - timedelta(days=settings.exchange_alert_window_days)
+        # Claims come before pickup, so an exchange due inside the window may
+        # have been claimed up to the claim lead before it; bounding
+        # created_at that far back only lets the planner prune partitions
+        claimed_after = cutoff_date - timedelta(days=settings.exchange_alert_claim_lead_days)
+        # Confirmed but past pickup time
+        overdue = and_(
+            Exchange.status == ExchangeStatus.CONFIRMED,
+            Exchange.scheduled_pickup_at < now,
+            Exchange.scheduled_pickup_at > cutoff_date,
+            Exchange.created_at > claimed_after,
+        )
+        # Pending for more than a day, however long ago
+        long_pending = and_(
+            Exchange.status == ExchangeStatus.PENDING,
+            Exchange.created_at < now - timedelta(hours=24),
+        )
+        high_severity = and_(overdue, Exchange.scheduled_pickup_at < now - timedelta(hours=24))
+        return overdue, long_pending, high_severity
+
+    @classmethod
+    def _detect_problematic_exchanges_query(cls, now: datetime) -> Select:
+        """Problematic exchanges as ``exchange_alerts`` rows."""
+        overdue, long_pending, high_severity = cls._problematic_conditions(now)
+        
+        return (
+            select(
+                Exchange.id.label("exchange_id"),
+                Exchange.created_at.label("exchange_created_at"),
+                case((overdue, "overdue"), else_="long_pending").label("alert_type"),
+                case((high_severity, "high"), else_="medium").label("severity"),
+                case((high_severity, 0), else_=1).label("severity_rank"),
+                case(
+                    (overdue, Exchange.scheduled_pickup_at),
+                    else_=Exchange.created_at + timedelta(hours=24),
+                ).label("due_at"),
+                Exchange.scheduled_pickup_at,
+                literal(now).label("detected_at"),
+            )
+            .where(or_(overdue, long_pending))
+        )
+
+    @staticmethod
+    def _problematic_exchanges_query(days: int, now: datetime) -> Select:
+        """Open alerts, overdue ones only if due within ``days``, most urgent first.
+
+        Alerts whose exchange has since moved on are skipped until the next
+        refresh deletes them.
+        """
+        cutoff_date = now - timedelta(days=days)
+        sharer = aliased(User)
+        recipient = aliased(User)
+        
+        still_open = or_(
+            and_(
+                ExchangeAlert.alert_type == "overdue",
+                Exchange.status == ExchangeStatus.CONFIRMED,
+                ExchangeAlert.scheduled_pickup_at > cutoff_date,
+            ),
+            and_(
+                ExchangeAlert.alert_type == "long_pending",
+                Exchange.status == ExchangeStatus.PENDING,
+            ),
+        )
+        
+        return (
+            select(
+                ExchangeAlert.exchange_id.label("id"),
+                ExchangeAlert.alert_type.label("type"),
+                ExchangeAlert.severity,
+                Food.title.label("food_title"),
+                _display_name(sharer).label("sharer_name"),
+                _display_name(recipient).label("recipient_name"),
+                ExchangeAlert.scheduled_pickup_at,
+                ExchangeAlert.exchange_created_at.label("created_at"),
+            )
+            .select_from(ExchangeAlert)
+            .join(
+                Exchange,
+                and_(
+                    Exchange.id == ExchangeAlert.exchange_id,
+                    Exchange.created_at == ExchangeAlert.exchange_created_at,
+                ),
+            )
+            .outerjoin(Food, Food.id == Exchange.food_id)
+            .outerjoin(sharer, sharer.id == Exchange.sharer_id)
+            .outerjoin(recipient, recipient.id == Exchange.recipient_id)
+            .where(still_open)
+            .order_by(
+                ExchangeAlert.severity_rank,
+                ExchangeAlert.exchange_created_at,
+                ExchangeAlert.exchange_id,
+            )
+        )
+
+    @staticmethod
+    def _problematic_exchange_record(row: Any, now: datetime) -> Dict[str, Any]:
+        record = {
+            "id": row.id,
+            "type": row.type,
+            "severity": row.severity,
+            "food_title": row.food_title or "Unknown",
+            "sharer_name": row.sharer_name or "Unknown",
+            "recipient_name": row.recipient_name or "Unknown",
+        }
+        if row.type == "overdue":
+            hours_overdue = (now - row.scheduled_pickup_at).total_seconds() / 3600
+            record["description"] = f"Exchange overdue by {int(hours_overdue)} hours"
+            record["scheduled_pickup"] = row.scheduled_pickup_at
+        else:
+            hours_pending = (now - row.created_at).total_seconds() / 3600
+            record["description"] = f"Exchange pending for {int(hours_pending)} hours"
+        record["created_at"] = row.created_at
+        return record
+
     async def get_system_health(self) -> Dict[str, Any]:
         """Get system health indicators."""
         logger.info("Getting system health")
@@ -426,15 +849,13 @@ class AdminService:
             # Database connectivity (this call itself tests it)
             db_healthy = True
             
-            # Recent activity (food posts in last hour)
-            recent_posts_result = await self.db.execute(
+            # Recent activity and failed exchanges in one round trip
+            recent_posts_query = (
                 select(func.count(Food.id))
                 .where(Food.created_at > now - timedelta(hours=1))
+                .scalar_subquery()
             )
-            recent_posts = recent_posts_result.scalar()
-            
-            # Failed exchanges (cancelled in last 24h)
-            failed_exchanges_result = await self.db.execute(
+            failed_exchanges_query = (
                 select(func.count(Exchange.id))
                 .where(
                     and_(
@@ -442,8 +863,17 @@ class AdminService:
                         Exchange.cancelled_at > now - timedelta(hours=24)
                     )
                 )
+                .scalar_subquery()
+            )
+            activity_result = await self.db.execute(
+                select(
+                    recent_posts_query.label("recent_posts"),
+                    failed_exchanges_query.label("failed_exchanges"),
+                )
             )
-            failed_exchanges = failed_exchanges_result.scalar()
+            activity = activity_result.one()
+            recent_posts = activity.recent_posts
+            failed_exchanges = activity.failed_exchanges
             
             # Determine overall health
             health_score = 100
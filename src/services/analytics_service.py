@@ -0,0 +1,275 @@
+"""Real-time analytics counters kept in Redis.
+
+Committed domain events (see ``core.events``) are counted in memory by
+``AnalyticsRecorder`` and flushed in batches as HINCRBYs into hashes per
+time bucket (minute, hour, day) and building, plus a platform-wide ``all``
+hash. ``AnalyticsService`` reads those hashes for the dashboard and can
+rebuild them from SQL.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from redis.asyncio import Redis
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from ..core.events import DomainEvent
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.exchange import Exchange, ExchangeStatus
+from ..models.food import Food
+
+logger = get_logger(__name__)
+
+# Events counted by the pipeline
+FOOD_POSTED = "food_posted"
+FOOD_CLAIMED = "food_claimed"
+FOOD_COMPLETED = "food_completed"
+EXCHANGE_CANCELLED = "exchange_cancelled"
+CREDIT_TRANSFER = "credit_transfer"
+ANALYTICS_EVENTS = (FOOD_POSTED, FOOD_CLAIMED, FOOD_COMPLETED, EXCHANGE_CANCELLED, CREDIT_TRANSFER)
+
+# Sum of credits moved by CREDIT_TRANSFER events
+CREDITS_TRANSFERRED = "credits_transferred"
+
+ALL_BUILDINGS = "all"
+KEY_PREFIX = "analytics"
+
+# Bucket format and retention per granularity
+GRANULARITIES: Dict[str, Tuple[str, timedelta]] = {
+    "minute": ("%Y%m%d%H%M", timedelta(days=2)),
+    "hour": ("%Y%m%d%H", timedelta(days=35)),
+    "day": ("%Y%m%d", timedelta(days=400)),
+}
+BUCKET_STEPS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+def bucket_start(granularity: str, moment: datetime) -> datetime:
+    """Truncate ``moment`` to the start of its bucket."""
+    if granularity == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def analytics_key(granularity: str, moment: datetime, building_id: Optional[str] = None) -> str:
+    """Redis hash holding the counters for one bucket and building."""
+    bucket = moment.strftime(GRANULARITIES[granularity][0])
+    return f"{KEY_PREFIX}:{granularity}:{building_id or ALL_BUILDINGS}:{bucket}"
+
+
+def _fields(name: str, count: int, amount: int) -> Iterable[Tuple[str, int]]:
+    yield name, count
+    if name == CREDIT_TRANSFER and amount:
+        yield CREDITS_TRANSFERRED, amount
+
+
+class AnalyticsRecorder:
+    """Count committed events in memory and flush them to Redis in batches."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._expiry: Dict[str, int] = {}
+        self._minute: Optional[datetime] = None
+        self._bucket_keys: List[Tuple[str, str, int]] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of counter fields waiting to be flushed."""
+        return len(self._counts)
+
+    def record(self, event: DomainEvent) -> None:
+        """Event handler: add ``event`` to the in-memory counters."""
+        if event.name not in ANALYTICS_EVENTS:
+            return
+
+        minute = event.occurred_at.replace(second=0, microsecond=0)
+        if minute != self._minute:
+            self._minute = minute
+            self._bucket_keys = [
+                (granularity, minute.strftime(fmt), int(ttl.total_seconds()))
+                for granularity, (fmt, ttl) in GRANULARITIES.items()
+            ]
+
+        buildings = (event.building_id, ALL_BUILDINGS) if event.building_id else (ALL_BUILDINGS,)
+        for granularity, bucket, ttl in self._bucket_keys:
+            for building in buildings:
+                key = f"{KEY_PREFIX}:{granularity}:{building}:{bucket}"
+                self._expiry[key] = ttl
+                for field, value in _fields(event.name, 1, event.amount):
+                    self._counts[(key, field)] += value
+
+    async def flush(self, redis_client: Optional[Redis]) -> int:
+        """Write pending counters with one pipeline. Returns fields written.
+
+        On failure the counters are kept and retried on the next flush.
+        """
+        if not self._counts or redis_client is None:
+            return 0
+
+        counts, expiry = self._counts, self._expiry
+        self._counts, self._expiry = defaultdict(int), {}
+        try:
+            with metrics.timer("analytics_flush_seconds"):
+                pipe = redis_client.pipeline(transaction=False)
+                for (key, field), value in counts.items():
+                    pipe.hincrby(key, field, value)
+                for key, ttl in expiry.items():
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+            metrics.increment("analytics_fields_flushed_total", len(counts))
+            return len(counts)
+        except Exception as e:
+            for counter, value in counts.items():
+                self._counts[counter] += value
+            self._expiry.update(expiry)
+            metrics.increment("analytics_flush_failures_total")
+            logger.warning("Analytics flush failed", pending=len(self._counts), error=str(e))
+            return 0
+
+
+# Process-wide recorder subscribed to committed events by the API
+analytics_recorder = AnalyticsRecorder()
+
+
+class AnalyticsService:
+    """Read and rebuild analytics counters."""
+
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis = redis_client
+
+    async def get_counts(
+        self,
+        since: timedelta,
+        building_id: Optional[str] = None,
+        now: Optional[datetime] = None,
+    ) -> Optional[Dict[str, int]]:
+        """Sum counters over the last ``since``.
+
+        Uses the coarsest buckets that fit, so the window is rounded out to
+        whole minutes, hours or days.
+        """
+        now = now or datetime.utcnow()
+        if since <= timedelta(hours=2):
+            granularity = "minute"
+        elif since <= timedelta(days=2):
+            granularity = "hour"
+        else:
+            granularity = "day"
+
+        try:
+            series = await self.get_series(granularity, now - since, now, building_id)
+            totals = {name: 0 for name in (*ANALYTICS_EVENTS, CREDITS_TRANSFERRED)}
+            for _, counts in series:
+                for field, value in counts.items():
+                    totals[field] = totals.get(field, 0) + value
+            return totals
+        except Exception as e:
+            logger.error("Error reading analytics counters", building_id=building_id, error=str(e))
+            return None
+
+    async def get_series(
+        self,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        building_id: Optional[str] = None,
+    ) -> List[Tuple[datetime, Dict[str, int]]]:
+        """Counters per bucket between ``start`` and ``end`` (inclusive)."""
+        step = BUCKET_STEPS[granularity]
+        buckets = []
+        moment = bucket_start(granularity, start)
+        while moment <= end:
+            buckets.append(moment)
+            moment += step
+
+        pipe = self.redis.pipeline(transaction=False)
+        for moment in buckets:
+            pipe.hgetall(analytics_key(granularity, moment, building_id))
+        results = await pipe.execute()
+
+        return [
+            (moment, {field: int(value) for field, value in counts.items()})
+            for moment, counts in zip(buckets, results)
+        ]
+
+    async def backfill(self, db: AsyncSession, since: datetime, until: Optional[datetime] = None) -> int:
+        """Rebuild counters for ``[since, until)`` from SQL. Returns hashes written.
+
+        Bucket fields are overwritten, not incremented, so a backfill can be
+        re-run; run it for closed periods since events arriving meanwhile
+        in the same buckets are replaced.
+        """
+        until = until or bucket_start("minute", datetime.utcnow())
+        logger.info("Backfilling analytics", since=since, until=until)
+
+        buckets: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        now = datetime.utcnow()
+        result = await db.stream(self._history_query(since, until))
+        async for row in result:
+            for granularity, (_, ttl) in GRANULARITIES.items():
+                moment = bucket_start(granularity, row.minute)
+                if moment + ttl < now:
+                    continue
+                for building in {row.building_id, None}:
+                    key = analytics_key(granularity, moment, building)
+                    for field, value in _fields(row.event, row.events, row.amount or 0):
+                        buckets[key][field] += value
+
+        pipe = self.redis.pipeline(transaction=False)
+        for key, fields in buckets.items():
+            granularity = key.split(":")[1]
+            pipe.hset(key, mapping=dict(fields))
+            pipe.expire(key, int(GRANULARITIES[granularity][1].total_seconds()))
+        await pipe.execute()
+
+        logger.info("Analytics backfill completed", hashes=len(buckets))
+        return len(buckets)
+
+    @staticmethod
+    def _history_query(since: datetime, until: datetime) -> Select:
+        """Per-minute event counts by building, reconstructed from the tables."""
+
+        def per_minute(name: str, column: Any, *criteria: Any, amount: Any = literal(0)) -> Select:
+            minute = func.date_trunc("minute", column)
+            return (
+                select(
+                    literal(name).label("event"),
+                    Food.building_id.label("building_id"),
+                    minute.label("minute"),
+                    func.count().label("events"),
+                    func.sum(amount).label("amount"),
+                )
+                .where(column >= since, column < until, *criteria)
+                .group_by(Food.building_id, minute)
+            )
+
+        with_food = Exchange.food_id == Food.id
+        return union_all(
+            per_minute(FOOD_POSTED, Food.created_at),
+            per_minute(FOOD_CLAIMED, Exchange.created_at, with_food),
+            per_minute(
+                FOOD_COMPLETED,
+                Exchange.completed_at,
+                and_(with_food, Exchange.status == ExchangeStatus.COMPLETED),
+            ),
+            per_minute(
+                EXCHANGE_CANCELLED,
+                Exchange.cancelled_at,
+                and_(with_food, Exchange.status == ExchangeStatus.CANCELLED),
+            ),
+            per_minute(
+                CREDIT_TRANSFER,
+                Exchange.credits_transferred_at,
+                and_(with_food, Exchange.credits_transferred.is_(True)),
+                amount=Exchange.credit_amount,
+            ),
+        )
@@ -0,0 +1,642 @@
+"""Credit account service."""
+
+import hashlib
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import ARRAY, any_, bindparam, func, literal, select, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..models.credit import (
+    Credit,
+    CreditOperation,
+    CreditOperationStatus,
+    CreditTransaction,
+    TransactionType,
+)
+from ..models.exchange import Exchange
+from ..models.user import User
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class CreditService:
+    """Service for credit account operations."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_balance(self, user_id: str) -> Optional[Credit]:
+        """Get a user's credit account."""
+        try:
+            result = await self.db.execute(
+                select(Credit).where(Credit.user_id == user_id)
+            )
+            return result.scalar_one_or_none()
+        except Exception as e:
+            logger.error("Error getting credit balance", user_id=user_id, error=str(e))
+            return None
+
+    async def initialize_user_credits(self, user_id: str) -> Optional[Credit]:
+        """Create a user's credit account with the signup bonus if missing."""
+        try:
+            credit = await self.get_balance(user_id)
+            if credit:
+                return credit
+
+            initial_balance = settings.credit_initial_balance
+            credit = Credit(
+                user_id=user_id,
+                balance=initial_balance,
+                lifetime_earned=initial_balance,
+                lifetime_spent=0,
+            )
+            self.db.add(credit)
+
+            self.db.add(CreditTransaction(
+                user_id=user_id,
+                transaction_type=TransactionType.BONUS_SIGNUP,
+                amount=initial_balance,
+                balance_before=0,
+                balance_after=initial_balance,
+                description=f"Welcome bonus: {initial_balance} credits",
+            ))
+
+            await self.db.commit()
+            await self.db.refresh(credit)
+
+            logger.info("Credit account initialized", user_id=user_id, balance=initial_balance)
+            return credit
+
+        except Exception as e:
+            logger.error("Error initializing credits", user_id=user_id, error=str(e))
+            await self.db.rollback()
+            return None
+
+    async def get_user_transactions(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+    ) -> List[CreditTransaction]:
+        """Get a user's credit transactions, newest first.
+
+        Passing ``since`` lets the planner skip older monthly partitions.
+        """
+        try:
+            query = (
+                select(CreditTransaction)
+                .where(CreditTransaction.user_id == user_id)
+                .order_by(CreditTransaction.created_at.desc())
+                .limit(limit)
+                .offset(offset)
+            )
+            if since is not None:
+                query = query.where(CreditTransaction.created_at >= since)
+            result = await self.db.execute(query)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error("Error getting credit transactions", user_id=user_id, error=str(e))
+            return []
+
+    async def transfer_exchange_credits(self, exchange_id: str) -> bool:
+        """Move an exchange's credits from recipient to sharer.
+
+        One statement debits the recipient, credits the sharer, writes both
+        ledger rows and marks the exchange transferred. Nothing changes if the
+        credits were already transferred, an account is missing or the
+        recipient cannot cover the amount.
+        """
+        try:
+            target = (
+                select(
+                    Exchange.id,
+                    Exchange.sharer_id,
+                    Exchange.recipient_id,
+                    Exchange.food_id,
+                    Exchange.credit_amount,
+                )
+                .where(Exchange.id == exchange_id)
+                .where(Exchange.credits_transferred.is_(False))
+                .with_for_update()
+                .cte("target")
+            )
+
+            sharer_credit = aliased(Credit)
+            sharer_account = select(sharer_credit.id).where(sharer_credit.user_id == target.c.sharer_id)
+            debited = (
+                update(Credit)
+                .where(Credit.user_id == target.c.recipient_id)
+                .where(Credit.balance >= target.c.credit_amount)
+                .where(sharer_account.exists())
+                .values(
+                    balance=Credit.balance - target.c.credit_amount,
+                    lifetime_spent=Credit.lifetime_spent + target.c.credit_amount,
+                )
+                .returning(
+                    Credit.user_id,
+                    Credit.balance,
+                    target.c.id.label("exchange_id"),
+                    target.c.food_id,
+                    target.c.credit_amount,
+                )
+                .cte("debited")
+            )
+
+            credited = (
+                update(Credit)
+                .where(Credit.user_id == target.c.sharer_id)
+                .where(target.c.id == debited.c.exchange_id)
+                .values(
+                    balance=Credit.balance + target.c.credit_amount,
+                    lifetime_earned=Credit.lifetime_earned + target.c.credit_amount,
+                )
+                .returning(
+                    Credit.user_id,
+                    Credit.balance,
+                    target.c.id.label("exchange_id"),
+                    target.c.food_id,
+                    target.c.credit_amount,
+                )
+                .cte("credited")
+            )
+
+            marked = (
+                update(Exchange)
+                .where(Exchange.id == credited.c.exchange_id)
+                .values(credits_transferred=True, credits_transferred_at=datetime.utcnow())
+                .returning(Exchange.id)
+                .cte("marked")
+            )
+
+            ledger_columns = [
+                "id",
+                "user_id",
+                "transaction_type",
+                "amount",
+                "balance_before",
+                "balance_after",
+                "description",
+                "exchange_id",
+                "food_id",
+            ]
+            ledger = (
+                pg_insert(CreditTransaction)
+                .from_select(
+                    ledger_columns,
+                    select(
+                        func.gen_random_uuid(),
+                        debited.c.user_id,
+                        literal(TransactionType.SPENT_CLAIMING.value),
+                        -debited.c.credit_amount,
+                        debited.c.balance + debited.c.credit_amount,
+                        debited.c.balance,
+                        literal("Claimed food from exchange"),
+                        debited.c.exchange_id,
+                        debited.c.food_id,
+                    ).union_all(
+                        select(
+                            func.gen_random_uuid(),
+                            credited.c.user_id,
+                            literal(TransactionType.EARNED_SHARING.value),
+                            credited.c.credit_amount,
+                            credited.c.balance - credited.c.credit_amount,
+                            credited.c.balance,
+                            literal("Earned from sharing food"),
+                            credited.c.exchange_id,
+                            credited.c.food_id,
+                        )
+                    ),
+                )
+                .returning(CreditTransaction.id)
+                .cte("ledger")
+            )
+
+            statement = select(
+                select(func.count()).select_from(marked).scalar_subquery().label("transferred"),
+            ).add_cte(ledger)
+            transferred = (await self.db.execute(statement)).scalar_one()
+
+            if not transferred:
+                logger.error("Credits not transferred", exchange_id=exchange_id)
+                return False
+
+            logger.info("Credits transferred", exchange_id=exchange_id)
+            return True
+
+        except Exception as e:
+            logger.error(
+                "Error transferring credits",
+                exchange_id=exchange_id,
+                error=str(e),
+                exc_info=True,
+            )
+            return False
+
+    async def bulk_adjust(
+        self,
+        operation_key: str,
+        amount: int,
+        transaction_type: TransactionType = TransactionType.ADJUSTMENT_ADMIN,
+        user_ids: Optional[List[str]] = None,
+        building_id: Optional[str] = None,
+        description: Optional[str] = None,
+        created_by_id: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """Apply a credit adjustment to every matching account.
+
+        Balances and ledger rows are written with one set-based statement per
+        chunk, and each chunk commits on its own. Debits skip accounts that
+        would go negative. Re-running a key resumes an interrupted operation
+        and is a no-op once the operation has completed; callers targeting
+        explicit ``user_ids`` must pass the same set again.
+        """
+        if amount == 0:
+            raise ValueError("Amount must be non-zero")
+
+        def build_chunk(operation: CreditOperation) -> Select:
+            targets = (
+                select(Credit.user_id)
+                .join(User, User.id == Credit.user_id)
+                .where(*self._target_filters(Credit.user_id, user_ids, building_id))
+                .order_by(Credit.user_id)
+                .limit(chunk_size)
+            )
+            if operation.last_user_id:
+                targets = targets.where(Credit.user_id > operation.last_user_id)
+            targets = targets.cte("targets")
+
+            updated = (
+                update(Credit)
+                .where(Credit.user_id == targets.c.user_id)
+                .where(Credit.balance + amount >= 0)
+                .values(
+                    balance=Credit.balance + amount,
+                    lifetime_earned=Credit.lifetime_earned + max(amount, 0),
+                    lifetime_spent=Credit.lifetime_spent + max(-amount, 0),
+                )
+                .returning(Credit.user_id, Credit.balance)
+                .cte("updated")
+            )
+
+            ledger = select(
+                func.gen_random_uuid(),
+                updated.c.user_id,
+                literal(transaction_type.value),
+                literal(amount),
+                updated.c.balance - amount,
+                updated.c.balance,
+                literal(description, type_=CreditTransaction.description.type),
+                literal(created_by_id, type_=CreditTransaction.created_by_id.type),
+                literal(operation.id, type_=CreditTransaction.operation_id.type),
+            )
+            return self._chunk_statement(operation, targets, ledger)
+
+        return await self._run_chunked(
+            operation_key=operation_key,
+            transaction_type=transaction_type,
+            amount=amount,
+            user_ids=user_ids,
+            building_id=building_id,
+            description=description,
+            created_by_id=created_by_id,
+            build_chunk=build_chunk,
+        )
+
+    async def bulk_initialize_accounts(
+        self,
+        operation_key: str,
+        user_ids: Optional[List[str]] = None,
+        building_id: Optional[str] = None,
+        initial_balance: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """Create credit accounts with the signup bonus for users lacking one."""
+        if initial_balance is None:
+            initial_balance = settings.credit_initial_balance
+        description = f"Welcome bonus: {initial_balance} credits"
+
+        def build_chunk(operation: CreditOperation) -> Select:
+            targets = (
+                select(User.id.label("user_id"))
+                .outerjoin(Credit, Credit.user_id == User.id)
+                .where(Credit.id.is_(None))
+                .where(*self._target_filters(User.id, user_ids, building_id))
+                .order_by(User.id)
+                .limit(chunk_size)
+            )
+            if operation.last_user_id:
+                targets = targets.where(User.id > operation.last_user_id)
+            targets = targets.cte("targets")
+
+            updated = (
+                pg_insert(Credit)
+                .from_select(
+                    ["id", "user_id", "balance", "lifetime_earned", "lifetime_spent"],
+                    select(
+                        func.gen_random_uuid(),
+                        targets.c.user_id,
+                        literal(initial_balance),
+                        literal(initial_balance),
+                        literal(0),
+                    ),
+                )
+                .on_conflict_do_nothing(index_elements=[Credit.user_id])
+                .returning(Credit.user_id, Credit.balance)
+                .cte("updated")
+            )
+
+            ledger = select(
+                func.gen_random_uuid(),
+                updated.c.user_id,
+                literal(TransactionType.BONUS_SIGNUP.value),
+                literal(initial_balance),
+                literal(0),
+                updated.c.balance,
+                literal(description),
+                literal(None, type_=CreditTransaction.created_by_id.type),
+                literal(operation.id, type_=CreditTransaction.operation_id.type),
+            )
+            return self._chunk_statement(operation, targets, ledger)
+
+        return await self._run_chunked(
+            operation_key=operation_key,
+            transaction_type=TransactionType.BONUS_SIGNUP,
+            amount=initial_balance,
+            user_ids=user_ids,
+            building_id=building_id,
+            description=description,
+            created_by_id=None,
+            build_chunk=build_chunk,
+        )
+
+    @staticmethod
+    def _target_filters(
+        user_id_column: Any,
+        user_ids: Optional[List[str]],
+        building_id: Optional[str],
+    ) -> List[Any]:
+        """Build WHERE clauses for a user set and/or building filter."""
+        filters = []
+        if user_ids:
+            filters.append(
+                user_id_column == any_(
+                    bindparam(
+                        "target_user_ids",
+                        value=list(user_ids),
+                        type_=ARRAY(UUID(as_uuid=False)),
+                    )
+                )
+            )
+        if building_id:
+            filters.append(User.building_id == building_id)
+        return filters
+
+    @staticmethod
+    def _target_fingerprint(
+        transaction_type: TransactionType,
+        amount: int,
+        user_ids: Optional[List[str]],
+        building_id: Optional[str],
+    ) -> str:
+        """Fingerprint operation parameters so a key cannot be reused for a different run."""
+        parts = [
+            transaction_type.value,
+            str(amount),
+            building_id or "",
+            ",".join(sorted(user_ids or [])),
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _chunk_statement(operation: CreditOperation, targets: Any, ledger: Select) -> Select:
+        """Combine a chunk's balance update, ledger insert and progress update.
+
+        ``ledger`` selects from the ``updated`` CTE; everything runs as one
+        statement so the watermark moves atomically with the balances.
+        """
+        inserted = (
+            pg_insert(CreditTransaction)
+            .from_select(
+                [
+                    "id",
+                    "user_id",
+                    "transaction_type",
+                    "amount",
+                    "balance_before",
+                    "balance_after",
+                    "description",
+                    "created_by_id",
+                    "operation_id",
+                ],
+                ledger,
+            )
+            .returning(CreditTransaction.user_id)
+            .cte("inserted")
+        )
+
+        last_target = (
+            select(targets.c.user_id)
+            .order_by(targets.c.user_id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        target_count = select(func.count()).select_from(targets).scalar_subquery()
+        inserted_count = select(func.count()).select_from(inserted).scalar_subquery()
+
+        progress = (
+            update(CreditOperation)
+            .where(CreditOperation.id == operation.id)
+            .values(
+                last_user_id=func.coalesce(last_target, CreditOperation.last_user_id),
+                processed_count=CreditOperation.processed_count + inserted_count,
+                skipped_count=CreditOperation.skipped_count + target_count - inserted_count,
+            )
+            .returning(CreditOperation.id)
+            .cte("progress")
+        )
+
+        return select(
+            target_count.label("targets"),
+            inserted_count.label("applied"),
+        ).add_cte(progress)
+
+    async def _claim_operation(
+        self,
+        operation_key: str,
+        transaction_type: TransactionType,
+        amount: int,
+        fingerprint: str,
+        building_id: Optional[str],
+        description: Optional[str],
+        created_by_id: Optional[str],
+    ) -> CreditOperation:
+        """Get or create the operation row for an idempotency key."""
+        result = await self.db.execute(
+            select(CreditOperation).where(CreditOperation.operation_key == operation_key)
+        )
+        operation = result.scalar_one_or_none()
+
+        if operation is None:
+            operation = CreditOperation(
+                operation_key=operation_key,
+                target_fingerprint=fingerprint,
+                transaction_type=transaction_type,
+                amount=amount,
+                building_id=building_id,
+                description=description,
+                created_by_id=created_by_id,
+                status=CreditOperationStatus.RUNNING,
+            )
+            self.db.add(operation)
+            try:
+                await self.db.commit()
+            except IntegrityError:
+                # Another run registered the same key first
+                await self.db.rollback()
+                result = await self.db.execute(
+                    select(CreditOperation)
+                    .where(CreditOperation.operation_key == operation_key)
+                )
+                operation = result.scalar_one()
+
+        if operation.target_fingerprint != fingerprint:
+            raise ValueError(
+                f"Operation key '{operation_key}' was already used with different parameters"
+            )
+
+        return operation
+
+    async def _run_chunked(
+        self,
+        operation_key: str,
+        transaction_type: TransactionType,
+        amount: int,
+        user_ids: Optional[List[str]],
+        building_id: Optional[str],
+        description: Optional[str],
+        created_by_id: Optional[str],
+        build_chunk: Callable[[CreditOperation], Select],
+    ) -> Dict[str, Any]:
+        """Run chunk statements in separate transactions until no targets remain."""
+        if not user_ids and not building_id:
+            raise ValueError("Either user_ids or building_id is required")
+
+        started = time.perf_counter()
+        fingerprint = self._target_fingerprint(transaction_type, amount, user_ids, building_id)
+
+        try:
+            operation = await self._claim_operation(
+                operation_key=operation_key,
+                transaction_type=transaction_type,
+                amount=amount,
+                fingerprint=fingerprint,
+                building_id=building_id,
+                description=description,
+                created_by_id=created_by_id,
+            )
+
+            if operation.is_completed:
+                logger.info("Bulk credit operation already applied", operation_key=operation_key)
+                return self._summarize(
+                    operation, applied=0, chunks=0, started=started, already_applied=True
+                )
+
+            applied_total = 0
+            chunks = 0
+
+            while True:
+                # Lock the operation row so concurrent runs of the same key
+                # serialize and always read the latest watermark.
+                result = await self.db.execute(
+                    select(CreditOperation)
+                    .where(CreditOperation.id == operation.id)
+                    .with_for_update()
+                    .execution_options(populate_existing=True)
+                )
+                operation = result.scalar_one()
+                if operation.is_completed:
+                    await self.db.commit()
+                    break
+
+                row = (await self.db.execute(build_chunk(operation))).one()
+
+                if row.targets == 0:
+                    await self.db.execute(
+                        update(CreditOperation)
+                        .where(CreditOperation.id == operation.id)
+                        .values(
+                            status=CreditOperationStatus.COMPLETED,
+                            completed_at=datetime.utcnow(),
+                        )
+                    )
+                    await self.db.commit()
+                    break
+
+                await self.db.commit()
+                chunks += 1
+                applied_total += row.applied
+
+                logger.debug(
+                    "Bulk credit chunk applied",
+                    operation_key=operation_key,
+                    chunk=chunks,
+                    targets=row.targets,
+                    applied=row.applied,
+                )
+
+            result = await self.db.execute(
+                select(CreditOperation)
+                .where(CreditOperation.id == operation.id)
+                .execution_options(populate_existing=True)
+            )
+            operation = result.scalar_one()
+            summary = self._summarize(operation, applied=applied_total, chunks=chunks, started=started)
+
+            logger.info("Bulk credit operation finished", **summary)
+            return summary
+
+        except Exception as e:
+            logger.error(
+                "Error running bulk credit operation",
+                operation_key=operation_key,
+                error=str(e),
+                exc_info=True,
+            )
+            await self.db.rollback()
+            raise
+
+    @staticmethod
+    def _summarize(
+        operation: CreditOperation,
+        applied: int,
+        chunks: int,
+        started: float,
+        already_applied: bool = False,
+    ) -> Dict[str, Any]:
+        """Build the result reported back to callers."""
+        duration = time.perf_counter() - started
+        return {
+            "operation_key": operation.operation_key,
+            "status": operation.status,
+            "already_applied": already_applied,
+            "applied_this_run": applied,
+            "processed_total": operation.processed_count,
+            "skipped_total": operation.skipped_count,
+            "chunks": chunks,
+            "duration_seconds": round(duration, 3),
+            "rows_per_second": round(applied / duration, 1) if duration > 0 else 0.0,
+        }
@@ -5,14 +5,15 @@ from typing import List, Optional, Dict, Any
 
 from sqlalchemy import select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from ..core.config import get_settings
+from ..core.events import record_event
 from ..core.logging import get_logger, log_exchange_event
-from ..models.exchange import Exchange, ExchangeStatus
-from ..models.food import Food, FoodStatus
-from ..models.user import User
-from ..models.credit import Credit, CreditTransaction, TransactionType
+from ..models.exchange import Exchange, ExchangeAction, ExchangeStatus
+from .analytics_service import CREDIT_TRANSFER, EXCHANGE_CANCELLED, FOOD_COMPLETED
+from .credit_service import CreditService
+from .exchange_transitions import ExchangeTransitionExecutor, TransitionResult
+from .load_profiles import EXCHANGE_LOAD_OPTIONS, LoadProfile
 from .notification_service import NotificationService
 
 settings = get_settings()
@@ -25,17 +26,19 @@ class ExchangeService:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
         self.notification_service = NotificationService(db)
+        self.credit_service = CreditService(db)
+        self.transitions = ExchangeTransitionExecutor(db)
     
-    async def get_exchange_by_id(self, exchange_id: str) -> Optional[Exchange]:
+    async def get_exchange_by_id(
+        self,
+        exchange_id: str,
+        profile: LoadProfile = LoadProfile.FULL,
+    ) -> Optional[Exchange]:
         """Get exchange by ID."""
         try:
             result = await self.db.execute(
                 select(Exchange)
-                .options(
-                    selectinload(Exchange.sharer),
-                    selectinload(Exchange.recipient),
-                    selectinload(Exchange.food),
-                )
+                .options(*EXCHANGE_LOAD_OPTIONS[profile])
                 .where(Exchange.id == exchange_id)
             )
             return result.scalar_one_or_none()
@@ -52,47 +55,40 @@ class ExchangeService:
     ) -> bool:
         """Confirm participation in an exchange."""
         try:
-            exchange = await self.get_exchange_by_id(exchange_id)
-            if not exchange:
-                return False
+            values = {}
+            if notes:
+                values.update(self.transitions.for_role(
+                    user_id, Exchange.sharer_notes, Exchange.recipient_notes, notes
+                ))
             
-            # Check if user is part of the exchange
-            if user_id not in [exchange.sharer_id, exchange.recipient_id]:
+            result = await self.transitions.apply(
+                ExchangeAction.CONFIRM,
+                exchange_id,
+                user_id=user_id,
+                values=values,
+            )
+            if not result.applied:
                 logger.error(
-                    "User not part of exchange",
+                    "Cannot confirm exchange",
                     exchange_id=exchange_id,
                     user_id=user_id,
+                    reason=result.reason,
                 )
                 return False
             
-            # Confirm based on user role
-            confirmed = exchange.confirm_by_user(user_id)
-            if not confirmed:
-                logger.info(
-                    "User already confirmed",
-                    exchange_id=exchange_id,
-                    user_id=user_id,
-                )
-                return True  # Already confirmed
-            
-            # If both confirmed, update status
-            if exchange.is_confirmed:
-                exchange.status = ExchangeStatus.CONFIRMED
-                
-                # Send notifications
+            # Both parties confirmed with this call
+            if result.status_changed and result.status == ExchangeStatus.CONFIRMED:
                 await self.notification_service.send_exchange_confirmed(
                     exchange_id=exchange_id,
-                    sharer_id=exchange.sharer_id,
-                    recipient_id=exchange.recipient_id,
+                    sharer_id=result.sharer_id,
+                    recipient_id=result.recipient_id,
                 )
             
-            await self.db.flush()
-            
             log_exchange_event(
                 event="exchange_confirmed",
                 exchange_id=exchange_id,
-                sharer_id=exchange.sharer_id,
-                recipient_id=exchange.recipient_id,
+                sharer_id=result.sharer_id,
+                recipient_id=result.recipient_id,
                 confirmed_by=user_id,
             )
             
@@ -118,73 +114,59 @@ class ExchangeService:
     ) -> bool:
         """Complete an exchange and transfer credits."""
         try:
-            exchange = await self.get_exchange_by_id(exchange_id)
-            if not exchange:
-                return False
+            now = datetime.utcnow()
+            values = {"completed_at": now, "actual_pickup_at": now}
             
-            # Verify user is part of the exchange
-            if user_id not in [exchange.sharer_id, exchange.recipient_id]:
+            # Add rating if provided
+            if rating:
+                values.update(self.transitions.for_role(
+                    user_id, Exchange.sharer_rating, Exchange.recipient_rating, rating
+                ))
+                if notes:
+                    values.update(self.transitions.for_role(
+                        user_id, Exchange.sharer_notes, Exchange.recipient_notes, notes
+                    ))
+            
+            result = await self.transitions.apply(
+                ExchangeAction.COMPLETE,
+                exchange_id,
+                user_id=user_id,
+                values=values,
+            )
+            if not result.applied:
+                if result.reason == "invalid_status" and result.status == ExchangeStatus.COMPLETED:
+                    logger.info(
+                        "Exchange already completed",
+                        exchange_id=exchange_id,
+                    )
+                    return True
+                
                 logger.error(
-                    "User not part of exchange",
+                    "Cannot complete exchange",
                     exchange_id=exchange_id,
                     user_id=user_id,
+                    status=result.status,
+                    reason=result.reason,
                 )
                 return False
             
-            # Check if already completed
-            if exchange.status == ExchangeStatus.COMPLETED:
-                logger.info(
-                    "Exchange already completed",
-                    exchange_id=exchange_id,
-                )
-                return True
-            
-            # Mark as completed
-            success = exchange.complete()
-            if not success:
-                logger.error(
-                    "Exchange not confirmed, cannot complete",
-                    exchange_id=exchange_id,
-                    status=exchange.status,
-                )
-                return False
-            
-            # Add rating if provided
-            if rating:
-                if user_id == exchange.recipient_id:
-                    exchange.recipient_rating = rating
-                    if notes:
-                        exchange.recipient_notes = notes
-                elif user_id == exchange.sharer_id:
-                    exchange.sharer_rating = rating
-                    if notes:
-                        exchange.sharer_notes = notes
+            record_event(self.db, FOOD_COMPLETED, building_id=result.building_id)
             
             # Transfer credits
-            await self._transfer_credits(exchange)
-            
-            # Update food status
-            result = await self.db.execute(
-                select(Food).where(Food.id == exchange.food_id)
-            )
-            food = result.scalar_one_or_none()
-            if food:
-                food.status = FoodStatus.COMPLETED
-            
-            await self.db.flush()
+            await self._transfer_credits(result)
             
             # Send notifications
             await self.notification_service.send_exchange_completed(
                 exchange_id=exchange_id,
-                sharer_id=exchange.sharer_id,
-                recipient_id=exchange.recipient_id,
+                sharer_id=result.sharer_id,
+                recipient_id=result.recipient_id,
             )
             
             log_exchange_event(
                 event="exchange_completed",
                 exchange_id=exchange_id,
-                sharer_id=exchange.sharer_id,
-                recipient_id=exchange.recipient_id,
+                sharer_id=result.sharer_id,
+                recipient_id=result.recipient_id,
                 completed_by=user_id,
                 rating=rating,
             )
@@ -210,39 +192,34 @@ class ExchangeService:
     ) -> bool:
         """Cancel an exchange."""
         try:
-            exchange = await self.get_exchange_by_id(exchange_id)
-            if not exchange:
-                return False
-            
-            # Cancel the exchange
-            success = exchange.cancel_by_user(user_id, reason)
-            if not success:
+            # Cancel the exchange and release the food claim
+            result = await self.transitions.apply(
+                ExchangeAction.CANCEL,
+                exchange_id,
+                user_id=user_id,
+                values={
+                    "cancelled_by_id": user_id,
+                    "cancelled_at": datetime.utcnow(),
+                    "cancellation_reason": reason,
+                },
+            )
+            if not result.applied:
                 logger.error(
                     "Cannot cancel exchange",
                     exchange_id=exchange_id,
                     user_id=user_id,
-                    status=exchange.status,
+                    status=result.status,
+                    reason=result.reason,
                 )
                 return False
             
-            # Reset food status if needed
-            if exchange.status == ExchangeStatus.CANCELLED:
-                result = await self.db.execute(
-                    select(Food).where(Food.id == exchange.food_id)
-                )
-                food = result.scalar_one_or_none()
-                if food and food.status == FoodStatus.CLAIMED:
-                    food.status = FoodStatus.AVAILABLE
-                    food.claimed_by_id = None
-                    food.claimed_at = None
-            
-            await self.db.flush()
+            record_event(self.db, EXCHANGE_CANCELLED, building_id=result.building_id)
             
             # Send notifications
             other_user_id = (
-                exchange.recipient_id
-                if user_id == exchange.sharer_id
-                else exchange.sharer_id
+                result.recipient_id
+                if user_id == result.sharer_id
+                else result.sharer_id
             )
             await self.notification_service.send_exchange_cancelled(
                 exchange_id=exchange_id,
@@ -254,8 +231,8 @@ class ExchangeService:
             log_exchange_event(
                 event="exchange_cancelled",
                 exchange_id=exchange_id,
-                sharer_id=exchange.sharer_id,
-                recipient_id=exchange.recipient_id,
+                sharer_id=result.sharer_id,
+                recipient_id=result.recipient_id,
                 cancelled_by=user_id,
                 reason=reason,
             )
@@ -282,45 +259,43 @@ class ExchangeService:
     ) -> bool:
         """Mark an exchange as no-show."""
         try:
-            exchange = await self.get_exchange_by_id(exchange_id)
-            if not exchange:
-                return False
+            values = {"completed_at": datetime.utcnow()}
             
-            # Verify reporting user is part of the exchange
-            if user_id not in [exchange.sharer_id, exchange.recipient_id]:
+            # Add notes
+            if notes:
+                values.update(self.transitions.for_role(
+                    user_id, Exchange.sharer_notes, Exchange.recipient_notes, notes
+                ))
+            
+            result = await self.transitions.apply(
+                ExchangeAction.NO_SHOW,
+                exchange_id,
+                user_id=user_id,
+                values=values,
+            )
+            if not result.applied:
                 logger.error(
-                    "User not part of exchange",
+                    "Cannot mark no-show",
                     exchange_id=exchange_id,
                     user_id=user_id,
+                    status=result.status,
+                    reason=result.reason,
                 )
                 return False
             
-            # Update status
-            exchange.status = ExchangeStatus.NO_SHOW
-            exchange.completed_at = datetime.utcnow()
-            
-            # Add notes
-            if notes:
-                if user_id == exchange.sharer_id:
-                    exchange.sharer_notes = notes
-                else:
-                    exchange.recipient_notes = notes
-            
             # Return credits to appropriate party
-            if no_show_user_id == exchange.recipient_id:
+            if no_show_user_id == result.recipient_id:
                 # Recipient didn't show, no credits transferred
                 pass
             else:
                 # Sharer didn't show, refund recipient's credits
-                await self._refund_credits(exchange)
-            
-            await self.db.flush()
+                await self._refund_credits(result)
             
             log_exchange_event(
                 event="exchange_no_show",
                 exchange_id=exchange_id,
-                sharer_id=exchange.sharer_id,
-                recipient_id=exchange.recipient_id,
+                sharer_id=result.sharer_id,
+                recipient_id=result.recipient_id,
                 reported_by=user_id,
                 no_show_user=no_show_user_id,
             )
@@ -345,14 +320,11 @@ class ExchangeService:
         status: Optional[ExchangeStatus] = None,
         limit: int = 20,
         offset: int = 0,
+        profile: LoadProfile = LoadProfile.SUMMARY,
     ) -> List[Exchange]:
         """Get user's exchanges."""
         try:
-            query = select(Exchange).options(
-                selectinload(Exchange.sharer),
-                selectinload(Exchange.recipient),
-                selectinload(Exchange.food),
-            )
+            query = select(Exchange).options(*EXCHANGE_LOAD_OPTIONS[profile])
             
             # Filter by role
             if role == "sharer":
@@ -394,16 +366,13 @@ class ExchangeService:
     async def get_active_exchanges(
         self,
         user_id: str,
+        profile: LoadProfile = LoadProfile.SUMMARY,
     ) -> List[Exchange]:
         """Get user's active exchanges (pending/confirmed)."""
         try:
             result = await self.db.execute(
                 select(Exchange)
-                .options(
-                    selectinload(Exchange.sharer),
-                    selectinload(Exchange.recipient),
-                    selectinload(Exchange.food),
-                )
+                .options(*EXCHANGE_LOAD_OPTIONS[profile])
                 .where(
                     or_(
                         Exchange.sharer_id == user_id,
@@ -431,108 +400,33 @@ class ExchangeService:
             )
             return []
     
-    async def _transfer_credits(self, exchange: Exchange) -> bool:
+    async def _transfer_credits(self, exchange: TransitionResult) -> bool:
         """Transfer credits from recipient to sharer."""
-        try:
-            if exchange.credits_transferred:
-                logger.info(
-                    "Credits already transferred",
-                    exchange_id=exchange.id,
-                )
-                return True
-            
-            # Get credit accounts
-            recipient_credit_result = await self.db.execute(
-                select(Credit).where(Credit.user_id == exchange.recipient_id)
-            )
-            recipient_credit = recipient_credit_result.scalar_one_or_none()
-            
-            sharer_credit_result = await self.db.execute(
-                select(Credit).where(Credit.user_id == exchange.sharer_id)
-            )
-            sharer_credit = sharer_credit_result.scalar_one_or_none()
-            
-            if not recipient_credit or not sharer_credit:
-                logger.error(
-                    "Credit accounts not found",
-                    recipient_id=exchange.recipient_id,
-                    sharer_id=exchange.sharer_id,
-                )
-                return False
-            
-            # Transfer credits
-            amount = exchange.credit_amount
-            
-            # Deduct from recipient
-            if not recipient_credit.spend_credits(amount):
-                logger.error(
-                    "Insufficient credits",
-                    user_id=exchange.recipient_id,
-                    required=amount,
-                    available=recipient_credit.balance,
-                )
-                return False
-            
-            # Add to sharer
-            sharer_credit.add_credits(amount)
-            
-            # Create transaction records
-            recipient_transaction = CreditTransaction.create_transaction(
-                user_id=exchange.recipient_id,
-                transaction_type=TransactionType.SPENT_CLAIMING,
-                amount=-amount,
-                balance_before=recipient_credit.balance + amount,
-                balance_after=recipient_credit.balance,
-                description=f"Claimed food from exchange",
-                exchange_id=exchange.id,
-                food_id=exchange.food_id,
-            )
-            
-            sharer_transaction = CreditTransaction.create_transaction(
-                user_id=exchange.sharer_id,
-                transaction_type=TransactionType.EARNED_SHARING,
-                amount=amount,
-                balance_before=sharer_credit.balance - amount,
-                balance_after=sharer_credit.balance,
-                description=f"Earned from sharing food",
-                exchange_id=exchange.id,
-                food_id=exchange.food_id,
-            )
-            
-            self.db.add(recipient_transaction)
-            self.db.add(sharer_transaction)
-            
-            # Mark as transferred
-            exchange.credits_transferred = True
-            exchange.credits_transferred_at = datetime.utcnow()
-            
+        if exchange.credits_transferred:
             logger.info(
-                "Credits transferred",
-                exchange_id=exchange.id,
-                amount=amount,
-                from_user=exchange.recipient_id,
-                to_user=exchange.sharer_id,
+                "Credits already transferred",
+                exchange_id=exchange.exchange_id,
             )
-            
             return True
-            
-        except Exception as e:
-            logger.error(
-                "Error transferring credits",
-                exchange_id=exchange.id,
-                error=str(e),
-                exc_info=True,
+        
+        transferred = await self.credit_service.transfer_exchange_credits(exchange.exchange_id)
+        if transferred:
+            record_event(
+                self.db,
+                CREDIT_TRANSFER,
+                building_id=exchange.building_id,
+                amount=exchange.credit_amount,
             )
-            return False
+        return transferred
     
-    async def _refund_credits(self, exchange: Exchange) -> bool:
+    async def _refund_credits(self, exchange: TransitionResult) -> bool:
         """Refund credits to recipient if exchange is cancelled."""
         try:
             # Only refund if credits were reserved but not transferred
             if exchange.credits_transferred:
                 logger.info(
                     "Credits already transferred, no refund",
-                    exchange_id=exchange.id,
+                    exchange_id=exchange.exchange_id,
                 )
                 return False
             
@@ -541,7 +435,7 @@ class ExchangeService:
             
             logger.info(
                 "No credits to refund (not yet transferred)",
-                exchange_id=exchange.id,
+                exchange_id=exchange.exchange_id,
             )
             
             return True
@@ -549,7 +443,7 @@ class ExchangeService:
         except Exception as e:
             logger.error(
                 "Error refunding credits",
-                exchange_id=exchange.id,
+                exchange_id=exchange.exchange_id,
                 error=str(e),
                 exc_info=True,
             )
@@ -561,33 +455,18 @@ class ExchangeService:
             # Expire unconfirmed exchanges after 30 minutes
             expiry_time = datetime.utcnow() - timedelta(minutes=30)
             
-            result = await self.db.execute(
-                select(Exchange)
-                .where(Exchange.status == ExchangeStatus.PENDING)
-                .where(Exchange.created_at <= expiry_time)
+            results = await self.transitions.apply_bulk(
+                ExchangeAction.EXPIRE,
+                Exchange.status == ExchangeStatus.PENDING,
+                Exchange.created_at <= expiry_time,
+                values={
+                    "cancelled_at": datetime.utcnow(),
+                    "cancellation_reason": "Expired - not confirmed in time",
+                },
             )
-            expired_exchanges = result.scalars().all()
-            
-            count = 0
-            for exchange in expired_exchanges:
-                exchange.status = ExchangeStatus.CANCELLED
-                exchange.cancelled_at = datetime.utcnow()
-                exchange.cancellation_reason = "Expired - not confirmed in time"
-                
-                # Reset food status
-                food_result = await self.db.execute(
-                    select(Food).where(Food.id == exchange.food_id)
-                )
-                food = food_result.scalar_one_or_none()
-                if food and food.status == FoodStatus.CLAIMED:
-                    food.status = FoodStatus.AVAILABLE
-                    food.claimed_by_id = None
-                    food.claimed_at = None
-                
-                count += 1
             
+            count = len(results)
             if count > 0:
-                await self.db.flush()
                 logger.info(f"Expired {count} unconfirmed exchanges")
             
             return count
@@ -595,4 +474,4 @@ class ExchangeService:
         except Exception as e:
             logger.error("Error expiring old exchanges", error=str(e), exc_info=True)
             await self.db.rollback()
-            return 0
\ No newline at end of file
+            return 0
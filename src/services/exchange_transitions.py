@@ -0,0 +1,295 @@
+"""Exchange state transition executor."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from ..core.logging import get_logger
+from ..models.exchange import (
+    EXCHANGE_TRANSITIONS,
+    Exchange,
+    ExchangeAction,
+    ExchangeStatus,
+    ExchangeTransition,
+)
+from ..models.food import Food
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TransitionResult:
+    """Outcome of an exchange transition."""
+    exchange_id: str
+    applied: bool
+    status: Optional[ExchangeStatus] = None
+    previous_status: Optional[ExchangeStatus] = None
+    sharer_id: Optional[str] = None
+    recipient_id: Optional[str] = None
+    food_id: Optional[str] = None
+    building_id: Optional[str] = None
+    credit_amount: int = 0
+    credits_transferred: bool = False
+    food_updated: bool = False
+    # Why a transition was not applied
+    reason: Optional[str] = None
+
+    @property
+    def status_changed(self) -> bool:
+        """Check if the transition moved the exchange to a new status."""
+        return self.applied and self.status != self.previous_status
+
+
+class ExchangeTransitionExecutor:
+    """Apply exchange transitions from ``EXCHANGE_TRANSITIONS``.
+
+    Each transition is a single statement: the exchange UPDATE is guarded by
+    the allowed source statuses (and participant/confirmation checks), and
+    the matching food UPDATE runs in the same statement. Relationships are
+    never loaded here; a guard miss costs one extra SELECT to report why.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def apply(
+        self,
+        action: ExchangeAction,
+        exchange_id: str,
+        user_id: Optional[str] = None,
+        values: Optional[Dict[str, Any]] = None,
+    ) -> TransitionResult:
+        """Apply a transition to one exchange."""
+        statement = self.build_statement(
+            action,
+            Exchange.id == exchange_id,
+            user_id=user_id,
+            values=values,
+        )
+        row = (await self.db.execute(statement)).one_or_none()
+
+        if row is None:
+            return await self._diagnose(action, exchange_id, user_id)
+
+        return self._to_result(row)
+
+    async def apply_bulk(
+        self,
+        action: ExchangeAction,
+        *criteria: Any,
+        values: Optional[Dict[str, Any]] = None,
+    ) -> List[TransitionResult]:
+        """Apply a system transition to every exchange matching ``criteria``.
+
+        Rows locked by a concurrent user transition are skipped and picked
+        up on the next run.
+        """
+        transition = EXCHANGE_TRANSITIONS[action]
+        if transition.participant_only:
+            raise ValueError(f"Transition '{action.value}' requires a participant")
+
+        statement = self.build_statement(action, *criteria, values=values, skip_locked=True)
+        rows = (await self.db.execute(statement)).all()
+        return [self._to_result(row) for row in rows]
+
+    def build_statement(
+        self,
+        action: ExchangeAction,
+        *criteria: Any,
+        user_id: Optional[str] = None,
+        values: Optional[Dict[str, Any]] = None,
+        skip_locked: bool = False,
+    ) -> Select:
+        """Build the combined exchange and food UPDATE for a transition."""
+        transition = EXCHANGE_TRANSITIONS[action]
+
+        # Lock target rows and remember their current status
+        previous = (
+            select(Exchange.id, Exchange.status)
+            .where(*criteria)
+            .with_for_update(skip_locked=skip_locked)
+            .cte("previous")
+        )
+
+        guards = [
+            Exchange.id == previous.c.id,
+            Exchange.status.in_(transition.from_statuses),
+        ]
+        if transition.participant_only:
+            guards.append(
+                or_(Exchange.sharer_id == user_id, Exchange.recipient_id == user_id)
+            )
+        if transition.requires_confirmation:
+            guards.append(Exchange.sharer_confirmed.is_(True))
+            guards.append(Exchange.recipient_confirmed.is_(True))
+
+        exchange_values = self._status_values(transition, user_id)
+        exchange_values.update(values or {})
+
+        updated = (
+            update(Exchange)
+            .where(*guards)
+            .values(**exchange_values)
+            .returning(
+                Exchange.id,
+                Exchange.status,
+                previous.c.status.label("previous_status"),
+                Exchange.sharer_id,
+                Exchange.recipient_id,
+                Exchange.food_id,
+                Exchange.credit_amount,
+                Exchange.credits_transferred,
+            )
+            .cte("updated")
+        )
+
+        # The food's building, for per-building analytics
+        building_id = (
+            select(Food.building_id)
+            .where(Food.id == updated.c.food_id)
+            .scalar_subquery()
+            .label("building_id")
+        )
+
+        if transition.food_to_status is None:
+            return select(updated, building_id, true().label("food_updated"))
+
+        food_guards = [Food.id == updated.c.food_id]
+        if transition.food_from_statuses:
+            food_guards.append(Food.status.in_(transition.food_from_statuses))
+
+        food_values: Dict[str, Any] = {"status": transition.food_to_status}
+        if transition.release_food_claim:
+            food_values.update(claimed_by_id=None, claimed_at=None)
+
+        food_updated = (
+            update(Food)
+            .where(*food_guards)
+            .values(**food_values)
+            .returning(Food.id)
+            .cte("food_updated")
+        )
+
+        return select(
+            updated,
+            building_id,
+            food_updated.c.id.is_not(None).label("food_updated"),
+        ).select_from(
+            updated.outerjoin(food_updated, food_updated.c.id == updated.c.food_id)
+        )
+
+    @staticmethod
+    def for_role(
+        user_id: str,
+        sharer_column: Any,
+        recipient_column: Any,
+        value: Any,
+    ) -> Dict[str, Any]:
+        """Set ``value`` on the sharer or recipient column, whichever ``user_id`` is."""
+        return {
+            sharer_column.key: case(
+                (Exchange.sharer_id == user_id, value), else_=sharer_column
+            ),
+            recipient_column.key: case(
+                (Exchange.recipient_id == user_id, value), else_=recipient_column
+            ),
+        }
+
+    def _status_values(
+        self,
+        transition: ExchangeTransition,
+        user_id: Optional[str],
+    ) -> Dict[str, Any]:
+        """Column values that move the exchange to its next status."""
+        if transition.to_status is not None:
+            return {"status": transition.to_status}
+
+        # Confirmation: mark the caller's side, and move to CONFIRMED once
+        # both sides are in. SET expressions see the pre-update row.
+        now = datetime.utcnow()
+        sharer_done = or_(Exchange.sharer_confirmed.is_(True), Exchange.sharer_id == user_id)
+        recipient_done = or_(Exchange.recipient_confirmed.is_(True), Exchange.recipient_id == user_id)
+        return {
+            "sharer_confirmed": sharer_done,
+            "recipient_confirmed": recipient_done,
+            "sharer_confirmed_at": case(
+                (Exchange.sharer_confirmed.is_(True), Exchange.sharer_confirmed_at),
+                (Exchange.sharer_id == user_id, now),
+                else_=Exchange.sharer_confirmed_at,
+            ),
+            "recipient_confirmed_at": case(
+                (Exchange.recipient_confirmed.is_(True), Exchange.recipient_confirmed_at),
+                (Exchange.recipient_id == user_id, now),
+                else_=Exchange.recipient_confirmed_at,
+            ),
+            "status": case(
+                (sharer_done & recipient_done, ExchangeStatus.CONFIRMED.value),
+                else_=Exchange.status,
+            ),
+        }
+
+    async def _diagnose(
+        self,
+        action: ExchangeAction,
+        exchange_id: str,
+        user_id: Optional[str],
+    ) -> TransitionResult:
+        """Explain why a guarded transition matched no row."""
+        result = await self.db.execute(
+            select(Exchange).where(Exchange.id == exchange_id)
+        )
+        exchange = result.scalar_one_or_none()
+
+        if exchange is None:
+            return TransitionResult(exchange_id=exchange_id, applied=False, reason="not_found")
+
+        transition = EXCHANGE_TRANSITIONS[action]
+        if transition.participant_only and not exchange.is_participant(user_id):
+            reason = "not_participant"
+        elif exchange.status not in transition.from_statuses:
+            reason = "invalid_status"
+        elif transition.requires_confirmation and not exchange.is_confirmed:
+            reason = "not_confirmed"
+        else:
+            reason = "conflict"
+
+        logger.info(
+            "Exchange transition not applied",
+            exchange_id=exchange_id,
+            action=action.value,
+            status=exchange.status,
+            reason=reason,
+        )
+
+        return TransitionResult(
+            exchange_id=exchange_id,
+            applied=False,
+            status=ExchangeStatus(exchange.status),
+            previous_status=ExchangeStatus(exchange.status),
+            sharer_id=exchange.sharer_id,
+            recipient_id=exchange.recipient_id,
+            food_id=exchange.food_id,
+            credit_amount=exchange.credit_amount,
+            credits_transferred=exchange.credits_transferred,
+            reason=reason,
+        )
+
+    @staticmethod
+    def _to_result(row: Any) -> TransitionResult:
+        return TransitionResult(
+            exchange_id=row.id,
+            applied=True,
+            status=ExchangeStatus(row.status),
+            previous_status=ExchangeStatus(row.previous_status),
+            sharer_id=row.sharer_id,
+            recipient_id=row.recipient_id,
+            food_id=row.food_id,
+            building_id=row.building_id,
+            credit_amount=row.credit_amount,
+            credits_transferred=row.credits_transferred,
+            food_updated=bool(row.food_updated),
+        )
@@ -0,0 +1,216 @@
+"""Columnar export of history tables for offline analysis."""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    Numeric,
+    Table,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.logging import get_logger
+from ..models.credit import CreditTransaction
+from ..models.exchange import Exchange
+from ..models.food import Food
+
+logger = get_logger(__name__)
+
+# Exported tables and the column their incremental watermark follows
+EXPORT_TABLES: Dict[str, Tuple[Table, str]] = {
+    "foods": (Food.__table__, "updated_at"),
+    "exchanges": (Exchange.__table__, "updated_at"),
+    "credit_transactions": (CreditTransaction.__table__, "created_at"),
+}
+
+WATERMARKS_FILE = "_watermarks.json"
+
+
+@dataclass
+class ExportResult:
+    """Summary of one table export."""
+
+    table: str
+    rows: int = 0
+    seconds: float = 0.0
+    files: List[str] = field(default_factory=list)
+    bytes_written: int = 0
+    watermark: Optional[Dict[str, Any]] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def _arrow_type(column: Any) -> pa.DataType:
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    # Strings, text, UUIDs and enum values
+    return pa.string()
+
+
+class ExportService:
+    """Stream tables in chunks into Parquet files partitioned by day.
+
+    Rows are read with a server-side cursor ordered by the watermark
+    column, so only one chunk and one open file are held at a time. Each
+    run writes new ``part-<run>.parquet`` files under
+    ``<output>/<table>/date=YYYY-MM-DD/`` and records the last exported
+    ``(watermark, id)`` in ``<output>/_watermarks.json``; the next run
+    continues from there. Tables watermarked on ``updated_at`` re-export
+    changed rows, so readers should keep the latest version per ``id``.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        output_dir: str,
+        chunk_size: int = 10_000,
+        compression: str = "zstd",
+    ) -> None:
+        self.db = db
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.compression = compression
+
+    async def export_table(
+        self,
+        table_name: str,
+        full: bool = False,
+        lag_seconds: int = 60,
+    ) -> ExportResult:
+        """Export rows added or changed since the last run.
+
+        Rows newer than ``lag_seconds`` are left for the next run, since
+        transactions still in flight may commit rows with earlier
+        timestamps.
+        """
+        table, watermark_column = EXPORT_TABLES[table_name]
+        column = table.c[watermark_column]
+        schema = pa.schema([(c.name, _arrow_type(c)) for c in table.columns])
+        result = ExportResult(table=table_name)
+        run_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        started = time.perf_counter()
+
+        watermarks = self._load_watermarks()
+        previous = None if full else watermarks.get(table_name)
+
+        # Use the database clock; the timestamps come from its now()
+        until = (await self.db.execute(
+            select(func.localtimestamp() - timedelta(seconds=lag_seconds))
+        )).scalar_one()
+
+        statement = select(table).where(column < until).order_by(column, table.c.id)
+        if previous:
+            statement = statement.where(
+                tuple_(column, table.c.id)
+                > tuple_(
+                    literal(datetime.fromisoformat(previous["value"]), column.type),
+                    literal(previous["id"], table.c.id.type),
+                )
+            )
+
+        logger.info("Exporting table", table=table_name, since=previous, until=until)
+
+        writer: Optional[pq.ParquetWriter] = None
+        writer_day: Optional[date] = None
+        last_row = None
+        try:
+            stream = await self.db.stream(statement.execution_options(yield_per=self.chunk_size))
+            async for rows in stream.partitions():
+                # Rows arrive in watermark order, so each day is contiguous
+                for day, day_rows in self._split_by_day(rows, watermark_column):
+                    if day != writer_day:
+                        if writer is not None:
+                            writer.close()
+                        path = self._partition_path(table_name, day, run_id)
+                        writer = pq.ParquetWriter(path, schema, compression=self.compression)
+                        writer_day = day
+                        result.files.append(path)
+                    writer.write_table(self._to_arrow(day_rows, schema))
+                result.rows += len(rows)
+                last_row = rows[-1]
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if last_row is not None:
+            result.watermark = {
+                "column": watermark_column,
+                "value": getattr(last_row, watermark_column).isoformat(),
+                "id": str(last_row.id),
+            }
+            watermarks[table_name] = result.watermark
+            self._save_watermarks(watermarks)
+        else:
+            result.watermark = previous
+
+        result.seconds = time.perf_counter() - started
+        result.bytes_written = sum(os.path.getsize(path) for path in result.files)
+        logger.info(
+            "Table exported",
+            table=table_name,
+            rows=result.rows,
+            files=len(result.files),
+            bytes=result.bytes_written,
+            rows_per_second=round(result.rows_per_second),
+        )
+        return result
+
+    @staticmethod
+    def _split_by_day(rows: List[Any], column: str) -> List[Tuple[date, List[Any]]]:
+        groups: List[Tuple[date, List[Any]]] = []
+        for row in rows:
+            day = getattr(row, column).date()
+            if not groups or groups[-1][0] != day:
+                groups.append((day, []))
+            groups[-1][1].append(row)
+        return groups
+
+    @staticmethod
+    def _to_arrow(rows: List[Any], schema: pa.Schema) -> pa.Table:
+        columns = list(zip(*rows))
+        return pa.Table.from_arrays(
+            [pa.array(values, type=f.type) for values, f in zip(columns, schema)],
+            schema=schema,
+        )
+
+    def _partition_path(self, table_name: str, day: date, run_id: str) -> str:
+        directory = os.path.join(self.output_dir, table_name, f"date={day.isoformat()}")
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"part-{run_id}.parquet")
+
+    def _load_watermarks(self) -> Dict[str, Any]:
+        path = os.path.join(self.output_dir, WATERMARKS_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_watermarks(self, watermarks: Dict[str, Any]) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, WATERMARKS_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_path, path)
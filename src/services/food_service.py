@@ -7,15 +7,18 @@ from uuid import uuid4
 
 from sqlalchemy import select, and_, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from ..core.config import get_settings
+from ..core.events import record_event
 from ..core.logging import get_logger, log_food_action
+from ..core.lookup_cache import cached_lookup
 from ..models.food import Food, FoodStatus, FoodCategory, ServingSize
 from ..models.user import User
 from ..models.building import Building
 from ..models.exchange import Exchange, ExchangeStatus
 from ..models.credit import Credit, CreditTransaction, TransactionType
+from .analytics_service import FOOD_CLAIMED, FOOD_POSTED
+from .load_profiles import FOOD_LOAD_OPTIONS, LoadProfile
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -46,12 +49,8 @@ class FoodService:
     ) -> Optional[Food]:
         """Create a new food post."""
         try:
-            # Get user and validate
-            from sqlalchemy import select
-            result = await self.db.execute(
-                select(User).options(selectinload(User.building)).where(User.id == user_id)
-            )
-            user = result.scalar_one_or_none()
+            # Get user and validate (usually already in the session)
+            user = await self.db.get(User, user_id)
             
             if not user:
                 logger.error("User not found", user_id=user_id)
@@ -99,6 +98,7 @@ class FoodService:
             
             self.db.add(food)
             await self.db.flush()
+            record_event(self.db, FOOD_POSTED, building_id=food.building_id)
             
             log_food_action(
                 action="food_posted",
@@ -129,19 +129,22 @@ class FoodService:
             await self.db.rollback()
             return None
     
-    async def get_food_by_id(self, food_id: str) -> Optional[Food]:
+    async def get_food_by_id(
+        self,
+        food_id: str,
+        profile: LoadProfile = LoadProfile.FULL,
+    ) -> Optional[Food]:
         """Get food post by ID."""
-        try:
+        async def load() -> Optional[Food]:
             result = await self.db.execute(
                 select(Food)
-                .options(
-                    selectinload(Food.sharer),
-                    selectinload(Food.claimed_by),
-                    selectinload(Food.building),
-                )
+                .options(*FOOD_LOAD_OPTIONS[profile])
                 .where(Food.id == food_id)
             )
             return result.scalar_one_or_none()
+
+        try:
+            return await cached_lookup(self.db, Food, "id", food_id, load, profile.rank)
             
         except Exception as e:
             logger.error("Error getting food by ID", food_id=food_id, error=str(e))
@@ -156,25 +159,20 @@ class FoodService:
         exclude_allergens: Optional[List[str]] = None,
         limit: int = 20,
         offset: int = 0,
+        profile: LoadProfile = LoadProfile.SUMMARY,
     ) -> List[Food]:
         """Browse available food with filters."""
         try:
             # Get user's building if not specified
             if not building_id:
-                result = await self.db.execute(
-                    select(User).where(User.id == user_id)
-                )
-                user = result.scalar_one_or_none()
+                user = await self.db.get(User, user_id)
                 if user:
                     building_id = user.building_id
             
             # Build query
             query = (
                 select(Food)
-                .options(
-                    selectinload(Food.sharer),
-                    selectinload(Food.building),
-                )
+                .options(*FOOD_LOAD_OPTIONS[profile])
                 .where(Food.status == FoodStatus.AVAILABLE)
                 .where(Food.expires_at > datetime.utcnow())
                 .where(Food.sharer_id != user_id)  # Don't show own posts
@@ -237,6 +235,40 @@ class FoodService:
             )
             return []
     
+    async def get_building_food(
+        self,
+        building_id: str,
+        limit: int = 50,
+        profile: LoadProfile = LoadProfile.BARE,
+    ) -> List[Food]:
+        """Available food in a building, soonest pickup first.
+        
+        Unlike ``browse_available_food`` the sharer's own posts are
+        included, so the result can be shared between residents. Database
+        errors are raised rather than returned as an empty building, which
+        callers would cache.
+        """
+        try:
+            result = await self.db.execute(
+                select(Food)
+                .options(*FOOD_LOAD_OPTIONS[profile])
+                .where(Food.building_id == building_id)
+                .where(Food.status == FoodStatus.AVAILABLE)
+                .where(Food.expires_at > datetime.utcnow())
+                .order_by(Food.pickup_start)
+                .limit(limit)
+            )
+            return list(result.scalars().all())
+            
+        except Exception as e:
+            logger.error(
+                "Error getting building food",
+                building_id=building_id,
+                error=str(e),
+                exc_info=True,
+            )
+            raise
+    
     async def claim_food(
         self,
         food_id: str,
@@ -246,7 +278,7 @@ class FoodService:
         """Claim a food post."""
         try:
             # Get food post
-            food = await self.get_food_by_id(food_id)
+            food = await self.get_food_by_id(food_id, profile=LoadProfile.BARE)
             if not food:
                 logger.error("Food not found", food_id=food_id)
                 return None
@@ -300,6 +332,7 @@ class FoodService:
             # Credits are transferred when exchange is completed
             
             await self.db.flush()
+            record_event(self.db, FOOD_CLAIMED, building_id=food.building_id)
             
             log_food_action(
                 action="food_claimed",
@@ -337,7 +370,7 @@ class FoodService:
         """Unclaim a previously claimed food post."""
         try:
             # Get food post
-            food = await self.get_food_by_id(food_id)
+            food = await self.get_food_by_id(food_id, profile=LoadProfile.BARE)
             if not food:
                 return False
             
@@ -406,15 +439,13 @@ class FoodService:
         user_id: str,
         include_expired: bool = False,
         limit: int = 20,
+        profile: LoadProfile = LoadProfile.SUMMARY,
     ) -> List[Food]:
         """Get user's food posts."""
         try:
             query = (
                 select(Food)
-                .options(
-                    selectinload(Food.claimed_by),
-                    selectinload(Food.exchanges),
-                )
+                .options(*FOOD_LOAD_OPTIONS[profile])
                 .where(Food.sharer_id == user_id)
             )
             
@@ -443,7 +474,8 @@ class FoodService:
     ) -> Optional[Food]:
         """Update a food post."""
         try:
-            food = await self.get_food_by_id(food_id)
+            # Returned for the response, which shows the sharer
+            food = await self.get_food_by_id(food_id, profile=LoadProfile.SUMMARY)
             if not food:
                 return None
             
@@ -522,7 +554,7 @@ class FoodService:
     ) -> bool:
         """Manually expire a food post."""
         try:
-            food = await self.get_food_by_id(food_id)
+            food = await self.get_food_by_id(food_id, profile=LoadProfile.BARE)
             if not food:
                 return False
             
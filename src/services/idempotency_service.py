@@ -0,0 +1,280 @@
+"""Idempotency service for retried state-changing requests."""
+
+import hashlib
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import get_settings
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.idempotency import IdempotencyKey
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+# Scopes of the idempotent endpoints, used for hit-rate reporting
+SCOPE_FOOD_CLAIM = "food_claim"
+SCOPE_EXCHANGE_CONFIRM = "exchange_confirm"
+SCOPE_EXCHANGE_COMPLETE = "exchange_complete"
+IDEMPOTENCY_SCOPES = (SCOPE_FOOD_CLAIM, SCOPE_EXCHANGE_CONFIRM, SCOPE_EXCHANGE_COMPLETE)
+
+REQUESTS_METRIC = "idempotency_requests_total"
+
+# Deletes the pending marker only if this request still owns it
+_RELEASE_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if value and cjson.decode(value)['token'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyInProgress(Exception):
+    """Another request with the same key is still being processed."""
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """Key was already used for a request with different parameters."""
+
+
+@dataclass
+class IdempotentResult:
+    """Response of an idempotent request."""
+    body: Dict[str, Any]
+    status_code: int = 200
+    replayed: bool = False
+
+
+class IdempotencyService:
+    """Service for answering retried requests from a stored result.
+
+    Results are cached in Valkey and written to the ``idempotency_keys``
+    table in the same transaction as the state change. Valkey answers
+    repeats without touching the database; the table covers evicted keys
+    and is the final guard against concurrent duplicates.
+    """
+
+    def __init__(self, db: AsyncSession, redis_client: Optional[Redis] = None) -> None:
+        self.db = db
+        self.redis = redis_client
+        self.ttl_seconds = settings.idempotency_ttl_seconds
+        self.lock_seconds = settings.idempotency_lock_seconds
+
+    @staticmethod
+    def fingerprint(*parts: Any) -> str:
+        """Hash the request parameters a key is bound to."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _cache_key(scope: str, key: str) -> str:
+        return f"idempotency:{scope}:{key}"
+
+    async def execute(
+        self,
+        scope: str,
+        key: Optional[str],
+        fingerprint: str,
+        handler: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> IdempotentResult:
+        """Run ``handler`` and commit, or replay the stored result for ``key``.
+
+        ``handler`` performs the state change without committing and returns
+        the JSON-serializable response body. Without a key the handler simply
+        runs and commits.
+        """
+        if not key:
+            body = await handler()
+            await self.db.commit()
+            return IdempotentResult(body=body)
+
+        token = uuid.uuid4().hex
+        try:
+            stored = await self._begin(scope, key, fingerprint, token)
+        except Exception:
+            await self._release(scope, key, token)
+            raise
+        if stored is not None:
+            return stored
+
+        try:
+            body = await handler()
+            self.db.add(IdempotencyKey(
+                scope=scope,
+                key=key,
+                request_fingerprint=fingerprint,
+                status_code=200,
+                response_body=json.dumps(body, default=str),
+                expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds),
+            ))
+            await self.db.commit()
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            await self.db.rollback()
+            stored = await self._load_stored(scope, key, fingerprint)
+            if stored is None:
+                await self._release(scope, key, token)
+                raise
+            metrics.increment(REQUESTS_METRIC, scope=scope, result="hit")
+            await self._cache_result(scope, key, fingerprint, stored.body, stored.status_code)
+            return stored
+        except Exception:
+            await self._release(scope, key, token)
+            raise
+
+        await self._cache_result(scope, key, fingerprint, body, 200)
+        return IdempotentResult(body=body)
+
+    async def _begin(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        token: str,
+    ) -> Optional[IdempotentResult]:
+        """Return a stored result, or claim the key for this request."""
+        cache_key = self._cache_key(scope, key)
+
+        if self.redis is not None:
+            try:
+                pending = json.dumps({"state": "pending", "token": token})
+                acquired = await self.redis.set(cache_key, pending, nx=True, ex=self.lock_seconds)
+                if not acquired:
+                    cached = await self.redis.get(cache_key)
+                    if cached is not None:
+                        entry = json.loads(cached)
+                        if entry["state"] == "pending":
+                            metrics.increment(REQUESTS_METRIC, scope=scope, result="in_progress")
+                            raise IdempotencyInProgress(key)
+                        self._check_fingerprint(scope, key, entry["fingerprint"], fingerprint)
+                        metrics.increment(REQUESTS_METRIC, scope=scope, result="hit")
+                        metrics.increment("idempotency_hits_by_source_total", scope=scope, source="valkey")
+                        return IdempotentResult(
+                            body=entry["body"],
+                            status_code=entry["status_code"],
+                            replayed=True,
+                        )
+                    # Expired between SET and GET; take it now
+                    await self.redis.set(cache_key, pending, nx=True, ex=self.lock_seconds)
+            except RedisError as e:
+                logger.warning("Idempotency cache unavailable", scope=scope, error=str(e))
+                metrics.increment("idempotency_cache_errors_total", scope=scope)
+
+        stored = await self._load_stored(scope, key, fingerprint)
+        if stored is not None:
+            metrics.increment(REQUESTS_METRIC, scope=scope, result="hit")
+            metrics.increment("idempotency_hits_by_source_total", scope=scope, source="database")
+            await self._cache_result(scope, key, fingerprint, stored.body, stored.status_code)
+            return stored
+
+        metrics.increment(REQUESTS_METRIC, scope=scope, result="miss")
+        return None
+
+    async def _load_stored(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+    ) -> Optional[IdempotentResult]:
+        """Load an unexpired stored result from the database."""
+        result = await self.db.execute(
+            select(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+        )
+        record = result.scalar_one_or_none()
+        if record is None:
+            return None
+
+        if record.is_expired:
+            # Free the key for reuse; removed with this request's transaction
+            await self.db.delete(record)
+            await self.db.flush()
+            return None
+
+        self._check_fingerprint(scope, key, record.request_fingerprint, fingerprint)
+        return IdempotentResult(
+            body=json.loads(record.response_body),
+            status_code=record.status_code,
+            replayed=True,
+        )
+
+    @staticmethod
+    def _check_fingerprint(scope: str, key: str, stored: str, current: str) -> None:
+        if stored != current:
+            metrics.increment(REQUESTS_METRIC, scope=scope, result="mismatch")
+            raise IdempotencyKeyMismatch(
+                f"Idempotency key '{key}' was already used with different parameters"
+            )
+
+    async def _cache_result(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        body: Dict[str, Any],
+        status_code: int,
+    ) -> None:
+        """Store a completed result in Valkey."""
+        if self.redis is None:
+            return
+
+        entry = {
+            "state": "done",
+            "fingerprint": fingerprint,
+            "status_code": status_code,
+            "body": body,
+        }
+        try:
+            await self.redis.set(
+                self._cache_key(scope, key),
+                json.dumps(entry, default=str),
+                ex=self.ttl_seconds,
+            )
+        except RedisError as e:
+            logger.warning("Error caching idempotent result", scope=scope, error=str(e))
+            metrics.increment("idempotency_cache_errors_total", scope=scope)
+
+    async def _release(self, scope: str, key: str, token: str) -> None:
+        """Drop this request's pending marker so a retry can run."""
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.eval(_RELEASE_SCRIPT, 1, self._cache_key(scope, key), token)
+        except RedisError as e:
+            logger.warning("Error releasing idempotency key", scope=scope, error=str(e))
+
+    async def purge_expired(self) -> int:
+        """Delete expired stored results."""
+        try:
+            result = await self.db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.expires_at <= datetime.utcnow())
+            )
+            await self.db.commit()
+
+            logger.info("Purged expired idempotency keys", count=result.rowcount)
+            return result.rowcount
+
+        except Exception as e:
+            logger.error("Error purging idempotency keys", error=str(e))
+            await self.db.rollback()
+            return 0
+
+    @staticmethod
+    def hit_rates() -> Dict[str, Optional[float]]:
+        """Get the hit rate of each idempotent endpoint."""
+        return {
+            scope: metrics.hit_rate(REQUESTS_METRIC, scope=scope)
+            for scope in IDEMPOTENCY_SCOPES
+        }
@@ -0,0 +1,59 @@
+"""Relationship load profiles for service getters."""
+
+from enum import Enum
+from typing import Dict, Tuple
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from ..models.exchange import Exchange
+from ..models.food import Food
+from ..models.user import User
+
+
+class LoadProfile(str, Enum):
+    """How much of an object graph a getter loads."""
+    BARE = "bare"          # Columns only, no relationship queries
+    SUMMARY = "summary"    # Many-to-one relationships for list views, joined in the same query
+    FULL = "full"          # Everything the detail views use
+
+    @property
+    def rank(self) -> int:
+        """Order of the profile; a richer load can serve a poorer one."""
+        return list(LoadProfile).index(self)
+
+
+LoadOptions = Dict[LoadProfile, Tuple[LoaderOption, ...]]
+
+FOOD_LOAD_OPTIONS: LoadOptions = {
+    LoadProfile.BARE: (),
+    LoadProfile.SUMMARY: (joinedload(Food.sharer),),
+    LoadProfile.FULL: (
+        selectinload(Food.sharer),
+        selectinload(Food.claimed_by),
+        selectinload(Food.building),
+    ),
+}
+
+EXCHANGE_LOAD_OPTIONS: LoadOptions = {
+    LoadProfile.BARE: (),
+    LoadProfile.SUMMARY: (
+        joinedload(Exchange.sharer),
+        joinedload(Exchange.recipient),
+        joinedload(Exchange.food),
+    ),
+    LoadProfile.FULL: (
+        selectinload(Exchange.sharer),
+        selectinload(Exchange.recipient),
+        selectinload(Exchange.food),
+    ),
+}
+
+USER_LOAD_OPTIONS: LoadOptions = {
+    LoadProfile.BARE: (),
+    LoadProfile.SUMMARY: (joinedload(User.building),),
+    LoadProfile.FULL: (
+        selectinload(User.building),
+        selectinload(User.credit_account),
+    ),
+}
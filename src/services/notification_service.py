@@ -1,48 +1,275 @@
 """Notification service for Telegram messaging."""
 
-from typing import Optional, List, Dict, Any
+import asyncio
+import time
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterable, Tuple
 from datetime import datetime
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from telegram import Bot
-from telegram.error import TelegramError
 
 from ..core.config import get_settings
 from ..core.logging import get_logger
+from ..core.lookup_cache import cached_lookup
+from ..core.metrics import metrics
+from ..core.redis import init_redis
+from ..bot.templates import templates
 from ..models.user import User
 from ..models.food import Food
 from ..models.exchange import Exchange
+from .subscriber_index import SubscriberIndex
+
+if TYPE_CHECKING:
+    from telegram import Bot
 
 settings = get_settings()
 logger = get_logger(__name__)
 
 
+# Notification texts, compiled once; see ``bot.templates``
+FOOD_POSTED = templates.add(
+    "notification.food_posted",
+    """
+    ✅ *Food Posted Successfully!*
+
+    🍲 *{title}*
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {pickup_start:%I:%M %p} - {pickup_end:%I:%M %p}
+    ⭐ Credits: {credit_value}
+
+    Your food is now visible to neighbors in your building. You'll be notified when someone requests it.
+
+    Use /myposts to manage your active posts.
+    """,
+)
+
+NEW_FOOD_NEARBY = templates.add(
+    "notification.new_food_nearby",
+    """
+    🍽️ *New Food in Your Building!*
+
+    *{title}*
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {pickup_start:%I:%M %p} - {pickup_end:%I:%M %p}
+    ⭐ Credits: {credit_value}
+
+    Browse available food: /browse
+    """,
+)
+
+FOOD_REQUESTED = templates.add(
+    "notification.food_requested",
+    """
+    🔔 *New Food Request!*
+
+    {recipient_name} (Apt {apartment_number}) wants to claim:
+    *{title}*
+
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {pickup_start:%I:%M %p}
+
+    Please confirm this exchange within 30 minutes.
+
+    Reply with:
+    /confirm\\_{exchange_code} - Confirm exchange
+    /decline\\_{exchange_code} - Decline request
+    """,
+)
+
+REQUEST_SENT = templates.add(
+    "notification.request_sent",
+    """
+    ✅ *Food Request Sent!*
+
+    You've requested:
+    *{title}*
+
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {pickup_start:%I:%M %p} - {pickup_end:%I:%M %p}
+
+    The sharer will be notified. You'll receive a confirmation once they approve.
+
+    ⚠️ This request will expire in 30 minutes if not confirmed.
+
+    To cancel: /cancel\\_{exchange_code}
+    """,
+)
+
+EXCHANGE_CONFIRMED_SHARER = templates.add(
+    "notification.exchange_confirmed_sharer",
+    """
+    ✅ *Exchange Confirmed!*
+
+    {recipient_name} will pick up the food.
+
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {scheduled_pickup_at:%I:%M %p}
+    📱 Contact: @{contact}
+
+    Mark complete after handoff: /complete\\_{exchange_code}
+    """,
+)
+
+EXCHANGE_CONFIRMED_RECIPIENT = templates.add(
+    "notification.exchange_confirmed_recipient",
+    """
+    ✅ *Exchange Confirmed!*
+
+    Your pickup is confirmed with {sharer_name}.
+
+    📍 Pickup: {pickup_location}
+    ⏰ Time: {scheduled_pickup_at:%I:%M %p}
+    📱 Contact: @{contact}
+
+    ⭐ {credit_amount} credit(s) will be deducted after completion.
+
+    Mark complete after pickup: /complete\\_{exchange_code}
+    """,
+)
+
+EXCHANGE_COMPLETED_SHARER = templates.add(
+    "notification.exchange_completed_sharer",
+    """
+    🎉 *Exchange Complete!*
+
+    Thank you for sharing with {recipient_name}!
+    ⭐ You earned {credit_amount} credit(s).
+
+    Please rate this exchange: /rate\\_{exchange_code}
+    """,
+)
+
+EXCHANGE_COMPLETED_RECIPIENT = templates.add(
+    "notification.exchange_completed_recipient",
+    """
+    🎉 *Exchange Complete!*
+
+    Hope you enjoyed the food from {sharer_name}!
+    ⭐ {credit_amount} credit(s) have been deducted.
+
+    Please rate this exchange: /rate\\_{exchange_code}
+    """,
+)
+
+EXCHANGE_CANCELLED = templates.add(
+    "notification.exchange_cancelled",
+    """
+    ❌ *Exchange Cancelled*
+
+    {cancelled_by_name} has cancelled the exchange.
+
+    Reason: {reason}
+
+    The food is now available for others to claim.
+    """,
+)
+
+FOOD_EXPIRING = templates.add(
+    "notification.food_expiring",
+    """
+    ⏰ *Food Expiring Soon!*
+
+    Your post "{title}" will expire in {minutes} minutes.
+
+    No one has claimed it yet. Consider:
+    • Extending the pickup time
+    • Sharing in a community group
+    • Consuming it yourself
+
+    To extend: /extend\\_{food_code}
+    To cancel: /expire\\_{food_code}
+    """,
+)
+
+DAILY_SUMMARY = templates.add(
+    "notification.daily_summary",
+    """
+    📊 *Your Daily Summary*
+
+    *Today's Activity:*
+    🍲 Food shared: {food_shared}
+    🔍 Food claimed: {food_claimed}
+    ⭐ Credits earned: {credits_earned}
+    💰 Credit balance: {credit_balance}
+
+    *Community Impact:*
+    🌱 Food saved from waste: {food_saved} items
+    👥 Neighbors helped: {neighbors_helped}
+
+    Keep up the great work building our community!
+
+    Browse available food: /browse
+    Share something new: /share
+    """,
+)
+
+ADMIN_MESSAGE = templates.add(
+    "notification.admin_message",
+    """
+    🛡️ *Admin Message*
+
+    {message}
+
+    If you have questions, please contact support.
+    """,
+)
+
+
 class NotificationService:
     """Service for sending notifications via Telegram."""
     
-    def __init__(self, db: AsyncSession, bot: Optional[Bot] = None) -> None:
+    def __init__(self, db: AsyncSession, bot: Optional["Bot"] = None) -> None:
         self.db = db
         self._bot = bot
     
     @property
-    def bot(self) -> Optional[Bot]:
-        """Get or create bot instance."""
+    def bot(self) -> Optional["Bot"]:
+        """Get or create bot instance, throttled by the shared send governor."""
         if not self._bot and settings.telegram_bot_token:
+            # Imported on first use to keep API worker startup light
+            from telegram.ext import ExtBot
+
+            from ..bot.send_governor import get_send_governor
+
             try:
-                self._bot = Bot(token=settings.telegram_bot_token)
+                self._bot = ExtBot(
+                    token=settings.telegram_bot_token,
+                    rate_limiter=get_send_governor(),
+                )
             except Exception as e:
                 logger.error("Failed to initialize bot", error=str(e))
         return self._bot
     
+    async def _get_user(self, user_id: str) -> Optional[User]:
+        """Get a notification recipient, reusing the request's lookups."""
+        async def load() -> Optional[User]:
+            result = await self.db.execute(select(User).where(User.id == user_id))
+            return result.scalar_one_or_none()
+
+        return await cached_lookup(self.db, User, "id", user_id, load)
+    
+    async def _get_food(self, food_id: str) -> Optional[Food]:
+        """Get a food post, reusing the request's lookups."""
+        async def load() -> Optional[Food]:
+            result = await self.db.execute(select(Food).where(Food.id == food_id))
+            return result.scalar_one_or_none()
+
+        return await cached_lookup(self.db, Food, "id", food_id, load)
+    
     async def send_message(
         self,
         telegram_id: int,
         text: str,
         parse_mode: str = "Markdown",
         reply_markup: Optional[Any] = None,
+        priority: str = "bulk",
     ) -> bool:
-        """Send a message to a user via Telegram."""
+        """Send a message to a user via Telegram.
+        
+        Notifications go out at bulk priority, behind the bot's replies.
+        """
+        from telegram.error import TelegramError
+
         if not self.bot:
             logger.error("Bot not initialized")
             return False
@@ -53,6 +280,7 @@ class NotificationService:
                 text=text,
                 parse_mode=parse_mode,
                 reply_markup=reply_markup,
+                rate_limit_args={"priority": priority},
             )
             
             logger.info(
@@ -78,6 +306,68 @@ class NotificationService:
             )
             return False
     
+    async def send_bulk(self, messages: Iterable[Tuple[int, str]]) -> int:
+        """Send many notifications concurrently; returns how many were delivered.
+        
+        At most ``notification_batch_concurrency`` are in flight; the send
+        governor spaces them out within Telegram's limits.
+        """
+        semaphore = asyncio.Semaphore(settings.notification_batch_concurrency)
+        
+        async def send(telegram_id: int, text: str) -> bool:
+            async with semaphore:
+                return await self.send_message(telegram_id, text)
+        
+        results = await asyncio.gather(*(send(telegram_id, text) for telegram_id, text in messages))
+        return sum(results)
+    
+    async def broadcast_food_post(self, food: Food, sharer_telegram_id: int) -> int:
+        """Tell compatible neighbours in the building about a new post.
+        
+        Recipients come from the Valkey subscriber index, not the users
+        table. Returns how many were notified.
+        """
+        started = time.perf_counter()
+        try:
+            recipients = await SubscriberIndex(await init_redis()).recipients(
+                food.building_id,
+                allergens=food.allergens,
+                dietary_info=food.dietary_info,
+                exclude_telegram_id=sharer_telegram_id,
+            )
+            
+            message = NEW_FOOD_NEARBY.render(
+                title=food.title,
+                pickup_location=food.pickup_location,
+                pickup_start=food.pickup_start,
+                pickup_end=food.pickup_end,
+                credit_value=food.credit_value,
+            ).text
+            
+            sent = await self.send_bulk((telegram_id, message) for telegram_id in recipients)
+            
+            elapsed = time.perf_counter() - started
+            metrics.observe("food_broadcast_seconds", elapsed)
+            metrics.increment("food_broadcast_sent_total", sent)
+            logger.info(
+                "Food post broadcast",
+                food_id=food.id,
+                building_id=food.building_id,
+                recipients=len(recipients),
+                sent=sent,
+                seconds=round(elapsed, 2),
+            )
+            return sent
+            
+        except Exception as e:
+            logger.error(
+                "Error broadcasting food post",
+                food_id=food.id,
+                error=str(e),
+                exc_info=True,
+            )
+            return 0
+    
     async def send_food_posted_confirmation(
         self,
         user_id: str,
@@ -86,31 +376,20 @@ class NotificationService:
         """Send confirmation when food is successfully posted."""
         try:
             # Get user and food details
-            user_result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
+            user = await self._get_user(user_id)
             
-            food_result = await self.db.execute(
-                select(Food).where(Food.id == food_id)
-            )
-            food = food_result.scalar_one_or_none()
+            food = await self._get_food(food_id)
             
             if not user or not food:
                 return False
             
-            message = f"""
-✅ **Food Posted Successfully!**
-
-🍲 **{food.title}**
-📍 Pickup: {food.pickup_location}
-⏰ Time: {food.pickup_start.strftime('%I:%M %p')} - {food.pickup_end.strftime('%I:%M %p')}
-⭐ Credits: {food.credit_value}
-
-Your food is now visible to neighbors in your building. You'll be notified when someone requests it.
-
-Use /myposts to manage your active posts.
-            """.strip()
+            message = FOOD_POSTED.render(
+                title=food.title,
+                pickup_location=food.pickup_location,
+                pickup_start=food.pickup_start,
+                pickup_end=food.pickup_end,
+                credit_value=food.credit_value,
+            ).text
             
             return await self.send_message(user.telegram_id, message)
             
@@ -133,39 +412,23 @@ Use /myposts to manage your active posts.
         """Notify sharer when someone requests their food."""
         try:
             # Get all details
-            sharer_result = await self.db.execute(
-                select(User).where(User.id == sharer_id)
-            )
-            sharer = sharer_result.scalar_one_or_none()
+            sharer = await self._get_user(sharer_id)
             
-            recipient_result = await self.db.execute(
-                select(User).where(User.id == recipient_id)
-            )
-            recipient = recipient_result.scalar_one_or_none()
+            recipient = await self._get_user(recipient_id)
             
-            food_result = await self.db.execute(
-                select(Food).where(Food.id == food_id)
-            )
-            food = food_result.scalar_one_or_none()
+            food = await self._get_food(food_id)
             
             if not all([sharer, recipient, food]):
                 return False
             
-            message = f"""
-🔔 **New Food Request!**
-
-{recipient.display_name} (Apt {recipient.apartment_number}) wants to claim:
-**{food.title}**
-
-📍 Pickup: {food.pickup_location}
-⏰ Time: {food.pickup_start.strftime('%I:%M %p')}
-
-Please confirm this exchange within 30 minutes.
-
-Reply with:
-/confirm_{exchange_id[:8]} - Confirm exchange
-/decline_{exchange_id[:8]} - Decline request
-            """.strip()
+            message = FOOD_REQUESTED.render(
+                recipient_name=recipient.display_name,
+                apartment_number=recipient.apartment_number,
+                title=food.title,
+                pickup_location=food.pickup_location,
+                pickup_start=food.pickup_start,
+                exchange_code=exchange_id[:8],
+            ).text
             
             return await self.send_message(sharer.telegram_id, message)
             
@@ -186,34 +449,20 @@ Reply with:
     ) -> bool:
         """Send confirmation to recipient after requesting food."""
         try:
-            recipient_result = await self.db.execute(
-                select(User).where(User.id == recipient_id)
-            )
-            recipient = recipient_result.scalar_one_or_none()
+            recipient = await self._get_user(recipient_id)
             
-            food_result = await self.db.execute(
-                select(Food).where(Food.id == food_id)
-            )
-            food = food_result.scalar_one_or_none()
+            food = await self._get_food(food_id)
             
             if not recipient or not food:
                 return False
             
-            message = f"""
-✅ **Food Request Sent!**
-
-You've requested:
-**{food.title}**
-
-📍 Pickup: {food.pickup_location}
-⏰ Time: {food.pickup_start.strftime('%I:%M %p')} - {food.pickup_end.strftime('%I:%M %p')}
-
-The sharer will be notified. You'll receive a confirmation once they approve.
-
-⚠️ This request will expire in 30 minutes if not confirmed.
-
-To cancel: /cancel_{exchange_id[:8]}
-            """.strip()
+            message = REQUEST_SENT.render(
+                title=food.title,
+                pickup_location=food.pickup_location,
+                pickup_start=food.pickup_start,
+                pickup_end=food.pickup_end,
+                exchange_code=exchange_id[:8],
+            ).text
             
             return await self.send_message(recipient.telegram_id, message)
             
@@ -244,46 +493,31 @@ To cancel: /cancel_{exchange_id[:8]}
                 return False
             
             # Get user details
-            sharer_result = await self.db.execute(
-                select(User).where(User.id == sharer_id)
-            )
-            sharer = sharer_result.scalar_one_or_none()
+            sharer = await self._get_user(sharer_id)
             
-            recipient_result = await self.db.execute(
-                select(User).where(User.id == recipient_id)
-            )
-            recipient = recipient_result.scalar_one_or_none()
+            recipient = await self._get_user(recipient_id)
             
             if not sharer or not recipient:
                 return False
             
             # Message to sharer
-            sharer_message = f"""
-✅ **Exchange Confirmed!**
-
-{recipient.display_name} will pick up the food.
-
-📍 Pickup: {exchange.pickup_location}
-⏰ Time: {exchange.scheduled_pickup_at.strftime('%I:%M %p')}
-📱 Contact: @{recipient.telegram_username or 'Not available'}
-
-Mark complete after handoff: /complete_{exchange_id[:8]}
-            """.strip()
+            sharer_message = EXCHANGE_CONFIRMED_SHARER.render(
+                recipient_name=recipient.display_name,
+                pickup_location=exchange.pickup_location,
+                scheduled_pickup_at=exchange.scheduled_pickup_at,
+                contact=recipient.telegram_username or "Not available",
+                exchange_code=exchange_id[:8],
+            ).text
             
             # Message to recipient
-            recipient_message = f"""
-✅ **Exchange Confirmed!**
-
-Your pickup is confirmed with {sharer.display_name}.
-
-📍 Pickup: {exchange.pickup_location}
-⏰ Time: {exchange.scheduled_pickup_at.strftime('%I:%M %p')}
-📱 Contact: @{sharer.telegram_username or 'Not available'}
-
-⭐ {exchange.credit_amount} credit(s) will be deducted after completion.
-
-Mark complete after pickup: /complete_{exchange_id[:8]}
-            """.strip()
+            recipient_message = EXCHANGE_CONFIRMED_RECIPIENT.render(
+                sharer_name=sharer.display_name,
+                pickup_location=exchange.pickup_location,
+                scheduled_pickup_at=exchange.scheduled_pickup_at,
+                contact=sharer.telegram_username or "Not available",
+                credit_amount=exchange.credit_amount,
+                exchange_code=exchange_id[:8],
+            ).text
             
             # Send both notifications
             sharer_sent = await self.send_message(sharer.telegram_id, sharer_message)
@@ -308,15 +542,9 @@ Mark complete after pickup: /complete_{exchange_id[:8]}
         """Notify both parties when exchange is completed."""
         try:
             # Get users
-            sharer_result = await self.db.execute(
-                select(User).where(User.id == sharer_id)
-            )
-            sharer = sharer_result.scalar_one_or_none()
+            sharer = await self._get_user(sharer_id)
             
-            recipient_result = await self.db.execute(
-                select(User).where(User.id == recipient_id)
-            )
-            recipient = recipient_result.scalar_one_or_none()
+            recipient = await self._get_user(recipient_id)
             
             exchange_result = await self.db.execute(
                 select(Exchange).where(Exchange.id == exchange_id)
@@ -327,24 +555,18 @@ Mark complete after pickup: /complete_{exchange_id[:8]}
                 return False
             
             # Message to sharer
-            sharer_message = f"""
-🎉 **Exchange Complete!**
-
-Thank you for sharing with {recipient.display_name}!
-⭐ You earned {exchange.credit_amount} credit(s).
-
-Please rate this exchange: /rate_{exchange_id[:8]}
-            """.strip()
+            sharer_message = EXCHANGE_COMPLETED_SHARER.render(
+                recipient_name=recipient.display_name,
+                credit_amount=exchange.credit_amount,
+                exchange_code=exchange_id[:8],
+            ).text
             
             # Message to recipient
-            recipient_message = f"""
-🎉 **Exchange Complete!**
-
-Hope you enjoyed the food from {sharer.display_name}!
-⭐ {exchange.credit_amount} credit(s) have been deducted.
-
-Please rate this exchange: /rate_{exchange_id[:8]}
-            """.strip()
+            recipient_message = EXCHANGE_COMPLETED_RECIPIENT.render(
+                sharer_name=sharer.display_name,
+                credit_amount=exchange.credit_amount,
+                exchange_code=exchange_id[:8],
+            ).text
             
             # Send both notifications
             sharer_sent = await self.send_message(sharer.telegram_id, sharer_message)
@@ -370,28 +592,17 @@ Please rate this exchange: /rate_{exchange_id[:8]}
         """Notify when exchange is cancelled."""
         try:
             # Get users
-            cancelled_by_result = await self.db.execute(
-                select(User).where(User.id == cancelled_by)
-            )
-            cancelled_by_user = cancelled_by_result.scalar_one_or_none()
+            cancelled_by_user = await self._get_user(cancelled_by)
             
-            other_user_result = await self.db.execute(
-                select(User).where(User.id == other_user_id)
-            )
-            other_user = other_user_result.scalar_one_or_none()
+            other_user = await self._get_user(other_user_id)
             
             if not cancelled_by_user or not other_user:
                 return False
             
-            message = f"""
-❌ **Exchange Cancelled**
-
-{cancelled_by_user.display_name} has cancelled the exchange.
-
-Reason: {reason}
-
-The food is now available for others to claim.
-            """.strip()
+            message = EXCHANGE_CANCELLED.render(
+                cancelled_by_name=cancelled_by_user.display_name,
+                reason=reason,
+            ).text
             
             return await self.send_message(other_user.telegram_id, message)
             
@@ -412,32 +623,18 @@ The food is now available for others to claim.
     ) -> bool:
         """Notify sharer when their food is about to expire."""
         try:
-            user_result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
+            user = await self._get_user(user_id)
             
-            food_result = await self.db.execute(
-                select(Food).where(Food.id == food_id)
-            )
-            food = food_result.scalar_one_or_none()
+            food = await self._get_food(food_id)
             
             if not user or not food:
                 return False
             
-            message = f"""
-⏰ **Food Expiring Soon!**
-
-Your post "{food.title}" will expire in {minutes_until_expiry} minutes.
-
-No one has claimed it yet. Consider:
-• Extending the pickup time
-• Sharing in a community group
-• Consuming it yourself
-
-To extend: /extend_{food_id[:8]}
-To cancel: /expire_{food_id[:8]}
-            """.strip()
+            message = FOOD_EXPIRING.render(
+                title=food.title,
+                minutes=minutes_until_expiry,
+                food_code=food_id[:8],
+            ).text
             
             return await self.send_message(user.telegram_id, message)
             
@@ -457,32 +654,19 @@ To cancel: /expire_{food_id[:8]}
     ) -> bool:
         """Send daily activity summary to user."""
         try:
-            user_result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
+            user = await self._get_user(user_id)
             
             if not user:
                 return False
             
-            message = f"""
-📊 **Your Daily Summary**
-
-**Today's Activity:**
-🍲 Food shared: {stats.get('food_shared', 0)}
-🔍 Food claimed: {stats.get('food_claimed', 0)}
-⭐ Credits earned: {stats.get('credits_earned', 0)}
-💰 Credit balance: {stats.get('credit_balance', 0)}
-
-**Community Impact:**
-🌱 Food saved from waste: {stats.get('food_saved', 0)} items
-👥 Neighbors helped: {stats.get('neighbors_helped', 0)}
-
-Keep up the great work building our community!
-
-Browse available food: /browse
-Share something new: /share
-            """.strip()
+            message = DAILY_SUMMARY.render(
+                food_shared=stats.get("food_shared", 0),
+                food_claimed=stats.get("food_claimed", 0),
+                credits_earned=stats.get("credits_earned", 0),
+                credit_balance=stats.get("credit_balance", 0),
+                food_saved=stats.get("food_saved", 0),
+                neighbors_helped=stats.get("neighbors_helped", 0),
+            ).text
             
             return await self.send_message(user.telegram_id, message)
             
@@ -501,21 +685,12 @@ Share something new: /share
     ) -> bool:
         """Send admin notification to user."""
         try:
-            user_result = await self.db.execute(
-                select(User).where(User.id == user_id)
-            )
-            user = user_result.scalar_one_or_none()
+            user = await self._get_user(user_id)
             
             if not user:
                 return False
             
-            admin_message = f"""
-🛡️ **Admin Message**
-
-{message}
-
-If you have questions, please contact support.
-            """.strip()
+            admin_message = ADMIN_MESSAGE.render(message=message).text
             
             return await self.send_message(user.telegram_id, admin_message)
             
@@ -6,7 +6,6 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, List
-from PIL import Image
 
 from ..core.config import get_settings
 from ..core.logging import get_logger
@@ -15,6 +14,20 @@ settings = get_settings()
 logger = get_logger(__name__)
 
 
+def thumbnail_url(photo_url: Optional[str]) -> Optional[str]:
+    """URL of the thumbnail saved with an original photo.
+    
+    Only absolute URLs are returned; Telegram cannot fetch the relative
+    ones of local storage.
+    """
+    if not photo_url or not photo_url.startswith(("http://", "https://")):
+        return None
+    if "/originals/" not in photo_url:
+        return photo_url
+    prefix, filename = photo_url.rsplit("/", 1)
+    return f"{prefix.replace('/originals', '/thumbnails')}/thumb_{filename}"
+
+
 class PhotoService:
     """Service for photo storage and processing."""
     
@@ -95,6 +108,8 @@ class PhotoService:
         thumbnail_size: Tuple[int, int] = (300, 300),
     ) -> Tuple[bytes, bytes]:
         """Process image: compress and create thumbnail."""
+        from PIL import Image
+
         try:
             # Open image
             img = Image.open(io.BytesIO(photo_data))
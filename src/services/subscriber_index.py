@@ -0,0 +1,233 @@
+"""Per-building index of the neighbours to tell about new food posts.
+
+Each building has a Valkey hash mapping the Telegram id of every verified
+user with notifications on to their allergens and dietary restrictions, so
+a new post is matched to its recipients without querying users.
+``UserService`` records ``subscriber_changed`` events; committed ones are
+collected by ``SubscriberIndexUpdater`` and the entries of those users
+rewritten in batches. ``SubscriberIndex.rebuild`` recreates the whole
+index from SQL and runs periodically to correct any drift.
+"""
+
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.events import DomainEvent
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..models.user import User, UserStatus
+
+logger = get_logger(__name__)
+
+SUBSCRIBER_CHANGED = "subscriber_changed"
+
+KEY_PREFIX = "food_subscribers"
+
+# Profile columns the index depends on
+SUBSCRIBER_FIELDS = frozenset({
+    "allergens", "dietary_restrictions", "notifications_enabled", "building_id",
+})
+
+_TERM_SEPARATORS = re.compile(r"[,;/\n]+")
+
+
+def subscriber_key(building_id: str) -> str:
+    """Hash of one building's subscribers, keyed by Telegram id."""
+    return f"{KEY_PREFIX}:{building_id}"
+
+
+def parse_terms(text: Optional[str]) -> List[str]:
+    """Split a free-text list such as "Peanuts, gluten" into lowercase terms."""
+    if not text:
+        return []
+    return [term.strip().lower() for term in _TERM_SEPARATORS.split(text) if term.strip()]
+
+
+def is_compatible(
+    profile: Dict[str, List[str]],
+    allergens: Optional[str],
+    dietary_info: Optional[str],
+) -> bool:
+    """Whether a subscriber can eat a post with these allergens and dietary info.
+
+    None of the subscriber's allergens may appear in the post's allergens,
+    and each of their dietary restrictions must appear in its dietary info.
+    """
+    food_allergens = (allergens or "").lower()
+    food_dietary = (dietary_info or "").lower()
+    if any(term in food_allergens for term in profile.get("allergens", ())):
+        return False
+    return all(term in food_dietary for term in profile.get("dietary", ()))
+
+
+def _is_subscribed(user: User) -> bool:
+    return bool(user.building_id and user.notifications_enabled and user.is_verified)
+
+
+def _entry(user: User) -> str:
+    return json.dumps(
+        {
+            "allergens": parse_terms(user.allergens),
+            "dietary": parse_terms(user.dietary_restrictions),
+        },
+        separators=(",", ":"),
+    )
+
+
+class SubscriberIndex:
+    """Read, update and rebuild the per-building subscriber hashes."""
+
+    def __init__(self, redis_client: Redis) -> None:
+        self.redis = redis_client
+
+    async def recipients(
+        self,
+        building_id: str,
+        allergens: Optional[str] = None,
+        dietary_info: Optional[str] = None,
+        exclude_telegram_id: Optional[int] = None,
+    ) -> List[int]:
+        """Telegram ids of the building's subscribers compatible with a post."""
+        with metrics.timer("subscriber_index_lookup_seconds"):
+            entries = await self.redis.hgetall(subscriber_key(building_id))
+        return [
+            int(telegram_id)
+            for telegram_id, profile in entries.items()
+            if int(telegram_id) != exclude_telegram_id
+            and is_compatible(json.loads(profile), allergens, dietary_info)
+        ]
+
+    async def refresh_users(self, db: AsyncSession, changes: Iterable[Tuple[str, str]]) -> int:
+        """Rewrite the entries for ``(building_id, user_id)`` pairs. Returns entries written.
+
+        A user is added to a building's hash if they are subscribed there
+        now and removed from it otherwise, e.g. after moving out.
+        """
+        changes = set(changes)
+        if not changes:
+            return 0
+        result = await db.execute(
+            select(User).where(User.id.in_({user_id for _, user_id in changes}))
+        )
+        users = {user.id: user for user in result.scalars()}
+
+        pipe = self.redis.pipeline(transaction=False)
+        written = 0
+        for building_id, user_id in changes:
+            user = users.get(user_id)
+            if user is None:
+                continue
+            key = subscriber_key(building_id)
+            if _is_subscribed(user) and user.building_id == building_id:
+                pipe.hset(key, str(user.telegram_id), _entry(user))
+            else:
+                pipe.hdel(key, str(user.telegram_id))
+            written += 1
+        await pipe.execute()
+        return written
+
+    async def rebuild(self, db: AsyncSession) -> int:
+        """Recreate every building's hash from the users table. Returns subscribers indexed.
+
+        Each building's hash is built under a temporary key and renamed
+        into place, so readers never see it half-written. A change flushed
+        while the rebuild runs can be overwritten until the next rebuild.
+        """
+        with metrics.timer("subscriber_index_rebuild_seconds"):
+            result = await db.stream(
+                select(
+                    User.building_id,
+                    User.telegram_id,
+                    User.allergens,
+                    User.dietary_restrictions,
+                )
+                .where(
+                    User.building_id.is_not(None),
+                    User.notifications_enabled.is_(True),
+                    User.status == UserStatus.VERIFIED,
+                    User.is_phone_verified.is_(True),
+                )
+                .order_by(User.building_id)
+                .execution_options(yield_per=1000)
+            )
+
+            buildings: Set[str] = set()
+            building_id: Optional[str] = None
+            entries: Dict[str, str] = {}
+            total = 0
+            async for row in result:
+                if row.building_id != building_id:
+                    await self._replace(building_id, entries)
+                    building_id, entries = row.building_id, {}
+                    buildings.add(building_id)
+                entries[str(row.telegram_id)] = _entry(row)
+                total += 1
+            await self._replace(building_id, entries)
+
+            # Buildings nobody is subscribed in any more
+            stale = [
+                key
+                async for key in self.redis.scan_iter(match=f"{KEY_PREFIX}:*", count=1000)
+                if not key.endswith(":rebuild") and key.split(":", 1)[1] not in buildings
+            ]
+            if stale:
+                await self.redis.delete(*stale)
+
+        metrics.set_gauge("subscriber_index_size", total)
+        logger.info("Rebuilt subscriber index", buildings=len(buildings), subscribers=total)
+        return total
+
+    async def _replace(self, building_id: Optional[str], entries: Dict[str, str]) -> None:
+        if building_id is None or not entries:
+            return
+        staging = f"{subscriber_key(building_id)}:rebuild"
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(staging)
+        pipe.hset(staging, mapping=entries)
+        pipe.rename(staging, subscriber_key(building_id))
+        await pipe.execute()
+
+
+class SubscriberIndexUpdater:
+    """Collect committed subscriber changes and apply them in batches."""
+
+    def __init__(self) -> None:
+        self._changes: Set[Tuple[str, str]] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of (building, user) entries waiting to be rewritten."""
+        return len(self._changes)
+
+    def record(self, event: DomainEvent) -> None:
+        """Event handler: remember whose entry needs rewriting."""
+        if event.name == SUBSCRIBER_CHANGED and event.building_id and event.subject_id:
+            self._changes.add((event.building_id, event.subject_id))
+
+    async def flush(self, db: AsyncSession, redis_client: Optional[Redis]) -> int:
+        """Rewrite the pending entries. Returns entries written.
+
+        On failure the changes are kept and retried on the next flush.
+        """
+        if not self._changes or redis_client is None:
+            return 0
+
+        changes, self._changes = self._changes, set()
+        try:
+            written = await SubscriberIndex(redis_client).refresh_users(db, changes)
+            metrics.increment("subscriber_index_updates_total", written)
+            return written
+        except Exception as e:
+            self._changes |= changes
+            metrics.increment("subscriber_index_flush_failures_total")
+            logger.warning("Subscriber index flush failed", pending=len(self._changes), error=str(e))
+            return 0
+
+
+# Process-wide updater subscribed to committed events by the API
+subscriber_index_updater = SubscriberIndexUpdater()
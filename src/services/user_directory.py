@@ -0,0 +1,277 @@
+"""Telegram id to user resolution, cached in process and in Valkey.
+
+Nearly every bot update and API request starts by mapping a Telegram id
+to a user. ``UserDirectory`` answers from a small LRU in each process,
+then from a Valkey copy shared by every process, and only then from SQL,
+and holds a compact ``UserProfile`` rather than the ORM row. Unknown ids
+are not cached, so a user who just registered is found straight away.
+
+``UserService`` records ``user_profile_changed`` events when a profile
+field changes; once committed, ``UserDirectory.record`` drops the local
+entry, deletes the Valkey copy and publishes the id so every other
+process drops its entry too. Both tiers also expire, which bounds how
+long an invalidation missed by a disconnected process can be served.
+
+Each invalidation also bumps a per-user version key. A process that
+loaded a profile from SQL only writes it to Valkey if the version is
+still the one it read before loading, so a load that raced a change in
+another process cannot put the old profile back for everyone.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from redis.asyncio import Redis
+
+from ..core.config import get_settings
+from ..core.events import DomainEvent
+from ..core.logging import get_logger
+from ..core.metrics import metrics
+from ..core.redis import init_redis
+from ..models.user import User, UserStatus
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+# Recorded with the user's Telegram id as ``subject_id``
+USER_PROFILE_CHANGED = "user_profile_changed"
+
+KEY_PREFIX = "user_profile"
+INVALIDATION_CHANNEL = f"{KEY_PREFIX}:invalidate"
+
+# User columns copied into the profile that ``UserService.update_user`` can change
+PROFILE_FIELDS = frozenset({"building_id", "notifications_enabled", "sharing_enabled"})
+
+LOOKUPS_METRIC = "user_directory_lookups_total"
+
+# Pause before resubscribing after the invalidation channel drops
+RESUBSCRIBE_SECONDS = 1.0
+
+ProfileLoader = Callable[[], Awaitable[Optional["UserProfile"]]]
+
+
+# Store the profile (ARGV[2], for ARGV[3] seconds) unless the version
+# has moved on from ARGV[1], the value read before loading it
+_SET_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def profile_key(telegram_id: int) -> str:
+    return f"{KEY_PREFIX}:{telegram_id}"
+
+
+def version_key(telegram_id: int) -> str:
+    return f"{KEY_PREFIX}:{telegram_id}:version"
+
+
+@dataclass(frozen=True)
+class UserProfile:
+    """The parts of a user most requests need to authorize and route."""
+
+    id: str
+    telegram_id: int
+    building_id: Optional[str]
+    status: str
+    is_phone_verified: bool
+    notifications_enabled: bool
+    sharing_enabled: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserProfile":
+        return cls(
+            id=user.id,
+            telegram_id=user.telegram_id,
+            building_id=user.building_id,
+            status=UserStatus(user.status).value,
+            is_phone_verified=bool(user.is_phone_verified),
+            notifications_enabled=bool(user.notifications_enabled),
+            sharing_enabled=bool(user.sharing_enabled),
+        )
+
+    @property
+    def is_verified(self) -> bool:
+        return self.status == UserStatus.VERIFIED.value and self.is_phone_verified
+
+    @property
+    def can_share(self) -> bool:
+        return self.is_verified and self.sharing_enabled
+
+    def dumps(self) -> str:
+        return json.dumps(astuple(self), separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, data: str) -> "UserProfile":
+        return cls(*json.loads(data))
+
+
+class UserDirectory:
+    """Resolve Telegram ids to profiles through a local LRU and Valkey."""
+
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        max_size: int = settings.user_directory_local_size,
+        local_ttl_seconds: float = settings.user_directory_local_ttl_seconds,
+        ttl_seconds: int = settings.user_directory_ttl_seconds,
+    ) -> None:
+        self.redis = redis_client
+        self.max_size = max_size
+        self.local_ttl_seconds = local_ttl_seconds
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[int, Tuple[float, UserProfile]]" = OrderedDict()
+        # Bumped by every invalidation, so a load that raced one is not cached
+        self._generation = 0
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def get(self, telegram_id: int, loader: ProfileLoader) -> Optional[UserProfile]:
+        """The user's profile, running ``loader`` against SQL only if neither tier has it."""
+        started = time.perf_counter()
+        entry = self._local.get(telegram_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._local.move_to_end(telegram_id)
+            metrics.increment(LOOKUPS_METRIC, tier="local", result="hit")
+            metrics.observe("user_directory_lookup_seconds", time.perf_counter() - started, source="local")
+            return entry[1]
+        metrics.increment(LOOKUPS_METRIC, tier="local", result="miss")
+
+        generation = self._generation
+        profile, version = await self._get_shared(telegram_id)
+        if profile is not None:
+            metrics.increment(LOOKUPS_METRIC, tier="valkey", result="hit")
+            source = "valkey"
+        else:
+            metrics.increment(LOOKUPS_METRIC, tier="valkey", result="miss")
+            profile = await loader()
+            source = "database"
+            if profile is not None and generation == self._generation and version is not None:
+                await self._set_shared(profile, version)
+
+        if profile is not None and generation == self._generation:
+            self._store(profile)
+        metrics.observe("user_directory_lookup_seconds", time.perf_counter() - started, source=source)
+        return profile
+
+    def record(self, event: DomainEvent) -> None:
+        """Event handler: invalidate a profile once its change commits."""
+        if event.name != USER_PROFILE_CHANGED or not event.subject_id:
+            return
+        telegram_id = int(event.subject_id)
+        self._drop(telegram_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate(telegram_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def invalidate(self, *telegram_ids: int) -> None:
+        """Drop profiles here, in Valkey and in every process listening."""
+        for telegram_id in telegram_ids:
+            self._drop(telegram_id)
+        try:
+            redis_client = await self._redis()
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.delete(*(profile_key(telegram_id) for telegram_id in telegram_ids))
+            for telegram_id in telegram_ids:
+                # Expires like the profile copies, so idle users leave no keys behind
+                pipe.incr(version_key(telegram_id))
+                pipe.expire(version_key(telegram_id), self.ttl_seconds)
+                pipe.publish(INVALIDATION_CHANNEL, telegram_id)
+            await pipe.execute()
+            metrics.increment("user_directory_invalidations_total", len(telegram_ids))
+        except Exception as e:
+            # The Valkey copies and other processes' entries expire on their own
+            metrics.increment("user_directory_invalidation_failures_total")
+            logger.warning("Failed to invalidate user profiles", users=len(telegram_ids), error=str(e))
+
+    async def listen(self) -> None:
+        """Drop entries invalidated by other processes; runs until cancelled."""
+        while True:
+            try:
+                redis_client = await self._redis()
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Anything cached before subscribing may have missed an invalidation
+                    self.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._drop(int(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("User profile invalidation channel lost", error=str(e))
+                await asyncio.sleep(RESUBSCRIBE_SECONDS)
+
+    async def drain(self) -> None:
+        """Wait for invalidations still being sent."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def clear(self) -> None:
+        """Drop every local entry."""
+        self._local.clear()
+        self._generation += 1
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    @staticmethod
+    def hit_rates() -> Dict[str, Optional[float]]:
+        """Get the hit rate of each tier."""
+        return {tier: metrics.hit_rate(LOOKUPS_METRIC, tier=tier) for tier in ("local", "valkey")}
+
+    def _store(self, profile: UserProfile) -> None:
+        self._local[profile.telegram_id] = (time.monotonic() + self.local_ttl_seconds, profile)
+        self._local.move_to_end(profile.telegram_id)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    def _drop(self, telegram_id: int) -> None:
+        self._local.pop(telegram_id, None)
+        self._generation += 1
+
+    async def _redis(self) -> Redis:
+        return self.redis if self.redis is not None else await init_redis()
+
+    async def _get_shared(self, telegram_id: int) -> Tuple[Optional[UserProfile], Optional[str]]:
+        """The Valkey copy, if any, and the version to write a fresh one against.
+
+        The version is None when Valkey could not be read, and then nothing
+        is written back.
+        """
+        try:
+            cached, version = await (await self._redis()).mget(
+                profile_key(telegram_id), version_key(telegram_id)
+            )
+            return (UserProfile.loads(cached) if cached else None), version or ""
+        except Exception as e:
+            logger.warning("User profile cache read failed", telegram_id=telegram_id, error=str(e))
+            return None, None
+
+    async def _set_shared(self, profile: UserProfile, version: str) -> None:
+        try:
+            await (await self._redis()).eval(
+                _SET_SCRIPT,
+                2,
+                profile_key(profile.telegram_id),
+                version_key(profile.telegram_id),
+                version,
+                profile.dumps(),
+                self.ttl_seconds,
+            )
+        except Exception as e:
+            logger.warning("User profile cache write failed", telegram_id=profile.telegram_id, error=str(e))
+
+
+# Process-wide directory, subscribed to committed events by the API and bot workers
+user_directory = UserDirectory()
@@ -3,18 +3,23 @@
 import random
 import string
 from datetime import datetime, timedelta
+from functools import cached_property
 from typing import List, Optional
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from ..core.config import get_settings
+from ..core.events import record_event
 from ..core.logging import get_logger
+from ..core.lookup_cache import cached_lookup
 from ..models.user import User, UserStatus
 from ..models.building import Building
 from ..models.credit import Credit, CreditTransaction, TransactionType
 from ..services.sms_service import SMSService
+from .load_profiles import USER_LOAD_OPTIONS, LoadProfile
+from .subscriber_index import SUBSCRIBER_CHANGED, SUBSCRIBER_FIELDS
+from .user_directory import PROFILE_FIELDS, USER_PROFILE_CHANGED, UserProfile, user_directory
 
 settings = get_settings()
 logger = get_logger(__name__)
@@ -25,34 +30,70 @@ class UserService:
     
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
-        self.sms_service = SMSService()
     
-    async def get_by_telegram_id(self, telegram_id: int) -> Optional[User]:
+    @cached_property
+    def sms_service(self) -> SMSService:
+        """SMS client, set up only by the requests that send a code."""
+        return SMSService()
+    
+    async def get_by_telegram_id(
+        self,
+        telegram_id: int,
+        profile: LoadProfile = LoadProfile.FULL,
+    ) -> Optional[User]:
         """Get user by Telegram ID."""
-        try:
+        async def load() -> Optional[User]:
             result = await self.db.execute(
                 select(User)
-                .options(selectinload(User.building), selectinload(User.credit_account))
+                .options(*USER_LOAD_OPTIONS[profile])
                 .where(User.telegram_id == telegram_id)
             )
             return result.scalar_one_or_none()
+
+        try:
+            return await cached_lookup(self.db, User, "telegram_id", telegram_id, load, profile.rank)
         except Exception as e:
             logger.error("Error getting user by telegram ID", telegram_id=telegram_id, error=str(e))
             return None
     
-    async def get_by_id(self, user_id: str) -> Optional[User]:
+    async def get_profile_by_telegram_id(self, telegram_id: int) -> Optional[UserProfile]:
+        """Get a user's compact profile by Telegram ID, from cache when possible."""
+        async def load() -> Optional[UserProfile]:
+            user = await self.get_by_telegram_id(telegram_id, profile=LoadProfile.BARE)
+            return UserProfile.from_user(user) if user else None
+
+        return await user_directory.get(telegram_id, load)
+    
+    async def get_by_id(
+        self,
+        user_id: str,
+        profile: LoadProfile = LoadProfile.FULL,
+    ) -> Optional[User]:
         """Get user by ID."""
-        try:
+        async def load() -> Optional[User]:
             result = await self.db.execute(
                 select(User)
-                .options(selectinload(User.building), selectinload(User.credit_account))
+                .options(*USER_LOAD_OPTIONS[profile])
                 .where(User.id == user_id)
             )
             return result.scalar_one_or_none()
+
+        try:
+            return await cached_lookup(self.db, User, "id", user_id, load, profile.rank)
         except Exception as e:
             logger.error("Error getting user by ID", user_id=user_id, error=str(e))
             return None
     
+    async def _get_building(self, building_id: str) -> Optional[Building]:
+        """Get building by ID, reusing the request's lookups."""
+        async def load() -> Optional[Building]:
+            result = await self.db.execute(
+                select(Building).where(Building.id == building_id)
+            )
+            return result.scalar_one_or_none()
+
+        return await cached_lookup(self.db, Building, "id", building_id, load)
+    
     async def create_user(
         self,
         telegram_id: int,
@@ -66,7 +107,7 @@ class UserService:
         """Create a new user."""
         try:
             # Check if user already exists
-            existing_user = await self.get_by_telegram_id(telegram_id)
+            existing_user = await self.get_by_telegram_id(telegram_id, profile=LoadProfile.BARE)
             if existing_user:
                 logger.info("User already exists", telegram_id=telegram_id, user_id=existing_user.id)
                 return existing_user
@@ -120,7 +161,7 @@ class UserService:
     async def update_user(self, user_id: str, **kwargs) -> Optional[User]:
         """Update user information."""
         try:
-            user = await self.get_by_id(user_id)
+            user = await self.get_by_id(user_id, profile=LoadProfile.BARE)
             if not user:
                 return None
             
@@ -131,11 +172,16 @@ class UserService:
                 'notifications_enabled', 'sharing_enabled', 'building_id'
             }
             
+            previous_building_id = user.building_id
             for key, value in kwargs.items():
                 if key in allowed_fields and hasattr(user, key):
                     setattr(user, key, value)
             
             user.updated_at = datetime.utcnow()
+            if SUBSCRIBER_FIELDS & kwargs.keys():
+                self._subscriber_changed(user, previous_building_id)
+            if PROFILE_FIELDS & kwargs.keys():
+                self._profile_changed(user)
             
             logger.info("Updated user", user_id=user_id, updated_fields=list(kwargs.keys()))
             return user
@@ -147,7 +193,7 @@ class UserService:
     async def request_phone_verification(self, user_id: str, phone_number: str) -> bool:
         """Request phone number verification."""
         try:
-            user = await self.get_by_id(user_id)
+            user = await self.get_by_id(user_id, profile=LoadProfile.BARE)
             if not user:
                 return False
             
@@ -184,7 +230,7 @@ class UserService:
     async def verify_phone_code(self, user_id: str, code: str) -> bool:
         """Verify phone verification code."""
         try:
-            user = await self.get_by_id(user_id)
+            user = await self.get_by_id(user_id, profile=LoadProfile.BARE)
             if not user:
                 return False
             
@@ -197,10 +243,12 @@ class UserService:
                 user.is_phone_verified = True
                 user.verification_code = None
                 user.verification_expires_at = None
+                self._profile_changed(user)
                 
                 # Update status if building is also set
                 if user.building_id:
                     user.status = UserStatus.VERIFIED
+                    self._subscriber_changed(user)
                 
                 logger.info("Phone verification successful", user_id=user_id)
                 return True
@@ -215,25 +263,25 @@ class UserService:
     async def assign_to_building(self, user_id: str, building_id: str) -> bool:
         """Assign user to a building."""
         try:
-            user = await self.get_by_id(user_id)
+            user = await self.get_by_id(user_id, profile=LoadProfile.BARE)
             if not user:
                 return False
             
             # Verify building exists and has capacity
-            result = await self.db.execute(
-                select(Building).where(Building.id == building_id)
-            )
-            building = result.scalar_one_or_none()
+            building = await self._get_building(building_id)
             
             if not building or not building.has_capacity:
                 logger.error("Building not found or at capacity", building_id=building_id)
                 return False
             
+            previous_building_id = user.building_id
             user.building_id = building_id
             
             # Update status if phone is also verified
             if user.is_phone_verified:
                 user.status = UserStatus.VERIFIED
+            self._subscriber_changed(user, previous_building_id)
+            self._profile_changed(user)
             
             logger.info("User assigned to building", user_id=user_id, building_id=building_id)
             return True
@@ -242,6 +290,15 @@ class UserService:
             logger.error("Error assigning user to building", user_id=user_id, error=str(e))
             return False
     
+    def _subscriber_changed(self, user: User, previous_building_id: Optional[str] = None) -> None:
+        """Have the user's food post subscriber entries rewritten after commit."""
+        for building_id in {previous_building_id, user.building_id} - {None}:
+            record_event(self.db, SUBSCRIBER_CHANGED, building_id=building_id, subject_id=user.id)
+    
+    def _profile_changed(self, user: User) -> None:
+        """Have the user's cached profile dropped after commit."""
+        record_event(self.db, USER_PROFILE_CHANGED, subject_id=str(user.telegram_id))
+    
     async def get_building_users(self, building_id: str, limit: int = 50) -> List[User]:
         """Get users in a building."""
         try:
@@ -260,7 +317,7 @@ class UserService:
     async def update_last_active(self, user_id: str) -> None:
         """Update user's last active timestamp."""
         try:
-            user = await self.get_by_id(user_id)
+            user = await self.get_by_id(user_id, profile=LoadProfile.BARE)
             if user:
                 user.last_active_at = datetime.utcnow()
                 
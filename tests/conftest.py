@@ -5,7 +5,7 @@ import pytest
 import pytest_asyncio
 from datetime import datetime, timedelta
 from typing import AsyncGenerator, Generator
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
@@ -19,6 +19,7 @@ from src.models.building import Building
 from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
 from src.models.exchange import Exchange, ExchangeStatus
 from src.models.credit import Credit, CreditTransaction, TransactionType
+from src.services.user_directory import UserDirectory
 
 
 @pytest.fixture(scope="session")
@@ -218,6 +219,16 @@ def mock_redis():
     return redis
 
 
+@pytest.fixture(autouse=True)
+def user_directory(mock_redis) -> Generator[UserDirectory, None, None]:
+    """Give each test an empty user profile cache that never reaches Valkey."""
+    mock_redis.pipeline = MagicMock(return_value=MagicMock(execute=AsyncMock(return_value=[])))
+    mock_redis.mget = AsyncMock(return_value=[None, None])
+    directory = UserDirectory(mock_redis)
+    with patch("src.services.user_service.user_directory", directory):
+        yield directory
+
+
 @pytest_asyncio.fixture
 async def credit_transaction(
     test_db: AsyncSession,
@@ -0,0 +1,322 @@
+"""Integration tests for the admin reports and their streaming exports.
+
+Runs against PostgreSQL (``DATABASE_TEST_URL``) for server-side cursors.
+"""
+
+import csv
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.main import app
+from src.core.config import get_settings
+from src.core.database import Base, get_db_session
+from src.core.metrics import metrics
+from src.models.alert import ExchangeAlert
+from src.models.building import Building
+from src.models.credit import CreditTransaction, TransactionType
+from src.models.exchange import Exchange, ExchangeStatus
+from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
+from src.models.user import User
+from src.services.admin_service import PROBLEMATIC_EXCHANGE_FIELDS, AdminService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Admin report tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+# (status, hours since created, hours since scheduled pickup)
+EXCHANGES = [
+    (ExchangeStatus.CONFIRMED, 31, 30),   # overdue, high
+    (ExchangeStatus.CONFIRMED, 3, 2),     # overdue, medium
+    (ExchangeStatus.PENDING, 30, 30),     # long pending, medium
+    (ExchangeStatus.PENDING, 1, 1),       # fine
+    (ExchangeStatus.COMPLETED, 40, 40),   # fine
+]
+
+
+@pytest_asyncio.fixture
+async def seeded():
+    """Seed one sharer's exchanges; yields the session factory and user ids."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.utcnow()
+    async with factory() as db:
+        building = Building(
+            name="Test Building",
+            address="1 Test Street",
+            city="Test City",
+            state="TS",
+            zip_code="12345",
+        )
+        db.add(building)
+        await db.flush()
+        sharer = User(telegram_id=1, first_name="Sam", last_name="Sharer", building_id=building.id)
+        db.add(sharer)
+        await db.flush()
+        recipient = User(telegram_id=2, first_name="Rae", preferred_name="Rae R", building_id=building.id)
+        db.add(recipient)
+        await db.flush()
+        for i, (status, created_hours, pickup_hours) in enumerate(EXCHANGES):
+            food = Food(
+                title=f"Soup {i}",
+                category=FoodCategory.COOKED_GRAINS,
+                serving_size=ServingSize.SMALL,
+                status=FoodStatus.CLAIMED,
+                prepared_at=now,
+                pickup_start=now,
+                pickup_end=now,
+                expires_at=now,
+                credit_value=2,
+                sharer_id=sharer.id,
+                building_id=building.id,
+                created_at=now - timedelta(hours=created_hours + 1),
+            )
+            db.add(food)
+            await db.flush()
+            db.add(Exchange(
+                sharer_id=sharer.id,
+                recipient_id=recipient.id,
+                food_id=food.id,
+                status=status,
+                credit_amount=2,
+                scheduled_pickup_at=now - timedelta(hours=pickup_hours),
+                created_at=now - timedelta(hours=created_hours),
+            ))
+            await db.flush()
+        db.add(CreditTransaction(
+            user_id=sharer.id,
+            transaction_type=TransactionType.EARNED_SHARING,
+            amount=2,
+            balance_before=0,
+            balance_after=2,
+            description="Shared soup",
+        ))
+        await db.flush()
+        await db.commit()
+    async with factory() as db:
+        await AdminService(db).refresh_exchange_alerts(now=now)
+        await db.commit()
+
+    yield factory, sharer.id
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+class TestProblematicExchanges:
+    """Test cases for the problematic exchanges report."""
+
+    @pytest.mark.asyncio
+    async def test_report_is_ordered_by_severity_and_limited(self, seeded):
+        """Test overdue-by-a-day first, then the rest oldest first."""
+        factory, _ = seeded
+        async with factory() as db:
+            service = AdminService(db)
+            report = await service.get_problematic_exchanges(days=7)
+            limited = await service.get_problematic_exchanges(days=7, limit=2)
+            count = await service.count_problematic_exchanges(days=7)
+
+        assert [(r["type"], r["severity"]) for r in report] == [
+            ("overdue", "high"),
+            ("long_pending", "medium"),
+            ("overdue", "medium"),
+        ]
+        assert report[0]["description"] == "Exchange overdue by 30 hours"
+        assert report[0]["sharer_name"] == "Sam Sharer"
+        assert report[0]["recipient_name"] == "Rae R"
+        assert "scheduled_pickup" not in report[1]
+        assert limited == report[:2]
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_stream_matches_report(self, seeded):
+        """Test the streamed rows equal the list, even one row per fetch."""
+        factory, _ = seeded
+        async with factory() as db:
+            service = AdminService(db)
+            report = await service.get_problematic_exchanges(days=7)
+            streamed = [r async for r in service.stream_problematic_exchanges(days=7, chunk_size=1)]
+
+        assert streamed == report
+
+
+class TestExchangeAlerts:
+    """Test cases for the exchange alert detector."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_tracks_new_escalated_and_resolved(self, seeded):
+        """Test alerts follow the exchanges and record detection latency."""
+        factory, _ = seeded
+        metrics.reset()
+        later = datetime.utcnow() + timedelta(hours=23)
+        async with factory() as db:
+            await db.execute(
+                update(Exchange)
+                .where(Exchange.status == ExchangeStatus.PENDING)
+                .values(status=ExchangeStatus.COMPLETED)
+            )
+            counts = await AdminService(db).refresh_exchange_alerts(now=later)
+            await db.commit()
+            severities = (await db.execute(select(ExchangeAlert.severity))).scalars().all()
+
+        # The pending exchange resolved; the fresh one crossed its deadline
+        assert counts == {"new": 0, "regraded": 1, "resolved": 1}
+        assert sorted(severities) == ["high", "high"]
+        assert metrics.timing_summary("exchange_alert_detection_latency_seconds", type="overdue") is None
+
+    @pytest.mark.asyncio
+    async def test_report_hides_alerts_resolved_since_refresh(self, seeded):
+        """Test a completed exchange leaves the report before the next refresh."""
+        factory, _ = seeded
+        async with factory() as db:
+            await db.execute(
+                update(Exchange)
+                .where(Exchange.status == ExchangeStatus.CONFIRMED)
+                .values(status=ExchangeStatus.COMPLETED)
+            )
+            await db.commit()
+            report = await AdminService(db).get_problematic_exchanges(days=7)
+
+        assert [r["type"] for r in report] == ["long_pending"]
+
+    @pytest.mark.asyncio
+    async def test_new_alert_records_latency(self, seeded):
+        """Test latency is measured from the deadline to its detection."""
+        factory, _ = seeded
+        async with factory() as db:
+            await db.execute(ExchangeAlert.__table__.delete())
+            await db.commit()
+        metrics.reset()
+        async with factory() as db:
+            counts = await AdminService(db).refresh_exchange_alerts()
+            await db.commit()
+
+        assert counts["new"] == 3
+        latency = metrics.timing_summary("exchange_alert_detection_latency_seconds", type="overdue")
+        assert latency["count"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_exchanges_claimed_before_the_window_still_alert(self, seeded):
+        """Test old claims stay reported: overdue inside the window, or pending for weeks."""
+        factory, _ = seeded
+        now = datetime.utcnow()
+        window = timedelta(days=settings.exchange_alert_window_days)
+        async with factory() as db:
+            # Claimed before the window, picked up late inside it
+            await db.execute(
+                update(Exchange)
+                .where(
+                    Exchange.status == ExchangeStatus.CONFIRMED,
+                    Exchange.scheduled_pickup_at < now - timedelta(hours=24),
+                )
+                .values(created_at=now - window - timedelta(days=2))
+            )
+            # Left pending for longer than the window
+            await db.execute(
+                update(Exchange)
+                .where(
+                    Exchange.status == ExchangeStatus.PENDING,
+                    Exchange.created_at < now - timedelta(hours=24),
+                )
+                .values(created_at=now - window - timedelta(days=60))
+            )
+            await AdminService(db).refresh_exchange_alerts(now=now)
+            await db.commit()
+            report = await AdminService(db).get_problematic_exchanges(days=7)
+
+        assert [(r["type"], r["severity"]) for r in report] == [
+            ("overdue", "high"),
+            ("long_pending", "medium"),
+            ("overdue", "medium"),
+        ]
+
+
+class TestUserActivityStream:
+    """Test cases for the user activity stream."""
+
+    @pytest.mark.asyncio
+    async def test_stream_covers_posts_exchanges_and_transactions(self, seeded):
+        """Test every kind of activity is streamed newest first."""
+        factory, sharer_id = seeded
+        async with factory() as db:
+            records = [r async for r in AdminService(db).stream_user_activity(sharer_id, chunk_size=2)]
+
+        kinds = [record["kind"] for record in records]
+        assert kinds.count("food_post") == len(EXCHANGES)
+        assert kinds.count("exchange") == len(EXCHANGES)
+        assert kinds.count("transaction") == 1
+        assert {r["role"] for r in records if r["kind"] == "exchange"} == {"sharer"}
+        created = [record["created_at"] for record in records]
+        assert created == sorted(created, reverse=True)
+
+
+class TestExportEndpoints:
+    """Test cases for the admin report endpoints."""
+
+    @pytest_asyncio.fixture
+    async def http(self, seeded):
+        factory, _ = seeded
+
+        async def get_test_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_db_session] = get_test_db
+        with patch("src.api.routers.admin.get_read_db", asynccontextmanager(get_test_db)):
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                yield client
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_problematic_list_has_more_only_past_the_limit(self, http):
+        """Test has_more is false when exactly ``limit`` exchanges match."""
+        exact = (await http.get("/admin/exchanges/problematic", params={"limit": 3})).json()
+        short = (await http.get("/admin/exchanges/problematic", params={"limit": 2})).json()
+
+        assert (exact["total_count"], exact["has_more"]) == (3, False)
+        assert (short["total_count"], short["has_more"]) == (2, True)
+
+    @pytest.mark.asyncio
+    async def test_problematic_export_as_csv(self, http):
+        """Test the CSV export has a header and one row per exchange."""
+        response = await http.get("/admin/exchanges/problematic/export", params={"format": "csv"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "attachment" in response.headers["content-disposition"]
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows[0] == list(PROBLEMATIC_EXCHANGE_FIELDS)
+        assert [row[2] for row in rows[1:]] == ["high", "medium", "medium"]
+
+    @pytest.mark.asyncio
+    async def test_activity_export_as_ndjson(self, http, seeded):
+        """Test each NDJSON line is one activity record."""
+        _, sharer_id = seeded
+        response = await http.get(f"/admin/users/{sharer_id}/activity/export")
+        missing = await http.get("/admin/users/00000000-0000-0000-0000-000000000000/activity/export")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert len(records) == 2 * len(EXCHANGES) + 1
+        assert missing.status_code == 404
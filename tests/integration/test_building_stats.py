@@ -0,0 +1,170 @@
+"""Integration tests for batched building statistics.
+
+Runs against PostgreSQL (``DATABASE_TEST_URL``) since the aggregates use
+``FILTER`` clauses and window functions.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.core.database import Base
+from src.models.building import Building
+from src.models.exchange import Exchange, ExchangeStatus
+from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
+from src.models.user import User
+from src.services.admin_service import AdminService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Building stats tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+
+@pytest_asyncio.fixture
+async def seeded():
+    """Seed three buildings with one to three sharers each."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.utcnow()
+    building_ids: List[str] = []
+
+    async with factory() as db:
+        for b in range(3):
+            building = Building(
+                name=f"Building {b}",
+                address=f"{b} Test Street",
+                city="Test City",
+                state="TS",
+                zip_code="12345",
+            )
+            db.add(building)
+            await db.flush()
+            building_ids.append(building.id)
+
+            recipient = User(telegram_id=1000 + b, first_name="Recipient", building_id=building.id)
+            db.add(recipient)
+            await db.flush()
+
+            for u in range(b + 1):
+                sharer = User(
+                    telegram_id=100 * (b + 1) + u,
+                    first_name=f"Sharer{u}",
+                    last_name="Smith" if u else None,
+                    building_id=building.id,
+                )
+                db.add(sharer)
+                await db.flush()
+                for i in range(u + 1):
+                    food = Food(
+                        title=f"Soup {b}-{u}-{i}",
+                        category=FoodCategory.COOKED_GRAINS,
+                        serving_size=ServingSize.SMALL,
+                        status=FoodStatus.COMPLETED,
+                        prepared_at=now,
+                        pickup_start=now,
+                        pickup_end=now + timedelta(hours=2),
+                        expires_at=now + timedelta(hours=4),
+                        credit_value=5,
+                        sharer_id=sharer.id,
+                        building_id=building.id,
+                    )
+                    db.add(food)
+                    await db.flush()
+                    db.add(Exchange(
+                        food_id=food.id,
+                        sharer_id=sharer.id,
+                        recipient_id=recipient.id,
+                        credit_amount=5,
+                        status=ExchangeStatus.COMPLETED,
+                        completed_at=now,
+                    ))
+                    await db.flush()
+        await db.commit()
+
+    yield factory, building_ids
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+class TestBuildingStats:
+    """Test cases for AdminService.get_buildings_stats."""
+
+    @pytest.mark.asyncio
+    async def test_batched_stats_per_building(self, seeded):
+        """Test each building gets its own counts and top sharers."""
+        factory, building_ids = seeded
+        async with factory() as db:
+            stats = await AdminService(db).get_buildings_stats(building_ids, days=7)
+
+        assert list(stats) == building_ids
+        last = stats[building_ids[2]]
+        assert last["users"] == {"total": 4, "active": 3}
+        assert last["activity"] == {"food_posts": 6, "completed_exchanges": 6}
+        assert [s["posts_count"] for s in last["top_sharers"]] == [3, 2, 1]
+        assert last["top_sharers"][0]["name"] == "Sharer2 Smith"
+        assert last["top_sharers"][2]["name"] == "Sharer0"
+        assert stats[building_ids[0]]["users"] == {"total": 2, "active": 1}
+
+    @pytest.mark.asyncio
+    async def test_query_count_does_not_grow_with_buildings(self, seeded):
+        """Test one building and three buildings cost the same round trips."""
+        factory, building_ids = seeded
+        statements: List[str] = []
+
+        async with factory() as db:
+            sync_engine = db.bind.sync_engine
+            listener = lambda *args: statements.append(args[2])
+            event.listen(sync_engine, "before_cursor_execute", listener)
+            try:
+                single = await AdminService(db).get_building_stats(building_ids[0])
+                single_count = len(statements)
+                statements.clear()
+                await AdminService(db).get_buildings_stats(building_ids)
+            finally:
+                event.remove(sync_engine, "before_cursor_execute", listener)
+
+        assert single["building"]["id"] == building_ids[0]
+        assert single_count == 4
+        assert len(statements) == 4
+
+    @pytest.mark.asyncio
+    async def test_missing_building_returns_none(self, seeded):
+        """Test an unknown building ID yields None like before."""
+        factory, _ = seeded
+        async with factory() as db:
+            assert await AdminService(db).get_building_stats("00000000-0000-0000-0000-000000000000") is None
+
+    @pytest.mark.asyncio
+    async def test_system_health_is_one_query(self, seeded):
+        """Test the health check fetches its counters in one statement."""
+        factory, _ = seeded
+        statements: List[str] = []
+
+        async with factory() as db:
+            sync_engine = db.bind.sync_engine
+            listener = lambda *args: statements.append(args[2])
+            event.listen(sync_engine, "before_cursor_execute", listener)
+            try:
+                health = await AdminService(db).get_system_health()
+            finally:
+                event.remove(sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert health["recent_activity"]["posts_last_hour"] == 6 + 3 + 1
@@ -0,0 +1,76 @@
+"""Integration tests for Alembic migrations.
+
+The API no longer creates tables at startup, so the migrations must
+produce exactly the schema the models describe.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.partitions import include_name
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Migration tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _alembic_config(connection) -> Config:
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    config.attributes["connection"] = connection
+    return config
+
+
+def _upgrade_and_compare(connection) -> list:
+    command.upgrade(_alembic_config(connection), "head")
+    context = MigrationContext.configure(connection, opts={"include_name": include_name})
+    return compare_metadata(context, Base.metadata)
+
+
+def _downgrade(connection) -> None:
+    command.downgrade(_alembic_config(connection), "base")
+
+
+class TestMigrations:
+    """Test cases for the migration history."""
+
+    @pytest.mark.asyncio
+    async def test_upgrade_matches_models(self):
+        """Test upgrading an empty database yields the model schema."""
+        engine = create_async_engine(settings.database_test_url)
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+            async with engine.begin() as conn:
+                differences = await conn.run_sync(_upgrade_and_compare)
+
+            assert differences == []
+
+            async with engine.begin() as conn:
+                await conn.run_sync(_downgrade)
+                remaining = await conn.execute(text(
+                    "SELECT count(*) FROM pg_tables "
+                    "WHERE schemaname = 'public' AND tablename <> 'alembic_version'"
+                ))
+                assert remaining.scalar() == 0
+        finally:
+            await engine.dispose()
@@ -0,0 +1,217 @@
+"""Integration tests for the monthly history partitions.
+
+Partitioning is created by migration 0003, so these tests seed history at
+revision 0002 and upgrade to head against ``DATABASE_TEST_URL``.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from alembic import command
+from alembic.config import Config
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.partitions import (
+    ARCHIVE_SCHEMA,
+    PARTITIONED_TABLES,
+    PartitionManager,
+    add_months,
+    month_start,
+    partition_name,
+)
+from src.models.building import Building
+from src.models.credit import CreditTransaction, TransactionType
+from src.models.exchange import Exchange, ExchangeStatus
+from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
+from src.models.user import User
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Partition tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Months ago for each seeded exchange and its credit transaction
+HISTORY_MONTHS = (30, 14, 2, 0)
+
+
+def _migrate(connection, revision: str) -> None:
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    config.attributes["connection"] = connection
+    if revision == "base":
+        command.downgrade(config, revision)
+    else:
+        command.upgrade(config, revision)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Seed history spanning several years at 0002, then upgrade to head."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {ARCHIVE_SCHEMA} CASCADE"))
+        # Before 0003 it references exchanges, which the models no longer declare
+        await conn.execute(text("DROP TABLE IF EXISTS credit_transactions"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "0002")
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.utcnow()
+    async with factory() as db:
+        building = Building(
+            name="Test Building",
+            address="1 Test Street",
+            city="Test City",
+            state="TS",
+            zip_code="12345",
+        )
+        db.add(building)
+        await db.flush()
+        sharer = User(telegram_id=1, first_name="Sharer", building_id=building.id)
+        db.add(sharer)
+        await db.flush()
+        recipient = User(telegram_id=2, first_name="Recipient", building_id=building.id)
+        db.add(recipient)
+        await db.flush()
+        food = Food(
+            title="Soup",
+            category=FoodCategory.COOKED_GRAINS,
+            serving_size=ServingSize.SMALL,
+            status=FoodStatus.COMPLETED,
+            prepared_at=now,
+            pickup_start=now,
+            pickup_end=now,
+            expires_at=now,
+            credit_value=3,
+            sharer_id=sharer.id,
+            building_id=building.id,
+        )
+        db.add(food)
+        await db.flush()
+        for months_ago in HISTORY_MONTHS:
+            created_at = datetime.combine(add_months(month_start(now), -months_ago), datetime.min.time())
+            created_at += timedelta(hours=1)
+            exchange = Exchange(
+                sharer_id=sharer.id,
+                recipient_id=recipient.id,
+                food_id=food.id,
+                status=ExchangeStatus.COMPLETED,
+                credit_amount=3,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+            db.add(exchange)
+            await db.flush()
+            db.add(CreditTransaction(
+                user_id=sharer.id,
+                transaction_type=TransactionType.EARNED_SHARING,
+                amount=3,
+                balance_before=0,
+                balance_after=3,
+                exchange_id=exchange.id,
+                created_at=created_at,
+            ))
+            await db.flush()
+        await db.commit()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "head")
+
+    yield factory
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {ARCHIVE_SCHEMA} CASCADE"))
+        await conn.run_sync(_migrate, "base")
+    await engine.dispose()
+
+
+async def _row_partitions(db, table: str) -> dict:
+    result = await db.execute(text(f"SELECT tableoid::regclass::text, created_at FROM {table}"))
+    return {created_at: partition for partition, created_at in result.all()}
+
+
+class TestPartitions:
+    """Test cases for the partitioned history tables."""
+
+    @pytest.mark.asyncio
+    async def test_migration_moves_rows_into_monthly_partitions(self, session_factory):
+        """Test every existing row lands in its month's partition."""
+        now = datetime.utcnow()
+        async with session_factory() as db:
+            manager = PartitionManager(db)
+            assert await manager.partitioned_tables() == list(PARTITIONED_TABLES)
+            for table in PARTITIONED_TABLES:
+                rows = await _row_partitions(db, table)
+                assert len(rows) == len(HISTORY_MONTHS)
+                for created_at, partition in rows.items():
+                    assert partition == partition_name(table, month_start(created_at))
+
+                months = [partition.month for partition in await manager.list_partitions(table)]
+                assert months[0] == add_months(month_start(now), -max(HISTORY_MONTHS))
+                assert months[-1] == add_months(month_start(now), 3)
+
+    @pytest.mark.asyncio
+    async def test_partitions_are_created_ahead_and_archived(self, session_factory):
+        """Test maintenance adds future months and moves old ones to the archive."""
+        now = datetime.utcnow()
+        async with session_factory() as db:
+            manager = PartitionManager(db)
+            created = await manager.ensure_partitions(3, now=datetime(now.year + 1, now.month, 1))
+            assert partition_name("exchanges", add_months(month_start(now), 15)) in created
+            assert await manager.ensure_partitions(3, now=datetime(now.year + 1, now.month, 1)) == []
+
+            archived = await manager.archive_partitions(12)
+
+            # Months 30 to 13 back, for both tables
+            assert len(archived) == len(PARTITIONED_TABLES) * (max(HISTORY_MONTHS) - 12)
+            remaining = await _row_partitions(db, "credit_transactions")
+            assert len(remaining) == 2
+            archived_rows = await db.execute(text(
+                f"SELECT count(*) FROM {archived[0]}"
+            ))
+            assert archived_rows.scalar() == 1
+
+            # Archived partitions no longer reference live rows
+            await db.execute(text("DELETE FROM credit_transactions"))
+            await db.execute(text("DELETE FROM exchanges"))
+            await db.execute(text("DELETE FROM foods"))
+            await db.commit()
+
+    @pytest.mark.asyncio
+    async def test_bounded_queries_prune_old_partitions(self, session_factory):
+        """Test a recent-history query only scans the partitions it needs."""
+        async with session_factory() as db:
+            since = datetime.utcnow() - timedelta(days=90)
+            statement = (
+                select(CreditTransaction)
+                .where(CreditTransaction.user_id == "00000000-0000-0000-0000-000000000000")
+                .where(CreditTransaction.created_at >= since)
+                .order_by(CreditTransaction.created_at.desc())
+                .limit(10)
+            )
+            sql = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = "\n".join((await db.execute(text(f"EXPLAIN {sql}"))).scalars())
+
+        scanned = {
+            partition.name
+            for partition in await PartitionManager(db).list_partitions("credit_transactions")
+            if partition.name in plan
+        }
+        assert scanned
+        assert all(name >= partition_name("credit_transactions", month_start(since)) for name in scanned)
@@ -0,0 +1,162 @@
+"""Integration tests for the materialized platform statistics.
+
+The view is created by migration 0002, so these tests build the schema
+with ``alembic upgrade head`` against ``DATABASE_TEST_URL``.
+"""
+
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from alembic import command
+from alembic.config import Config
+from src.core.config import get_settings
+from src.core.database import Base
+from src.models.building import Building
+from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
+from src.models.user import User
+from src.services.admin_service import AdminService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Platform stats view needs a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _migrate(connection, revision: str) -> None:
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "alembic"))
+    config.attributes["connection"] = connection
+    if revision == "base":
+        command.downgrade(config, revision)
+    else:
+        command.upgrade(config, revision)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Migrate an empty database and seed a building with food posts."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP MATERIALIZED VIEW IF EXISTS platform_stats_mv"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "head")
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.utcnow()
+    async with factory() as db:
+        building = Building(
+            name="Test Building",
+            address="1 Test Street",
+            city="Test City",
+            state="TS",
+            zip_code="12345",
+        )
+        db.add(building)
+        await db.flush()
+        sharer = User(telegram_id=1, first_name="Sharer", building_id=building.id)
+        db.add(sharer)
+        await db.flush()
+        for i, age_days in enumerate((0, 2, 10, 40)):
+            db.add(Food(
+                title=f"Soup {i}",
+                category=FoodCategory.COOKED_GRAINS,
+                serving_size=ServingSize.SMALL,
+                status=FoodStatus.AVAILABLE,
+                prepared_at=now,
+                pickup_start=now,
+                pickup_end=now + timedelta(hours=2),
+                expires_at=now + timedelta(hours=4),
+                credit_value=5,
+                sharer_id=sharer.id,
+                building_id=building.id,
+                created_at=now - timedelta(days=age_days),
+            ))
+            await db.flush()
+        await db.commit()
+
+    yield factory
+
+    async with engine.begin() as conn:
+        await conn.run_sync(_migrate, "base")
+    await engine.dispose()
+
+
+def _without_freshness(stats: dict) -> dict:
+    return {key: value for key, value in stats.items() if key not in ("updated_at", "data_age_seconds")}
+
+
+class TestPlatformStatsView:
+    """Test cases for materialized platform statistics."""
+
+    @pytest.mark.asyncio
+    async def test_view_matches_live_stats(self, session_factory):
+        """Test every precomputed window agrees with the live queries."""
+        async with session_factory() as db:
+            service = AdminService(db)
+            assert await service.refresh_platform_stats() is True
+            await db.commit()
+
+            for days in (1, 7, 30, 90):
+                snapshot = await service.get_platform_stats(days=days)
+                live = await service._compute_platform_stats(days)
+                assert _without_freshness(snapshot) == _without_freshness(live)
+
+            assert (await service.get_platform_stats(days=7))["food_posts"]["recent"] == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_a_single_query(self, session_factory):
+        """Test serving from the view costs one statement whatever the table size."""
+        statements = []
+
+        async with session_factory() as db:
+            await AdminService(db).refresh_platform_stats()
+            await db.commit()
+
+            sync_engine = db.bind.sync_engine
+            listener = lambda *args: statements.append(args[2])
+            event.listen(sync_engine, "before_cursor_execute", listener)
+            try:
+                stats = await AdminService(db).get_platform_stats(days=30)
+            finally:
+                event.remove(sync_engine, "before_cursor_execute", listener)
+
+        assert len(statements) == 1
+        assert stats["data_age_seconds"] < settings.platform_stats_max_staleness_seconds
+
+    @pytest.mark.asyncio
+    async def test_stale_view_falls_back_to_live(self, session_factory):
+        """Test data older than the staleness bound is not served."""
+        async with session_factory() as db:
+            service = AdminService(db)
+            await service.refresh_platform_stats()
+            await db.commit()
+
+            with patch.object(settings, "platform_stats_max_staleness_seconds", -1):
+                stats = await service.get_platform_stats(days=7)
+
+        assert stats["data_age_seconds"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_other_windows_are_computed_live(self, session_factory):
+        """Test a window the view doesn't precompute still works."""
+        async with session_factory() as db:
+            stats = await AdminService(db).get_platform_stats(days=14)
+
+        assert stats["period_days"] == 14
+        assert stats["food_posts"]["recent"] == 3
+        assert stats["data_age_seconds"] == 0.0
@@ -0,0 +1,260 @@
+"""Query-count regression tests for API endpoints.
+
+These run against PostgreSQL (``DATABASE_TEST_URL``) since the models use
+Postgres column types. Each test counts the SQL statements one request
+issues, so a getter that starts loading relationships it doesn't need
+shows up as a failure here.
+"""
+
+from datetime import datetime, timedelta
+from typing import List
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.main import app
+from src.core.config import get_settings
+from src.core.database import Base, get_db_session, get_read_session
+from src.core.lookup_cache import attach_lookup_cache
+from src.core.redis import get_redis
+from src.models.building import Building
+from src.models.credit import Credit
+from src.models.exchange import Exchange, ExchangeStatus
+from src.models.food import Food, FoodCategory, FoodStatus, ServingSize
+from src.models.user import User
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Query-count tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+# Telegram ID the API currently acts as
+API_TELEGRAM_ID = 123456789
+
+
+class StatementCounter:
+    """Collect the SQL statements executed on an engine."""
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+        self.enabled = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self.enabled:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest_asyncio.fixture
+async def pg_engine():
+    """Create a PostgreSQL engine with a fresh schema."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def seeded(pg_engine):
+    """Seed a building, a sharer, the API user and food posts."""
+    session_factory = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+    now = datetime.utcnow()
+
+    async with session_factory() as db:
+        building = Building(
+            name="Test Building",
+            address="1 Test Street",
+            city="Test City",
+            state="TS",
+            zip_code="12345",
+        )
+        db.add(building)
+        await db.flush()
+
+        sharer = User(telegram_id=1, first_name="Sharer", building_id=building.id)
+        db.add(sharer)
+        await db.flush()
+        recipient = User(telegram_id=API_TELEGRAM_ID, first_name="Recipient", building_id=building.id)
+        db.add(recipient)
+        await db.flush()
+
+        for user in (sharer, recipient):
+            db.add(Credit(user_id=user.id, balance=50))
+            await db.flush()
+
+        foods = []
+        for i in range(5):
+            food = Food(
+                title=f"Soup {i}",
+                category=FoodCategory.COOKED_GRAINS,
+                serving_size=ServingSize.SMALL,
+                status=FoodStatus.AVAILABLE,
+                prepared_at=now,
+                pickup_start=now,
+                pickup_end=now + timedelta(hours=2),
+                expires_at=now + timedelta(hours=4),
+                credit_value=5,
+                sharer_id=sharer.id,
+                building_id=building.id,
+            )
+            db.add(food)
+            await db.flush()
+            foods.append(food)
+
+        # One food already claimed with an exchange in progress
+        claimed = foods[-1]
+        claimed.status = FoodStatus.CLAIMED
+        claimed.claimed_by_id = recipient.id
+        claimed.claimed_at = now
+        exchange = Exchange(
+            food_id=claimed.id,
+            sharer_id=sharer.id,
+            recipient_id=recipient.id,
+            status=ExchangeStatus.PENDING,
+            credit_amount=claimed.credit_value,
+        )
+        db.add(exchange)
+        await db.commit()
+
+        return {
+            "food_id": foods[0].id,
+            "exchange_id": exchange.id,
+            "session_factory": session_factory,
+        }
+
+
+@pytest_asyncio.fixture
+async def client(pg_engine, seeded):
+    """HTTP client bound to the test database, with Telegram sends stubbed."""
+    session_factory = seeded["session_factory"]
+
+    async def get_test_db():
+        async with session_factory() as session:
+            attach_lookup_cache(session)
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def get_no_redis():
+        yield None
+
+    app.dependency_overrides[get_db_session] = get_test_db
+    app.dependency_overrides[get_read_session] = get_test_db
+    app.dependency_overrides[get_redis] = get_no_redis
+
+    send_message = AsyncMock(return_value=True)
+    with patch("src.services.notification_service.NotificationService.send_message", send_message):
+        async with AsyncClient(app=app, base_url="http://test") as http:
+            yield http
+
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def counter(pg_engine):
+    """Count statements for the duration of one request."""
+    statements = StatementCounter()
+    event.listen(pg_engine.sync_engine, "before_cursor_execute", statements)
+    yield statements
+    event.remove(pg_engine.sync_engine, "before_cursor_execute", statements)
+
+
+async def _count(counter: StatementCounter, request) -> int:
+    counter.statements.clear()
+    counter.enabled = True
+    try:
+        response = await request
+    finally:
+        counter.enabled = False
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+class TestEndpointQueryCounts:
+    """SQL statements issued per endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_food_detail(self, client, counter, seeded):
+        """Detail loads the food plus sharer and building (no claimant)."""
+        count = await _count(counter, client.get(f"/foods/{seeded['food_id']}"))
+        assert count == 3
+
+    @pytest.mark.asyncio
+    async def test_browse_foods(self, client, counter, seeded):
+        """Browse is the user lookup and one joined page query."""
+        count = await _count(counter, client.get("/foods/browse"))
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_user_posts(self, client, counter, seeded):
+        """Own posts are the user lookup and one joined query."""
+        count = await _count(counter, client.get("/foods/user/posts"))
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_list_exchanges(self, client, counter, seeded):
+        """Exchange list is the user lookup and one joined query."""
+        count = await _count(counter, client.get("/exchanges/"))
+        assert count == 2
+
+    @pytest.mark.asyncio
+    async def test_exchange_detail(self, client, counter, seeded):
+        """Detail loads the exchange, its three relationships and the user."""
+        count = await _count(counter, client.get(f"/exchanges/{seeded['exchange_id']}"))
+        assert count == 5
+
+    @pytest.mark.asyncio
+    async def test_user_lookup_is_cached_between_requests(self, client, counter, seeded):
+        """Later requests resolve the API user from the profile cache."""
+        first = await _count(counter, client.get("/foods/user/posts"))
+        second = await _count(counter, client.get("/exchanges/"))
+        assert (first, second) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_current_user(self, client, counter, seeded):
+        """Profile is a single user lookup."""
+        count = await _count(counter, client.get("/users/me"))
+        assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_claim_food(self, client, counter, seeded):
+        """Claiming reads user, food and credits, then writes food and exchange.
+
+        The sharer notification reuses the cached recipient and food and
+        only fetches the sharer.
+        """
+        count = await _count(
+            counter,
+            client.post(f"/foods/{seeded['food_id']}/claim", json={"notes": "Thanks"}),
+        )
+        assert count == 6
+
+    @pytest.mark.asyncio
+    async def test_confirm_exchange(self, client, counter, seeded):
+        """Confirming is the user lookup and the guarded transition."""
+        count = await _count(
+            counter,
+            client.post(f"/exchanges/{seeded['exchange_id']}/confirm", json={}),
+        )
+        assert count == 2
@@ -0,0 +1,153 @@
+"""Integration tests for read-replica routing.
+
+Needs two PostgreSQL databases: ``DATABASE_TEST_URL`` as the primary and
+``DATABASE_TEST_REPLICA_URL`` standing in for a replica. They are not
+actually replicating, which lets each test see where a read was sent.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.db_routing import (
+    REPLICA_BIND_KEY,
+    ReplicaRouter,
+    RoutingSession,
+    start_request_routing,
+)
+from src.models.building import Building
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.external,
+    pytest.mark.skipif(
+        not (
+            settings.database_test_url.startswith("postgresql")
+            and settings.database_test_replica_url.startswith("postgresql")
+        ),
+        reason="Replica tests need DATABASE_TEST_URL and DATABASE_TEST_REPLICA_URL",
+    ),
+]
+
+
+def _building(name: str) -> Building:
+    return Building(name=name, address="1 Test Street", city="Test City", state="TS", zip_code="12345")
+
+
+@pytest_asyncio.fixture
+async def engines():
+    """Primary and replica engines with fresh schemas and one marker row each."""
+    primary = create_async_engine(settings.database_test_url)
+    replica = create_async_engine(settings.database_test_replica_url)
+
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(_building(name))
+            await db.commit()
+
+    yield primary, replica
+
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engines):
+    primary, _ = engines
+    return async_sessionmaker(
+        primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+    )
+
+
+async def _read_session(session_factory, router: ReplicaRouter) -> AsyncSession:
+    session = session_factory()
+    replica = await router.choose()
+    if replica is not None:
+        session.info[REPLICA_BIND_KEY] = replica
+    return session
+
+
+async def _building_names(db: AsyncSession) -> list:
+    result = await db.execute(select(Building.name).order_by(Building.name))
+    return list(result.scalars().all())
+
+
+class TestReadReplicaRouting:
+    """Routing between a primary and a replica database."""
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica(self, engines, session_factory):
+        """Test a read session queries the replica."""
+        _, replica = engines
+        router = ReplicaRouter([replica], max_lag_seconds=5, check_interval=60)
+
+        async with await _read_session(session_factory, router) as db:
+            assert await _building_names(db) == ["replica"]
+
+    @pytest.mark.asyncio
+    async def test_read_your_writes_in_same_request(self, engines, session_factory):
+        """Test reads after a write in the same request use the primary."""
+        _, replica = engines
+        router = ReplicaRouter([replica], max_lag_seconds=5, check_interval=60)
+        start_request_routing()
+
+        async with await _read_session(session_factory, router) as read_db:
+            assert await _building_names(read_db) == ["replica"]
+
+            async with session_factory() as write_db:
+                write_db.add(_building("new"))
+                await write_db.commit()
+
+            assert await _building_names(read_db) == ["new", "primary"]
+
+    @pytest.mark.asyncio
+    async def test_write_through_read_session_pins_it(self, engines, session_factory):
+        """Test a read session that flushes keeps reading from the primary."""
+        _, replica = engines
+        router = ReplicaRouter([replica], max_lag_seconds=5, check_interval=60)
+
+        async with await _read_session(session_factory, router) as db:
+            db.add(_building("new"))
+            await db.flush()
+
+            assert await _building_names(db) == ["new", "primary"]
+            await db.rollback()
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_falls_back_to_primary(self, engines, session_factory):
+        """Test reads use the primary when the replica is over the lag bound."""
+        _, replica = engines
+        router = ReplicaRouter([replica], max_lag_seconds=-1, check_interval=60)
+
+        async with await _read_session(session_factory, router) as db:
+            assert await _building_names(db) == ["primary"]
+
+        assert router.status()[0]["healthy"] is False
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back_to_primary(self, session_factory):
+        """Test reads use the primary when the replica cannot be reached."""
+        unreachable = create_async_engine(
+            "postgresql+asyncpg://postgres@127.0.0.1:1/missing",
+            connect_args={"timeout": 1},
+        )
+        router = ReplicaRouter([unreachable], max_lag_seconds=5, check_interval=60)
+
+        async with await _read_session(session_factory, router) as db:
+            assert await _building_names(db) == ["primary"]
+
+        assert router.status()[0]["lag_seconds"] is None
+        await unreachable.dispose()
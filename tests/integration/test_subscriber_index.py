@@ -0,0 +1,215 @@
+"""Integration tests for the food post subscriber index.
+
+Runs ``UserService`` against PostgreSQL (``DATABASE_TEST_URL``) and checks
+the index kept up to date from committed events matches a rebuild from the
+users table, and that broadcasts reach only compatible neighbours.
+"""
+
+import fnmatch
+from collections import defaultdict
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.events import subscribe, unsubscribe
+from src.models.building import Building
+from src.models.user import User, UserStatus
+from src.services.notification_service import NotificationService
+from src.services.subscriber_index import (
+    SubscriberIndex,
+    SubscriberIndexUpdater,
+    subscriber_key,
+)
+from src.services.user_service import UserService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="Subscriber index tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+# telegram_id -> (allergens, dietary_restrictions, notifications_enabled, verified)
+NEIGHBOURS = {
+    1: (None, None, True, True),
+    2: ("Peanuts, shellfish", None, True, True),
+    3: (None, "Vegan", True, True),
+    4: (None, None, False, True),
+    5: (None, None, True, False),
+}
+
+
+class FakeRedis:
+    """Just enough of a Valkey client for the index, backed by dicts."""
+
+    def __init__(self) -> None:
+        self.hashes = defaultdict(dict)
+
+    def pipeline(self, transaction: bool = True) -> MagicMock:
+        pipe = MagicMock()
+        pipe.hset.side_effect = lambda key, field=None, value=None, mapping=None: (
+            self.hashes[key].update(mapping or {field: value})
+        )
+        pipe.hdel.side_effect = lambda key, field: self.hashes[key].pop(field, None)
+        pipe.delete.side_effect = lambda *keys: [self.hashes.pop(key, None) for key in keys]
+        pipe.rename.side_effect = lambda src, dst: self.hashes.__setitem__(dst, self.hashes.pop(src))
+        pipe.execute = AsyncMock(return_value=[])
+        return pipe
+
+    async def hgetall(self, key: str) -> dict:
+        return dict(self.hashes.get(key, {}))
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.hashes.pop(key, None)
+
+    async def scan_iter(self, match: str, count: int = 10):
+        for key in [key for key, value in self.hashes.items() if value]:
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    def snapshot(self) -> dict:
+        return {key: value for key, value in self.hashes.items() if value}
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create a fresh schema with two buildings and a set of neighbours."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        buildings = []
+        for name in ("North", "South"):
+            building = Building(
+                name=name,
+                address=f"1 {name} Street",
+                city="Test City",
+                state="TS",
+                zip_code="12345",
+            )
+            db.add(building)
+            await db.flush()
+            buildings.append(building)
+        for telegram_id, (allergens, dietary, notifications, verified) in NEIGHBOURS.items():
+            db.add(User(
+                telegram_id=telegram_id,
+                first_name=f"User{telegram_id}",
+                building_id=buildings[0].id,
+                allergens=allergens,
+                dietary_restrictions=dietary,
+                notifications_enabled=notifications,
+                status=UserStatus.VERIFIED if verified else UserStatus.PENDING,
+                is_phone_verified=verified,
+            ))
+            await db.flush()
+        await db.commit()
+
+    yield factory, [building.id for building in buildings]
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def _user(factory, telegram_id: int) -> User:
+    async with factory() as db:
+        return (await db.execute(select(User).where(User.telegram_id == telegram_id))).scalar_one()
+
+
+class TestSubscriberIndex:
+    """End-to-end tests for the subscriber index."""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_indexes_opted_in_neighbours_and_matches_posts(self, session_factory):
+        """Test only verified users with notifications on are matched to compatible posts."""
+        factory, (north, _) = session_factory
+        index = SubscriberIndex(FakeRedis())
+        async with factory() as db:
+            assert await index.rebuild(db) == 3
+
+        # Without dietary info a post only reaches neighbours without restrictions
+        assert sorted(await index.recipients(north)) == [1, 2]
+        assert sorted(await index.recipients(north, allergens="Contains peanuts")) == [1]
+        assert sorted(await index.recipients(
+            north, dietary_info="vegan, gluten-free", exclude_telegram_id=1
+        )) == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_committed_profile_changes_match_a_rebuild(self, session_factory):
+        """Test entries rewritten from events equal the index rebuilt from SQL."""
+        factory, (north, south) = session_factory
+        live = FakeRedis()
+        async with factory() as db:
+            await SubscriberIndex(live).rebuild(db)
+
+        updater = SubscriberIndexUpdater()
+        subscribe(updater.record)
+        try:
+            first, second, fourth = [await _user(factory, i) for i in (1, 2, 4)]
+            async with factory() as db:
+                service = UserService(db)
+                await service.update_user(first.id, building_id=south)
+                await service.update_user(second.id, allergens="Gluten")
+                await service.update_user(fourth.id, notifications_enabled=True)
+                await db.commit()
+
+                # Rolled back changes are never applied
+                await service.update_user(first.id, notifications_enabled=False)
+                await db.rollback()
+        finally:
+            unsubscribe(updater.record)
+
+        assert updater.pending == 4
+        async with factory() as db:
+            assert await updater.flush(db, live) == 4
+        assert updater.pending == 0
+
+        rebuilt = FakeRedis()
+        async with factory() as db:
+            await SubscriberIndex(rebuilt).rebuild(db)
+        assert live.snapshot() == rebuilt.snapshot()
+        assert set(live.snapshot()[subscriber_key(north)]) == {"2", "3", "4"}
+        assert set(live.snapshot()[subscriber_key(south)]) == {"1"}
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_to_compatible_neighbours_in_one_batch(self, session_factory):
+        """Test a new post is sent to matching subscribers without querying users."""
+        factory, (north, _) = session_factory
+        redis_client = FakeRedis()
+        async with factory() as db:
+            await SubscriberIndex(redis_client).rebuild(db)
+
+        bot = AsyncMock()
+        food = SimpleNamespace(
+            id="food-1",
+            building_id=north,
+            title="Satay",
+            allergens="peanuts",
+            dietary_info="Vegan",
+            pickup_location="Lobby",
+            pickup_start=datetime(2024, 1, 1, 18),
+            pickup_end=datetime(2024, 1, 1, 20),
+            credit_value=2,
+        )
+        db = MagicMock()
+        with patch("src.services.notification_service.init_redis", AsyncMock(return_value=redis_client)):
+            sent = await NotificationService(db, bot=bot).broadcast_food_post(food, sharer_telegram_id=1)
+
+        assert sent == 1
+        assert [call.kwargs["chat_id"] for call in bot.send_message.call_args_list] == [3]
+        assert bot.send_message.call_args.kwargs["rate_limit_args"] == {"priority": "bulk"}
+        db.execute.assert_not_called()
@@ -0,0 +1,218 @@
+"""Integration tests for batched last activity tracking.
+
+Records touches in a dict-backed stand-in for Valkey and flushes them to
+PostgreSQL (``DATABASE_TEST_URL``), checking each flush writes every
+pending user once and never moves a timestamp backwards.
+"""
+
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.metrics import metrics
+from src.models.building import Building
+from src.models.user import User
+from src.services import activity_tracker
+from src.services.activity_tracker import ActivityTracker, write_last_seen
+from src.services.admin_service import AdminService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="User activity tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+NOW = 1_700_000_000
+
+
+class FakeRedis:
+    """A sorted set and hash backed by dicts, running the tracker's scripts."""
+
+    def __init__(self) -> None:
+        self.scores = {}
+        self.pending = {}
+
+    async def eval(self, script, numkeys, *args):
+        if script == activity_tracker._TOUCH_SCRIPT:
+            member, at = str(args[2]), int(args[3])
+            self.scores[member] = max(self.scores.get(member, at), at)
+            if int(self.pending.get(member, at)) <= at:
+                self.pending[member] = str(at)
+            return 1
+        if script == activity_tracker._TAKE_SCRIPT:
+            taken = [value for item in self.pending.items() for value in item]
+            self.pending = {}
+            return taken
+        if script == activity_tracker._RESTORE_SCRIPT:
+            for member, at in zip(args[1::2], args[2::2]):
+                if member not in self.pending or int(self.pending[member]) < int(at):
+                    self.pending[member] = at
+            return len(args[1:]) // 2
+        raise AssertionError("unexpected script")
+
+    def pipeline(self, transaction: bool = True) -> MagicMock:
+        pipe = MagicMock()
+        counts = []
+        pipe.zcount.side_effect = lambda key, low, high: counts.append(
+            sum(1 for score in self.scores.values() if score >= low)
+        )
+
+        async def execute():
+            return counts
+
+        pipe.execute = execute
+        return pipe
+
+    async def zremrangebyscore(self, key, low, high):
+        self.scores = {member: score for member, score in self.scores.items() if score > high}
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    """Create a fresh schema with one building of four residents."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        building = Building(
+            name="North", address="1 North Street", city="Test City", state="TS", zip_code="12345"
+        )
+        db.add(building)
+        await db.flush()
+        for telegram_id in range(1, 5):
+            db.add(User(telegram_id=telegram_id, first_name=f"User{telegram_id}", building_id=building.id))
+            await db.flush()
+        await db.commit()
+
+    yield factory, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def _last_active(factory) -> dict:
+    async with factory() as db:
+        rows = await db.execute(select(User.telegram_id, User.last_active_at))
+        return dict(rows.all())
+
+
+class TestUserActivity:
+    """End-to-end tests for ActivityTracker."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_each_user_once_in_one_statement(self, session_factory):
+        """Test repeated touches coalesce into one row per user and one UPDATE."""
+        factory, engine = session_factory
+        tracker = ActivityTracker(FakeRedis())
+        for offset in range(10):
+            await tracker.touch(1, at=NOW + offset)
+            await tracker.touch(2, at=NOW - offset)
+        await tracker.touch(99, at=NOW)  # Not a registered user
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        async with factory() as db:
+            written = await tracker.flush(db)
+
+        assert written == 2
+        assert sum(1 for sql in statements if sql.lstrip().upper().startswith("UPDATE")) == 1
+        assert await _last_active(factory) == {
+            1: datetime.utcfromtimestamp(NOW + 9),
+            2: datetime.utcfromtimestamp(NOW),
+            3: None,
+            4: None,
+        }
+        assert metrics.counter_value("user_activity_flushed_total") == 3
+        # Nothing is pending afterwards
+        async with factory() as db:
+            assert await tracker.flush(db) == 0
+
+    @pytest.mark.asyncio
+    async def test_timestamps_only_move_forward(self, session_factory):
+        """Test a stale timestamp never overwrites a newer one in SQL."""
+        factory, _ = session_factory
+        newer = datetime.utcfromtimestamp(NOW)
+        async with factory() as db:
+            await write_last_seen(db, {1: newer})
+            await db.commit()
+
+        async with factory() as db:
+            updated = await write_last_seen(db, {1: newer - timedelta(hours=1), 2: newer})
+            await db.commit()
+
+        assert updated == 1
+        assert (await _last_active(factory))[1] == newer
+
+    @pytest.mark.asyncio
+    async def test_large_flushes_are_chunked(self, session_factory):
+        """Test flushes larger than one chunk still update every user."""
+        factory, _ = session_factory
+        seen = {telegram_id: datetime.utcfromtimestamp(NOW + telegram_id) for telegram_id in range(1, 5)}
+
+        with patch.object(activity_tracker, "WRITE_CHUNK_SIZE", 3):
+            async with factory() as db:
+                assert await write_last_seen(db, seen) == 4
+                await db.commit()
+
+        assert await _last_active(factory) == seen
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_timestamps_pending(self, session_factory):
+        """Test timestamps are restored for the next flush when the write fails."""
+        factory, _ = session_factory
+        redis_client = FakeRedis()
+        tracker = ActivityTracker(redis_client)
+        await tracker.touch(1, at=NOW)
+
+        async def fail(*args, **kwargs):
+            raise RuntimeError("database down")
+
+        with patch.object(activity_tracker, "write_last_seen", fail):
+            async with factory() as db:
+                assert await tracker.flush(db) == 0
+        # A touch that arrived meanwhile wins over the restored one
+        await tracker.touch(1, at=NOW + 5)
+
+        assert redis_client.pending == {"1": str(NOW + 5)}
+        assert metrics.counter_value("user_activity_flush_failures_total") == 1
+        async with factory() as db:
+            assert await tracker.flush(db) == 1
+        assert (await _last_active(factory))[1] == datetime.utcfromtimestamp(NOW + 5)
+
+    @pytest.mark.asyncio
+    async def test_admin_active_counts_come_from_valkey(self, session_factory):
+        """Test active user counts are read from the sorted set, not SQL."""
+        factory, engine = session_factory
+        redis_client = FakeRedis()
+        tracker = ActivityTracker(redis_client)
+        now = time.time()
+        await tracker.touch(1, at=now - 60)
+        await tracker.touch(2, at=now - 2 * 3600)
+        await tracker.touch(3, at=now - 3 * 86400)
+
+        statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        async with factory() as db:
+            counts = await AdminService(db, redis_client).get_active_user_counts()
+            assert await AdminService(db).get_active_user_counts() is None
+
+        assert counts == {"last_15m": 1, "last_hour": 1, "last_24h": 2, "last_7d": 3, "last_30d": 3}
+        assert statements == []
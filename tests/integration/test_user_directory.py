@@ -0,0 +1,127 @@
+"""Integration tests for user profile caching around ``UserService``.
+
+Runs against PostgreSQL (``DATABASE_TEST_URL``) and checks profiles are
+served without SQL once cached, and dropped only when a change to them
+commits.
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.config import get_settings
+from src.core.database import Base
+from src.core.events import subscribe, unsubscribe
+from src.models.building import Building
+from src.models.user import User
+from src.services.user_service import UserService
+
+settings = get_settings()
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not settings.database_test_url.startswith("postgresql"),
+        reason="User directory tests need a PostgreSQL DATABASE_TEST_URL",
+    ),
+]
+
+TELEGRAM_ID = 42
+
+
+@pytest_asyncio.fixture
+async def setup(user_directory):
+    """Create two buildings and a user in the first; invalidate on commit."""
+    engine = create_async_engine(settings.database_test_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as db:
+        buildings = []
+        for name in ("North", "South"):
+            building = Building(
+                name=name, address=f"1 {name} Street", city="Test City", state="TS", zip_code="12345"
+            )
+            db.add(building)
+            await db.flush()
+            buildings.append(building.id)
+        db.add(User(telegram_id=TELEGRAM_ID, first_name="Ann", building_id=buildings[0]))
+        await db.commit()
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    subscribe(user_directory.record)
+
+    yield factory, buildings, statements, user_directory
+
+    unsubscribe(user_directory.record)
+    await user_directory.drain()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def _resolve(factory):
+    async with factory() as db:
+        return await UserService(db).get_profile_by_telegram_id(TELEGRAM_ID)
+
+
+class TestUserDirectory:
+    """End-to-end tests for cached Telegram id resolution."""
+
+    @pytest.mark.asyncio
+    async def test_moving_building_invalidates_the_cached_profile(self, setup):
+        """Test the profile is cached until the user moves, then reloaded."""
+        factory, (north, south), statements, directory = setup
+
+        first = await _resolve(factory)
+        statements.clear()
+        assert await _resolve(factory) == first
+        assert statements == []
+        assert first.building_id == north
+
+        async with factory() as db:
+            assert await UserService(db).update_user(first.id, building_id=south)
+            await db.commit()
+
+        assert len(directory) == 0
+        assert (await _resolve(factory)).building_id == south
+
+    @pytest.mark.asyncio
+    async def test_only_committed_profile_changes_invalidate(self, setup):
+        """Test rollbacks and unrelated fields keep the cached profile."""
+        factory, _, _, directory = setup
+        profile = await _resolve(factory)
+
+        async with factory() as db:
+            await UserService(db).update_user(profile.id, sharing_enabled=False)
+            await db.rollback()
+        async with factory() as db:
+            await UserService(db).update_user(profile.id, bio="Loves baking")
+            await db.commit()
+        assert len(directory) == 1
+
+        async with factory() as db:
+            await UserService(db).update_user(profile.id, sharing_enabled=False)
+            await db.commit()
+        assert len(directory) == 0
+        assert (await _resolve(factory)).sharing_enabled is False
+
+    @pytest.mark.asyncio
+    async def test_phone_verification_invalidates(self, setup):
+        """Test a verified phone is seen on the next lookup."""
+        factory, *_ = setup
+        profile = await _resolve(factory)
+        assert not profile.is_verified
+
+        async with factory() as db:
+            service = UserService(db)
+            assert await service.request_phone_verification(profile.id, "+15550100")
+            user = await service.get_by_id(profile.id)
+            assert await service.verify_phone_code(profile.id, user.verification_code)
+            await db.commit()
+
+        assert (await _resolve(factory)).is_verified
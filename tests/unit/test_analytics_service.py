@@ -0,0 +1,128 @@
+"""Unit tests for domain events and the analytics counters pipeline."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.events import DomainEvent, record_event, subscribe, unsubscribe
+from src.services.analytics_service import (
+    CREDIT_TRANSFER,
+    CREDITS_TRANSFERRED,
+    FOOD_POSTED,
+    AnalyticsRecorder,
+    AnalyticsService,
+    analytics_key,
+)
+
+MOMENT = datetime(2026, 10, 19, 12, 34, 56)
+
+
+def _pipeline(results=None):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results or [])
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value = pipe
+    return redis_client, pipe
+
+
+class TestDomainEvents:
+    """Test cases for post-commit event publishing."""
+
+    @pytest.mark.asyncio
+    async def test_events_publish_only_after_commit(self):
+        """Test events reach subscribers on commit and are dropped on rollback."""
+        received = []
+        subscribe(received.append)
+        engine = create_async_engine("sqlite+aiosqlite://")
+        try:
+            async with AsyncSession(engine) as session:
+                await session.execute(text("SELECT 1"))
+                record_event(session, FOOD_POSTED, building_id="b1")
+                assert received == []
+                await session.commit()
+                assert [event.name for event in received] == [FOOD_POSTED]
+
+                await session.execute(text("SELECT 1"))
+                record_event(session, FOOD_POSTED, building_id="b1")
+                await session.rollback()
+                await session.commit()
+                assert len(received) == 1
+        finally:
+            unsubscribe(received.append)
+            await engine.dispose()
+
+    def test_mock_sessions_are_ignored(self):
+        """Test services under unit-test mocks don't fail on record_event."""
+        record_event(AsyncMock(), FOOD_POSTED)
+
+
+class TestAnalyticsRecorder:
+    """Test cases for AnalyticsRecorder."""
+
+    def test_events_fan_out_to_buckets_and_buildings(self):
+        """Test one event counts in three granularities for its building and all."""
+        recorder = AnalyticsRecorder()
+        for _ in range(3):
+            recorder.record(DomainEvent(FOOD_POSTED, building_id="b1", occurred_at=MOMENT))
+        recorder.record(DomainEvent("user_registered", occurred_at=MOMENT))
+
+        assert recorder.pending == 6
+        assert recorder._counts[(analytics_key("minute", MOMENT, "b1"), FOOD_POSTED)] == 3
+        assert recorder._counts[(analytics_key("day", MOMENT), FOOD_POSTED)] == 3
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_pipeline(self):
+        """Test a flush sends HINCRBYs with expiry and empties the buffer."""
+        recorder = AnalyticsRecorder()
+        recorder.record(DomainEvent(CREDIT_TRANSFER, building_id="b1", amount=5, occurred_at=MOMENT))
+        redis_client, pipe = _pipeline()
+
+        assert await recorder.flush(redis_client) == 12
+        pipe.hincrby.assert_any_call(analytics_key("hour", MOMENT, "b1"), CREDITS_TRANSFERRED, 5)
+        assert pipe.expire.call_count == 6
+        pipe.execute.assert_awaited_once()
+        assert recorder.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_counts(self):
+        """Test counters survive a Redis failure and merge with new events."""
+        recorder = AnalyticsRecorder()
+        recorder.record(DomainEvent(FOOD_POSTED, occurred_at=MOMENT))
+        redis_client, pipe = _pipeline()
+        pipe.execute.side_effect = ConnectionError("down")
+
+        assert await recorder.flush(redis_client) == 0
+        recorder.record(DomainEvent(FOOD_POSTED, occurred_at=MOMENT))
+
+        assert recorder._counts[(analytics_key("minute", MOMENT), FOOD_POSTED)] == 2
+
+
+class TestAnalyticsService:
+    """Test cases for AnalyticsService reads."""
+
+    @pytest.mark.asyncio
+    async def test_counts_sum_minute_buckets(self):
+        """Test a short window is summed from minute buckets."""
+        redis_client, pipe = _pipeline(
+            [{FOOD_POSTED: "2"}, {}, {FOOD_POSTED: "1", CREDIT_TRANSFER: "1"}]
+        )
+
+        counts = await AnalyticsService(redis_client).get_counts(
+            timedelta(minutes=2), building_id="b1", now=MOMENT
+        )
+
+        assert counts[FOOD_POSTED] == 3
+        assert counts[CREDIT_TRANSFER] == 1
+        pipe.hgetall.assert_any_call(analytics_key("minute", MOMENT, "b1"))
+        assert pipe.hgetall.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_return_none(self):
+        """Test the dashboard gets None rather than an exception."""
+        redis_client, pipe = _pipeline()
+        pipe.execute.side_effect = ConnectionError("down")
+
+        assert await AnalyticsService(redis_client).get_counts(timedelta(days=7)) is None
@@ -0,0 +1,94 @@
+"""Unit tests for CreditService."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.models.credit import CreditOperation, CreditOperationStatus, TransactionType
+from src.services.credit_service import CreditService
+
+
+class TestCreditService:
+    """Test cases for CreditService."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_adjust_requires_non_zero_amount(self):
+        """Test that a zero adjustment is rejected."""
+        service = CreditService(AsyncMock())
+
+        with pytest.raises(ValueError):
+            await service.bulk_adjust("grant-1", 0, building_id="building-1")
+
+    @pytest.mark.asyncio
+    async def test_bulk_adjust_requires_target(self):
+        """Test that a bulk adjustment needs users or a building."""
+        db = AsyncMock()
+        service = CreditService(db)
+
+        with pytest.raises(ValueError):
+            await service.bulk_adjust("grant-1", 5)
+
+        # Nothing is registered for a rejected call
+        db.add.assert_not_called()
+
+    def test_target_fingerprint_ignores_user_order(self):
+        """Test fingerprint is stable for the same user set."""
+        first = CreditService._target_fingerprint(
+            TransactionType.ADJUSTMENT_ADMIN, 5, ["b", "a"], None
+        )
+        second = CreditService._target_fingerprint(
+            TransactionType.ADJUSTMENT_ADMIN, 5, ["a", "b"], None
+        )
+        different = CreditService._target_fingerprint(
+            TransactionType.ADJUSTMENT_ADMIN, 6, ["a", "b"], None
+        )
+
+        assert first == second
+        assert first != different
+
+    @pytest.mark.asyncio
+    async def test_completed_operation_is_not_reapplied(self):
+        """Test re-running a completed key returns without writing."""
+        fingerprint = CreditService._target_fingerprint(
+            TransactionType.ADJUSTMENT_ADMIN, 5, None, "building-1"
+        )
+        operation = CreditOperation(
+            operation_key="grant-1",
+            target_fingerprint=fingerprint,
+            transaction_type=TransactionType.ADJUSTMENT_ADMIN,
+            amount=5,
+            status=CreditOperationStatus.COMPLETED,
+            processed_count=40,
+            skipped_count=0,
+        )
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = operation
+        db = AsyncMock()
+        db.execute.return_value = result
+        service = CreditService(db)
+
+        summary = await service.bulk_adjust("grant-1", 5, building_id="building-1")
+
+        assert summary["already_applied"] is True
+        assert summary["processed_total"] == 40
+        assert db.execute.await_count == 1
+        db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_reused_key_with_different_parameters(self):
+        """Test a key cannot be reused for a different grant."""
+        operation = CreditOperation(
+            operation_key="grant-1",
+            target_fingerprint="something-else",
+            transaction_type=TransactionType.ADJUSTMENT_ADMIN,
+            amount=5,
+            status=CreditOperationStatus.RUNNING,
+        )
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = operation
+        db = AsyncMock()
+        db.execute.return_value = result
+        service = CreditService(db)
+
+        with pytest.raises(ValueError):
+            await service.bulk_adjust("grant-1", 5, building_id="building-1")
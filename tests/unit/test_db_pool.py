@@ -0,0 +1,114 @@
+"""Unit tests for connection pool instrumentation."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.db_pool import (
+    POOL_TIMEOUTS_METRIC,
+    InstrumentedAsyncPool,
+    install_idle_pre_ping,
+    pool_status,
+)
+from src.core.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _engine(pool_timeout: float = 0.1):
+    return create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedAsyncPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=pool_timeout,
+    )
+
+
+class TestInstrumentedPool:
+    """Test cases for InstrumentedAsyncPool."""
+
+    @pytest.mark.asyncio
+    async def test_exhausted_pool_records_wait_and_timeout(self):
+        """Test a checkout that cannot get a connection is counted."""
+        engine = _engine()
+
+        async with engine.connect():
+            status = pool_status(engine.sync_engine)
+            assert status["checked_out"] == 1
+
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+        status = pool_status(engine.sync_engine)
+        assert status["checked_out"] == 0
+        assert status["waiters"] == 0
+        assert status["timeouts"] == 1
+        assert status["wait"]["count"] == 1
+        assert metrics.counter_value(POOL_TIMEOUTS_METRIC, pool="primary") == 1
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_reported_while_blocked(self):
+        """Test checkouts blocked on the pool show up as waiters."""
+        engine = _engine(pool_timeout=5)
+        pool = engine.sync_engine.pool
+
+        async def checkout() -> None:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        async with engine.connect():
+            waiting = asyncio.ensure_future(checkout())
+            await asyncio.sleep(0.05)
+            assert pool.waiters() == 1
+
+        await waiting
+        assert pool.waiters() == 0
+        await engine.dispose()
+
+
+class TestIdlePrePing:
+    """Test cases for the idle pre-ping strategy."""
+
+    @pytest.mark.asyncio
+    async def test_recently_used_connection_is_not_pinged(self):
+        """Test connections returned within the idle window skip the ping."""
+        engine = _engine()
+        install_idle_pre_ping(engine.sync_engine, idle_seconds=60)
+
+        with patch.object(engine.sync_engine.dialect, "do_ping") as do_ping:
+            for _ in range(3):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+
+        do_ping.assert_not_called()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_dead_idle_connection_is_replaced(self):
+        """Test a failed ping swaps in a fresh connection."""
+        engine = _engine()
+        install_idle_pre_ping(engine.sync_engine, idle_seconds=0)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        with patch.object(
+            engine.sync_engine.dialect, "do_ping", side_effect=[Exception("gone"), True]
+        ):
+            async with engine.connect() as conn:
+                result = await conn.execute(text("SELECT 1"))
+                assert result.scalar() == 1
+
+        assert metrics.counter_value("db_pool_stale_connections_total") == 1
+        await engine.dispose()
@@ -0,0 +1,91 @@
+"""Unit tests for read-replica routing."""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.db_routing import (
+    PINNED_KEY,
+    REPLICA_BIND_KEY,
+    ReplicaRouter,
+    RoutingSession,
+    _is_write,
+)
+from src.models.exchange import Exchange, ExchangeAction
+from src.services.exchange_transitions import ExchangeTransitionExecutor
+
+
+@pytest.fixture
+def primary():
+    return create_async_engine("postgresql+asyncpg://primary/db")
+
+
+@pytest.fixture
+def replica():
+    return create_async_engine("postgresql+asyncpg://replica/db")
+
+
+class TestRoutingSession:
+    """Test cases for RoutingSession.get_bind."""
+
+    def test_read_session_uses_replica(self, primary, replica):
+        """Test reads on a session opened for reading go to the replica."""
+        session = RoutingSession(bind=primary.sync_engine)
+        session.info[REPLICA_BIND_KEY] = replica
+
+        assert session.get_bind(clause=select(Exchange)) is replica.sync_engine
+
+    def test_dml_pins_session_to_primary(self, primary, replica):
+        """Test DML goes to the primary and later reads follow it."""
+        session = RoutingSession(bind=primary.sync_engine)
+        session.info[REPLICA_BIND_KEY] = replica
+
+        assert session.get_bind(clause=update(Exchange).values(notes="x")) is primary.sync_engine
+        assert session.info[PINNED_KEY] is True
+        assert session.get_bind(clause=select(Exchange)) is primary.sync_engine
+
+    def test_default_session_uses_primary(self, primary):
+        """Test sessions without a replica are unaffected."""
+        session = RoutingSession(bind=primary.sync_engine)
+
+        assert session.get_bind(clause=select(Exchange)) is primary.sync_engine
+
+    def test_data_modifying_cte_is_a_write(self):
+        """Test single-statement transitions are detected as writes."""
+        statement = ExchangeTransitionExecutor(AsyncMock()).build_statement(
+            ExchangeAction.CANCEL, Exchange.id == "exchange-1", user_id="user-1"
+        )
+
+        assert _is_write(statement) is True
+        assert _is_write(select(Exchange).where(Exchange.id == "exchange-1")) is False
+
+
+class TestReplicaRouter:
+    """Test cases for ReplicaRouter."""
+
+    @pytest.mark.asyncio
+    async def test_lag_is_checked_once_per_interval(self, replica):
+        """Test repeated reads reuse the last lag measurement."""
+        router = ReplicaRouter([replica], max_lag_seconds=5, check_interval=60)
+
+        async def healthy(state):
+            state.checked_at = time.monotonic()
+            state.healthy = True
+            state.lag_seconds = 0.5
+
+        with patch.object(router, "_check", side_effect=healthy) as check:
+            for _ in range(3):
+                assert await router.choose() is replica
+
+        assert check.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_no_replicas_reads_primary(self):
+        """Test an empty router always answers with the primary."""
+        router = ReplicaRouter([], max_lag_seconds=5, check_interval=60)
+
+        assert router.enabled is False
+        assert await router.choose() is None
@@ -0,0 +1,135 @@
+"""Unit tests for exchange state transitions."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.models.exchange import (
+    EXCHANGE_TRANSITIONS,
+    Exchange,
+    ExchangeAction,
+    ExchangeStatus,
+)
+from src.services.exchange_transitions import ExchangeTransitionExecutor
+
+
+def _exchange(status=ExchangeStatus.PENDING, **kwargs):
+    return Exchange(
+        id="exchange-1",
+        sharer_id="sharer-1",
+        recipient_id="recipient-1",
+        food_id="food-1",
+        status=status,
+        sharer_confirmed=kwargs.pop("sharer_confirmed", False),
+        recipient_confirmed=kwargs.pop("recipient_confirmed", False),
+        credit_amount=1,
+        credits_transferred=False,
+        **kwargs,
+    )
+
+
+def _compile(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestExchangeTransitionTable:
+    """Test cases for the declarative transition table."""
+
+    def test_every_action_has_a_transition(self):
+        """Test the table covers every action."""
+        assert set(EXCHANGE_TRANSITIONS) == set(ExchangeAction)
+
+    def test_can_be_cancelled_by_participant(self):
+        """Test only participants can cancel an active exchange."""
+        exchange = _exchange()
+
+        assert exchange.can_be_cancelled_by("sharer-1")
+        assert exchange.can_be_cancelled_by("recipient-1")
+        assert not exchange.can_be_cancelled_by("someone-else")
+
+    def test_completed_exchange_cannot_be_cancelled(self):
+        """Test terminal states reject cancellation."""
+        exchange = _exchange(status=ExchangeStatus.COMPLETED)
+
+        assert not exchange.can_be_cancelled_by("sharer-1")
+
+    def test_confirm_by_both_users(self):
+        """Test exchange becomes confirmed once both parties confirm."""
+        exchange = _exchange()
+
+        assert exchange.confirm_by_user("sharer-1")
+        assert exchange.status == ExchangeStatus.PENDING
+        assert exchange.confirm_by_user("recipient-1")
+        assert exchange.status == ExchangeStatus.CONFIRMED
+        assert not exchange.confirm_by_user("recipient-1")
+
+    def test_complete_requires_confirmation(self):
+        """Test unconfirmed exchanges cannot be completed."""
+        assert not _exchange().complete()
+
+        exchange = _exchange(
+            status=ExchangeStatus.CONFIRMED,
+            sharer_confirmed=True,
+            recipient_confirmed=True,
+        )
+        assert exchange.complete()
+        assert exchange.status == ExchangeStatus.COMPLETED
+
+
+class TestExchangeTransitionExecutor:
+    """Test cases for ExchangeTransitionExecutor."""
+
+    def test_cancel_is_single_guarded_statement(self):
+        """Test cancel updates exchange and food in one statement."""
+        executor = ExchangeTransitionExecutor(AsyncMock())
+
+        sql = _compile(executor.build_statement(
+            ExchangeAction.CANCEL,
+            Exchange.id == "exchange-1",
+            user_id="sharer-1",
+        ))
+
+        assert "FOR UPDATE" in sql
+        assert "UPDATE exchanges" in sql
+        assert "exchanges.status IN" in sql
+        assert "UPDATE foods" in sql
+
+    def test_confirm_does_not_touch_food(self):
+        """Test confirm only updates the exchange."""
+        executor = ExchangeTransitionExecutor(AsyncMock())
+
+        sql = _compile(executor.build_statement(
+            ExchangeAction.CONFIRM,
+            Exchange.id == "exchange-1",
+            user_id="sharer-1",
+        ))
+
+        assert "UPDATE exchanges" in sql
+        assert "UPDATE foods" not in sql
+
+    @pytest.mark.asyncio
+    async def test_bulk_rejects_participant_transitions(self):
+        """Test user transitions cannot be applied in bulk."""
+        executor = ExchangeTransitionExecutor(AsyncMock())
+
+        with pytest.raises(ValueError):
+            await executor.apply_bulk(ExchangeAction.CANCEL)
+
+    @pytest.mark.asyncio
+    async def test_guard_miss_reports_reason(self):
+        """Test a rejected transition explains why with one extra query."""
+        missed = MagicMock()
+        missed.one_or_none.return_value = None
+        loaded = MagicMock()
+        loaded.scalar_one_or_none.return_value = _exchange(status=ExchangeStatus.COMPLETED)
+        db = AsyncMock()
+        db.execute.side_effect = [missed, loaded]
+        executor = ExchangeTransitionExecutor(db)
+
+        result = await executor.apply(ExchangeAction.CANCEL, "exchange-1", user_id="sharer-1")
+
+        assert not result.applied
+        assert result.reason == "invalid_status"
+        assert result.status == ExchangeStatus.COMPLETED
+        assert db.execute.await_count == 2
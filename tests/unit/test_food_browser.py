@@ -0,0 +1,192 @@
+"""Unit tests for paged food browsing in the bot."""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.bot.browse import (
+    REFRESH_CALLBACK,
+    FoodBrowser,
+    browse_key,
+    decode_cursor,
+    encode_cursor,
+)
+from src.bot.messages import BROWSE_EMPTY, BROWSE_NOT_REGISTERED
+from src.core.metrics import metrics
+
+TELEGRAM_ID = 4242
+START = datetime(2024, 1, 1, 18)
+
+
+class FakeRedis:
+    """Strings with their TTLs, backed by a dict."""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.ttls[key] = ex
+
+
+def _foods(count: int, first: int = 0):
+    return [
+        SimpleNamespace(
+            id=f"food-{i}",
+            title=f"Dish_{i}",
+            pickup_location="Lobby",
+            pickup_start=START,
+            pickup_end=START + timedelta(hours=2),
+            credit_value=1,
+        )
+        for i in range(first, first + count)
+    ]
+
+
+def _buttons(message):
+    return [button.callback_data for row in message.reply_markup.inline_keyboard for button in row]
+
+
+@pytest.fixture
+def browse_settings():
+    with patch("src.bot.browse.settings") as settings:
+        settings.bot_browse_page_size = 2
+        settings.bot_browse_prefetch_pages = 2
+        settings.bot_browse_cache_seconds = 60
+        yield settings
+
+
+@pytest.fixture
+def services(browse_settings):
+    """Patch the user lookup and food query; ``food`` serves ``available`` posts."""
+    available = _foods(7)
+
+    async def browse(user_id, exclude_allergens=None, limit=20, offset=0, profile=None):
+        return available[offset:offset + limit]
+
+    user = SimpleNamespace(id="user-1", building_id="building-1", allergens="Peanuts")
+    with patch("src.bot.browse.UserService") as user_service, \
+            patch("src.bot.browse.FoodService") as food_service:
+        user_service.return_value.get_by_telegram_id = AsyncMock(return_value=user)
+        food_service.return_value.browse_available_food = AsyncMock(side_effect=browse)
+        yield SimpleNamespace(
+            user=user,
+            browse=food_service.return_value.browse_available_food,
+            sessions=[],
+        )
+
+
+def _browser(redis_client, services) -> FoodBrowser:
+    @asynccontextmanager
+    async def session_factory():
+        session = MagicMock()
+        services.sessions.append(session)
+        yield session
+
+    return FoodBrowser(redis_client, session_factory=session_factory)
+
+
+class TestFoodBrowser:
+    """Test cases for FoodBrowser."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_cursor_round_trip(self):
+        """Test callback data is compact and malformed data is rejected."""
+        data = encode_cursor("a1b2c3", 1000)
+
+        assert data == "br:a1b2c3:3e8"
+        assert decode_cursor(data) == ("a1b2c3", 1000)
+        assert len(encode_cursor("a1b2c3", 10**9).encode()) <= 64
+        assert decode_cursor(REFRESH_CALLBACK) is None
+        assert decode_cursor("br:a1b2c3:zz") is None
+        assert decode_cursor("claim_food_1") is None
+
+    @pytest.mark.asyncio
+    async def test_start_caches_a_window_of_pages(self, services):
+        """Test one query fills the cache and renders the first page."""
+        redis_client = FakeRedis()
+
+        message = await _browser(redis_client, services).start(TELEGRAM_ID)
+
+        services.browse.assert_awaited_once()
+        kwargs = services.browse.call_args.kwargs
+        assert kwargs["limit"] == 5 and kwargs["offset"] == 0
+        assert kwargs["exclude_allergens"] == ["peanuts"]
+
+        (key,) = redis_client.values
+        token = key.rsplit(":", 1)[1]
+        assert key == browse_key(TELEGRAM_ID, token)
+        assert redis_client.ttls[key] == 60
+        assert "page 1 of 2+" in message.text
+        assert "*Dish\\_0*" in message.text and "Dish\\_2" not in message.text
+        assert _buttons(message) == [
+            "claim_food_food-0", "claim_food_food-1", REFRESH_CALLBACK, encode_cursor(token, 2),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cached_pages_do_not_query(self, services):
+        """Test paging within the window is served from Valkey only."""
+        redis_client = FakeRedis()
+        browser = _browser(redis_client, services)
+        await browser.start(TELEGRAM_ID)
+        token = next(iter(redis_client.values)).rsplit(":", 1)[1]
+
+        message = await browser.page(TELEGRAM_ID, token, 2)
+
+        assert services.browse.await_count == 1
+        assert len(services.sessions) == 1
+        assert "page 2 of 2+" in message.text and "Dish\\_3" in message.text
+        assert encode_cursor(token, 0) in _buttons(message)
+        assert metrics.counter_value("bot_browse_pages_total", source="cache") == 1
+
+    @pytest.mark.asyncio
+    async def test_paging_past_the_window_fetches_the_next_one(self, services):
+        """Test the next window is appended to the cached session."""
+        redis_client = FakeRedis()
+        browser = _browser(redis_client, services)
+        await browser.start(TELEGRAM_ID)
+        token = next(iter(redis_client.values)).rsplit(":", 1)[1]
+
+        message = await browser.page(TELEGRAM_ID, token, 4)
+        again = await browser.page(TELEGRAM_ID, token, 6)
+
+        assert services.browse.await_count == 2
+        assert services.browse.call_args.kwargs["offset"] == 4
+        assert "page 3 of 4" in message.text
+        assert "page 4 of 4" in again.text and "Dish\\_6" in again.text
+        # Last page: no next button
+        assert _buttons(again)[-1] == REFRESH_CALLBACK
+        assert metrics.counter_value("bot_browse_pages_total", source="fetch") == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_session_is_queried_again_at_the_same_page(self, services):
+        """Test a tap on an old message still lands on the page it asked for."""
+        redis_client = FakeRedis()
+
+        message = await _browser(redis_client, services).page(TELEGRAM_ID, "gone", 2)
+
+        assert services.browse.call_args.kwargs["offset"] == 0
+        assert "page 2 of 2+" in message.text
+        assert metrics.counter_value("bot_browse_pages_total", source="expired") == 1
+
+    @pytest.mark.asyncio
+    async def test_unregistered_and_empty_buildings(self, services):
+        """Test users without a building are sent to /start and empty lists say so."""
+        redis_client = FakeRedis()
+        browser = _browser(redis_client, services)
+
+        services.browse.side_effect = None
+        services.browse.return_value = []
+        assert await browser.start(TELEGRAM_ID) is BROWSE_EMPTY.render()
+
+        services.user.building_id = None
+        assert await browser.start(TELEGRAM_ID) is BROWSE_NOT_REGISTERED.render()
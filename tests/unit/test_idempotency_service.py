@@ -0,0 +1,131 @@
+"""Unit tests for IdempotencyService."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.metrics import metrics
+from src.services.idempotency_service import (
+    IdempotencyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+)
+
+
+def _db_without_stored_result():
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = None
+    db = AsyncMock()
+    db.add = MagicMock()
+    db.execute.return_value = result
+    return db
+
+
+class TestIdempotencyService:
+    """Test cases for IdempotencyService."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_without_key_runs_handler(self):
+        """Test requests without a key are processed normally."""
+        db = AsyncMock()
+        redis = AsyncMock()
+        handler = AsyncMock(return_value={"success": True})
+        service = IdempotencyService(db, redis)
+
+        result = await service.execute("food_claim", None, "fp", handler)
+
+        assert result.body == {"success": True}
+        assert not result.replayed
+        handler.assert_awaited_once()
+        db.commit.assert_awaited_once()
+        redis.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_first_request_stores_result(self):
+        """Test a new key runs the handler and stores the result."""
+        db = _db_without_stored_result()
+        redis = AsyncMock()
+        redis.set.return_value = True
+        handler = AsyncMock(return_value={"success": True})
+        service = IdempotencyService(db, redis)
+
+        result = await service.execute("food_claim", "key-1", "fp", handler)
+
+        assert not result.replayed
+        handler.assert_awaited_once()
+        db.add.assert_called_once()
+        db.commit.assert_awaited_once()
+
+        cached = json.loads(redis.set.await_args_list[-1].args[1])
+        assert cached["state"] == "done"
+        assert cached["body"] == {"success": True}
+        assert metrics.counter_value("idempotency_requests_total", scope="food_claim", result="miss") == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_replayed(self):
+        """Test a retried request is answered from Valkey without the database."""
+        db = AsyncMock()
+        redis = AsyncMock()
+        redis.set.return_value = None
+        redis.get.return_value = json.dumps({
+            "state": "done",
+            "fingerprint": "fp",
+            "status_code": 200,
+            "body": {"success": True, "exchange_id": "exchange-1"},
+        })
+        handler = AsyncMock()
+        service = IdempotencyService(db, redis)
+
+        result = await service.execute("food_claim", "key-1", "fp", handler)
+
+        assert result.replayed
+        assert result.body["exchange_id"] == "exchange-1"
+        handler.assert_not_called()
+        db.execute.assert_not_called()
+        assert IdempotencyService.hit_rates()["food_claim"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_pending_request_conflicts(self):
+        """Test a concurrent retry is rejected while the first is running."""
+        redis = AsyncMock()
+        redis.set.return_value = None
+        redis.get.return_value = json.dumps({"state": "pending", "token": "other"})
+        service = IdempotencyService(AsyncMock(), redis)
+
+        with pytest.raises(IdempotencyInProgress):
+            await service.execute("food_claim", "key-1", "fp", AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_key_reused_with_different_parameters(self):
+        """Test a key cannot be replayed for a different request."""
+        redis = AsyncMock()
+        redis.set.return_value = None
+        redis.get.return_value = json.dumps({
+            "state": "done",
+            "fingerprint": "other",
+            "status_code": 200,
+            "body": {},
+        })
+        service = IdempotencyService(AsyncMock(), redis)
+
+        with pytest.raises(IdempotencyKeyMismatch):
+            await service.execute("food_claim", "key-1", "fp", AsyncMock())
+
+    @pytest.mark.asyncio
+    async def test_failed_handler_releases_key(self):
+        """Test a failed request does not block retries."""
+        db = _db_without_stored_result()
+        redis = AsyncMock()
+        redis.set.return_value = True
+        handler = AsyncMock(side_effect=RuntimeError("boom"))
+        service = IdempotencyService(db, redis)
+
+        with pytest.raises(RuntimeError):
+            await service.execute("food_claim", "key-1", "fp", handler)
+
+        redis.eval.assert_awaited_once()
+        db.add.assert_not_called()
@@ -0,0 +1,204 @@
+"""Unit tests for inline query search."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.bot.handlers.inline import inline_query_handler
+from src.bot.inline_search import (
+    PAGE_SIZE,
+    InlineSearch,
+    _summary,
+    build_results,
+    normalize_query,
+    results_key,
+)
+from src.core.metrics import metrics
+from src.models.food import FoodCategory
+
+START = datetime(2024, 1, 1, 18)
+
+# telegram_id -> (user id, building id)
+MEMBERS = {1: ("user-1", "north"), 2: ("user-2", "north"), 3: ("user-3", None)}
+
+
+class FakeRedis:
+    """Strings backed by a dict."""
+
+    def __init__(self) -> None:
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+def _food(i: int, title: str, sharer_id: str = "user-9", photo: str = None):
+    return SimpleNamespace(
+        id=f"food-{i}",
+        sharer_id=sharer_id,
+        title=title,
+        description=None,
+        dietary_info="Vegan" if "soup" in title.lower() else None,
+        category=FoodCategory.COOKED_VEGETABLES,
+        pickup_location="Lobby",
+        pickup_start=START,
+        pickup_end=START + timedelta(hours=2),
+        credit_value=1,
+        photo_urls=json.dumps([photo]) if photo else None,
+    )
+
+
+@pytest.fixture
+def services():
+    """Patch the user lookup and building food query."""
+    foods = [_food(0, "Lentil soup", sharer_id="user-1"), _food(1, "Tomato soup"), _food(2, "Bread")]
+
+    async def get_user(telegram_id):
+        user_id, building_id = MEMBERS[telegram_id]
+        return SimpleNamespace(id=user_id, building_id=building_id)
+
+    async def get_building_food(building_id, limit=50):
+        await asyncio.sleep(0)
+        return foods
+
+    with patch("src.bot.inline_search.UserService") as user_service, \
+            patch("src.bot.inline_search.FoodService") as food_service:
+        user_service.return_value.get_profile_by_telegram_id = AsyncMock(side_effect=get_user)
+        food_service.return_value.get_building_food = AsyncMock(side_effect=get_building_food)
+        yield SimpleNamespace(
+            foods=foods,
+            get_building_food=food_service.return_value.get_building_food,
+        )
+
+
+def _search(redis_client) -> InlineSearch:
+    @asynccontextmanager
+    async def session_factory():
+        yield MagicMock()
+
+    return InlineSearch(redis_client, session_factory=session_factory)
+
+
+class TestInlineSearch:
+    """Test cases for InlineSearch."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_equivalent_queries_share_a_key(self):
+        """Test case and spacing do not split the result cache."""
+        assert normalize_query("  Vegan   SOUP ") == "vegan soup"
+        assert results_key("north", normalize_query("Vegan  soup")) == results_key("north", "vegan soup")
+        assert results_key("north", "soup") != results_key("south", "soup")
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_in_a_building_are_answered_once(self, services):
+        """Test neighbours share cached matches and never see their own posts."""
+        redis_client = FakeRedis()
+        search = _search(redis_client)
+
+        first, _ = await search.search(1, "Soup")
+        second, _ = await search.search(2, "soup ")
+        again, _ = await search.search(1, "soup")
+
+        assert [summary["id"] for summary in first] == ["food-1"]
+        assert [summary["id"] for summary in second] == ["food-0", "food-1"]
+        assert again == first
+        services.get_building_food.assert_awaited_once()
+        assert metrics.counter_value("bot_inline_cache_total", result="hit") == 2
+        assert metrics.counter_value("bot_inline_cache_total", result="miss") == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self, services):
+        """Test different searches arriving together load the building once."""
+        search = _search(FakeRedis())
+
+        results = await asyncio.gather(
+            search.search(1, "soup"), search.search(2, "bread"), search.search(2, ""),
+        )
+
+        assert [len(page) for page, _ in results] == [1, 1, 3]
+        services.get_building_food.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self, services):
+        """Test a database error is not cached as a building without food."""
+        redis_client = FakeRedis()
+        search = _search(redis_client)
+        services.get_building_food.side_effect = RuntimeError("database down")
+
+        with pytest.raises(RuntimeError):
+            await search.search(1, "soup")
+        assert redis_client.values == {}
+
+        services.get_building_food.side_effect = lambda building_id, limit=50: services.foods
+        page, _ = await search.search(1, "soup")
+        assert [summary["id"] for summary in page] == ["food-1"]
+
+    @pytest.mark.asyncio
+    async def test_matches_are_paged_with_next_offset(self, services):
+        """Test long result lists are returned a page at a time."""
+        services.foods[:] = [_food(i, f"Soup {i}") for i in range(PAGE_SIZE + 5)]
+        search = _search(FakeRedis())
+
+        page, next_offset = await search.search(1, "soup")
+        last, end = await search.search(1, "soup", next_offset)
+
+        assert len(page) == PAGE_SIZE and next_offset == PAGE_SIZE
+        assert len(last) == 5 and end is None
+        services.get_building_food.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_users_without_a_building_get_no_results(self, services):
+        """Test unregistered users are told to join instead of searching."""
+        assert await _search(FakeRedis()).search(3, "soup") is None
+        services.get_building_food.assert_not_awaited()
+
+    def test_results_post_the_food_with_a_claim_button(self):
+        """Test articles carry thumbnails, escaped text and a claim callback."""
+        food = _food(7, "Mac_and_cheese", photo="https://cdn.example/photos/originals/a.jpg")
+
+        (article,) = build_results([_summary(food)])
+
+        assert article.id == "food-7"
+        assert article.thumbnail_url == "https://cdn.example/photos/thumbnails/thumb_a.jpg"
+        assert article.description.startswith("📍 Lobby · ⏰ 06:00 PM · ⭐ 1")
+        assert "*Mac\\_and\\_cheese*" in article.input_message_content.message_text
+        assert article.reply_markup.inline_keyboard[0][0].callback_data == "claim_food_food-7"
+
+    @pytest.mark.asyncio
+    async def test_handler_answers_with_cache_time_and_next_offset(self, services):
+        """Test the handler pages through Telegram and times each answer."""
+        services.foods[:] = [_food(i, f"Soup {i}") for i in range(PAGE_SIZE + 1)]
+        query = SimpleNamespace(
+            query="soup", offset="", from_user=SimpleNamespace(id=1), answer=AsyncMock()
+        )
+        update = SimpleNamespace(inline_query=query)
+
+        with patch("src.bot.handlers.inline.init_redis", AsyncMock(return_value=FakeRedis())), \
+                patch("src.bot.handlers.inline.InlineSearch", lambda redis_client: _search(redis_client)):
+            await inline_query_handler(update, MagicMock())
+
+        results = query.answer.call_args.args[0]
+        kwargs = query.answer.call_args.kwargs
+        assert len(results) == PAGE_SIZE
+        assert kwargs["next_offset"] == str(PAGE_SIZE)
+        assert kwargs["is_personal"] is True
+        assert kwargs["cache_time"] > 0
+        assert metrics.timing_summary("bot_inline_answer_seconds")["count"] == 1
+        assert metrics.counter_value("bot_inline_late_total") == 0
+
+    @pytest.mark.asyncio
+    async def test_category_words_are_searchable(self, services):
+        """Test ``cooked vegetables`` finds posts in that category."""
+        page, _ = await _search(FakeRedis()).search(2, "cooked vegetables bread")
+
+        assert [summary["id"] for summary in page] == ["food-2"]
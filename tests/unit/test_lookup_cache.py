@@ -0,0 +1,121 @@
+"""Unit tests for the request lookup cache."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.lookup_cache import (
+    LookupCache,
+    LookupStats,
+    attach_lookup_cache,
+    cached_lookup,
+    get_lookup_cache,
+)
+from src.models.user import User
+
+
+def _user(user_id: str = "user-1", telegram_id: int = 42) -> User:
+    return User(id=user_id, telegram_id=telegram_id, first_name="Test")
+
+
+class TestLookupCache:
+    """Test cases for LookupCache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_hits_cache(self):
+        """Test the second identical lookup does not run the loader."""
+        cache = LookupCache(LookupStats())
+        loader = AsyncMock(return_value=_user())
+
+        first = await cache.get_or_load(User, "telegram_id", 42, loader)
+        second = await cache.get_or_load(User, "telegram_id", 42, loader)
+
+        assert first is second
+        assert loader.await_count == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.saved_queries == 1
+
+    @pytest.mark.asyncio
+    async def test_lookup_is_also_cached_by_primary_key(self):
+        """Test a user found by Telegram ID is served to a lookup by ID."""
+        cache = LookupCache(LookupStats())
+        user = _user()
+        await cache.get_or_load(User, "telegram_id", 42, AsyncMock(return_value=user))
+
+        loader = AsyncMock()
+        assert await cache.get_or_load(User, "id", "user-1", loader) is user
+        loader.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_richer_level_reloads(self):
+        """Test an entry loaded with less of the graph is not served to a richer lookup."""
+        cache = LookupCache(LookupStats())
+        user = _user()
+        await cache.get_or_load(User, "id", "user-1", AsyncMock(return_value=user), level=0)
+
+        loader = AsyncMock(return_value=user)
+        await cache.get_or_load(User, "id", "user-1", loader, level=2)
+        await cache.get_or_load(User, "id", "user-1", loader, level=1)
+
+        assert loader.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_coalesced(self):
+        """Test identical in-flight lookups share one query."""
+        cache = LookupCache(LookupStats())
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return _user()
+
+        results = await asyncio.gather(
+            *(cache.get_or_load(User, "id", "user-1", loader) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert results[0] is results[1] is results[2]
+        assert cache.stats.coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_misses_and_errors_are_not_cached(self):
+        """Test a lookup that finds nothing or fails runs again next time."""
+        cache = LookupCache(LookupStats())
+
+        missing = AsyncMock(return_value=None)
+        await cache.get_or_load(User, "id", "nobody", missing)
+        await cache.get_or_load(User, "id", "nobody", missing)
+        assert missing.await_count == 2
+
+        failing = AsyncMock(side_effect=RuntimeError("boom"))
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load(User, "id", "user-1", failing)
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_rollback_clears_attached_cache(self):
+        """Test a session rollback drops cached objects."""
+        session = AsyncSession()
+        cache = attach_lookup_cache(session)
+        cache.store(_user())
+
+        # What a rollback of an active transaction dispatches
+        session.sync_session.dispatch.after_soft_rollback(session.sync_session, None)
+
+        assert get_lookup_cache(session) is cache
+        assert len(cache) == 0
+        await session.close()
+
+    @pytest.mark.asyncio
+    async def test_session_without_cache_runs_loader(self):
+        """Test lookups on sessions without a cache go straight to the loader."""
+        loader = AsyncMock(return_value=None)
+
+        await cached_lookup(AsyncMock(), User, "id", "user-1", loader)
+        await cached_lookup(AsyncMock(), User, "id", "user-1", loader)
+
+        assert loader.await_count == 2
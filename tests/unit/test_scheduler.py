@@ -0,0 +1,66 @@
+"""Unit tests for the periodic job scheduler."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.metrics import metrics
+from src.core.scheduler import Scheduler
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+class TestScheduler:
+    """Test cases for Scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_job_runs_only_where_lock_is_won(self):
+        """Test a worker that loses the lock skips the round."""
+        job = AsyncMock()
+        redis = AsyncMock()
+        redis.set.side_effect = [True, None]
+        scheduler = Scheduler(redis)
+        scheduler.add_job("refresh", 60, job)
+
+        assert await scheduler.run_once(scheduler.jobs["refresh"]) is True
+        assert await scheduler.run_once(scheduler.jobs["refresh"]) is False
+
+        job.assert_awaited_once()
+        redis.set.assert_awaited_with("scheduler:lock:refresh", "1", nx=True, px=60000)
+
+    @pytest.mark.asyncio
+    async def test_failing_job_is_counted_and_loop_continues(self):
+        """Test an exception is logged and counted rather than raised."""
+        calls = []
+
+        async def flaky():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        scheduler = Scheduler()
+        scheduler.add_job("flaky", 0.01, flaky)
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert len(calls) > 1
+        assert metrics.counter_value("scheduler_job_failures_total", job="flaky") == len(calls)
+        assert scheduler.running is False
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_fall_back_to_running_locally(self):
+        """Test the job still runs when the lock cannot be taken."""
+        job = AsyncMock()
+        redis = AsyncMock()
+        redis.set.side_effect = ConnectionError("down")
+        scheduler = Scheduler(redis)
+        scheduler.add_job("refresh", 60, job)
+
+        assert await scheduler.run_once(scheduler.jobs["refresh"]) is True
+        job.assert_awaited_once()
@@ -0,0 +1,111 @@
+"""Unit tests for the outbound Telegram send governor."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+from telegram.error import RetryAfter
+
+from src.bot.send_governor import (
+    BULK,
+    GLOBAL_BUCKET_KEY,
+    PAUSE_KEY,
+    SendGovernor,
+    chat_bucket_key,
+)
+from src.core.metrics import metrics
+
+
+def _redis(*waits: int) -> MagicMock:
+    redis_client = MagicMock()
+    redis_client.eval = AsyncMock(side_effect=list(waits) or None, return_value=0)
+    redis_client.set = AsyncMock()
+    return redis_client
+
+
+async def _send(governor, callback, chat_id=42, priority=None, endpoint="sendMessage"):
+    return await governor.process_request(
+        callback,
+        (),
+        {},
+        endpoint,
+        {"chat_id": chat_id, "text": "hi"} if chat_id is not None else {},
+        {"priority": priority} if priority else None,
+    )
+
+
+class TestSendGovernor:
+    """Test cases for SendGovernor."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_leaves_the_interactive_reserve(self):
+        """Test replies may drain the global bucket while notifications may not."""
+        redis_client = _redis()
+        governor = SendGovernor()
+
+        with patch("src.bot.send_governor.init_redis", AsyncMock(return_value=redis_client)):
+            assert await _send(governor, AsyncMock(return_value=True)) is True
+            await _send(governor, AsyncMock(), chat_id=-100, priority=BULK)
+
+        reply, notification = (call.args for call in redis_client.eval.call_args_list)
+        assert reply[2:5] == (GLOBAL_BUCKET_KEY, chat_bucket_key(42), PAUSE_KEY)
+        assert reply[7] == 1.0 and reply[-1] == 0
+        assert notification[7] == pytest.approx(20 / 60) and notification[-1] == 5
+
+    @pytest.mark.asyncio
+    async def test_waits_until_both_budgets_allow(self):
+        """Test the request is held while the global, then the chat budget is short."""
+        metrics.reset()
+        redis_client = _redis(20, -30, 0)
+        callback = AsyncMock()
+        sleep = AsyncMock()
+
+        with patch("src.bot.send_governor.init_redis", AsyncMock(return_value=redis_client)), \
+                patch("src.bot.send_governor.asyncio.sleep", sleep):
+            await _send(SendGovernor(), callback)
+
+        assert [call.args[0] for call in sleep.call_args_list] == [0.02, 0.03]
+        callback.assert_awaited_once()
+        assert metrics.timing_summary("telegram_send_wait_seconds", priority="interactive")["count"] == 1
+        assert metrics.gauge_value("telegram_send_waiting", priority="interactive") == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_every_process_then_retries(self):
+        """Test a flood wait is shared through Valkey and the request retried."""
+        metrics.reset()
+        redis_client = _redis()
+        callback = AsyncMock(side_effect=[RetryAfter(3), True])
+
+        with patch("src.bot.send_governor.init_redis", AsyncMock(return_value=redis_client)), \
+                patch("src.bot.send_governor.asyncio.sleep", AsyncMock()):
+            assert await _send(SendGovernor(), callback) is True
+
+        redis_client.set.assert_awaited_once_with(PAUSE_KEY, "1", px=3000)
+        assert callback.await_count == 2
+        assert metrics.counter_value("telegram_retry_after_total", endpoint="sendMessage") == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test RetryAfter reaches the caller once the retries are used up."""
+        callback = AsyncMock(side_effect=RetryAfter(1))
+
+        with patch("src.bot.send_governor.init_redis", AsyncMock(return_value=_redis())), \
+                patch("src.bot.send_governor.asyncio.sleep", AsyncMock()):
+            with pytest.raises(RetryAfter):
+                await _send(SendGovernor(max_retries=1), callback)
+
+        assert callback.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_chatless_requests_and_valkey_outages_are_not_held(self):
+        """Test getMe-style calls skip the buckets and a Valkey error fails open."""
+        redis_client = _redis()
+        redis_client.eval = AsyncMock(side_effect=ConnectionError("down"))
+        callback = AsyncMock()
+
+        with patch("src.bot.send_governor.init_redis", AsyncMock(return_value=redis_client)):
+            await _send(SendGovernor(), callback, chat_id=None, endpoint="getMe")
+            redis_client.eval.assert_not_awaited()
+            await _send(SendGovernor(), callback)
+
+        assert callback.await_count == 2
@@ -0,0 +1,62 @@
+"""Unit tests for the streaming report encoders."""
+
+from datetime import datetime
+
+import pytest
+
+from src.api.streaming import FLUSH_BYTES, csv_lines, ndjson_lines, stream_records
+from src.core.metrics import metrics
+from src.models.exchange import ExchangeStatus
+
+MOMENT = datetime(2026, 10, 19, 12, 0, 0)
+
+
+async def _records(count: int):
+    for i in range(count):
+        yield {"id": str(i), "status": ExchangeStatus.PENDING, "created_at": MOMENT, "note": None}
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestEncoders:
+    """Test cases for the NDJSON and CSV encoders."""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_encodes_dates_and_enums(self):
+        """Test one compact JSON object per line."""
+        lines = await _collect(ndjson_lines(_records(2)))
+
+        assert lines[0] == (
+            '{"id":"0","status":"pending","created_at":"2026-10-19T12:00:00","note":null}\n'
+        )
+        assert len(lines) == 2
+
+    @pytest.mark.asyncio
+    async def test_csv_writes_header_and_blank_nulls(self):
+        """Test the header comes first and None becomes an empty cell."""
+        lines = await _collect(csv_lines(_records(1), ("id", "status", "created_at", "note")))
+
+        assert lines == [
+            "id,status,created_at,note\r\n",
+            "0,pending,2026-10-19T12:00:00,\r\n",
+        ]
+
+
+class TestStreamRecords:
+    """Test cases for stream_records."""
+
+    @pytest.mark.asyncio
+    async def test_first_record_is_sent_alone_then_chunked(self):
+        """Test the first chunk is small and later chunks are batched."""
+        metrics.reset()
+        response = stream_records(_records(5000), "ndjson", (), report="test")
+
+        chunks = await _collect(response.body_iterator)
+
+        assert chunks[0].count(b"\n") == 1
+        assert all(len(chunk) >= FLUSH_BYTES for chunk in chunks[1:-1])
+        assert sum(chunk.count(b"\n") for chunk in chunks) == 5000
+        assert metrics.counter_value("report_stream.rows", report="test") == 5000
+        assert metrics.timing_summary("report_stream.first_byte", report="test")["count"] == 1
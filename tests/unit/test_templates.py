@@ -0,0 +1,93 @@
+"""Unit tests for the precompiled bot message templates."""
+
+from datetime import datetime
+
+import pytest
+from telegram.constants import ParseMode
+
+from src.bot import messages
+from src.bot.templates import TemplateRegistry
+from src.services import notification_service
+
+
+class TestMessageTemplates:
+    """Test cases for MessageTemplate and TemplateRegistry."""
+
+    def test_static_template_is_built_once(self):
+        """Test a template without fields returns the same message and markup."""
+        first = messages.HELP.render()
+        second = messages.HELP.render()
+
+        assert messages.HELP.is_static
+        assert first is second
+        assert first.reply_markup is second.reply_markup
+        assert first.parse_mode == ParseMode.MARKDOWN
+        assert first.text.startswith("📱 *Neighborhood Sharing Platform Help*")
+
+    def test_field_values_are_escaped_for_markdown(self):
+        """Test a user's name cannot open bold or italic text."""
+        rendered = messages.MAIN_MENU.render(first_name="snake_case*star")
+
+        assert "Hello snake\\_case\\*star!" in rendered.text
+        # The menu keyboard has no fields and is shared between renders
+        assert rendered.reply_markup is messages.MAIN_MENU.render(first_name="x").reply_markup
+
+    def test_plain_text_template_is_not_escaped(self):
+        """Test values are left as they are when there is no parse mode."""
+        registry = TemplateRegistry()
+        template = registry.add("plain", "Hi {name}", parse_mode=None)
+
+        assert template.render(name="a_b").text == "Hi a_b"
+        assert template.render(name="a_b").parse_mode is None
+
+    def test_format_spec_is_applied_before_escaping(self):
+        """Test ``{field:spec}`` formats like ``str.format``."""
+        registry = TemplateRegistry()
+        template = registry.add("times", "{start:%I:%M %p} for {credits:>3}")
+
+        rendered = template.render(start=datetime(2024, 1, 1, 18, 30), credits=2)
+
+        assert rendered.text == "06:30 PM for   2"
+
+    def test_keyboard_callback_data_is_filled(self):
+        """Test callback data with fields is rendered per message."""
+        rendered = messages.CLAIM_FOOD.render(food_id="abc_123")
+        buttons = rendered.reply_markup.inline_keyboard[0]
+
+        assert buttons[0].callback_data == "confirm_claim_abc_123"
+        assert buttons[1].callback_data == "cancel_claim"
+        assert "*Food ID:* abc\\_123" in rendered.text
+
+    def test_missing_field_raises_key_error(self):
+        """Test rendering names the fields that were not given."""
+        with pytest.raises(KeyError, match="food_id"):
+            messages.CLAIM_FOOD.render()
+
+    def test_registry_rejects_duplicates_and_bad_fields(self):
+        """Test names are unique and fields must be plain names."""
+        registry = TemplateRegistry()
+        registry.add("greeting", "Hi {name}")
+
+        with pytest.raises(ValueError):
+            registry.add("greeting", "Hello {name}")
+        with pytest.raises(ValueError):
+            registry.add("attribute", "Hi {user.name}")
+        with pytest.raises(ValueError):
+            registry.add("conversion", "Hi {name!r}")
+
+        assert "greeting" in registry
+        assert registry.render("greeting", name="Ann").text == "Hi Ann"
+
+    def test_notification_commands_keep_their_underscores(self):
+        """Test command links survive Markdown rendering."""
+        rendered = notification_service.FOOD_REQUESTED.render(
+            recipient_name="Ann",
+            apartment_number="3B",
+            title="Soup",
+            pickup_location="Lobby",
+            pickup_start=datetime(2024, 1, 1, 18),
+            exchange_code="1a2b3c4d",
+        )
+
+        assert "/confirm\\_1a2b3c4d - Confirm exchange" in rendered.text
+        assert "*Soup*" in rendered.text
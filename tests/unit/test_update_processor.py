@@ -0,0 +1,185 @@
+"""Unit tests for the bot's update processor and webhook intake."""
+
+import asyncio
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+from telegram.ext import CommandHandler, ConversationHandler
+
+from src.api.main import app
+from src.bot.update_processor import OrderedUpdateProcessor, time_handlers
+from src.core.metrics import metrics
+
+
+def _update(update_id: int, chat_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        update_id=update_id,
+        effective_chat=SimpleNamespace(id=chat_id),
+        effective_user=None,
+        message=object(),
+    )
+
+
+class TestOrderedUpdateProcessor:
+    """Test cases for OrderedUpdateProcessor."""
+
+    @pytest.mark.asyncio
+    async def test_same_chat_in_order_other_chats_concurrently(self):
+        """Test one chat's updates never overlap while other chats proceed."""
+        processor = OrderedUpdateProcessor(concurrent_updates=8, max_pending_updates=100)
+        running = {}
+        overlaps = []
+        finished = []
+
+        async def handle(update):
+            chat = update.effective_chat.id
+            running[chat] = running.get(chat, 0) + 1
+            overlaps.append(sum(1 for count in running.values() if count))
+            assert running[chat] == 1
+            await asyncio.sleep(0.01)
+            running[chat] -= 1
+            finished.append(update.update_id)
+
+        updates = [_update(i, chat_id=i % 2) for i in range(6)]
+        for update in updates:
+            assert processor.admit(update)
+        await asyncio.gather(*(
+            processor.process_update(update, handle(update)) for update in updates
+        ))
+
+        assert [i for i in finished if i % 2 == 0] == [0, 2, 4]
+        assert [i for i in finished if i % 2 == 1] == [1, 3, 5]
+        assert max(overlaps) == 2
+        assert processor.pending_updates == 0
+
+    @pytest.mark.asyncio
+    async def test_admission_is_bounded_until_handled(self):
+        """Test updates are refused once the pending limit is reached."""
+        metrics.reset()
+        processor = OrderedUpdateProcessor(concurrent_updates=1, max_pending_updates=2)
+        first, second, third = _update(1, 1), _update(2, 2), _update(3, 3)
+
+        assert processor.admit(first)
+        assert processor.admit(second)
+        assert not processor.admit(third)
+        assert metrics.counter_value("bot_updates_rejected_total") == 1
+
+        await processor.process_update(first, asyncio.sleep(0))
+        assert processor.admit(third)
+
+    @pytest.mark.asyncio
+    async def test_records_latency_from_admission(self):
+        """Test latency runs from admission to the handler starting."""
+        metrics.reset()
+        processor = OrderedUpdateProcessor(concurrent_updates=1, max_pending_updates=10)
+        update = _update(1, 1)
+        processor.admit(update)
+        await asyncio.sleep(0.02)
+
+        await processor.process_update(update, asyncio.sleep(0))
+
+        latency = metrics.timing_summary("bot_update_latency_seconds", type="message")
+        assert latency["count"] == 1
+        assert latency["max_ms"] >= 20
+        assert metrics.timing_summary("bot_update_handle_seconds", type="message")["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_polled_updates_count_as_pending(self):
+        """Test updates that skipped admission are still counted while handled."""
+        processor = OrderedUpdateProcessor(concurrent_updates=1, max_pending_updates=10)
+        seen = []
+
+        async def handle():
+            seen.append((processor.pending_updates, processor.running_updates))
+
+        await processor.process_update(_update(1, 1), handle())
+
+        assert seen == [(1, 1)]
+        assert (processor.pending_updates, processor.running_updates) == (0, 0)
+
+
+class TestTimeHandlers:
+    """Test cases for time_handlers."""
+
+    @pytest.mark.asyncio
+    async def test_records_latency_per_callback_once(self):
+        """Test callbacks inside conversations are timed by name, without double wrapping."""
+        metrics.reset()
+
+        async def ask_photo(update, context):
+            return 1
+
+        async def cancel(update, context):
+            return ConversationHandler.END
+
+        conversation = ConversationHandler(
+            entry_points=[CommandHandler("share", ask_photo)],
+            states={1: [CommandHandler("cancel", cancel)]},
+            fallbacks=[],
+        )
+        time_handlers(conversation)
+        time_handlers(conversation)
+
+        assert await conversation.entry_points[0].callback(None, None) == 1
+        await conversation.states[1][0].callback(None, None)
+
+        assert metrics.timing_summary("bot_handler_seconds", handler="ask_photo")["count"] == 1
+        assert metrics.timing_summary("bot_handler_seconds", handler="cancel")["count"] == 1
+
+
+class TestTelegramWebhook:
+    """Test cases for POST /webhook/telegram."""
+
+    @pytest.mark.asyncio
+    async def test_queued_update_is_acknowledged_and_full_queue_gets_503(self):
+        """Test 200 when the update is queued and 503 when it is not."""
+        accepted = []
+        bot = SimpleNamespace(
+            running=True,
+            bot=None,
+            update_processor=SimpleNamespace(pending_updates=0),
+            enqueue_update=lambda update: accepted.append(update.update_id) or len(accepted) < 2,
+        )
+
+        with patch("src.bot.main.bot_instance", bot), \
+                patch("src.api.routers.webhook.settings.telegram_webhook_secret", ""):
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                ok = await client.post("/webhook/telegram", json={"update_id": 1})
+                full = await client.post("/webhook/telegram", json={"update_id": 2})
+
+        assert ok.status_code == 200
+        assert full.status_code == 503
+        assert full.headers["retry-after"] == "1"
+        assert accepted == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_bot_not_running_gets_503(self):
+        """Test updates are refused until the bot has started."""
+        bot = SimpleNamespace(running=False)
+
+        with patch("src.bot.main.bot_instance", bot), \
+                patch("src.api.routers.webhook.settings.telegram_webhook_secret", ""):
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                response = await client.post("/webhook/telegram", json={"update_id": 1})
+
+        assert response.status_code == 503
+
+    def test_api_without_webhook_does_not_load_telegram(self):
+        """Test importing the API leaves python-telegram-bot unloaded."""
+        env = {**os.environ, "TELEGRAM_WEBHOOK_URL": ""}
+        # A fresh interpreter, since this one already imported the bot
+        result = subprocess.run(
+            [sys.executable, "-c", "import sys, src.api.main; print('telegram' in sys.modules)"],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+            check=True,
+        )
+
+        assert result.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,284 @@
+"""Unit tests for the Valkey stream transport of bot updates."""
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+from src.api.main import app
+from src.bot.update_stream import (
+    _RELEASE_SCRIPT,
+    _RENEW_SCRIPT,
+    CONSUMER_GROUP,
+    UpdateStreamProducer,
+    UpdateStreamWorker,
+    lease_key,
+    partition_for,
+    stream_key,
+)
+from src.core.metrics import metrics
+
+
+def _redis(zcard: int = 1) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 0, zcard])
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value = pipe
+    redis_client.eval = AsyncMock(return_value=1)
+    redis_client.set = AsyncMock(return_value=True)
+    redis_client.xack = AsyncMock()
+    redis_client.zrem = AsyncMock()
+    return redis_client
+
+
+class FakeStreamRedis:
+    """Leases that expire, a worker pool and streams with one consumer group."""
+
+    def __init__(self) -> None:
+        self.leases = {}
+        self.workers = {}
+        # Entries not yet delivered, and those read but not acknowledged
+        self.entries = {}
+        self.pending = {}
+
+    def add(self, key: str, entry_id: str, update_data: dict) -> None:
+        self.entries.setdefault(key, []).append((entry_id, {"update": json.dumps(update_data)}))
+
+    def _holder(self, key):
+        holder, expires_at = self.leases.get(key, (None, 0))
+        return holder if expires_at > time.monotonic() else None
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._holder(key) is not None:
+            return None
+        self.leases[key] = (value, time.monotonic() + px / 1000)
+        return True
+
+    async def eval(self, script, numkeys, key, token, *args):
+        if self._holder(key) != token:
+            return 0
+        if script == _RENEW_SCRIPT:
+            self.leases[key] = (token, time.monotonic() + int(args[0]) / 1000)
+        elif script == _RELEASE_SCRIPT:
+            del self.leases[key]
+        return 1
+
+    def pipeline(self, transaction: bool = True) -> MagicMock:
+        pipe = MagicMock()
+        results = []
+
+        def zremrangebyscore(key, low, high):
+            self.workers = {name: at for name, at in self.workers.items() if at > high}
+
+        pipe.zadd.side_effect = lambda key, mapping: self.workers.update(mapping)
+        pipe.zremrangebyscore.side_effect = zremrangebyscore
+        pipe.zcard.side_effect = lambda key: results.append(len(self.workers))
+        pipe.xack.side_effect = lambda key, group, entry_id: self.pending.pop((key, entry_id), None)
+        pipe.xdel.side_effect = lambda key, entry_id: None
+
+        async def execute():
+            return [None, None, *results]
+
+        pipe.execute = execute
+        return pipe
+
+    async def zrem(self, key, name):
+        self.workers.pop(name, None)
+
+    async def xgroup_create(self, *args, **kwargs):
+        pass
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time, start_id="0-0", count=None):
+        claimed = [(entry_id, fields) for (k, entry_id), (_, fields) in self.pending.items() if k == key]
+        for entry_id, fields in claimed:
+            self.pending[(key, entry_id)] = (consumer, fields)
+        return ["0-0", claimed, []]
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (key, _), = streams.items()
+        new = self.entries.pop(key, [])
+        if not new:
+            await asyncio.sleep(0.05)
+            return []
+        for entry_id, fields in new:
+            self.pending[(key, entry_id)] = (consumer, fields)
+        return [[key, new]]
+
+
+class TestUpdateStreamProducer:
+    """Test cases for UpdateStreamProducer."""
+
+    def test_chat_always_maps_to_the_same_partition(self):
+        """Test partitioning by chat id, with chatless updates on 0."""
+        assert partition_for(42, 16) == partition_for(42, 16) == 10
+        assert partition_for(-1001, 16) == -1001 % 16
+        assert partition_for(None, 16) == 0
+
+    @pytest.mark.asyncio
+    async def test_publish_appends_to_the_chat_partition(self):
+        """Test the raw update is appended with the length limit."""
+        redis_client = _redis()
+        redis_client.eval = AsyncMock(return_value="1-0")
+        producer = UpdateStreamProducer(redis_client, partitions=4, max_length=10)
+
+        entry_id = await producer.publish({"update_id": 7}, chat_id=6)
+
+        assert entry_id == "1-0"
+        _, numkeys, key, max_length, payload = redis_client.eval.call_args.args
+        assert (numkeys, key, max_length) == (1, stream_key(2), 10)
+        assert json.loads(payload) == {"update_id": 7}
+
+    @pytest.mark.asyncio
+    async def test_full_partition_is_rejected(self):
+        """Test None comes back when the partition is at its limit."""
+        metrics.reset()
+        redis_client = _redis()
+        redis_client.eval = AsyncMock(return_value=None)
+
+        assert await UpdateStreamProducer(redis_client).publish({"update_id": 7}, 1) is None
+        assert metrics.counter_value("bot_stream_rejected_total") == 1
+
+
+class TestUpdateStreamWorker:
+    """Test cases for UpdateStreamWorker."""
+
+    @pytest.mark.asyncio
+    async def test_rebalance_claims_a_fair_share(self):
+        """Test a worker among four claims a quarter of the partitions."""
+        redis_client = _redis(zcard=4)
+        worker = UpdateStreamWorker(
+            redis_client, AsyncMock(), consumer="w1", partitions=16, lease_seconds=3
+        )
+
+        with patch.object(UpdateStreamWorker, "_consume", AsyncMock()):
+            await worker.rebalance()
+
+        assert len(worker.owned_partitions) == 4
+        claimed = {call.args[0] for call in redis_client.set.call_args_list}
+        assert claimed == {lease_key(p) for p in worker.owned_partitions}
+        assert redis_client.set.call_args.kwargs == {"nx": True, "px": 3000}
+
+    @pytest.mark.asyncio
+    async def test_rebalance_hands_back_surplus_partitions(self):
+        """Test partitions beyond the share are released when workers join."""
+        redis_client = _redis(zcard=1)
+        worker = UpdateStreamWorker(redis_client, AsyncMock(), consumer="w1", partitions=4)
+
+        async def consume(self, partition):
+            while self._owns(partition):
+                await asyncio.sleep(0)
+
+        with patch.object(UpdateStreamWorker, "_consume", consume):
+            await worker.rebalance()
+            kept = worker.owned_partitions
+            assert len(kept) == 4
+
+            redis_client.pipeline.return_value.execute = AsyncMock(return_value=[1, 0, 2])
+            await worker.rebalance()
+            owned = worker.owned_partitions
+            await asyncio.gather(*worker._hand_backs.values())
+            released = [
+                call.args[2] for call in redis_client.eval.call_args_list if call.args[0] == _RELEASE_SCRIPT
+            ]
+            await worker.stop()
+
+        assert owned == kept[:2]
+        # Handed back concurrently, so in no particular order
+        assert sorted(released) == sorted(lease_key(p) for p in kept[2:])
+
+    @pytest.mark.asyncio
+    async def test_slow_handler_keeps_its_lease_while_a_worker_joins(self):
+        """Test no partition is consumed twice when a handback outlasts the lease."""
+        redis_client = FakeStreamRedis()
+        for partition in (0, 1):
+            redis_client.add(stream_key(partition), "1000-0", {"update_id": partition, "partition": partition})
+        started = asyncio.Event()
+        handling = {}
+        handled = []
+        overlaps = []
+
+        async def handle(update_data):
+            partition = update_data["partition"]
+            handling[partition] = handling.get(partition, 0) + 1
+            if handling[partition] > 1:
+                overlaps.append(partition)
+            started.set()
+            # Three leases long
+            await asyncio.sleep(1.5)
+            handling[partition] -= 1
+            handled.append(update_data["update_id"])
+
+        first = UpdateStreamWorker(redis_client, handle, consumer="w1", partitions=2, lease_seconds=0.5)
+        second = UpdateStreamWorker(redis_client, handle, consumer="w2", partitions=2, lease_seconds=0.5)
+        runs = [asyncio.ensure_future(first.run())]
+        await asyncio.wait_for(started.wait(), timeout=1)
+        assert first.owned_partitions == [0, 1]
+
+        runs.append(asyncio.ensure_future(second.run()))
+        await asyncio.sleep(2.0)
+        owned = (first.owned_partitions, second.owned_partitions)
+        await asyncio.gather(first.stop(), second.stop())
+        await asyncio.gather(*runs)
+
+        assert overlaps == []
+        assert sorted(handled) == [0, 1]
+        # The surplus partition moved over once its handler returned
+        assert owned == ([0], [1])
+
+    @pytest.mark.asyncio
+    async def test_entries_are_acked_after_handling_even_on_failure(self):
+        """Test each entry is handled in order, then acknowledged and deleted."""
+        metrics.reset()
+        handled = []
+
+        async def handle(update_data):
+            handled.append(update_data["update_id"])
+            if update_data["update_id"] == 2:
+                raise ValueError("bad update")
+
+        redis_client = _redis()
+        pipe = redis_client.pipeline.return_value
+        worker = UpdateStreamWorker(redis_client, handle, consumer="w1")
+        entries = [
+            ("1000-0", {"update": json.dumps({"update_id": 1, "message": {}})}),
+            ("1000-1", {"update": json.dumps({"update_id": 2, "message": {}})}),
+            ("1000-2", None),
+        ]
+
+        await worker._handle_entries(stream_key(0), entries)
+
+        assert handled == [1, 2]
+        assert [call.args for call in pipe.xack.call_args_list] == [
+            (stream_key(0), CONSUMER_GROUP, "1000-0"),
+            (stream_key(0), CONSUMER_GROUP, "1000-1"),
+        ]
+        redis_client.xack.assert_awaited_once_with(stream_key(0), CONSUMER_GROUP, "1000-2")
+        assert metrics.counter_value("bot_stream_failures_total") == 1
+        assert metrics.timing_summary("bot_update_latency_seconds", type="message")["count"] == 2
+
+
+class TestStreamWebhook:
+    """Test cases for POST /webhook/telegram with the stream transport."""
+
+    @pytest.mark.asyncio
+    async def test_update_is_published_and_full_stream_gets_503(self):
+        """Test 200 once appended and 503 when the partition is full."""
+        publish = AsyncMock(side_effect=["1-0", None])
+        update = {"update_id": 1, "message": {
+            "message_id": 1, "date": 0, "chat": {"id": 5, "type": "private"}, "text": "hi",
+        }}
+
+        with patch("src.api.routers.webhook.settings.bot_update_transport", "stream"), \
+                patch("src.api.routers.webhook.settings.telegram_webhook_secret", ""), \
+                patch("src.api.routers.webhook.init_redis", AsyncMock()), \
+                patch.object(UpdateStreamProducer, "publish", publish):
+            async with AsyncClient(app=app, base_url="http://test") as client:
+                ok = await client.post("/webhook/telegram", json=update)
+                full = await client.post("/webhook/telegram", json=update)
+
+        assert ok.status_code == 200
+        assert full.status_code == 503
+        assert publish.call_args.args == (update, 5)
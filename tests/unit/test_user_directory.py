@@ -0,0 +1,221 @@
+"""Unit tests for the Telegram id to user profile cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.events import DomainEvent
+from src.core.metrics import metrics
+from src.services.user_directory import (
+    _SET_SCRIPT,
+    INVALIDATION_CHANNEL,
+    USER_PROFILE_CHANGED,
+    UserDirectory,
+    UserProfile,
+    profile_key,
+    version_key,
+)
+
+
+def _profile(telegram_id: int = 42, building_id: str = "north") -> UserProfile:
+    return UserProfile(
+        id=f"user-{telegram_id}",
+        telegram_id=telegram_id,
+        building_id=building_id,
+        status="verified",
+        is_phone_verified=True,
+        notifications_enabled=True,
+        sharing_enabled=False,
+    )
+
+
+class FakePubSub:
+    """Delivers messages put on a queue until cancelled."""
+
+    def __init__(self, messages: asyncio.Queue) -> None:
+        self.messages = messages
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def subscribe(self, channel):
+        pass
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+
+class FakeRedis:
+    """Strings backed by a dict, recording published messages."""
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.published = []
+        self.messages = asyncio.Queue()
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+    async def eval(self, script, numkeys, key, version_key, version, value, ttl):
+        assert script == _SET_SCRIPT
+        if self.values.get(version_key, "") != version:
+            return 0
+        self.values[key] = value
+        return 1
+
+    def _incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+
+    def pipeline(self, transaction: bool = True) -> MagicMock:
+        pipe = MagicMock()
+        pipe.delete.side_effect = lambda *keys: [self.values.pop(key, None) for key in keys]
+        pipe.incr.side_effect = self._incr
+        pipe.publish.side_effect = lambda channel, message: self.published.append((channel, message))
+        pipe.execute = AsyncMock(return_value=[])
+        return pipe
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self.messages)
+
+
+class TestUserDirectory:
+    """Test cases for UserDirectory."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_are_served_locally(self):
+        """Test only the first lookup reaches Valkey and SQL."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client)
+        loader = AsyncMock(return_value=_profile())
+
+        first = await directory.get(42, loader)
+        second = await directory.get(42, loader)
+
+        assert first == second == _profile()
+        loader.assert_awaited_once()
+        assert UserProfile.loads(redis_client.values[profile_key(42)]) == _profile()
+        assert directory.hit_rates() == {"local": 0.5, "valkey": 0.0}
+        assert metrics.timing_summary("user_directory_lookup_seconds", source="local")["count"] == 1
+        assert metrics.timing_summary("user_directory_lookup_seconds", source="database")["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_processes_share_profiles_through_valkey(self):
+        """Test another process finds the profile in Valkey without querying."""
+        redis_client = FakeRedis()
+        await UserDirectory(redis_client).get(42, AsyncMock(return_value=_profile()))
+
+        loader = AsyncMock()
+        assert await UserDirectory(redis_client).get(42, loader) == _profile()
+        loader.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_local_entries_expire_and_are_bounded(self):
+        """Test expired entries are fetched again and the LRU drops the oldest."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client, max_size=2, local_ttl_seconds=0)
+        await directory.get(42, AsyncMock(return_value=_profile()))
+
+        await directory.get(42, AsyncMock())
+        assert metrics.counter_value("user_directory_lookups_total", tier="valkey", result="hit") == 1
+
+        directory.local_ttl_seconds = 60
+        for telegram_id in (1, 2, 3):
+            await directory.get(telegram_id, AsyncMock(return_value=_profile(telegram_id)))
+        assert len(directory) == 2
+        assert list(directory._local) == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_unknown_users_are_not_cached(self):
+        """Test a user who registers after a miss is found on the next lookup."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client)
+
+        assert await directory.get(42, AsyncMock(return_value=None)) is None
+        assert await directory.get(42, AsyncMock(return_value=_profile())) == _profile()
+        assert list(redis_client.values) == [profile_key(42)]
+
+    @pytest.mark.asyncio
+    async def test_committed_change_invalidates_every_tier(self):
+        """Test a profile change event drops the entry here, in Valkey and elsewhere."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client)
+        await directory.get(42, AsyncMock(return_value=_profile()))
+
+        directory.record(DomainEvent(name=USER_PROFILE_CHANGED, subject_id="42"))
+        assert len(directory) == 0
+        await directory.drain()
+
+        assert redis_client.values == {version_key(42): "1"}
+        assert redis_client.published == [(INVALIDATION_CHANNEL, 42)]
+        moved = await directory.get(42, AsyncMock(return_value=_profile(building_id="south")))
+        assert moved.building_id == "south"
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_is_not_cached(self):
+        """Test a profile read before a concurrent change is not kept."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client)
+
+        async def stale_load():
+            await directory.invalidate(42)
+            return _profile(building_id="north")
+
+        assert (await directory.get(42, stale_load)).building_id == "north"
+        assert len(directory) == 0
+        assert profile_key(42) not in redis_client.values
+
+    @pytest.mark.asyncio
+    async def test_load_racing_an_invalidation_elsewhere_is_not_shared(self):
+        """Test a slow load is not written to Valkey after another process invalidates."""
+        redis_client = FakeRedis()
+        slow, other = UserDirectory(redis_client), UserDirectory(redis_client)
+        loading, changed = asyncio.Event(), asyncio.Event()
+
+        async def slow_load():
+            loading.set()
+            await changed.wait()
+            return _profile(building_id="north")
+
+        lookup = asyncio.ensure_future(slow.get(42, slow_load))
+        await loading.wait()
+        # The user moves and the other process invalidates mid-load
+        await other.invalidate(42)
+        changed.set()
+
+        assert (await lookup).building_id == "north"
+        assert profile_key(42) not in redis_client.values
+        moved = await other.get(42, AsyncMock(return_value=_profile(building_id="south")))
+        assert moved.building_id == "south"
+        assert UserProfile.loads(redis_client.values[profile_key(42)]).building_id == "south"
+
+    @pytest.mark.asyncio
+    async def test_listener_drops_entries_invalidated_elsewhere(self):
+        """Test published invalidations clear this process's entries."""
+        redis_client = FakeRedis()
+        directory = UserDirectory(redis_client)
+        await directory.get(1, AsyncMock(return_value=_profile(1)))
+
+        listener = asyncio.ensure_future(directory.listen())
+        await asyncio.sleep(0)
+        # Entries cached before subscribing may have missed invalidations
+        assert len(directory) == 0
+
+        for telegram_id in (7, 42):
+            await directory.get(telegram_id, AsyncMock(return_value=_profile(telegram_id)))
+        await redis_client.messages.put({"type": "message", "data": "42"})
+        for _ in range(3):
+            await asyncio.sleep(0)
+        listener.cancel()
+
+        assert list(directory._local) == [7]